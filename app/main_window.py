@@ -10,6 +10,7 @@ from PyQt5.QtWidgets import (
 from app import __version__
 from service.file_opener import FileOpener
 from service.pdf_handler import temp_file_manager
+from service.search_query import SearchQuery
 from utils.config_manager import ConfigManager
 from utils.constants import (
     WINDOW_TITLE_TEMPLATE, MAIN_WINDOW_LAYOUT_SPACING, MAIN_WINDOW_LAYOUT_MARGIN,
@@ -95,6 +96,7 @@ class MainWindow(QMainWindow):
 
     def _connect_signals(self) -> None:
         self.search_widget.search_requested.connect(self.start_search)
+        self.search_widget.incremental_search_requested.connect(self.start_incremental_search)
         self.search_widget.clear_requested.connect(self.clear_search)
         self.results_widget.result_selected.connect(self.enable_open_buttons)
         self.results_widget.file_open_requested.connect(self.open_file)
@@ -131,6 +133,7 @@ class MainWindow(QMainWindow):
         search_terms = self.search_widget.get_search_terms()
         include_subdirs = self.search_widget.include_subdirs()
         search_type = self.search_widget.get_search_type()
+        match_mode = self.search_widget.get_match_mode()
 
         if not search_terms:
             return
@@ -142,29 +145,62 @@ class MainWindow(QMainWindow):
         self.search_widget.disable_open_folder_button()
 
         try:
+            # 正規表現・演算子の誤りは検索スレッドの開始前に知らせる
+            SearchQuery(search_terms, search_type, match_mode)
+
             directories = self.config_manager.get_directories()
             if self.use_index_search:
                 self.results_widget.perform_global_index_search(
-                    directories, search_terms, include_subdirs, search_type
+                    directories, search_terms, include_subdirs, search_type, match_mode
                 )
             else:
                 self.results_widget.perform_global_search(
-                    directories, search_terms, include_subdirs, search_type
+                    directories, search_terms, include_subdirs, search_type, match_mode
                 )
         except Exception as e:
             self.auto_close_message.show_message(
                 LOG_MESSAGE_TEMPLATES['SEARCH_ERROR'].format(error=str(e)), 5000
             )
 
+    def start_incremental_search(self) -> None:
+        """入力が止まった時点の検索語でインデックスを検索する.
+
+        入力途中の正規表現・演算子の誤りはメッセージを出さず、直前の結果を残す.
+        """
+        if not self.use_index_search:
+            return
+
+        search_terms = self.search_widget.get_search_terms()
+        search_type = self.search_widget.get_search_type()
+        match_mode = self.search_widget.get_match_mode()
+
+        if not search_terms:
+            self.results_widget.clear_results()
+            self.search_widget.disable_open_folder_button()
+            return
+
+        try:
+            SearchQuery(search_terms, search_type, match_mode)
+        except Exception as e:
+            logger.debug(f"入力途中の検索語を解釈できません: {e}")
+            return
+
+        self.results_widget.clear_results()
+        self.search_widget.disable_open_folder_button()
+        self.results_widget.perform_incremental_search(search_terms, search_type, match_mode)
+
     def clear_search(self) -> None:
         """検索語と検索結果をクリア"""
         self.search_widget.clear_input()
         self.results_widget.clear_results()
+        self.results_widget.reset_refinement()
 
     def open_index_management(self) -> None:
         """インデックス管理ダイアログを表示する"""
         if self.index_dialog is None:
             self.index_dialog = IndexManagementDialog(self.config_manager, self)
+            # 更新後のインデックスでは前回の結果を絞り込みの候補に使わない
+            self.index_dialog.index_widget.index_updated.connect(self.results_widget.reset_refinement)
 
         self.index_dialog.show()
         self.index_dialog.raise_()
@@ -177,6 +213,9 @@ class MainWindow(QMainWindow):
             enabled: 有効にする場合True、無効にする場合False.
         """
         self.use_index_search = enabled
+        self.search_widget.set_incremental_search_available(enabled)
+        if not enabled:
+            self.results_widget.cancel_incremental_search()
         status = '有効' if enabled else '無効'
         logger.info(LOG_MESSAGE_TEMPLATES['INDEX_TOGGLE'].format(status=status))
 
@@ -198,7 +237,8 @@ class MainWindow(QMainWindow):
             if not file_path:
                 return
             search_terms = self.search_widget.get_search_terms()
-            self.file_opener.open_file(file_path, position or 0, search_terms)
+            match_mode = self.search_widget.get_match_mode()
+            self.file_opener.open_file(file_path, position or 0, search_terms, match_mode)
         except FileNotFoundError:
             self._show_error_message(ERROR_MESSAGES['FILE_NOT_FOUND'])
         except Exception as e:
@@ -235,6 +275,7 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             logger.info(LOG_MESSAGE_TEMPLATES['APP_EXIT'])
             try:
+                self.results_widget.shutdown()
                 self.file_opener.cleanup_resources()
                 temp_file_manager.cleanup_all()
             except Exception as e:
@@ -247,6 +288,7 @@ class MainWindow(QMainWindow):
     def closeEvent(self, a0: QCloseEvent) -> None:
         """ウィンドウクローズイベントを処理する"""
         try:
+            self.results_widget.shutdown()
             self.file_opener.cleanup_resources()
             temp_file_manager.cleanup_all()
 
@@ -9,6 +9,7 @@ sys.path.insert(0, str(project_root))
 
 from service.search_indexer import SearchIndexer
 from utils.config_manager import ConfigManager
+from utils.helpers import format_compaction_report
 
 
 def parse_arguments():
@@ -21,6 +22,9 @@ def parse_arguments():
   python scripts/rebuild_index.py
   python scripts/rebuild_index.py --index-file my_index.json
   python scripts/rebuild_index.py --config-file /path/to/config.ini
+  python scripts/rebuild_index.py --root C:/manuals/sample1
+  python scripts/rebuild_index.py --compact
+  python scripts/rebuild_index.py --count ポンプ --count バルブ
         """
     )
     
@@ -41,6 +45,25 @@ def parse_arguments():
         action='store_true',
         help='サブディレクトリを含めない（デフォルトは含める）'
     )
+
+    parser.add_argument(
+        '--root',
+        action='append',
+        help='指定したフォルダのシャードだけを再構築（複数指定可、デフォルトは全フォルダ）'
+    )
+
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='元ファイルを読み直さずにインデックスを最適化し、回収した容量を表示'
+    )
+
+    parser.add_argument(
+        '--count',
+        action='append',
+        metavar='TERM',
+        help='インデックスを再構築せず、検索語を含む文書数と出現回数を表示（複数指定可）'
+    )
     
     
     return parser.parse_args()
@@ -61,6 +84,31 @@ def print_progress(current: int, total: int):
         print()  # 改行
 
 
+def compact_index(index_file_path: str, local_cache_dir: str) -> int:
+    """インデックスを最適化してレポートを表示"""
+    if not os.path.exists(index_file_path):
+        print(f"エラー: インデックスファイルが見つかりません: {index_file_path}")
+        return 1
+
+    print("インデックスの最適化を開始します...")
+    report = SearchIndexer(index_file_path, local_cache_dir).compact_index()
+    print(format_compaction_report(report))
+    return 0
+
+
+def count_terms(index_file_path: str, local_cache_dir: str, terms: list, fold_kana: bool) -> int:
+    """検索語を含む文書数と出現回数を表示"""
+    if not os.path.exists(index_file_path):
+        print(f"エラー: インデックスファイルが見つかりません: {index_file_path}")
+        return 1
+
+    counts = SearchIndexer(index_file_path, local_cache_dir).count_terms(terms, fold_kana=fold_kana)
+    print(f"{'検索語':<20} {'文書数':>8} {'出現回数':>10}")
+    for term, count in counts.items():
+        print(f"{term:<20} {count['documents']:>10} {count['occurrences']:>12}")
+    return 0
+
+
 def main():
     """メイン処理"""
     args = parse_arguments()
@@ -77,11 +125,21 @@ def main():
             index_file_path = args.index_file
         else:
             index_file_path = config_manager.get_index_file_path()
+        local_cache_dir = config_manager.get_index_local_cache_dir()
         
-        print("インデックス再構築スクリプト")
+        if args.count:
+            print("検索語の集計スクリプト")
+        else:
+            print("インデックス最適化スクリプト" if args.compact else "インデックス再構築スクリプト")
         print(f"インデックスファイル: {index_file_path}")
         print(f"設定ファイル: {config_manager.config_file}")
         print("-" * 50)
+
+        if args.count:
+            return count_terms(index_file_path, local_cache_dir, args.count, config_manager.get_fold_kana())
+
+        if args.compact:
+            return compact_index(index_file_path, local_cache_dir)
         
         # ディレクトリ設定の取得
         directories = config_manager.get_directories()
@@ -102,27 +160,33 @@ def main():
         print()
         
         # インデックス再構築の開始
-        if os.path.exists(index_file_path):
+        if args.root:
+            unknown_roots = [root for root in args.root if root not in directories]
+            if unknown_roots:
+                print(f"エラー: 設定されていないフォルダが指定されました: {', '.join(unknown_roots)}")
+                return 1
+            directories = args.root
+            print(f"再構築するシャード: {', '.join(directories)}")
+        elif os.path.exists(index_file_path):
             print(f"既存のインデックスファイルが見つかりました: {index_file_path}")
             print("既存のインデックスを削除して再構築します。")
         else:
             print("新しいインデックスを作成します。")
         
-        # 既存インデックスの削除
-        if os.path.exists(index_file_path):
-            try:
-                os.remove(index_file_path)
-                print(f"既存のインデックスファイルを削除しました: {index_file_path}")
-            except OSError as e:
-                print(f"エラー: インデックスファイルの削除に失敗しました: {e}")
-                return 1
+        indexer = SearchIndexer(index_file_path, local_cache_dir)
+
+        # 既存インデックスの削除（--root指定時は対象シャードのみで、他のシャードは書き換えない）
+        if args.root:
+            indexer.reset_index(directories)
+        else:
+            indexer.reset_index()
+            indexer.storage.save(indexer.index_data)
+            print(f"既存のインデックスを削除しました: {index_file_path}")
         
         # インデックスの再構築
         print("インデックスの再構築を開始します...")
         print()
         
-        indexer = SearchIndexer(index_file_path)
-        
         try:
             indexer.create_index(
                 directories=directories,
@@ -137,6 +201,7 @@ def main():
             print("\n=== インデックス統計 ===")
             print(f"インデックス化されたファイル数: {stats['files_count']}")
             print(f"総ファイルサイズ: {stats['total_size_mb']:.2f} MB")
+            print(f"シャード数: {stats['shards_count']}")
             print(f"インデックスファイルサイズ: {stats['index_file_size_mb']:.2f} MB")
             print(f"作成日時: {stats['created_at']}")
             print(f"最終更新: {stats['last_updated']}")
@@ -0,0 +1,107 @@
+import base64
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from utils.constants import (
+    FILE_EXTENSION_PDF,
+    INDEX_COMPRESSION_BLOCK_SIZE,
+    INDEX_COMPRESSION_LEVEL,
+    PDF_TEXT_PAGE_SEPARATOR,
+    TEXT_LINE_SEPARATOR,
+)
+
+CODEC_ZLIB = 'zlib'
+
+# インデックスのcontentは旧形式の文字列か、compress_textが返す辞書
+StoredText = Union[str, Dict]
+
+
+def text_separator(file_path: str) -> str:
+    """ファイルの種類に応じたページ/行の区切り文字を返す"""
+    return PDF_TEXT_PAGE_SEPARATOR if file_path.lower().endswith(FILE_EXTENSION_PDF) else TEXT_LINE_SEPARATOR
+
+
+def compress_text(text: str, separator: str, block_size: int = INDEX_COMPRESSION_BLOCK_SIZE) -> Dict:
+    """文書テキストをページ/行の区切りでブロックに分けて圧縮する
+
+    Args:
+        text: 文書テキスト
+        separator: ページ/行の区切り文字
+        block_size: 1ブロックの目安の文字数
+
+    Returns:
+        コーデック、区切り文字、ブロックごとのページ/行数と圧縮データを持つ辞書
+    """
+    blocks: List[str] = []
+    units: List[int] = []
+    current: List[str] = []
+    length = 0
+
+    def flush() -> None:
+        data = zlib.compress(separator.join(current).encode('utf-8'), INDEX_COMPRESSION_LEVEL)
+        blocks.append(base64.b64encode(data).decode('ascii'))
+        units.append(len(current))
+
+    for unit in text.split(separator):
+        if current and length + len(unit) > block_size:
+            flush()
+            current, length = [], 0
+        current.append(unit)
+        length += len(unit) + len(separator)
+    flush()
+
+    return {"codec": CODEC_ZLIB, "separator": separator, "units": units, "blocks": blocks}
+
+
+def is_compressed(stored: StoredText) -> bool:
+    return isinstance(stored, dict)
+
+
+class CompressedText:
+    """インデックスに保存された文書テキストをブロック単位で必要な分だけ展開する
+
+    旧形式の文字列もページ/行番号1から始まる1つのブロックとして扱う。
+    """
+
+    def __init__(self, stored: StoredText) -> None:
+        """初期化
+
+        Args:
+            stored: インデックスのcontentの値
+        """
+        self._stored = stored
+        if is_compressed(stored):
+            self.separator: Optional[str] = stored["separator"]
+            self._blocks: List[Optional[str]] = [None] * len(stored["blocks"])
+        else:
+            self.separator = None
+            self._blocks = [stored or ""]
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def iter_blocks(self) -> Iterator[Tuple[int, str]]:
+        """ブロックを先頭から展開して返す
+
+        Returns:
+            (ブロック先頭のページ/行番号, ブロックのテキスト)のイテレータ
+        """
+        first_unit = 1
+        for block_index in range(len(self._blocks)):
+            yield first_unit, self.get_block(block_index)
+            if is_compressed(self._stored):
+                first_unit += self._stored["units"][block_index]
+
+    def get_block(self, block_index: int) -> str:
+        block = self._blocks[block_index]
+        if block is None:
+            data = base64.b64decode(self._stored["blocks"][block_index])
+            block = zlib.decompress(data).decode('utf-8')
+            self._blocks[block_index] = block
+        return block
+
+    @property
+    def text(self) -> str:
+        if self.separator is None:
+            return self._blocks[0]
+        return self.separator.join(block for _, block in self.iter_blocks())
@@ -30,19 +30,42 @@ class ContentExtractor:
         else:
             return ContentExtractor._extract_text_file_content(file_path)
 
+    @staticmethod
+    def extract_pdf_page_text(file_path: str, page_number: int) -> str:
+        """PDFの1ページのテキストを抽出
+
+        Args:
+            file_path: ファイルパス
+            page_number: ページ番号（1から）
+
+        Returns:
+            抽出されたテキスト
+        """
+        try:
+            with fitz.open(file_path) as doc:
+                if 1 <= page_number <= len(doc):
+                    return ContentExtractor._get_page_text(doc[page_number - 1])
+        except Exception as e:
+            logger.error(f"PDF読み込みエラー: {file_path} - {e}")
+        return ""
+
+    @staticmethod
+    def _get_page_text(page) -> str:
+        try:
+            return cast(str, page.get_text())  # type: ignore[attr-defined]
+        except AttributeError:
+            try:
+                return cast(str, page.get_text("text"))  # type: ignore[attr-defined]
+            except Exception:
+                return ""
+
     @staticmethod
     def _extract_pdf_content(file_path: str) -> str:
         content = ""
         try:
             with fitz.open(file_path) as doc:
                 for page in doc:
-                    try:
-                        text = cast(str, page.get_text())  # type: ignore[attr-defined]
-                    except AttributeError:
-                        try:
-                            text = cast(str, page.get_text("text"))  # type: ignore[attr-defined]
-                        except Exception:
-                            text = ""
+                    text = ContentExtractor._get_page_text(page)
                     if text:
                         content += text + "\n"
         except Exception as e:
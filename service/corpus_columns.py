@@ -0,0 +1,109 @@
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from service.compressed_text import CompressedText
+from service.text_normalizer import normalize_text
+from utils.constants import CORPUS_DOCUMENT_SEPARATOR, DEFAULT_FOLD_KANA
+
+# UTF-16の符号単位で照合する（サロゲートペアも検索語と同じ単位に分かれるため一致は崩れない）
+_CODE_UNIT = np.dtype('<u2')
+
+
+def _encode(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode('utf-16-le'), dtype=_CODE_UNIT)
+
+
+class CorpusColumns:
+    """コーパス全体を列形式で持ち、検索語の出現をNumPyでまとめて数える
+
+    正規化した全文書のテキストをUTF-16の符号単位の1つの配列に連結し、
+    文書の先頭位置の配列で文書IDに対応付ける。文書の間には区切りの単位を挟み、
+    文書をまたぐ一致が生じないようにする。
+    """
+
+    def __init__(self, doc_paths: Sequence[str], texts: Sequence[str],
+                 fold_kana: bool = DEFAULT_FOLD_KANA) -> None:
+        """初期化
+
+        Args:
+            doc_paths: 文書IDの順に並べたファイルパス
+            texts: 文書IDの順に並べた文書テキスト
+            fold_kana: カタカナとひらがなを同一視する場合True
+        """
+        self.doc_paths = list(doc_paths)
+        self.doc_ids = np.arange(len(self.doc_paths), dtype=np.int64)
+        self.fold_kana = fold_kana
+
+        encoded = [_encode(normalize_text(text, fold_kana) + CORPUS_DOCUMENT_SEPARATOR) for text in texts]
+        lengths = np.fromiter((len(codes) for codes in encoded), dtype=np.int64, count=len(encoded))
+        self.offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        self.codes = np.concatenate(encoded) if encoded else np.empty(0, dtype=_CODE_UNIT)
+
+    @classmethod
+    def from_files(cls, files: Dict[str, Dict], doc_paths: Sequence[str],
+                   fold_kana: bool = DEFAULT_FOLD_KANA) -> 'CorpusColumns':
+        """インデックスの文書情報から作成する
+
+        Args:
+            files: インデックスのfiles
+            doc_paths: 文書IDの順に並べたファイルパス
+            fold_kana: カタカナとひらがなを同一視する場合True
+        """
+        texts = [CompressedText(files[path].get("content", "")).text for path in doc_paths]
+        return cls(doc_paths, texts, fold_kana)
+
+    def __len__(self) -> int:
+        return len(self.doc_paths)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.codes.nbytes + self.offsets.nbytes + self.doc_ids.nbytes)
+
+    def find_positions(self, term: str) -> np.ndarray:
+        """検索語が現れる位置（連結した配列上の位置）をすべて返す
+
+        先頭の単位が一致する位置を求め、残りの単位ごとに候補を絞り込む。
+        """
+        pattern = _encode(normalize_text(term, self.fold_kana))
+        if len(pattern) == 0 or len(pattern) > len(self.codes):
+            return np.empty(0, dtype=np.int64)
+
+        last_start = len(self.codes) - len(pattern) + 1
+        positions = np.flatnonzero(self.codes[:last_start] == pattern[0])
+        for index in range(1, len(pattern)):
+            if len(positions) == 0:
+                break
+            positions = positions[self.codes[positions + index] == pattern[index]]
+        return positions
+
+    def term_frequencies(self, term: str) -> np.ndarray:
+        """文書ごとの検索語の出現回数を返す（重なり合う出現もそれぞれ数える）
+
+        Returns:
+            文書IDを添字とする出現回数の配列
+        """
+        doc_index = np.searchsorted(self.offsets, self.find_positions(term), side='right') - 1
+        return np.bincount(doc_index, minlength=len(self.doc_paths))
+
+    def count_terms(self, terms: List[str], doc_ids: Sequence[int] = None) -> Dict[str, Dict[str, int]]:
+        """検索語ごとに、含む文書数と出現回数の合計を返す
+
+        Args:
+            terms: 検索語リスト
+            doc_ids: 集計対象の文書ID。Noneの場合は全文書
+
+        Returns:
+            {検索語: {"documents": 文書数, "occurrences": 出現回数}}
+        """
+        selection = self.doc_ids if doc_ids is None else np.asarray(doc_ids, dtype=np.int64)
+        counts = {}
+
+        for term in terms:
+            frequencies = self.term_frequencies(term)[selection]
+            counts[term] = {
+                "documents": int(np.count_nonzero(frequencies)),
+                "occurrences": int(frequencies.sum()),
+            }
+
+        return counts
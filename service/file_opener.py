@@ -1,19 +1,22 @@
 import logging
 import os
 import subprocess
-import time
 from typing import List
 
 from PyQt5.QtWidgets import QMessageBox
 
-from service.pdf_handler import open_pdf, temp_file_manager
+from service.pdf_handler import HighlightCache, temp_file_manager
+from service.pdf_open_worker import PDFOpenWorker
+from service.pdf_viewer_handler import open_pdf_in_viewer
 from service.text_handler import open_text_file
 from utils.constants import (
     DIALOG_TITLES,
     ERROR_MESSAGES,
     FILE_HANDLER_MAPPING,
     FILE_OPEN_ERROR_TEMPLATES,
-    PROCESS_CLEANUP_DELAY
+    MATCH_MODE_LITERAL,
+    PDF_OPEN_STOP_TIMEOUT,
+    PDF_VIEWER_BUILTIN
 )
 from utils.helpers import is_network_file
 
@@ -36,14 +39,22 @@ class FileOpener:
         self.parent_window = parent_window
         self.acrobat_path = self.config_manager.find_available_acrobat_path() or ""
         self._last_opened_file: str = ""
-
-    def open_file(self, file_path: str, position: int, search_terms: List[str]) -> None:
+        self._pdf_workers: List[PDFOpenWorker] = []
+        self.highlight_cache = HighlightCache(
+            temp_file_manager,
+            self.config_manager.get_max_temp_files(),
+            self.config_manager.get_max_temp_size_mb() * 1024 * 1024
+        )
+
+    def open_file(self, file_path: str, position: int, search_terms: List[str],
+                  match_mode: str = MATCH_MODE_LITERAL) -> None:
         """ファイルを開く
 
         Args:
             file_path: ファイルパス
             position: ページ/行位置
             search_terms: 検索語リスト
+            match_mode: 検索したときの照合方法（ハイライトも同じ方法で照合する）
         """
         if not os.path.exists(file_path):
             self._show_error(ERROR_MESSAGES['FILE_NOT_FOUND'])
@@ -56,31 +67,31 @@ class FileOpener:
             self._show_error(ERROR_MESSAGES['UNSUPPORTED_FORMAT'])
             return
 
-        if file_path == self._last_opened_file and file_extension == '.pdf':
-            temp_file_manager.cleanup_all()
-            time.sleep(PROCESS_CLEANUP_DELAY)
-
         try:
             method = getattr(self, handler_method)
             if file_extension == '.pdf':
-                method(file_path, position, search_terms)
+                method(file_path, position, search_terms, match_mode)
             else:
-                method(file_path, search_terms, position)
+                method(file_path, search_terms, position, match_mode)
 
             self._last_opened_file = file_path
 
         except Exception as e:
             self._show_error(FILE_OPEN_ERROR_TEMPLATES['FILE_OPEN_ERROR'].format(error=e))
-            if file_extension == '.pdf':
-                temp_file_manager.cleanup_all()
 
-    def _open_pdf_file(self, file_path: str, position: int, search_terms: List[str]) -> None:
+    def _open_pdf_file(self, file_path: str, position: int, search_terms: List[str],
+                       match_mode: str = MATCH_MODE_LITERAL) -> None:
         """PDFファイルを開く
 
+        設定がアプリ内ビューアの場合は、表示するページだけを描画するPDFViewerWindowで開く。
+        Acrobatの場合は、ハイライトしたPDFの作成とAcrobatの起動を別スレッドで行い、
+        完了を待たずに戻る。別スレッドで失敗した場合はエラーダイアログで知らせる。
+
         Args:
             file_path: PDFファイルパス
             position: ページ番号
             search_terms: 検索語リスト
+            match_mode: 検索語の照合方法
 
         Raises:
             IOError: ファイルアクセス失敗
@@ -90,10 +101,20 @@ class FileOpener:
             if not self._check_pdf_accessibility(file_path):
                 raise IOError(ERROR_MESSAGES['PDF_ACCESS_FAILED'])
 
+            if self.config_manager.get_pdf_viewer() == PDF_VIEWER_BUILTIN:
+                open_pdf_in_viewer(
+                    file_path, search_terms, position, self.parent_window,
+                    self.config_manager.get_text_viewer_width(),
+                    self.config_manager.get_text_viewer_height(),
+                    match_mode,
+                    self.config_manager.get_fold_kana()
+                )
+                return
+
             if not self.acrobat_path or not os.path.exists(self.acrobat_path):
                 raise FileNotFoundError(ERROR_MESSAGES['ALL_ACROBAT_PATHS_NOT_FOUND'])
 
-            open_pdf(file_path, self.acrobat_path, position, search_terms)
+            self._start_pdf_worker(file_path, position, search_terms, match_mode)
 
         except IOError as e:
             self._show_error(FILE_OPEN_ERROR_TEMPLATES['PDF_PROCESS_FAILED'].format(error=e))
@@ -106,6 +127,19 @@ class FileOpener:
             self._show_error(FILE_OPEN_ERROR_TEMPLATES['PDF_OPERATION_ERROR'].format(error=e))
             raise
 
+    def _start_pdf_worker(self, file_path: str, position: int, search_terms: List[str],
+                          match_mode: str = MATCH_MODE_LITERAL) -> None:
+        self._pdf_workers = [worker for worker in self._pdf_workers if worker.isRunning()]
+
+        worker = PDFOpenWorker(
+            file_path, self.acrobat_path, position, search_terms,
+            self.config_manager.get_highlight_page_window(), self.highlight_cache,
+            match_mode, self.config_manager.get_fold_kana()
+        )
+        worker.open_failed.connect(self._show_error)
+        self._pdf_workers.append(worker)
+        worker.start()
+
     def _check_pdf_accessibility(self, file_path: str) -> bool:
         """PDFファイルのアクセス可能性を確認
 
@@ -124,13 +158,15 @@ class FileOpener:
         except (IOError, OSError):
             return False
 
-    def _open_text_file(self, file_path: str, search_terms: List[str], position: int = 0) -> None:
+    def _open_text_file(self, file_path: str, search_terms: List[str], position: int = 0,
+                        match_mode: str = MATCH_MODE_LITERAL) -> None:
         """テキストファイルを開く
 
         Args:
             file_path: ファイルパス
             search_terms: 検索語リスト
             position: 検索ヒット行番号(1始まり)
+            match_mode: 検索語の照合方法
 
         Raises:
             IOError: ファイル読み込み失敗
@@ -140,7 +176,11 @@ class FileOpener:
             font_size = self.config_manager.get_text_viewer_font_size()
             width = self.config_manager.get_text_viewer_width()
             height = self.config_manager.get_text_viewer_height()
-            open_text_file(file_path, search_terms, font_size, position, self.parent_window, width, height)
+            fold_kana = self.config_manager.get_fold_kana()
+            open_text_file(
+                file_path, search_terms, font_size, position, self.parent_window, width, height,
+                match_mode, fold_kana
+            )
         except IOError as e:
             self._show_error(FILE_OPEN_ERROR_TEMPLATES['TEXT_READ_FAILED'].format(error=e))
             raise
@@ -172,6 +212,13 @@ class FileOpener:
     def cleanup_resources(self) -> None:
         """リソースをクリーンアップ"""
         try:
+            for worker in self._pdf_workers:
+                worker.requestInterruption()
+            for worker in self._pdf_workers:
+                worker.wait(PDF_OPEN_STOP_TIMEOUT)
+            self._pdf_workers = []
+
+            self.highlight_cache.clear()
             temp_file_manager.cleanup_all()
             self._last_opened_file = ""
         except Exception as e:
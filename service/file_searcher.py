@@ -6,12 +6,16 @@ from typing import Callable, List, Optional, Tuple, cast
 from PyQt5.QtCore import QThread, pyqtSignal
 
 from service.pdf_search_strategy import PDFSearchStrategy
+from service.result_batcher import ResultBatcher
 from service.search_matcher import SearchMatcher
+from service.snippet_provider import SearchHit
 from service.text_search_strategy import TextSearchStrategy
 from utils.constants import (
     ERROR_DIRECTORY_ACCESS,
     ERROR_DIRECTORY_SEARCH,
+    DEFAULT_FOLD_KANA,
     LOG_MESSAGE_TEMPLATES,
+    MATCH_MODE_LITERAL,
     SEARCH_METHODS_MAPPING,
 )
 from utils.helpers import check_file_accessibility, normalize_path
@@ -20,9 +24,13 @@ logger = logging.getLogger(__name__)
 
 
 class FileSearcher(QThread):
-    """マルチスレッドで複数ファイルを検索"""
+    """マルチスレッドで複数ファイルを検索
 
-    result_found = pyqtSignal(str, list)
+    結果はResultBatcherでまとめ、results_batchで通知する。
+    候補のファイルを指定した場合（前回の検索の絞り込みなど）は、フォルダを走査せずそのファイルだけを検索する。
+    """
+
+    results_batch = pyqtSignal(list)
     progress_update = pyqtSignal(int)
     search_completed = pyqtSignal()
 
@@ -35,7 +43,10 @@ class FileSearcher(QThread):
         file_extensions: List[str],
         context_length: int,
         global_search: bool = False,
-        global_directories: Optional[List[str]] = None
+        global_directories: Optional[List[str]] = None,
+        match_mode: str = MATCH_MODE_LITERAL,
+        fold_kana: bool = DEFAULT_FOLD_KANA,
+        candidate_files: Optional[List[str]] = None
     ):
         super().__init__()
         self.directory = directory
@@ -46,17 +57,23 @@ class FileSearcher(QThread):
         self.context_length = context_length
         self.global_search = global_search
         self.global_directories = global_directories or []
+        self.candidate_files = candidate_files
         self.cancel_flag = False
 
         # 検索戦略の初期化
-        self.matcher = SearchMatcher(search_terms, search_type, context_length)
+        self.matcher = SearchMatcher(search_terms, search_type, context_length, match_mode, fold_kana)
         self.pdf_strategy = PDFSearchStrategy(self.matcher)
         self.text_strategy = TextSearchStrategy(self.matcher)
+        self.batcher = ResultBatcher(self.results_batch.emit, self.progress_update.emit)
 
     def run(self) -> None:
         """検索を実行"""
-        directories = self._get_target_directories()
-        self._execute_search(directories)
+        if self.candidate_files is not None:
+            self._search_candidates(self.candidate_files)
+        else:
+            directories = self._get_target_directories()
+            self._execute_search(directories)
+        self.batcher.flush()
         self.search_completed.emit()
 
     def _get_target_directories(self) -> List[str]:
@@ -78,7 +95,12 @@ class FileSearcher(QThread):
 
                 if total_files > 0:
                     progress = int((processed_files / total_files) * 100)
-                    self.progress_update.emit(progress)
+                    self.batcher.progress(progress)
+
+    def _search_candidates(self, file_paths: List[str]) -> None:
+        with ThreadPoolExecutor() as executor:
+            self.process_files(executor, "", file_paths)
+        self.batcher.progress(100)
 
     def _count_total_files(self, directories: List[str]) -> int:
         """ディレクトリ内のファイル総数をカウント
@@ -162,7 +184,7 @@ class FileSearcher(QThread):
             result = future.result()
             if result:
                 file_path, matches = result
-                self.result_found.emit(file_path, matches)
+                self.batcher.add(file_path, matches)
 
     def _is_supported_file(self, filename: str) -> bool:
         return any(filename.endswith(ext) for ext in self.file_extensions)
@@ -170,7 +192,7 @@ class FileSearcher(QThread):
     def cancel_search(self) -> None:
         self.cancel_flag = True
 
-    def search_file(self, file_path: str) -> Optional[Tuple[str, List[Tuple[int, str]]]]:
+    def search_file(self, file_path: str) -> Optional[Tuple[str, List[SearchHit]]]:
         normalized_path = normalize_path(file_path)
 
         if not check_file_accessibility(normalized_path):
@@ -190,16 +212,16 @@ class FileSearcher(QThread):
             logger.error(LOG_MESSAGE_TEMPLATES['SEARCH_ERROR_DETAIL'].format(path=normalized_path, error=e))
             return None
 
-    def _get_search_method(self, file_extension: str) -> Optional[Callable[[str], Optional[Tuple[str, List[Tuple[int, str]]]]]]:
+    def _get_search_method(self, file_extension: str) -> Optional[Callable[[str], Optional[Tuple[str, List[SearchHit]]]]]:
         method_name = SEARCH_METHODS_MAPPING.get(file_extension)
         if method_name:
             method = getattr(self, method_name, None)
             if callable(method):
-                return cast(Callable[[str], Optional[Tuple[str, List[Tuple[int, str]]]]], method)
+                return cast(Callable[[str], Optional[Tuple[str, List[SearchHit]]]], method)
         return None
 
-    def search_pdf(self, file_path: str) -> Optional[Tuple[str, List[Tuple[int, str]]]]:
+    def search_pdf(self, file_path: str) -> Optional[Tuple[str, List[SearchHit]]]:
         return self.pdf_strategy.search(file_path)
 
-    def search_text(self, file_path: str) -> Optional[Tuple[str, List[Tuple[int, str]]]]:
+    def search_text(self, file_path: str) -> Optional[Tuple[str, List[SearchHit]]]:
         return self.text_strategy.search(file_path)
@@ -0,0 +1,154 @@
+from typing import Iterator, List, Optional, Tuple
+
+from service.ngram_signature import NgramSignature, text_ngrams
+from service.text_normalizer import NormalizedText, normalize_text
+from utils.constants import DEFAULT_FOLD_KANA, FUZZY_CHARS_PER_EDIT, FUZZY_NGRAM_SIZE
+
+
+class FuzzyPattern:
+    """検索語とのあいだの編集距離が一定以下の箇所に一致する（あいまい検索）
+
+    許す編集回数は検索語FUZZY_CHARS_PER_EDIT文字につき1回。
+    k回の編集で失われるn-gramは高々k×n個のため、検索語のn-gramのうち
+    残りが一定数以上含まれる文書・箇所だけを候補とし、候補のn-gramの周辺だけで
+    編集距離を計算する。
+    """
+
+    def __init__(self, term: str, fold_kana: bool = DEFAULT_FOLD_KANA) -> None:
+        """初期化
+
+        Args:
+            term: 検索語
+            fold_kana: カタカナとひらがなを同一視する場合True
+        """
+        self.term = term
+        self.fold_kana = fold_kana
+        self.normalized_term = normalize_text(term, fold_kana)
+        self.max_distance = len(self.normalized_term) // FUZZY_CHARS_PER_EDIT
+        self.grams = text_ngrams(self.normalized_term)
+        self.min_common = len(self.grams) - FUZZY_NGRAM_SIZE * self.max_distance
+
+        # インデックスの署名はカタカナをひらがなにそろえて作るため、同じ方法で求めておく
+        self.signature_grams = text_ngrams(normalize_text(term, fold_kana=True))
+        self.signature_min_common = len(self.signature_grams) - FUZZY_NGRAM_SIZE * self.max_distance
+
+    def may_match(self, normalized: str) -> bool:
+        """n-gramの数だけで一致する可能性があるか判定する"""
+        if self.min_common <= 0:
+            return True
+        present = 0
+        for gram in self.grams:
+            if gram in normalized:
+                present += 1
+                if present >= self.min_common:
+                    return True
+        return False
+
+    def signature_score(self, signature: NgramSignature) -> Optional[float]:
+        """インデックスのn-gram署名から文書の近さを求める
+
+        Args:
+            signature: 文書のn-gram署名
+
+        Returns:
+            署名に含まれる検索語のn-gramの割合。一致し得ない文書の場合None
+        """
+        if not self.signature_grams:
+            return 0.0
+        present = signature.count_present(self.signature_grams)
+        if present < self.signature_min_common:
+            return None
+        return present / len(self.signature_grams)
+
+    def matches(self, text: str, normalized: Optional[str] = None) -> bool:
+        if normalized is None:
+            normalized = normalize_text(text, self.fold_kana)
+        if not self.may_match(normalized):
+            return False
+        return next(self._find_approximate(normalized), None) is not None
+
+    def search(self, text: str) -> Optional[Tuple[int, int]]:
+        for start, end in self.finditer(text):
+            return start, end
+        return None
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int]]:
+        """編集距離が上限以下の箇所の、元のテキストでの位置を順に返す"""
+        normalized = NormalizedText(text, self.fold_kana)
+        if not self.may_match(normalized.text):
+            return
+        for start, end in self._find_approximate(normalized.text):
+            yield normalized.to_original(start, end)
+
+    def highlight_patterns(self) -> List['FuzzyPattern']:
+        return [self]
+
+    def _find_approximate(self, text: str) -> Iterator[Tuple[int, int]]:
+        if not self.normalized_term:
+            return
+        if self.max_distance == 0:
+            position = text.find(self.normalized_term)
+            while position != -1:
+                yield position, position + len(self.normalized_term)
+                position = text.find(self.normalized_term, position + len(self.normalized_term))
+            return
+
+        for window_start, window_end in self._candidate_windows(text):
+            yield from self._scan_window(text, window_start, window_end)
+
+    def _candidate_windows(self, text: str) -> List[Tuple[int, int]]:
+        """検索語のn-gramが現れる位置の周辺を、重なりをまとめて返す"""
+        margin = len(self.normalized_term) + self.max_distance
+        windows = []
+        for gram in self.grams:
+            position = text.find(gram)
+            while position != -1:
+                windows.append((max(0, position - margin), min(len(text), position + len(gram) + margin)))
+                position = text.find(gram, position + 1)
+
+        merged: List[Tuple[int, int]] = []
+        for start, end in sorted(windows):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def _scan_window(self, text: str, window_start: int, window_end: int) -> Iterator[Tuple[int, int]]:
+        """検索語を任意の位置から照合する編集距離の表を1文字ずつ更新し、距離が上限以下の箇所を返す
+
+        重なり合う候補からは距離が最も小さいものを選ぶ。
+        """
+        pattern = self.normalized_term
+        length = len(pattern)
+        previous = list(range(length + 1))
+        previous_starts = [window_start] * (length + 1)
+        best: Optional[Tuple[int, int, int]] = None
+
+        for position in range(window_start, window_end):
+            char = text[position]
+            current = [0] * (length + 1)
+            current_starts = [position + 1] * (length + 1)
+
+            for i in range(1, length + 1):
+                distance = previous[i - 1] + (pattern[i - 1] != char)
+                start = previous_starts[i - 1]
+                if previous[i] + 1 < distance:
+                    distance, start = previous[i] + 1, previous_starts[i]
+                if current[i - 1] + 1 < distance:
+                    distance, start = current[i - 1] + 1, current_starts[i - 1]
+                current[i] = distance
+                current_starts[i] = start
+
+            if current[length] <= self.max_distance:
+                candidate = (current_starts[length], position + 1, current[length])
+                if best is not None and candidate[0] >= best[1]:
+                    yield best[0], best[1]
+                    best = None
+                if best is None or candidate[2] < best[2]:
+                    best = candidate
+
+            previous, previous_starts = current, current_starts
+
+        if best is not None:
+            yield best[0], best[1]
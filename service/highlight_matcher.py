@@ -0,0 +1,101 @@
+import logging
+import re
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple, Union
+
+from service.fuzzy_pattern import FuzzyPattern
+from service.search_pattern import SearchPattern
+from service.search_query import SearchQuery
+from service.text_normalizer import NormalizedText
+from utils.constants import DEFAULT_FOLD_KANA, MATCH_MODE_LITERAL
+
+logger = logging.getLogger(__name__)
+
+HighlightPattern = Union[SearchPattern, FuzzyPattern]
+
+
+class HighlightMatcher:
+    """ビューアでハイライトする検索語の一致箇所を求める
+
+    検索語は結果一覧と同じくSearchQuery.parse_termで解釈する。除外する検索語（NOT）は
+    ハイライトせず、NEARは前後の検索語を、フレーズは語の間の空白を問わない正規表現を照合する。
+    一致位置は正規化したテキストから元のテキストに戻すため、全角・半角や
+    カタカナ・ひらがなが検索語と異なる箇所もハイライトされる。
+    あいまい検索の検索語は、FuzzyPatternで編集距離が上限以下の箇所をハイライトする。
+    正規表現で照合する検索語は1つの正規表現にまとめ、テキストごとに1回だけ正規化して照合する。
+    長い検索語を先に並べるため、重なる検索語では長い方が一致する。
+    """
+
+    def __init__(self, search_terms: List[str], match_mode: str = MATCH_MODE_LITERAL,
+                 fold_kana: bool = DEFAULT_FOLD_KANA) -> None:
+        """初期化
+
+        Args:
+            search_terms: 検索語リスト（ハイライトの色は検索語の位置で決まる）
+            match_mode: 照合方法
+            fold_kana: カタカナとひらがなを同一視する場合True
+        """
+        self.fold_kana = fold_kana
+        combined: List[Tuple[int, SearchPattern]] = []
+        self._separate: List[Tuple[int, HighlightPattern]] = []
+
+        for term_index, term in enumerate(search_terms):
+            stripped = term.strip() if term else ''
+            if not stripped:
+                continue
+            try:
+                excluded, clause = SearchQuery.parse_term(stripped, match_mode, fold_kana)
+            except (re.error, ValueError) as e:
+                logger.warning(f"ハイライトできない検索語: {stripped} - {e}")
+                continue
+            if excluded:
+                continue
+
+            for pattern in clause.highlight_patterns():
+                # グループを含む正規表現はまとめると参照がずれるため、個別に照合する
+                if isinstance(pattern, SearchPattern) and pattern.regex.groups == 0:
+                    combined.append((term_index, pattern))
+                else:
+                    self._separate.append((term_index, pattern))
+
+        self._regex: Optional[Pattern[str]] = None
+        self._group_terms: Dict[str, int] = {}
+        if combined:
+            self._combine(combined)
+
+    def _combine(self, patterns: List[Tuple[int, SearchPattern]]) -> None:
+        patterns = sorted(patterns, key=lambda item: len(item[1].term), reverse=True)
+        alternatives = []
+        for number, (term_index, pattern) in enumerate(patterns):
+            group_name = f"p{number}"
+            self._group_terms[group_name] = term_index
+            alternatives.append(f"(?P<{group_name}>{pattern.regex.pattern})")
+
+        try:
+            self._regex = re.compile("|".join(alternatives), re.IGNORECASE)
+        except re.error:
+            # 先頭にしか置けないインラインフラグなどを含む場合は、個別に照合する
+            self._group_terms = {}
+            self._separate.extend(patterns)
+
+    def __bool__(self) -> bool:
+        return self._regex is not None or bool(self._separate)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """空文字列以外の一致の、元のテキストでの位置を返す
+
+        Args:
+            text: 対象テキスト
+
+        Returns:
+            (開始位置, 終了位置, 検索語の位置)のイテレータ
+        """
+        if self._regex is not None:
+            normalized = NormalizedText(text, self.fold_kana)
+            for match in self._regex.finditer(normalized.text):
+                if match.end() > match.start():
+                    start, end = normalized.to_original(match.start(), match.end())
+                    yield start, end, self._group_terms[match.lastgroup]
+
+        for term_index, pattern in self._separate:
+            for start, end in pattern.finditer(text):
+                yield start, end, term_index
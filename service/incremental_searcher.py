@@ -0,0 +1,116 @@
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from service.search_indexer import SearchIndexer
+from utils.constants import (
+    DEFAULT_FOLD_KANA,
+    INCREMENTAL_SEARCH_STOP_TIMEOUT,
+    INDEX_MAX_RESULTS,
+    MATCH_MODE_LITERAL,
+    SEARCH_TYPE_AND,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalSearchWorker(QThread):
+    """入力中の検索を1つのスレッドで順に実行する
+
+    インデックスを読み込んだSearchIndexerを保持し続け、検索ごとにスレッドを作らない。
+    新しい検索を受け取ると実行中の検索をファイルの区切りで打ち切り、最新の検索だけを実行する。
+    結果は検索IDとともに通知し、受け取る側は最新の検索ID以外の結果を捨てる。
+    """
+
+    results_ready = pyqtSignal(int, list)
+
+    def __init__(self, index_file_path: str, local_cache_dir: Optional[str] = None) -> None:
+        """初期化
+
+        Args:
+            index_file_path: インデックスファイルパス
+            local_cache_dir: 共有インデックスを複製するローカルのフォルダ
+        """
+        super().__init__()
+        self.indexer = SearchIndexer(index_file_path, local_cache_dir)
+        self._condition = threading.Condition()
+        self._pending: Optional[Tuple[int, Dict]] = None
+        self._query_id = 0
+        self._stopping = False
+
+    def submit(self, search_terms: List[str], search_type: str = SEARCH_TYPE_AND,
+               match_mode: str = MATCH_MODE_LITERAL, fold_kana: bool = DEFAULT_FOLD_KANA,
+               max_results_per_file: int = INDEX_MAX_RESULTS,
+               candidates: Optional[List[str]] = None) -> int:
+        """検索を依頼する（未実行の検索は置き換え、実行中の検索は打ち切る）
+
+        Args:
+            candidates: 照合するファイルパス（前回の検索の絞り込みの場合）。Noneの場合はすべての文書
+
+        Returns:
+            検索ID
+        """
+        with self._condition:
+            self._query_id += 1
+            self._pending = (self._query_id, {
+                "search_terms": search_terms,
+                "search_type": search_type,
+                "match_mode": match_mode,
+                "fold_kana": fold_kana,
+                "max_results_per_file": max_results_per_file,
+                "candidates": candidates,
+            })
+            query_id = self._query_id
+            self._condition.notify()
+
+        if not self.isRunning():
+            self.start()
+        return query_id
+
+    def cancel(self) -> None:
+        """未実行・実行中の検索を取り消す"""
+        with self._condition:
+            self._query_id += 1
+            self._pending = None
+
+    def stop(self, timeout: int = INCREMENTAL_SEARCH_STOP_TIMEOUT) -> None:
+        """実行中の検索を打ち切ってスレッドを終了する"""
+        with self._condition:
+            self._stopping = True
+            self._query_id += 1
+            self._pending = None
+            self._condition.notify()
+        self.wait(timeout)
+
+    def is_current(self, query_id: int) -> bool:
+        return query_id == self._query_id
+
+    def run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                query_id, request = self._pending
+                self._pending = None
+
+            self._execute(query_id, request)
+
+    def _execute(self, query_id: int, request: Dict) -> None:
+        try:
+            results = self.indexer.search_in_index(
+                request["search_terms"], request["search_type"],
+                match_mode=request["match_mode"], fold_kana=request["fold_kana"],
+                max_results_per_file=request["max_results_per_file"],
+                cancel_check=lambda: not self.is_current(query_id),
+                candidates=request["candidates"]
+            )
+        except Exception as e:
+            logger.error(f"入力中の検索でエラー: {e}")
+            return
+
+        if self.is_current(query_id):
+            self.results_ready.emit(query_id, results)
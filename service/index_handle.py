@@ -0,0 +1,105 @@
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from service.index_storage import IndexStorage
+
+logger = logging.getLogger(__name__)
+
+
+class IndexHandle:
+    """プロセス内で共有するインデックスのハンドル
+
+    インデックスファイルごとに1つだけ作り、参照カウントで寿命を管理する。
+    本体（全シャードの文書）は最初に必要になった時点で1度だけ読み込み、
+    参照がなくなった時点で破棄する。
+    """
+
+    _handles: Dict[str, 'IndexHandle'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, index_file_path: str, local_cache_dir: Optional[str] = None) -> None:
+        """初期化
+
+        Args:
+            index_file_path: インデックスファイルパス
+            local_cache_dir: 共有インデックスを複製するローカルのフォルダ
+        """
+        self.storage = IndexStorage(index_file_path, local_cache_dir)
+        self.ref_count = 0
+        self._index_data: Optional[Dict] = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def acquire(cls, index_file_path: str, local_cache_dir: Optional[str] = None) -> 'IndexHandle':
+        """インデックスファイルのハンドルを取得し、参照カウントを増やす
+
+        Args:
+            index_file_path: インデックスファイルパス
+            local_cache_dir: 共有インデックスを複製するローカルのフォルダ（空文字列は複製しない）。
+                作成済みのハンドルと異なる場合は、以降の読み込みからこの設定を使う。
+                Noneの場合は作成済みのハンドルの設定をそのまま使う
+
+        Returns:
+            同じインデックスファイルで共有されるハンドル
+        """
+        key = os.path.normcase(os.path.abspath(index_file_path))
+
+        with cls._registry_lock:
+            handle = cls._handles.get(key)
+            if handle is None:
+                handle = cls(index_file_path, local_cache_dir)
+                cls._handles[key] = handle
+            elif local_cache_dir is not None and (local_cache_dir or None) != handle.storage.local_cache_dir:
+                logger.info(f"インデックスを複製するフォルダを変更します: {local_cache_dir or '（複製しない）'}")
+                handle.storage.local_cache_dir = local_cache_dir or None
+            handle.ref_count += 1
+            return handle
+
+    def release(self) -> None:
+        """参照カウントを減らし、参照がなくなったら本体を破棄する"""
+        with self._registry_lock:
+            self.ref_count -= 1
+            if self.ref_count > 0:
+                return
+
+            key = os.path.normcase(os.path.abspath(self.storage.index_file_path))
+            if self._handles.get(key) is self:
+                del self._handles[key]
+
+        with self._lock:
+            self._index_data = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._index_data is not None
+
+    @property
+    def index_data(self) -> Dict:
+        """インデックスの本体（未読み込みの場合はここで読み込む）"""
+        with self._lock:
+            if self._index_data is None:
+                logger.info(f"インデックス本体を読み込みます: {self.storage.index_file_path}")
+                self._index_data = self.storage.load()
+            return self._index_data
+
+    def refresh_if_stale(self) -> None:
+        """他のプロセスが新しい世代を公開していれば本体を読み直す"""
+        with self._lock:
+            if self._index_data is None:
+                return
+
+            generation = self.storage.published_generation()
+            if generation is not None and generation != self._index_data.get("generation"):
+                logger.info(f"インデックスの世代 {generation} が公開されたため読み直します")
+                self._index_data = self.storage.load()
+
+    def publish(self, index_data: Dict) -> None:
+        """更新したインデックスを共有中の本体として差し替える
+
+        Args:
+            index_data: 新しいインデックスデータ
+        """
+        with self._lock:
+            self._index_data = index_data
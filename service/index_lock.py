@@ -0,0 +1,170 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from utils.constants import (
+    INDEX_LOCK_FILE_SUFFIX,
+    INDEX_LOCK_POLL_INTERVAL,
+    INDEX_LOCK_REFRESH_INTERVAL,
+    INDEX_LOCK_STALE_SECONDS,
+    INDEX_LOCK_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class IndexLockTimeoutError(Exception):
+    """インデックスの書き込みロックを時間内に取得できなかった"""
+
+
+class IndexWriteLock:
+    """複数のPC・プロセスで共有するインデックスの書き込みロック
+
+    インデックスファイルの隣にロックファイルを排他作成できたプロセスだけが書き込む
+    アドバイザリロック。読み込み側はロックを取らず、世代番号で整合性を確認する。
+    異常終了で残ったロックは、更新日時から一定時間が経過した時点で破棄する。
+    ロック中は別スレッドで更新日時を定期的に更新するため、時間のかかる書き込みでも破棄されない。
+    ロックファイルには取得ごとのトークンを書き込み、解放時はトークンが一致する場合だけ削除する
+    （破棄されて他のプロセスが取得したロックを消さない）。
+    """
+
+    def __init__(self, index_file_path: str, timeout: float = INDEX_LOCK_TIMEOUT,
+                 stale_seconds: float = INDEX_LOCK_STALE_SECONDS,
+                 refresh_interval: float = INDEX_LOCK_REFRESH_INTERVAL) -> None:
+        """初期化
+
+        Args:
+            index_file_path: インデックスファイルパス
+            timeout: ロック取得の待ち時間（秒）
+            stale_seconds: 残ったロックを破棄するまでの時間（秒）
+            refresh_interval: ロック中にロックファイルの更新日時を更新する間隔（秒）
+        """
+        self.lock_path = index_file_path + INDEX_LOCK_FILE_SUFFIX
+        self.timeout = timeout
+        self.stale_seconds = stale_seconds
+        self.refresh_interval = refresh_interval
+        self._token: Optional[str] = None
+        self._stop_refresh = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> 'IndexWriteLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
+
+    def acquire(self) -> None:
+        """ロックを取得する
+
+        Raises:
+            IndexLockTimeoutError: 待ち時間内に取得できなかった場合
+        """
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._break_stale_lock():
+                    continue
+                if time.monotonic() >= deadline:
+                    raise IndexLockTimeoutError(
+                        f"インデックスは他のプロセスが更新中です: {self._read_owner()}"
+                    )
+                time.sleep(INDEX_LOCK_POLL_INTERVAL)
+                continue
+
+            token = uuid.uuid4().hex
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "host": socket.gethostname(),
+                    "pid": os.getpid(),
+                    "acquired_at": datetime.now().isoformat(),
+                    "token": token
+                }, f)
+            self._token = token
+            self._start_refresh()
+            return
+
+    def release(self) -> None:
+        self._stop_refresh.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join()
+            self._refresh_thread = None
+
+        token, self._token = self._token, None
+        if not self._remove_if_owned(token):
+            logger.warning(f"書き込みロックが既に破棄されています: {self.lock_path}")
+
+    def _start_refresh(self) -> None:
+        self._stop_refresh.clear()
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, args=(self._token,), daemon=True)
+        self._refresh_thread.start()
+
+    def _refresh_loop(self, token: str) -> None:
+        """ロック中、ロックファイルの更新日時を定期的に更新する"""
+        while not self._stop_refresh.wait(self.refresh_interval):
+            if self._read_token() != token:
+                logger.warning(f"書き込みロックが他のプロセスに破棄されました: {self.lock_path}")
+                return
+            try:
+                os.utime(self.lock_path)
+            except OSError as e:
+                logger.warning(f"書き込みロックの更新日時を更新できません: {self.lock_path} - {e}")
+
+    def _remove_if_owned(self, token: Optional[str]) -> bool:
+        """ロックファイルのトークンが一致する場合だけ削除し、削除した場合Trueを返す"""
+        if token is None or self._read_token() != token:
+            return False
+        try:
+            os.remove(self.lock_path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _break_stale_lock(self) -> bool:
+        """残ったロックを破棄した場合（またはロックが解放された場合）Trueを返す"""
+        token = self._read_token()
+        try:
+            age = time.time() - os.path.getmtime(self.lock_path)
+        except FileNotFoundError:
+            return True
+
+        if age < self.stale_seconds:
+            return False
+
+        logger.warning(f"古い書き込みロックを破棄します: {self._read_owner()}（{age:.0f}秒経過）")
+        # 同時に破棄した他のプロセスが取得し直したロックは消さない
+        if token is not None:
+            self._remove_if_owned(token)
+            return True
+        try:
+            os.remove(self.lock_path)
+        except FileNotFoundError:
+            pass
+        return True
+
+    def _read_lock_file(self) -> Optional[dict]:
+        try:
+            with open(self.lock_path, encoding='utf-8') as f:
+                owner = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return owner if isinstance(owner, dict) else None
+
+    def _read_token(self) -> Optional[str]:
+        owner = self._read_lock_file()
+        return owner.get("token") if owner is not None else None
+
+    def _read_owner(self) -> str:
+        owner = self._read_lock_file()
+        if owner is None:
+            return self.lock_path
+        return f"{owner.get('host')} (PID {owner.get('pid')}, {owner.get('acquired_at')})"
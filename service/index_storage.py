@@ -1,56 +1,366 @@
+import hashlib
 import json
 import logging
 import os
+import shutil
+import stat
+import tempfile
+import time
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Iterable, List, Optional
+
+from service.compressed_text import CompressedText, compress_text, text_separator
+from service.index_lock import IndexWriteLock
+from service.ngram_signature import build_signature
+from service.text_normalizer import normalize_text
+from utils.constants import (
+    INDEX_LOAD_RETRY_COUNT,
+    INDEX_LOCK_TIMEOUT,
+    INDEX_REPLACE_RETRY_COUNT,
+    INDEX_REPLACE_RETRY_DELAY,
+    INDEX_SHARD_DIR_SUFFIX,
+    INDEX_SHARD_ID_LENGTH,
+    INDEX_TEMP_FILE_SUFFIX,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class IndexStorage:
-    """検索インデックスの永続化を管理"""
+    """検索インデックスの永続化を管理
+
+    インデックスファイルはシャードの一覧を持つマニフェストとし、
+    文書本体は検索フォルダ（ルート）ごとのシャードファイルに分けて保存する。
+    どのルートにも属さない文書（旧形式のインデックスを含む）はマニフェストに残す。
+
+    保存のたびに世代番号を進め、書き直すシャードは世代番号付きの新しいファイルへ書き出す。
+    各ファイルは一時ファイルに書いてfsyncしてから置き換えるため、読み込み中の検索や
+    書き込み中の異常終了で壊れたインデックスを読むことはない。直前の世代のシャードは
+    次の保存まで残し、切り替え前のマニフェストを読んだ検索も最後まで読み込める。
 
-    def __init__(self, index_file_path: str = "search_index.json") -> None:
+    複数のPCで共有する場合、保存は書き込みロックを取得した1つのプロセスだけが行い、
+    読み込みは共有の世代番号が変わったときだけローカルの複製を更新して複製から行う。
+    """
+
+    def __init__(self, index_file_path: str = "search_index.json",
+                 local_cache_dir: Optional[str] = None,
+                 lock_timeout: float = INDEX_LOCK_TIMEOUT) -> None:
         """初期化
 
         Args:
             index_file_path: インデックスファイルパス
+            local_cache_dir: 共有インデックスを複製するローカルのフォルダ。Noneの場合は複製しない
+            lock_timeout: 書き込みロックの待ち時間（秒）
         """
         self.index_file_path = index_file_path
+        self.local_cache_dir = local_cache_dir or None
+        self.lock_timeout = lock_timeout
+        self._published_stat: Optional[tuple] = None
+        self._published_generation: Optional[int] = None
+
+    @property
+    def shard_dir(self) -> str:
+        return os.path.splitext(self.index_file_path)[0] + INDEX_SHARD_DIR_SUFFIX
+
+    def load(self, roots: Optional[Iterable[str]] = None) -> Dict:
+        """インデックスを読み込む
+
+        Args:
+            roots: 読み込むシャードのルート。Noneの場合はすべて
+
+        Returns:
+            全シャードの文書をfilesへまとめたインデックスデータ
+        """
+        if self.local_cache_dir and os.path.exists(self.index_file_path):
+            return self._load_from_local_cache(roots)
+
+        root_list = None if roots is None else list(roots)
+
+        for attempt in range(INDEX_LOAD_RETRY_COUNT):
+            if not os.path.exists(self.index_file_path):
+                return self._create_new_index()
 
-    def load(self) -> Dict:
-        if os.path.exists(self.index_file_path):
             try:
                 with open(self.index_file_path, encoding='utf-8') as f:
                     index_data = json.load(f)
-                logger.info(f"既存のインデックスを読み込みました: {len(index_data.get('files', {}))} ファイル")
-                return index_data
             except (json.JSONDecodeError, FileNotFoundError) as e:
                 logger.error(f"インデックスファイルの読み込みに失敗: {e}")
                 return self._create_new_index()
+
+            index_data.setdefault("files", {})
+            index_data.setdefault("shards", {})
+
+            try:
+                self._load_shards(index_data, root_list)
+                break
+            except FileNotFoundError:
+                # 読み込み中に2世代以上進んで古いシャードが削除された場合はマニフェストから読み直す
+                logger.warning(f"インデックスの世代が切り替わったため読み直します（{attempt + 1}回目）")
         else:
-            return self._create_new_index()
+            logger.error("インデックスの世代が切り替わり続けたため、読み込めたシャードのみを使用します")
+            self._load_shards(index_data, root_list, skip_missing=True)
 
-    def save(self, index_data: Dict) -> None:
-        index_data["last_updated"] = datetime.now().isoformat()
+        if roots is not None:
+            # 一部のシャードだけを読み込んだ場合、全体の要約は使えない
+            index_data.pop("summary", None)
+        self.ensure_summary(index_data)
 
+        logger.info(f"既存のインデックスを読み込みました: {len(index_data['files'])} ファイル")
+        return index_data
+
+    def load_header(self, require_summary: bool = True) -> Optional[Dict]:
+        """シャードを読まずにマニフェストだけを読み込む
+
+        Args:
+            require_summary: 要約を持たない旧形式の場合にNoneを返す場合True
+
+        Returns:
+            文書を含まないマニフェスト。読み込めない場合None
+        """
         try:
-            with open(self.index_file_path, 'w', encoding='utf-8') as f:
-                json.dump(index_data, f, ensure_ascii=False, indent=2)
-            logger.info(f"インデックスを保存しました: {self.index_file_path}")
+            with open(self.index_file_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        if require_summary and "summary" not in manifest:
+            return None
+
+        manifest.pop("files", None)
+        manifest.setdefault("shards", {})
+        return manifest
+
+    def _load_from_local_cache(self, roots: Optional[Iterable[str]]) -> Dict:
+        """ローカルの複製を共有の世代に合わせてから、複製を読み込む"""
+        local = IndexStorage(os.path.join(
+            self.local_cache_dir, self.shard_id(self.index_file_path), os.path.basename(self.index_file_path)
+        ))
+
+        for attempt in range(INDEX_LOAD_RETRY_COUNT):
+            try:
+                self._sync_local_cache(local)
+                return local.load(roots)
+            except FileNotFoundError:
+                logger.warning(f"複製中にインデックスの世代が切り替わったため複製し直します（{attempt + 1}回目）")
+            except (OSError, json.JSONDecodeError) as e:
+                logger.error(f"ローカルへの複製に失敗したため共有インデックスを直接読み込みます: {e}")
+                break
+
+        return IndexStorage(self.index_file_path).load(roots)
+
+    def _sync_local_cache(self, local: 'IndexStorage') -> None:
+        """共有の世代番号が複製と異なる場合、増えたシャードとマニフェストを複製する
+
+        Args:
+            local: ローカルの複製を管理するIndexStorage
+        """
+        with open(self.index_file_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        generation = manifest.get("generation")
+        cached = local.load_header(require_summary=False)
+        if generation is not None and cached is not None and cached.get("generation") == generation:
+            return
+
+        logger.info(f"共有インデックスの世代 {generation} をローカルに複製します: {local.index_file_path}")
+        os.makedirs(local.shard_dir, exist_ok=True)
+        shard_files = set(manifest.get("shards", {}).values())
+
+        # 世代番号付きのシャードは内容が変わらないため、手元にないものだけを複製する
+        for shard_file in shard_files:
+            local_path = os.path.join(local.shard_dir, shard_file)
+            if generation is None or not os.path.exists(local_path):
+                temp_path = local_path + INDEX_TEMP_FILE_SUFFIX
+                shutil.copyfile(os.path.join(self.shard_dir, shard_file), temp_path)
+                os.replace(temp_path, local_path)
+
+        local._write_json_atomic(local.index_file_path, manifest)
+        local._remove_orphan_shards(shard_files)
+
+    def _load_shards(self, index_data: Dict, roots: Optional[List[str]], skip_missing: bool = False) -> None:
+        shards = index_data["shards"]
+        selected = shards if roots is None else [r for r in roots if r in shards]
+
+        for root in selected:
+            try:
+                index_data["files"].update(self._read_shard(shards[root]))
+            except FileNotFoundError:
+                if not skip_missing:
+                    raise
+                logger.error(f"シャードが見つかりません: {root}")
+            except (OSError, json.JSONDecodeError) as e:
+                logger.error(f"シャードの読み込みに失敗: {root} - {e}")
+
+    def _read_shard(self, shard_file: str) -> Dict:
+        with open(os.path.join(self.shard_dir, shard_file), encoding='utf-8') as f:
+            return json.load(f).get("files", {})
+
+    def published_generation(self) -> Optional[int]:
+        """共有のマニフェストの世代番号を返す（ファイルが変わっていない場合は読み直さない）
+
+        Returns:
+            世代番号。インデックスがない場合や世代番号を持たない旧形式の場合None
+        """
+        try:
+            stat = os.stat(self.index_file_path)
+        except OSError:
+            return None
+
+        if (stat.st_mtime_ns, stat.st_size) != self._published_stat:
+            header = self.load_header(require_summary=False)
+            self._published_generation = header.get("generation") if header else None
+            self._published_stat = (stat.st_mtime_ns, stat.st_size)
+
+        return self._published_generation
+
+    def load_shard(self, root: str, shard_file: Optional[str] = None) -> Dict:
+        """1つのルートのシャードを読み込む
+
+        Args:
+            root: シャードのルートフォルダ
+            shard_file: シャードファイル名。省略時はルートから算出
+
+        Returns:
+            シャードに含まれる文書
+        """
+        try:
+            return self._read_shard(shard_file or self.shard_file_name(root))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"シャードの読み込みに失敗: {root} - {e}")
+            return {}
+
+    def save(self, index_data: Dict, roots: Optional[Iterable[str]] = None,
+             keep_previous: bool = True) -> None:
+        """書き込みロックを取得し、インデックスを新しい世代として保存する
+
+        Args:
+            index_data: インデックスデータ
+            roots: 書き込むシャードのルート。Noneの場合はすべてのシャードを書き直す
+            keep_previous: 直前の世代のシャードを残す場合True
+
+        Raises:
+            IndexLockTimeoutError: 他のプロセスが保存中で、待ち時間内にロックを取得できなかった場合
+        """
+        root_list = None if roots is None else list(roots)
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_file_path)), exist_ok=True)
+
+        with IndexWriteLock(self.index_file_path, timeout=self.lock_timeout):
+            self._merge_published_shards(index_data, root_list)
+            self._save_locked(index_data, root_list, keep_previous)
+
+    def _save_locked(self, index_data: Dict, roots: Optional[List[str]], keep_previous: bool) -> None:
+        last_updated = datetime.now().isoformat()
+        generation = index_data.get("generation", 0) + 1
+        shards = index_data.setdefault("shards", {})
+
+        try:
+            grouped = self.group_files_by_shard(index_data.get("files", {}), shards)
+            targets = shards if roots is None else [r for r in roots if r in shards]
+
+            os.makedirs(self.shard_dir, exist_ok=True)
+            new_shards = dict(shards)
+            for root in targets:
+                new_shards[root] = self.save_shard(root, grouped.get(root, {}), last_updated, generation)
+
+            manifest = {key: value for key, value in index_data.items() if key != "files"}
+            manifest.update(generation=generation, last_updated=last_updated, shards=new_shards)
+            # 要約はシャード一覧と同じマニフェストの書き込みで更新する
+            manifest["summary"] = self.ensure_summary(index_data)
+            manifest["files"] = grouped.get(None, {})
+            self._write_json_atomic(self.index_file_path, manifest)
+
+            # マニフェストを置き換えた時点で新しい世代が公開される
+            previous_shard_files = set(shards.values()) if keep_previous else set()
+            shards.update(new_shards)
+            index_data.update(generation=generation, last_updated=last_updated)
+            self._remove_orphan_shards(set(shards.values()) | previous_shard_files)
+
+            logger.info(f"インデックスを保存しました: {self.index_file_path}（世代 {generation}）")
         except Exception as e:
             logger.error(f"インデックス保存エラー: {e}")
 
+    def _merge_published_shards(self, index_data: Dict, roots: Optional[List[str]]) -> None:
+        """読み込み後に他のプロセスが公開したシャードを取り込む
+
+        書き込まないルートのうち、共有の最新世代でシャードが差し替わったもの・追加されたものを
+        読み込んで置き換える。統合はルート単位で行う。
+
+        Args:
+            index_data: インデックスデータ
+            roots: 書き込むシャードのルート。Noneの場合はすべて書き直すため取り込まない
+        """
+        published = self.load_header(require_summary=False)
+        if published is None or published.get("generation", 0) <= index_data.get("generation", 0):
+            return
+
+        # 世代番号は共有の最新世代から進める（全体を書き直す場合も巻き戻さない）
+        index_data["generation"] = published["generation"]
+        if roots is None:
+            return
+
+        shards = index_data.setdefault("shards", {})
+        files = index_data.setdefault("files", {})
+        changed_roots = [
+            root for root, shard_file in published.get("shards", {}).items()
+            if root not in roots and shards.get(root) != shard_file
+        ]
+
+        for root in changed_roots:
+            for file_path in [path for path in files if self.find_shard_root(path, shards) == root]:
+                del files[file_path]
+            files.update(self._read_shard(published["shards"][root]))
+            shards[root] = published["shards"][root]
+
+        if changed_roots:
+            logger.info(f"他のプロセスが更新したシャードを取り込みました: {', '.join(changed_roots)}")
+            last_build_seconds = self.ensure_summary(index_data).get("last_build_seconds")
+            index_data["summary"] = self.summarize_files(files, shards)
+            index_data["summary"]["last_build_seconds"] = last_build_seconds
+
+    def save_shard(self, root: str, files: Dict, last_updated: Optional[str] = None,
+                   generation: Optional[int] = None) -> str:
+        """1つのルートのシャードを書き出す
+
+        Args:
+            root: シャードのルートフォルダ
+            files: シャードに含める文書
+            last_updated: 更新日時
+            generation: 世代番号
+
+        Returns:
+            書き出したシャードファイル名
+        """
+        shard = {
+            "root": root,
+            "generation": generation,
+            "last_updated": last_updated or datetime.now().isoformat(),
+            "files": files
+        }
+        shard_file = self.shard_file_name(root, generation)
+        self._write_json_atomic(os.path.join(self.shard_dir, shard_file), shard)
+        return shard_file
+
     def get_stats(self, index_data: Dict) -> Dict:
-        files_count = len(index_data.get("files", {}))
-        total_size = sum(info.get("size", 0) for info in index_data.get("files", {}).values())
+        """統計情報を返す
+
+        Args:
+            index_data: インデックスデータ、またはload_headerで読み込んだマニフェスト
+
+        Returns:
+            統計情報
+        """
+        summary = index_data["summary"] if "files" not in index_data else self.ensure_summary(index_data)
 
         return {
-            "files_count": files_count,
-            "total_size_mb": total_size / (1024 * 1024),
+            "files_count": summary["files_count"],
+            "total_size_mb": summary["total_size"] / (1024 * 1024),
+            "extension_counts": dict(summary["extensions"]),
+            "root_counts": dict(summary["roots"]),
+            "last_build_seconds": summary.get("last_build_seconds"),
+            "shards_count": len(index_data.get("shards", {})),
             "created_at": index_data.get("created_at"),
             "last_updated": index_data.get("last_updated"),
-            "index_file_size_mb": os.path.getsize(self.index_file_path) / (1024 * 1024) if os.path.exists(self.index_file_path) else 0
+            "index_file_size_mb": self._get_index_size() / (1024 * 1024)
         }
 
     def remove_missing_files(self, index_data: Dict) -> int:
@@ -60,20 +370,317 @@ class IndexStorage:
             if not os.path.exists(file_path):
                 missing_files.append(file_path)
 
+        shards = index_data.get("shards", {})
+        summary = self.ensure_summary(index_data)
         for file_path in missing_files:
-            del index_data["files"][file_path]
+            self.update_summary(summary, file_path, index_data["files"].pop(file_path),
+                                self.find_shard_root(file_path, shards), -1)
 
         if missing_files:
-            self.save(index_data)
+            affected = {self.find_shard_root(file_path, shards) for file_path in missing_files}
+            self.save(index_data, roots=[root for root in affected if root is not None])
             logger.info(f"{len(missing_files)} 個の存在しないファイルをインデックスから削除しました")
 
         return len(missing_files)
 
+    def compact(self, index_data: Dict) -> Dict:
+        """抽出済みのテキストからインデックスを書き直して不要な領域を回収する
+
+        元ファイルの再抽出は行わず、表記違いで重複登録された文書を最新のものに統合し、
+        旧形式の非圧縮テキストを圧縮し、あいまい検索用のn-gram署名のない文書に署名を加えたうえで
+        全シャードを書き直し、参照されていないシャードファイルを削除する。
+
+        Args:
+            index_data: インデックスデータ
+
+        Returns:
+            回収したバイト数と読み込み時間の変化をまとめたレポート
+        """
+        size_before = self._get_index_size()
+        load_seconds_before = self._measure_load_time()
+
+        removed_duplicates = self._merge_duplicate_entries(index_data)
+        compressed = self._compress_plain_contents(index_data)
+        signed = self._add_missing_signatures(index_data)
+        # 重複の統合やシャードの整理でルート別の集計が変わるため数え直す
+        last_build_seconds = self.ensure_summary(index_data).get("last_build_seconds")
+        index_data["summary"] = self.summarize_files(index_data["files"], index_data.get("shards", {}))
+        index_data["summary"]["last_build_seconds"] = last_build_seconds
+        # 回収量を確定させるため、直前の世代のシャードも残さない
+        self.save(index_data, keep_previous=False)
+        if compressed:
+            logger.info(f"{compressed} 個の文書テキストを圧縮しました")
+        if signed:
+            logger.info(f"{signed} 個の文書にn-gram署名を追加しました")
+
+        size_after = self._get_index_size()
+        load_seconds_after = self._measure_load_time()
+        logger.info(f"インデックスを最適化しました: {size_before} -> {size_after} バイト")
+
+        return {
+            "size_before": size_before,
+            "size_after": size_after,
+            "reclaimed_bytes": size_before - size_after,
+            "removed_duplicates": removed_duplicates,
+            "load_seconds_before": load_seconds_before,
+            "load_seconds_after": load_seconds_after,
+        }
+
+    @classmethod
+    def ensure_summary(cls, index_data: Dict) -> Dict:
+        """インデックスの要約を返す
+
+        要約を持たない旧形式の場合や、ファイル数が文書数と食い違う場合はここで集計し直す。
+
+        Args:
+            index_data: インデックスデータ
+
+        Returns:
+            ファイル数・総サイズ・拡張子別/ルート別のファイル数・前回の作成時間を持つ要約
+        """
+        files = index_data.get("files", {})
+        summary = index_data.get("summary")
+
+        if summary is None or summary["files_count"] != len(files):
+            last_build_seconds = summary.get("last_build_seconds") if summary else None
+            summary = cls.summarize_files(files, index_data.get("shards", {}))
+            summary["last_build_seconds"] = last_build_seconds
+            index_data["summary"] = summary
+
+        return summary
+
+    @classmethod
+    def summarize_files(cls, files: Dict, roots: Iterable[str]) -> Dict:
+        root_list = list(roots)
+        summary = cls._create_new_summary()
+
+        for file_path, file_info in files.items():
+            cls.update_summary(summary, file_path, file_info, cls.find_shard_root(file_path, root_list))
+
+        return summary
+
+    @staticmethod
+    def update_summary(summary: Dict, file_path: str, file_info: Dict,
+                       root: Optional[str], sign: int = 1) -> None:
+        """文書の追加（sign=1）または削除（sign=-1）を要約の集計値に反映する
+
+        Args:
+            summary: インデックスの要約
+            file_path: ファイルパス
+            file_info: 文書の情報
+            root: 文書が属するシャードのルート
+            sign: 追加の場合1、削除の場合-1
+        """
+        summary["files_count"] += sign
+        summary["total_size"] += sign * file_info.get("size", 0)
+
+        counters = [(summary["extensions"], os.path.splitext(file_path)[1].lower())]
+        if root is not None:
+            counters.append((summary["roots"], root))
+
+        for counter, key in counters:
+            counter[key] = counter.get(key, 0) + sign
+            if counter[key] <= 0:
+                del counter[key]
+
+    @staticmethod
+    def shard_id(root: str) -> str:
+        key = os.path.normcase(os.path.normpath(os.path.abspath(root)))
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:INDEX_SHARD_ID_LENGTH]
+
+    @classmethod
+    def shard_file_name(cls, root: str, generation: Optional[int] = None) -> str:
+        if generation is None:
+            return cls.shard_id(root) + '.json'
+        return f"{cls.shard_id(root)}.{generation}.json"
+
     @staticmethod
-    def _create_new_index() -> Dict:
+    def find_shard_root(file_path: str, roots: Iterable[str]) -> Optional[str]:
+        """ファイルが属するシャードのルートを返す
+
+        入れ子のルートがある場合は最も深いルートを優先する。
+
+        Args:
+            file_path: ファイルパス
+            roots: シャードのルート
+
+        Returns:
+            ルート。どのルートにも属さない場合None
+        """
+        target = os.path.normcase(os.path.normpath(file_path))
+        best: Optional[str] = None
+        best_length = -1
+
+        for root in roots:
+            prefix = os.path.normcase(os.path.normpath(root))
+            if target != prefix and not target.startswith(prefix.rstrip(os.sep) + os.sep):
+                continue
+            if len(prefix) > best_length:
+                best, best_length = root, len(prefix)
+
+        return best
+
+    @classmethod
+    def group_files_by_shard(cls, files: Dict, roots: Iterable[str]) -> Dict[Optional[str], Dict]:
+        """文書をシャードのルートごとに振り分ける
+
+        Args:
+            files: ファイルパスをキーとする文書
+            roots: シャードのルート
+
+        Returns:
+            ルートをキーとする文書。どのルートにも属さない文書はNoneキーに入る
+        """
+        root_list: List[str] = list(roots)
+        grouped: Dict[Optional[str], Dict] = {}
+
+        for file_path, file_info in files.items():
+            root = cls.find_shard_root(file_path, root_list)
+            grouped.setdefault(root, {})[file_path] = file_info
+
+        return grouped
+
+    def _get_index_size(self) -> int:
+        total = os.path.getsize(self.index_file_path) if os.path.exists(self.index_file_path) else 0
+
+        if os.path.isdir(self.shard_dir):
+            for name in os.listdir(self.shard_dir):
+                total += os.path.getsize(os.path.join(self.shard_dir, name))
+
+        return total
+
+    def _measure_load_time(self) -> float:
+        start = time.perf_counter()
+        self.load()
+        return time.perf_counter() - start
+
+    @staticmethod
+    def _merge_duplicate_entries(index_data: Dict) -> int:
+        """区切り文字や大文字小文字の違いで重複した文書を最後に登録されたものへ統合する"""
+        latest: Dict[str, str] = {}
+        files = index_data.get("files", {})
+
+        for file_path, file_info in files.items():
+            key = os.path.normcase(os.path.normpath(file_path))
+            kept = latest.get(key)
+            if kept is None or (file_info.get("indexed_at") or "") >= (files[kept].get("indexed_at") or ""):
+                latest[key] = file_path
+
+        kept_paths = set(latest.values())
+        duplicates = [file_path for file_path in files if file_path not in kept_paths]
+        for file_path in duplicates:
+            del files[file_path]
+
+        # 表記違いの同じルートは同じシャードを指すため1つにまとめる
+        shards = index_data.get("shards", {})
+        seen_shard_ids = set()
+        for root in list(shards):
+            shard_id = IndexStorage.shard_id(root)
+            if shard_id in seen_shard_ids:
+                del shards[root]
+            else:
+                seen_shard_ids.add(shard_id)
+
+        return len(duplicates)
+
+    @staticmethod
+    def _compress_plain_contents(index_data: Dict) -> int:
+        """旧形式の非圧縮テキストを圧縮形式に置き換え、置き換えた文書数を返す"""
+        compressed = 0
+
+        for file_path, file_info in index_data.get("files", {}).items():
+            content = file_info.get("content")
+            if isinstance(content, str):
+                file_info["content"] = compress_text(content, text_separator(file_path))
+                compressed += 1
+
+        return compressed
+
+    @staticmethod
+    def _add_missing_signatures(index_data: Dict) -> int:
+        """n-gram署名のない文書に署名を加え、加えた文書数を返す"""
+        files = index_data.get("files", {})
+        missing = [file_path for file_path, file_info in files.items() if "ngrams" not in file_info]
+
+        for file_path in missing:
+            text = CompressedText(files[file_path].get("content", "")).text
+            files[file_path] = dict(files[file_path], ngrams=build_signature(normalize_text(text, fold_kana=True)))
+
+        return len(missing)
+
+    def _write_json_atomic(self, path: str, data: Dict) -> None:
+        """一時ファイルに書き出してfsyncし、既存のファイルと置き換える"""
+        fd, temp_path = tempfile.mkstemp(
+            prefix=os.path.basename(path) + '.', suffix=INDEX_TEMP_FILE_SUFFIX, dir=os.path.dirname(path) or '.'
+        )
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstempは所有者だけが読める0o600で作るため、置き換えるファイルと同じ権限にそろえる
+            os.chmod(temp_path, self._file_mode(path))
+            self._replace_file(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def _file_mode(path: str) -> int:
+        """置き換えるファイルの権限を返す（ファイルがなければ、通常の作成と同じ0o666からumaskを除いた権限）"""
+        try:
+            return stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+
+    @staticmethod
+    def _replace_file(source: str, destination: str) -> None:
+        # Windowsでは他のプロセスが読み込み中のファイルを置き換えられないため少し待って再試行する
+        for attempt in range(INDEX_REPLACE_RETRY_COUNT):
+            try:
+                os.replace(source, destination)
+                return
+            except PermissionError:
+                if attempt == INDEX_REPLACE_RETRY_COUNT - 1:
+                    raise
+                time.sleep(INDEX_REPLACE_RETRY_DELAY)
+
+    def _remove_orphan_shards(self, referenced: Iterable[str]) -> None:
+        """参照されていないシャードファイルを削除する
+
+        Args:
+            referenced: 残すシャードファイル名（現在と直前の世代）
+        """
+        referenced = set(referenced)
+
+        for name in os.listdir(self.shard_dir):
+            if name in referenced:
+                continue
+            try:
+                os.remove(os.path.join(self.shard_dir, name))
+            except OSError as e:
+                logger.warning(f"不要なシャードの削除に失敗: {name} - {e}")
+
+    @staticmethod
+    def _create_new_summary() -> Dict:
+        return {
+            "files_count": 0,
+            "total_size": 0,
+            "extensions": {},
+            "roots": {},
+            "last_build_seconds": None
+        }
+
+    @classmethod
+    def _create_new_index(cls) -> Dict:
         return {
             "version": "1.0",
             "created_at": datetime.now().isoformat(),
             "last_updated": None,
+            "shards": {},
+            "summary": cls._create_new_summary(),
             "files": {}
         }
@@ -5,8 +5,15 @@ from typing import Callable, List, Optional
 from PyQt5.QtCore import QThread, pyqtSignal
 
 from service.file_searcher import FileSearcher as OriginalFileSearcher
+from service.result_batcher import ResultBatcher
 from service.search_indexer import SearchIndexer
-from utils.constants import INDEX_STATUS_MESSAGES, INDEX_STATUS_TEMPLATES
+from utils.constants import (
+    DEFAULT_FOLD_KANA,
+    INDEX_MAX_RESULTS,
+    INDEX_STATUS_MESSAGES,
+    INDEX_STATUS_TEMPLATES,
+    MATCH_MODE_LITERAL,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +21,7 @@ logger = logging.getLogger(__name__)
 class IndexedFileSearcher(QThread):
     """インデックスを利用した高速ファイル検索"""
 
-    result_found = pyqtSignal(str, list)
+    results_batch = pyqtSignal(list)
     progress_update = pyqtSignal(int)
     search_completed = pyqtSignal()
     index_status_changed = pyqtSignal(str)
@@ -29,7 +36,12 @@ class IndexedFileSearcher(QThread):
             context_length: int,
             use_index: bool = True,
             index_file_path: str = "search_index.json",
-            cross_folder_search: bool = False
+            cross_folder_search: bool = False,
+            local_cache_dir: Optional[str] = None,
+            match_mode: str = MATCH_MODE_LITERAL,
+            fold_kana: bool = DEFAULT_FOLD_KANA,
+            max_results_per_file: int = INDEX_MAX_RESULTS,
+            candidate_files: Optional[List[str]] = None
     ):
         super().__init__()
         self.directory = directory
@@ -40,10 +52,17 @@ class IndexedFileSearcher(QThread):
         self.context_length = context_length
         self.use_index = use_index
         self.cross_folder_search = cross_folder_search
+        self.match_mode = match_mode
+        self.fold_kana = fold_kana
+        self.max_results_per_file = max_results_per_file
+        self.candidate_files = candidate_files
         self.cancel_flag = False
+        # インデックスで最後まで検索できた場合True（インデックスがなく通常の検索に切り替えた場合などはFalse）
+        self.index_search_succeeded = False
 
-        self.indexer = SearchIndexer(index_file_path)
+        self.indexer = SearchIndexer(index_file_path, local_cache_dir)
         self.fallback_searcher = None
+        self.batcher = ResultBatcher(self.results_batch.emit, self.progress_update.emit)
 
     def run(self) -> None:
         """インデックスの有無に応じた検索を実行"""
@@ -71,20 +90,30 @@ class IndexedFileSearcher(QThread):
 
     def _search_with_index(self) -> None:
         try:
-            results = self.indexer.search_in_index(self.search_terms, self.search_type)
+            directories = None if self.cross_folder_search else [self.directory]
+            results = self.indexer.search_in_index(
+                self.search_terms, self.search_type,
+                directories=directories, include_subdirs=self.include_subdirs,
+                match_mode=self.match_mode, fold_kana=self.fold_kana,
+                max_results_per_file=self.max_results_per_file,
+                candidates=self.candidate_files
+            )
 
             total_results = len(results)
             for i, (file_path, matches) in enumerate(results):
                 if self.cancel_flag:
                     break
 
-                if self._should_include_file(file_path):
-                    self.result_found.emit(file_path, matches)
+                self.batcher.add(file_path, matches)
 
                 progress = int((i + 1) / total_results * 100) if total_results > 0 else 100
-                self.progress_update.emit(progress)
+                self.batcher.progress(progress)
+
+            self.batcher.flush()
+            self.index_search_succeeded = True
 
         except Exception as e:
+            self.batcher.flush()
             logger.error(f"インデックス検索でエラー: {e}")
             self.index_status_changed.emit(INDEX_STATUS_MESSAGES['SEARCH_ERROR'])
             self._search_without_index()
@@ -98,45 +127,16 @@ class IndexedFileSearcher(QThread):
             self.include_subdirs,
             self.search_type,
             self.file_extensions,
-            self.context_length
+            self.context_length,
+            match_mode=self.match_mode,
+            fold_kana=self.fold_kana
         )
 
-        self.fallback_searcher.result_found.connect(self.result_found.emit)
+        self.fallback_searcher.results_batch.connect(self.results_batch.emit)
         self.fallback_searcher.progress_update.connect(self.progress_update.emit)
         self.fallback_searcher.search_completed.connect(self.search_completed.emit)
         self.fallback_searcher.run()
 
-    def _should_include_file(self, file_path: str) -> bool:
-        """サブディレクトリのファイルを含めるべきか判定
-
-        Args:
-            file_path: ファイルパス
-
-        Returns:
-            含めるべき場合True
-        """
-        if self.cross_folder_search:
-            return True
-            
-        try:
-            if not os.path.isabs(file_path):
-                file_path = os.path.abspath(file_path)
-
-            file_dir = os.path.normpath(os.path.dirname(file_path))
-            target_dir = os.path.normpath(os.path.abspath(self.directory))
-
-            if self.include_subdirs:
-                result = os.path.commonpath([file_dir, target_dir]) == target_dir
-                logger.debug(f"フィルタリング: {file_path} -> {result} (target: {target_dir})")
-                return result
-            else:
-                result = file_dir == target_dir
-                logger.debug(f"フィルタリング: {file_path} -> {result} (target: {target_dir})")
-                return result
-        except (ValueError, OSError) as e:
-            logger.error(f"フィルタリングエラー: {file_path} - {e}")
-            return True
-
     def cancel_search(self) -> None:
         self.cancel_flag = True
         if self.fallback_searcher:
@@ -174,7 +174,7 @@ class IndexedFileSearcher(QThread):
 
     def rebuild_index(self, directories: List[str]) -> None:
         try:
-            self.indexer.index_data = self.indexer.storage._create_new_index()
+            self.indexer.reset_index()
             self.create_or_update_index(directories)
 
         except Exception as e:
@@ -0,0 +1,123 @@
+import bisect
+import logging
+import mmap
+import os
+from array import array
+from typing import Dict, List, Union
+
+import chardet
+
+from utils.constants import (
+    ENCODING_FALLBACK,
+    ERROR_MESSAGES,
+    LARGE_TEXT_ENCODING_SAMPLE_SIZE,
+    LARGE_TEXT_LINE_INDEX_CHUNK_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _detect_encoding(sample: bytes) -> str:
+    """先頭部分からエンコーディングを推定する（改行が1バイトのエンコーディングのみ）
+
+    Raises:
+        ValueError: 改行が「\\n」の1バイトで表されないエンコーディング（UTF-16など）
+    """
+    encoding = chardet.detect(sample)['encoding'] if sample else None
+    if encoding is None or encoding.lower() == 'ascii':
+        # 先頭が英数字だけでも、後ろに日本語が続くことがあるため既定のエンコーディングとして扱う
+        encoding = ENCODING_FALLBACK
+
+    if '\n'.encode(encoding) != b'\n':
+        raise ValueError(f"{ERROR_MESSAGES['ENCODING_DETECTION_FAILED']}: {encoding}")
+    return encoding
+
+
+class MappedTextFile:
+    """大きなテキストファイルをメモリマップで開き、指定した範囲の行だけを読み出す
+
+    開くときはチャンクごとの改行の数だけを数え、ファイル全体を文字列にしない。
+    行の開始位置は、そのチャンクの行が初めて必要になった時点で求めて保持するため、
+    任意の行への移動はチャンクの二分探索と配列の参照だけで済む。
+    改行が1バイトの「\\n」で表されるエンコーディング（UTF-8、Shift_JISなど）のみ扱う。
+    """
+
+    def __init__(self, file_path: str, chunk_size: int = LARGE_TEXT_LINE_INDEX_CHUNK_SIZE) -> None:
+        """初期化
+
+        Args:
+            file_path: ファイルパス
+            chunk_size: 改行を数える単位（バイト）
+
+        Raises:
+            OSError: ファイルを開けない
+            ValueError: 対応していないエンコーディング
+        """
+        self.file_path = file_path
+        self._chunk_size = chunk_size
+        self._file = open(file_path, 'rb')
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            # 空のファイルはメモリマップできない
+            self._data: Union[mmap.mmap, bytes] = (
+                mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+            )
+            self.size = size
+            self.encoding = _detect_encoding(self._data[:LARGE_TEXT_ENCODING_SAMPLE_SIZE])
+            self._newlines_before: List[int] = []  # 各チャンクより前にある改行の数
+            self._chunk_line_starts: Dict[int, array] = {}
+            self.line_count = self._build_chunk_index()
+        except Exception:
+            self.close()
+            raise
+
+    def _build_chunk_index(self) -> int:
+        newlines = 0
+        for start in range(0, self.size, self._chunk_size):
+            self._newlines_before.append(newlines)
+            newlines += self._data[start:start + self._chunk_size].count(b'\n')
+
+        # 末尾が改行で終わる場合、その後ろは行として数えない
+        ends_with_newline = self.size > 0 and self._data[self.size - 1:self.size] == b'\n'
+        return newlines + (0 if ends_with_newline else 1)
+
+    def line_start(self, line: int) -> int:
+        """0始まりの行番号の行が始まるバイト位置（行数以上はファイルサイズ）"""
+        if line <= 0:
+            return 0
+        if line >= self.line_count:
+            return self.size
+
+        # line行目は(line - 1)番目の改行の直後から始まる
+        newline_index = line - 1
+        chunk = bisect.bisect_right(self._newlines_before, newline_index) - 1
+        return self._line_starts_in_chunk(chunk)[newline_index - self._newlines_before[chunk]]
+
+    def _line_starts_in_chunk(self, chunk: int) -> array:
+        starts = self._chunk_line_starts.get(chunk)
+        if starts is None:
+            starts = array('q')
+            position = chunk * self._chunk_size
+            end = min(position + self._chunk_size, self.size)
+            while True:
+                position = self._data.find(b'\n', position, end)
+                if position < 0:
+                    break
+                position += 1
+                starts.append(position)
+            self._chunk_line_starts[chunk] = starts
+        return starts
+
+    def lines(self, start: int, end: int) -> str:
+        """0始まりの行番号でstart行目からend行目の手前までを文字列で返す"""
+        raw = self._data[self.line_start(start):self.line_start(end)]
+        text = raw.decode(self.encoding, errors='replace').replace('\r\n', '\n')
+        return text[:-1] if text.endswith('\n') else text
+
+    def close(self) -> None:
+        """メモリマップとファイルを閉じる"""
+        data = getattr(self, '_data', None)
+        if isinstance(data, mmap.mmap):
+            data.close()
+        self._data = b''
+        self._file.close()
@@ -0,0 +1,203 @@
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from PyQt5.QtCore import QCoreApplication, QThread, pyqtSignal
+from PyQt5.QtGui import QTextDocument
+
+from utils.constants import (
+    MARKDOWN_LINE_KEY_LENGTH,
+    MARKDOWN_LINE_MATCH_LOOKAHEAD,
+    MARKDOWN_RENDER_CACHE_SIZE,
+)
+from utils.helpers import read_file_with_auto_encoding
+
+logger = logging.getLogger(__name__)
+
+# 見出し・引用・リスト・チェックボックスなど、行頭の記法
+_LINE_PREFIX_PATTERN = re.compile(r'^(?:\s*(?:#{1,6}\s+|>\s*|[-*+]\s+(?:\[[ xX]\]\s+)?|\d+[.)]\s+))*')
+_LINK_PATTERN = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+_MARKUP_PATTERN = re.compile(r'[*_`~]|<[^>]+>')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_TABLE_SEPARATOR_CHARACTERS = set('-: ')
+
+
+class RenderedMarkdown(NamedTuple):
+    document: QTextDocument
+    line_blocks: List[int]  # Markdownの行（0始まり）ごとの、描画後の文書のブロック番号
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_PATTERN.sub(' ', _MARKUP_PATTERN.sub('', text)).strip()
+
+
+def _line_key(line: str) -> str:
+    """Markdownの行から、描画後のブロックで探す文字列を取り出す（探さない行は空文字列）"""
+    stripped = line.strip()
+    if not stripped or stripped.startswith('```') or stripped.startswith('~~~'):
+        return ''
+
+    if stripped.startswith('|'):
+        # 表は行の先頭のセルで探す（区切り行は探さない）
+        cells = [cell for cell in stripped.strip('|').split('|') if cell.strip()]
+        if not cells or set(cells[0]) <= _TABLE_SEPARATOR_CHARACTERS:
+            return ''
+        stripped = cells[0]
+
+    text = _LINK_PATTERN.sub(r'\1', _LINE_PREFIX_PATTERN.sub('', stripped))
+    return _normalize(text)[:MARKDOWN_LINE_KEY_LENGTH]
+
+
+def build_line_map(source_lines: Sequence[str], block_texts: Sequence[str]) -> List[int]:
+    """Markdownの各行が描画後のどのブロックに表示されるかを求める
+
+    行の先頭の文字列を、直前の行のブロックから先へ順に探す。
+    見つからない行（空行・コードの囲みなど）は直前の行と同じブロックとする。
+
+    Args:
+        source_lines: Markdownの行
+        block_texts: 描画後の文書のブロックの文字列（ブロック番号順）
+
+    Returns:
+        行ごとのブロック番号
+    """
+    normalized_blocks = [_normalize(text) for text in block_texts]
+    line_blocks = []
+    current = 0
+    for line in source_lines:
+        key = _line_key(line)
+        if key:
+            end = min(len(normalized_blocks), current + MARKDOWN_LINE_MATCH_LOOKAHEAD)
+            for block_number in range(current, end):
+                if key in normalized_blocks[block_number]:
+                    current = block_number
+                    break
+        line_blocks.append(current)
+    return line_blocks
+
+
+def render_markdown(content: str) -> RenderedMarkdown:
+    """Markdownを文書に描画し、行とブロックの対応を求める"""
+    document = QTextDocument()
+    document.setMarkdown(content)
+
+    block_texts = []
+    block = document.begin()
+    while block.isValid():
+        block_texts.append(block.text())
+        block = block.next()
+
+    return RenderedMarkdown(document, build_line_map(content.splitlines(), block_texts))
+
+
+class MarkdownRenderCache:
+    """描画したMarkdownをファイルのパスと更新日時ごとに保持する（最も長く使っていないものから破棄）"""
+
+    def __init__(self, max_entries: int = MARKDOWN_RENDER_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple, RenderedMarkdown]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(file_path: str) -> Tuple:
+        stat = os.stat(file_path)
+        return os.path.normcase(os.path.abspath(file_path)), stat.st_mtime_ns, stat.st_size
+
+    def get(self, file_path: str) -> Optional[RenderedMarkdown]:
+        """ファイルが描画したときから変わっていなければ、描画済みの文書を返す"""
+        try:
+            key = self.make_key(file_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            rendered = self._entries.get(key)
+            if rendered is not None:
+                self._entries.move_to_end(key)
+            return rendered
+
+    def put(self, key: Tuple, rendered: RenderedMarkdown) -> None:
+        with self._lock:
+            self._entries[key] = rendered
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                evicted.document.deleteLater()
+
+    def clear(self) -> None:
+        with self._lock:
+            for rendered in self._entries.values():
+                rendered.document.deleteLater()
+            self._entries.clear()
+
+
+markdown_cache = MarkdownRenderCache()
+
+
+class MarkdownRenderWorker(QThread):
+    """Markdownファイルの読み込みと描画をGUIスレッドの外で行う
+
+    描画した文書はGUIスレッドへ移してからキャッシュに入れ、renderedで通知する。
+    文書はビューアごとに複製して使う。
+    """
+
+    rendered = pyqtSignal(object)
+    render_failed = pyqtSignal(str)
+
+    def __init__(self, file_path: str, cache: MarkdownRenderCache = markdown_cache) -> None:
+        """初期化
+
+        Args:
+            file_path: Markdownファイルパス
+            cache: 描画した文書を入れるキャッシュ
+        """
+        super().__init__()
+        self.file_path = file_path
+        self.cache = cache
+
+    def run(self) -> None:
+        try:
+            # 読み込み中にファイルが更新された場合は次回描画し直すよう、読み込む前の状態をキーにする
+            key = MarkdownRenderCache.make_key(self.file_path)
+            content = read_file_with_auto_encoding(self.file_path) or ""
+            rendered = render_markdown(content)
+            rendered.document.moveToThread(QCoreApplication.instance().thread())
+            self.cache.put(key, rendered)
+        except Exception as e:
+            logger.error(f"Markdownの描画でエラー: {self.file_path} - {e}")
+            self.render_failed.emit(str(e))
+            return
+
+        self.rendered.emit(rendered)
+
+
+# 実行中のスレッドがGCで破棄されないよう参照を保持する
+_running_workers: List[MarkdownRenderWorker] = []
+
+
+def start_markdown_render(
+    file_path: str,
+    on_rendered: Callable[[RenderedMarkdown], None],
+    on_failed: Callable[[str], None]
+) -> MarkdownRenderWorker:
+    """Markdownファイルの描画を別スレッドで開始する
+
+    Args:
+        file_path: Markdownファイルパス
+        on_rendered: 描画した文書を受け取る関数（GUIスレッドで呼ばれる）
+        on_failed: エラーメッセージを受け取る関数（GUIスレッドで呼ばれる）
+
+    Returns:
+        開始したスレッド
+    """
+    worker = MarkdownRenderWorker(file_path)
+    # 描画がすぐに終わっても通知を取りこぼさないよう、開始前に接続する
+    worker.rendered.connect(on_rendered)
+    worker.render_failed.connect(on_failed)
+    worker.finished.connect(lambda: _running_workers.remove(worker) if worker in _running_workers else None)
+    _running_workers.append(worker)
+    worker.start()
+    return worker
@@ -0,0 +1,78 @@
+import base64
+import zlib
+from typing import Dict, Iterable, Optional, Set
+
+from utils.constants import (
+    FUZZY_NGRAM_SIZE,
+    INDEX_COMPRESSION_LEVEL,
+    INDEX_NGRAM_BITS_PER_GRAM,
+    INDEX_NGRAM_MAX_BITS,
+    INDEX_NGRAM_MIN_BITS,
+)
+
+
+def text_ngrams(text: str, size: int = FUZZY_NGRAM_SIZE) -> Set[str]:
+    """テキストに含まれる文字n-gramの集合を返す（テキストがnより短い場合はテキスト自体）"""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def _gram_bit(gram: str, bits: int) -> int:
+    # hash()はプロセスごとに値が変わるため、保存する署名にはcrc32を使う
+    return zlib.crc32(gram.encode('utf-8')) % bits
+
+
+def build_signature(normalized_text: str) -> Dict:
+    """正規化した文書テキストのn-gram集合を、ハッシュしたビット列として表す
+
+    n-gramの種類数に比例した長さのビット列に各n-gramの位置を立てる。
+    あるn-gramのビットが立っていなければ、その文書はそのn-gramを含まない。
+
+    Args:
+        normalized_text: normalize_textで正規化した文書テキスト
+
+    Returns:
+        ビット数と圧縮したビット列を持つ辞書
+    """
+    grams = text_ngrams(normalized_text)
+    bits = INDEX_NGRAM_MIN_BITS
+    while bits < len(grams) * INDEX_NGRAM_BITS_PER_GRAM and bits < INDEX_NGRAM_MAX_BITS:
+        bits *= 2
+
+    bitset = bytearray(bits // 8)
+    for gram in grams:
+        position = _gram_bit(gram, bits)
+        bitset[position >> 3] |= 1 << (position & 7)
+
+    data = zlib.compress(bytes(bitset), INDEX_COMPRESSION_LEVEL)
+    return {"size": FUZZY_NGRAM_SIZE, "bits": bits, "data": base64.b64encode(data).decode('ascii')}
+
+
+class NgramSignature:
+    """インデックスに保存したn-gram署名の照会"""
+
+    def __init__(self, stored: Dict) -> None:
+        """初期化
+
+        Args:
+            stored: build_signatureが返した辞書
+        """
+        self.bits: int = stored["bits"]
+        self._bitset = zlib.decompress(base64.b64decode(stored["data"]))
+
+    @classmethod
+    def from_file_info(cls, file_info: Dict) -> Optional['NgramSignature']:
+        """文書の情報から署名を読み込む（署名のない旧形式や形式の異なる場合はNone）"""
+        stored = file_info.get("ngrams")
+        if not stored or stored.get("size") != FUZZY_NGRAM_SIZE:
+            return None
+        return cls(stored)
+
+    def __contains__(self, gram: str) -> bool:
+        position = _gram_bit(gram, self.bits)
+        return bool(self._bitset[position >> 3] & (1 << (position & 7)))
+
+    def count_present(self, grams: Iterable[str]) -> int:
+        """文書に含まれる可能性のあるn-gramの数を返す"""
+        return sum(1 for gram in grams if gram in self)
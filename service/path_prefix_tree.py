@@ -0,0 +1,72 @@
+import os
+from typing import Dict, Iterable, List, Tuple
+
+DirKey = Tuple[str, ...]
+
+
+class PathPrefixTree:
+    """フォルダから文書IDの範囲を引くための接頭辞木
+
+    文書IDはフォルダ階層の順に振るため、あるフォルダ直下の文書と
+    そのサブフォルダを含む文書はそれぞれ連続したIDの範囲になる。
+    """
+
+    def __init__(self, file_paths: Iterable[str]) -> None:
+        """初期化
+
+        Args:
+            file_paths: インデックスに含まれるファイルパス
+        """
+        keyed = sorted((self._split(os.path.dirname(path)), os.path.basename(path), path) for path in file_paths)
+        self.doc_paths: List[str] = [path for _, _, path in keyed]
+        # フォルダ -> [先頭ID, 直下の文書の終端ID, サブフォルダを含む終端ID]
+        self.nodes: Dict[DirKey, List[int]] = {}
+
+        for doc_id, (dir_key, _, _) in enumerate(keyed):
+            for depth in range(1, len(dir_key) + 1):
+                node = self.nodes.setdefault(dir_key[:depth], [doc_id, doc_id, doc_id])
+                node[2] = doc_id + 1
+            self.nodes[dir_key][1] = doc_id + 1
+
+    def __len__(self) -> int:
+        return len(self.doc_paths)
+
+    def get_range(self, directory: str, include_subdirs: bool = True) -> range:
+        """フォルダに含まれる文書IDの範囲を返す
+
+        Args:
+            directory: フォルダパス
+            include_subdirs: サブフォルダの文書を含める場合True
+
+        Returns:
+            文書IDの範囲。該当する文書がない場合は空の範囲
+        """
+        node = self.nodes.get(self._split(directory))
+        if node is None:
+            return range(0)
+
+        start, direct_end, end = node
+        return range(start, end if include_subdirs else direct_end)
+
+    def select(self, directories: Iterable[str], include_subdirs: bool = True) -> List[int]:
+        """複数フォルダに含まれる文書IDを返す
+
+        Args:
+            directories: フォルダパスリスト
+            include_subdirs: サブフォルダの文書を含める場合True
+
+        Returns:
+            文書IDリスト（重複なし、昇順）
+        """
+        doc_ids = set()
+        for directory in directories:
+            doc_ids.update(self.get_range(directory, include_subdirs))
+
+        return sorted(doc_ids)
+
+    @staticmethod
+    def _split(directory: str) -> DirKey:
+        normalized = os.path.normcase(os.path.normpath(os.path.abspath(directory)))
+        parts = normalized.split(os.sep)
+        # 先頭の空要素（ルートやUNCパス）は残し、末尾の区切り文字による空要素は除く
+        return tuple(part for i, part in enumerate(parts) if part or i == 0)
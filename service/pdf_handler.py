@@ -1,30 +1,28 @@
 import atexit
 import logging
 import os
+import shutil
 import subprocess
 import tempfile
-import time
-from typing import List, cast
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 import fitz
-import psutil
-import pyautogui
 
+from service.highlight_matcher import HighlightMatcher
 from utils.constants import (
-    ACROBAT_KEYBINDS,
-    ACROBAT_KEYSTROKE_DELAY,
-    ACROBAT_PROCESS_NAMES,
-    ACROBAT_WAIT_INTERVAL,
-    ACROBAT_WAIT_TIMEOUT,
+    ACROBAT_OPEN_PARAMETERS_OPTION,
+    ACROBAT_PAGE_PARAMETER_TEMPLATE,
+    DEFAULT_FOLD_KANA,
+    DEFAULT_HIGHLIGHT_PAGE_WINDOW,
+    DEFAULT_MAX_TEMP_FILES,
+    DEFAULT_MAX_TEMP_SIZE_MB,
     DIALOG_MESSAGES,
-    LOG_MESSAGE_TEMPLATES,
+    MATCH_MODE_LITERAL,
     PDF_HANDLER_ERROR_TEMPLATES,
-    PAGE_NAVIGATION_DELAY,
-    PAGE_NAVIGATION_RETRY_COUNT,
     PDF_ANNOT_FLAG_SCREEN_ONLY,
     PDF_HIGHLIGHT_COLORS,
-    PROCESS_CLEANUP_DELAY,
-    PROCESS_TERMINATE_TIMEOUT,
 )
 
 logger = logging.getLogger(__name__)
@@ -64,203 +62,462 @@ class TempFileManager:
 temp_file_manager = TempFileManager()
 
 
-class AcrobatProcessManager:
+class PDFHighlighter:
     @staticmethod
-    def close_all_processes() -> None:
-        try:
-            acrobat_processes = AcrobatProcessManager._find_processes()
-            
-            if not acrobat_processes:
-                logger.debug(LOG_MESSAGE_TEMPLATES['NO_ACROBAT_PROCESSES'])
-                return
+    def highlight_pdf(
+        pdf_path: str,
+        search_terms: List[str],
+        page_number: Optional[int] = None,
+        page_window: int = DEFAULT_HIGHLIGHT_PAGE_WINDOW,
+        match_mode: str = MATCH_MODE_LITERAL,
+        fold_kana: bool = DEFAULT_FOLD_KANA
+    ) -> str:
+        """検索語をハイライトしたPDFの一時ファイルを作成
 
-            logger.info(LOG_MESSAGE_TEMPLATES['FOUND_ACROBAT_PROCESSES'].format(count=len(acrobat_processes)))
-            
-            for proc in acrobat_processes:
-                AcrobatProcessManager._terminate_process(proc)
-            
-            time.sleep(PROCESS_CLEANUP_DELAY)
+        page_numberを指定した場合は、そのページと前後page_windowページだけをハイライトする。
+        元のPDFをそのまま複製し、ハイライトは追記保存するため、ページ数の多いPDFでも
+        文書全体を書き直さない。範囲外のページはハイライトしない
+        （HighlightCache.complete_highlightsで残りのページもハイライトした複製を作れる）。
+
+        Args:
+            pdf_path: PDFファイルパス
+            search_terms: 検索語リスト
+            page_number: 表示するページ番号（1始まり）。Noneの場合はすべてのページ
+            page_window: 表示するページの前後でハイライトするページ数
+            match_mode: 検索語の照合方法
+            fold_kana: カタカナとひらがなを同一視する場合True
+
+        Returns:
+            ハイライトしたPDFの一時ファイルパス
+        """
+        temp_path = PDFHighlighter._create_temp_file()
+        matcher = HighlightMatcher(search_terms, match_mode, fold_kana)
+
+        try:
+            if page_number is None:
+                with fitz.open(pdf_path) as doc:
+                    PDFHighlighter._add_highlights(doc, matcher)
+                    doc.save(temp_path)
+            else:
+                PDFHighlighter._highlight_page_window(
+                    pdf_path, temp_path, matcher, page_number, page_window
+                )
             
+            return temp_path
+        
+        except fitz.FileDataError as e:
+            raise ValueError(DIALOG_MESSAGES['INVALID_PDF'].format(pdf_path=pdf_path)) from e
         except Exception as e:
-            logger.error(f"プロセス確認中にエラー: {e}")
+            raise RuntimeError(PDF_HANDLER_ERROR_TEMPLATES['HIGHLIGHT_FAILED'].format(error=e)) from e
     
     @staticmethod
-    def _find_processes() -> List[psutil.Process]:
-        acrobat_processes = []
-        
-        for proc in psutil.process_iter(['pid', 'name']):
-            proc_name = proc.info['name'].lower()
-            
-            if AcrobatProcessManager._is_acrobat_process(proc_name):
-                acrobat_processes.append(proc)
+    def _create_temp_file() -> str:
+        """一時ファイルを作成"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
+            tmp_path = tmp_file.name
         
-        return acrobat_processes
+        temp_file_manager.add(tmp_path)
+        return tmp_path
     
     @staticmethod
-    def _is_acrobat_process(process_name: str) -> bool:
-        return any(
-            process_name in [name.lower(), f"{name.lower()}.exe"]
-            for name in ACROBAT_PROCESS_NAMES
-        )
-    
+    def page_window_range(page_count: int, page_number: int, page_window: int) -> range:
+        """ハイライトするページのインデックス（0始まり）の範囲を返す
+
+        Args:
+            page_count: 文書のページ数
+            page_number: 表示するページ番号（1始まり、範囲外は先頭・末尾に丸める）
+            page_window: 前後にハイライトするページ数
+
+        Returns:
+            ページインデックスの範囲
+        """
+        if page_count <= 0:
+            return range(0)
+        center = min(max(page_number, 1), page_count) - 1
+        window = max(page_window, 0)
+        return range(max(center - window, 0), min(center + window + 1, page_count))
+
     @staticmethod
-    def _terminate_process(proc: psutil.Process) -> None:
+    def highlight_other_pages(
+        highlighted_path: str,
+        search_terms: List[str],
+        highlighted_pages: range,
+        match_mode: str = MATCH_MODE_LITERAL,
+        fold_kana: bool = DEFAULT_FOLD_KANA,
+        is_cancelled: Callable[[], bool] = lambda: False
+    ) -> Optional[str]:
+        """ページの範囲だけハイライトした一時ファイルから、残りのページもハイライトした一時ファイルを作る
+
+        範囲のページのハイライトは複製した一時ファイルのものをそのまま使い、残りのページのハイライトだけを追記保存する。
+
+        Args:
+            highlighted_path: PDFHighlighter.highlight_pdfでページを指定して作った一時ファイルパス
+            search_terms: 検索語リスト
+            highlighted_pages: ハイライト済みのページインデックス（0始まり）の範囲
+            match_mode: 検索語の照合方法
+            fold_kana: カタカナとひらがなを同一視する場合True
+            is_cancelled: 中断する場合にTrueを返す関数（ページごとに確認する）
+
+        Returns:
+            すべてのページをハイライトした一時ファイルパス。中断した場合None
+        """
+        temp_path = PDFHighlighter._create_temp_file()
+        matcher = HighlightMatcher(search_terms, match_mode, fold_kana)
+
+        def other_pages(page_count: int) -> Iterable[int]:
+            for index in range(page_count):
+                if is_cancelled():
+                    return
+                if index not in highlighted_pages:
+                    yield index
+
         try:
-            logger.info(LOG_MESSAGE_TEMPLATES['PROCESS_TERMINATING'].format(
-                process_name=proc.info['name'], pid=proc.pid
-            ))
-            proc.terminate()
+            PDFHighlighter._highlight_copy(highlighted_path, temp_path, matcher, other_pages)
+        except Exception:
+            temp_file_manager.cleanup_single(temp_path)
+            raise
 
-            try:
-                proc.wait(timeout=PROCESS_TERMINATE_TIMEOUT)
-                logger.info(LOG_MESSAGE_TEMPLATES['PROCESS_TERMINATED'].format(pid=proc.pid))
-            except psutil.TimeoutExpired:
-                proc.kill()
-                logger.warning(LOG_MESSAGE_TEMPLATES['PROCESS_FORCE_KILLED'].format(pid=proc.pid))
-                
-        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-            logger.error(f"プロセス終了中にエラー: {e}")
-    
-    @staticmethod
-    def wait_for_startup(pid: int, timeout: int = ACROBAT_WAIT_TIMEOUT) -> bool:
-        """Acrobatの起動を待機"""
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            try:
-                process = psutil.Process(pid)
-                
-                if process.status() != psutil.STATUS_RUNNING:
-                    time.sleep(ACROBAT_WAIT_INTERVAL)
-                    continue
+        if is_cancelled():
+            temp_file_manager.cleanup_single(temp_path)
+            return None
+        return temp_path
 
-                time.sleep(ACROBAT_WAIT_INTERVAL)
-                return True
+    @staticmethod
+    def _highlight_page_window(
+        pdf_path: str,
+        temp_path: str,
+        matcher: HighlightMatcher,
+        page_number: int,
+        page_window: int
+    ) -> None:
+        PDFHighlighter._highlight_copy(
+            pdf_path, temp_path, matcher,
+            lambda page_count: PDFHighlighter.page_window_range(page_count, page_number, page_window)
+        )
 
-            except psutil.NoSuchProcess:
-                return False
-            except Exception as e:
-                logger.error(LOG_MESSAGE_TEMPLATES['ACROBAT_WAIT_ERROR'].format(error=e))
+    @staticmethod
+    def _highlight_copy(
+        source_path: str,
+        temp_path: str,
+        matcher: HighlightMatcher,
+        select_pages: Callable[[int], Iterable[int]]
+    ) -> None:
+        """PDFを複製し、選んだページのハイライトを複製に追記保存する
 
-            time.sleep(ACROBAT_WAIT_INTERVAL)
+        Args:
+            source_path: 複製元のPDFファイルパス
+            temp_path: 複製先の一時ファイルパス
+            matcher: 検索語の照合に使うHighlightMatcher
+            select_pages: ページ数を受け取り、ハイライトするページインデックスを返す関数
+        """
+        shutil.copyfile(source_path, temp_path)
 
-        logger.warning(LOG_MESSAGE_TEMPLATES['ACROBAT_TIMEOUT'].format(timeout=timeout))
-        return False
+        rewritten_path = f"{temp_path}.rewrite"
+        with fitz.open(temp_path) as doc:
+            PDFHighlighter._add_highlights(doc, matcher, select_pages(doc.page_count))
+            if doc.can_save_incrementally():
+                doc.saveIncr()
+                return
 
+            # 修復が必要なPDFなどは追記保存できない。開いた複製をそのまま1回だけ保存し直す
+            # （保存し直したファイルは修復済みのため、以降のハイライトは追記保存できる）
+            logger.debug(f"追記保存できないため全体を保存します: {source_path}")
+            try:
+                doc.save(rewritten_path)
+            except Exception:
+                if os.path.exists(rewritten_path):
+                    os.remove(rewritten_path)
+                raise
+        os.replace(rewritten_path, temp_path)
 
-class PDFNavigator:
     @staticmethod
-    def navigate_to_page(page_number: int) -> None:
-        if page_number == 1:
+    def _add_highlights(
+        doc: fitz.Document,
+        matcher: HighlightMatcher,
+        page_indexes: Optional[Iterable[int]] = None
+    ) -> None:
+        if not matcher:
             return
-        
-        for attempt in range(PAGE_NAVIGATION_RETRY_COUNT):
-            try:
-                PDFNavigator._execute_navigation(page_number)
-                break
-            except Exception as e:
-                logger.warning(f"ページ移動試行{attempt + 1}でエラー: {e}")
-                if attempt < PAGE_NAVIGATION_RETRY_COUNT - 1:
-                    time.sleep(PROCESS_CLEANUP_DELAY)
-    
+
+        pages = doc if page_indexes is None else (doc[index] for index in page_indexes)
+        for page in pages:
+            for rects, term_index in PDFHighlighter.find_highlights(page, matcher):
+                PDFHighlighter._add_highlight_annot(page, rects, term_index)
+
     @staticmethod
-    def _execute_navigation(page_number: int) -> None:
-        pyautogui.hotkey(*ACROBAT_KEYBINDS['FIND_AND_REPLACE'])
-        time.sleep(PAGE_NAVIGATION_DELAY)
+    def find_highlights(page: fitz.Page, matcher: HighlightMatcher) -> List[Tuple[List[fitz.Rect], int]]:
+        """ページの文字を行ごとに並べたテキストを照合し、一致箇所の矩形を求める
 
-        pyautogui.hotkey(*ACROBAT_KEYBINDS['SELECT_ALL'])
-        time.sleep(ACROBAT_KEYSTROKE_DELAY)
+        行をまたぐ一致は、行ごとの矩形に分けて返す。
 
-        pyautogui.write(str(page_number))
-        time.sleep(PAGE_NAVIGATION_DELAY)
+        Args:
+            page: PDFのページ
+            matcher: 検索語の照合に使うHighlightMatcher
 
-        pyautogui.press(ACROBAT_KEYBINDS['CONFIRM'][0])
+        Returns:
+            (一致箇所の行ごとの矩形, 検索語の位置)のリスト
+        """
+        if not matcher:
+            return []
 
+        characters: List[str] = []
+        boxes: List[Optional[Tuple[int, Tuple[float, float, float, float]]]] = []  # (行番号, 文字の矩形)
+        line_number = 0
+        text_page = page.get_text('rawdict', flags=fitz.TEXTFLAGS_TEXT)  # type: ignore[attr-defined]
+        for block in text_page['blocks']:
+            for line in block.get('lines', ()):
+                for span in line['spans']:
+                    for char in span['chars']:
+                        characters.append(char['c'])
+                        boxes.append((line_number, char['bbox']))
+                characters.append('\n')
+                boxes.append(None)
+                line_number += 1
+
+        highlights = []
+        for start, end, term_index in matcher.finditer(''.join(characters)):
+            line_rects: Dict[int, fitz.Rect] = {}
+            for box in boxes[start:end]:
+                if box is None:
+                    continue
+                line, bbox = box
+                if line in line_rects:
+                    line_rects[line].include_rect(bbox)
+                else:
+                    line_rects[line] = fitz.Rect(bbox)
+            if line_rects:
+                highlights.append((list(line_rects.values()), term_index))
+        return highlights
 
-class PDFHighlighter:
     @staticmethod
-    def highlight_pdf(pdf_path: str, search_terms: List[str]) -> str:
-        temp_path = PDFHighlighter._create_temp_file()
-        
+    def _add_highlight_annot(page: fitz.Page, rects: List[fitz.Rect], color_index: int) -> None:
+        try:
+            highlight = page.add_highlight_annot(rects)
+            color = PDF_HIGHLIGHT_COLORS[color_index % len(PDF_HIGHLIGHT_COLORS)]
+            highlight.set_colors(stroke=color)
+            highlight.set_flags(PDF_ANNOT_FLAG_SCREEN_ONLY)
+            highlight.update()
+        except Exception as e:
+            logger.warning(f"ハイライト追加エラー (page: {page.number + 1}): {e}")
+
+
+class _CachedCopy(NamedTuple):
+    path: str
+    size: int
+    page_count: int
+    pages: Optional[range]  # ハイライトしたページの範囲（Noneはすべてのページ）
+    handed_out: bool = False  # Acrobatに渡した場合True
+
+
+class HighlightCache:
+    """ハイライトしたPDFの一時ファイルを、元のファイルと検索語ごとに再利用する
+
+    キーは元のファイルのパス・更新日時・サイズと検索語・照合方法の組で、ファイルが更新されると別のキーになる。
+    キャッシュ済みの一時ファイルが表示するページの範囲をハイライト済みであれば、作り直さずに返す。
+    ページの範囲だけハイライトした一時ファイルは、complete_highlightsで残りのページもハイライトしたものに置き換える。
+    一時ファイルの数と合計サイズが上限を超えた場合は、最も長く使っていないものからキャッシュから外す。
+    Acrobatに渡した一時ファイルは開いている最中の可能性があるため、キャッシュから外しても削除せず、
+    終了時にTempFileManagerが削除する。
+    """
+
+    def __init__(
+        self,
+        file_manager: TempFileManager = temp_file_manager,
+        max_files: int = DEFAULT_MAX_TEMP_FILES,
+        max_bytes: int = DEFAULT_MAX_TEMP_SIZE_MB * 1024 * 1024
+    ) -> None:
+        """初期化
+
+        Args:
+            file_manager: 一時ファイルを削除するTempFileManager
+            max_files: 保持する一時ファイルの数の上限
+            max_bytes: 保持する一時ファイルの合計サイズの上限（バイト）
+        """
+        self.file_manager = file_manager
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Tuple, _CachedCopy]' = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def highlight_pdf(
+        self,
+        pdf_path: str,
+        search_terms: List[str],
+        page_number: Optional[int] = None,
+        page_window: int = DEFAULT_HIGHLIGHT_PAGE_WINDOW,
+        match_mode: str = MATCH_MODE_LITERAL,
+        fold_kana: bool = DEFAULT_FOLD_KANA
+    ) -> str:
+        """ハイライトしたPDFの一時ファイルを返す（キャッシュになければ作成する）
+
+        引数はPDFHighlighter.highlight_pdfと同じ。
+        """
+        key = self._make_key(pdf_path, search_terms, match_mode, fold_kana)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and os.path.exists(entry.path) and self._covers(entry, page_number, page_window):
+                self._entries[key] = entry._replace(handed_out=True)
+                self._entries.move_to_end(key)
+                logger.debug(f"ハイライト済みのPDFを再利用します: {pdf_path}")
+                return entry.path
+
+        temp_path = PDFHighlighter.highlight_pdf(
+            pdf_path, search_terms, page_number, page_window, match_mode, fold_kana
+        )
         try:
             with fitz.open(pdf_path) as doc:
-                PDFHighlighter._add_highlights(doc, search_terms)
-                doc.save(temp_path)
-            
-            return temp_path
-        
-        except fitz.FileDataError as e:
-            raise ValueError(DIALOG_MESSAGES['INVALID_PDF'].format(pdf_path=pdf_path)) from e
+                page_count = doc.page_count
+            size = os.path.getsize(temp_path)
         except Exception as e:
-            raise RuntimeError(PDF_HANDLER_ERROR_TEMPLATES['HIGHLIGHT_FAILED'].format(error=e)) from e
-    
-    @staticmethod
-    def _create_temp_file() -> str:
-        """一時ファイルを作成"""
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            tmp_path = tmp_file.name
-        
-        temp_file_manager.add(tmp_path)
-        return tmp_path
-    
+            logger.warning(f"ハイライトしたPDFをキャッシュできません: {pdf_path} - {e}")
+            return temp_path
+
+        pages = None if page_number is None else PDFHighlighter.page_window_range(page_count, page_number, page_window)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = _CachedCopy(temp_path, size, page_count, pages, handed_out=True)
+            self._total_bytes += size
+            self._evict()
+        return temp_path
+
+    def complete_highlights(
+        self,
+        pdf_path: str,
+        search_terms: List[str],
+        match_mode: str = MATCH_MODE_LITERAL,
+        fold_kana: bool = DEFAULT_FOLD_KANA,
+        is_cancelled: Callable[[], bool] = lambda: False
+    ) -> None:
+        """ページの範囲だけハイライトしたキャッシュを、すべてのページをハイライトした一時ファイルに置き換える
+
+        Acrobatを起動した後に別スレッドで呼ぶ。以降は別のページを開いても作り直さずに済む。
+        置き換える前の一時ファイルはAcrobatが開いている（または開こうとしている）ため、
+        ここでは削除せず、終了時にTempFileManagerが削除する。
+
+        Args:
+            pdf_path: PDFファイルパス
+            search_terms: 検索語リスト
+            match_mode: 検索語の照合方法
+            fold_kana: カタカナとひらがなを同一視する場合True
+            is_cancelled: 中断する場合にTrueを返す関数
+        """
+        key = self._make_key(pdf_path, search_terms, match_mode, fold_kana)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry.pages is None:
+            return
+
+        temp_path = PDFHighlighter.highlight_other_pages(
+            entry.path, search_terms, entry.pages, match_mode, fold_kana, is_cancelled
+        )
+        if temp_path is None:
+            return
+        size = os.path.getsize(temp_path)
+
+        with self._lock:
+            if self._entries.get(key) is not entry:
+                # ハイライト中に別のページの範囲で作り直された、または削除された
+                self.file_manager.cleanup_single(temp_path)
+                return
+            self._remove(key)
+            self._entries[key] = _CachedCopy(temp_path, size, entry.page_count, None)
+            self._total_bytes += size
+            self._evict()
+        logger.debug(f"すべてのページをハイライトしたPDFに置き換えました: {pdf_path}")
+
+    def clear(self) -> None:
+        """キャッシュを空にし、Acrobatに渡していない一時ファイルを削除する"""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
     @staticmethod
-    def _add_highlights(doc: fitz.Document, search_terms: List[str]) -> None:
-        for page in doc:
-            for i, term in enumerate(search_terms):
-                if not term or not term.strip():
-                    continue
-                
-                PDFHighlighter._highlight_term_in_page(page, term, i)
-    
+    def _make_key(pdf_path: str, search_terms: List[str], match_mode: str, fold_kana: bool) -> Tuple:
+        stat = os.stat(pdf_path)
+        # 色は検索語の位置で決まるため、順序と空の検索語の位置は保つ
+        terms = tuple(term.strip() if term else '' for term in search_terms)
+        return (
+            os.path.normcase(os.path.abspath(pdf_path)), stat.st_mtime_ns, stat.st_size, terms, match_mode, fold_kana
+        )
+
     @staticmethod
-    def _highlight_term_in_page(page: fitz.Page, term: str, color_index: int) -> None:
-        text_instances = []
-        try:
-            text_instances = cast(list, page.search_for(term.strip()))  # type: ignore[attr-defined]
-        except AttributeError:
-            try:
-                text_instances = cast(list, page.get_text("blocks"))  # type: ignore[attr-defined]
-            except Exception:
-                pass
+    def _covers(entry: _CachedCopy, page_number: Optional[int], page_window: int) -> bool:
+        if entry.pages is None:
+            return True
+        if page_number is None:
+            return False
+        needed = PDFHighlighter.page_window_range(entry.page_count, page_number, page_window)
+        return entry.pages.start <= needed.start and needed.stop <= entry.pages.stop
 
-        for inst in text_instances:
-            try:
-                highlight = page.add_highlight_annot(inst)
-                color = PDF_HIGHLIGHT_COLORS[color_index % len(PDF_HIGHLIGHT_COLORS)]
-                highlight.set_colors(stroke=color)
-                highlight.set_flags(PDF_ANNOT_FLAG_SCREEN_ONLY)
-                highlight.update()
-            except Exception as e:
-                logger.warning(f"ハイライト追加エラー (term: {term}): {e}")
+    def _evict(self) -> None:
+        # 直前に作成した一時ファイルは上限を超えていても残す
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_files or self._total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry.size
+        if not entry.handed_out:
+            self.file_manager.cleanup_single(entry.path)
+
+
+def build_acrobat_command(acrobat_path: str, pdf_path: str, page_number: int) -> List[str]:
+    """指定ページを表示してPDFを開くAcrobatのコマンドラインを作る"""
+    return [
+        acrobat_path,
+        ACROBAT_OPEN_PARAMETERS_OPTION,
+        ACROBAT_PAGE_PARAMETER_TEMPLATE.format(page=max(page_number, 1)),
+        pdf_path,
+    ]
 
 
 def open_pdf(
     file_path: str,
     acrobat_path: str,
     current_position: int,
-    search_terms: List[str]
+    search_terms: List[str],
+    page_window: int = DEFAULT_HIGHLIGHT_PAGE_WINDOW,
+    highlight_cache: Optional[HighlightCache] = None,
+    match_mode: str = MATCH_MODE_LITERAL,
+    fold_kana: bool = DEFAULT_FOLD_KANA
 ) -> None:
-    try:
-        # 既存のAcrobatプロセスを終了
-        AcrobatProcessManager.close_all_processes()
+    """検索語をハイライトしたPDFをAcrobatで開く
 
-        pdf_path = PDFHighlighter.highlight_pdf(file_path, search_terms)
+    起動中のAcrobatがあれば、Acrobatが自身でそのウィンドウにファイルを渡すため、
+    既存のプロセスは終了しない。表示するページは起動時のオープンパラメータで指定し、
+    Acrobatの起動を待たずに戻る。ハイライトは表示するページの前後だけに付ける。
+
+    Args:
+        file_path: PDFファイルパス
+        acrobat_path: Acrobatの実行ファイルパス
+        current_position: 表示するページ番号
+        search_terms: 検索語リスト
+        page_window: 表示するページの前後でハイライトするページ数
+        highlight_cache: ハイライトしたPDFを再利用するキャッシュ
+        match_mode: ハイライトする検索語の照合方法
+        fold_kana: ハイライトでカタカナとひらがなを同一視する場合True
+    """
+    pdf_path = None
+    try:
+        highlighter = highlight_cache.highlight_pdf if highlight_cache is not None else PDFHighlighter.highlight_pdf
+        pdf_path = highlighter(file_path, search_terms, current_position, page_window, match_mode, fold_kana)
+        subprocess.Popen(build_acrobat_command(acrobat_path, pdf_path, current_position))
 
-        # Acrobatで開く
-        process = subprocess.Popen([acrobat_path, pdf_path])
-        
-        # 起動を待機
-        if AcrobatProcessManager.wait_for_startup(process.pid):
-            time.sleep(PROCESS_CLEANUP_DELAY)
-            PDFNavigator.navigate_to_page(current_position)
-        else:
-            logger.warning("Acrobatの起動確認に失敗しました")
-    
     except FileNotFoundError as e:
         raise FileNotFoundError(
             PDF_HANDLER_ERROR_TEMPLATES['FILE_NOT_FOUND'].format(file_path=file_path)
         ) from e
     except subprocess.SubprocessError as e:
+        # キャッシュした一時ファイルは先に起動したAcrobatが開いている可能性があるため削除しない
+        if pdf_path and highlight_cache is None:
+            temp_file_manager.cleanup_single(pdf_path)
         raise RuntimeError(PDF_HANDLER_ERROR_TEMPLATES['ACROBAT_START_FAILED'].format(error=e)) from e
     except Exception as e:
+        if pdf_path and highlight_cache is None:
+            temp_file_manager.cleanup_single(pdf_path)
         raise RuntimeError(PDF_HANDLER_ERROR_TEMPLATES['UNEXPECTED_ERROR'].format(error=e)) from e
@@ -0,0 +1,71 @@
+import logging
+from typing import List, Optional
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from service.pdf_handler import HighlightCache, open_pdf
+from utils.constants import (
+    DEFAULT_FOLD_KANA,
+    DEFAULT_HIGHLIGHT_PAGE_WINDOW,
+    FILE_OPEN_ERROR_TEMPLATES,
+    MATCH_MODE_LITERAL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PDFOpenWorker(QThread):
+    """ハイライトしたPDFの作成とAcrobatへの受け渡しをGUIスレッドの外で行う
+
+    失敗した場合はエラーメッセージをopen_failedで通知する。
+    Acrobatを起動した後、キャッシュがあれば範囲外のページもハイライトした一時ファイルを作り、
+    次に開くときに使えるようにする（requestInterruptionで中断できる）。
+    """
+
+    open_failed = pyqtSignal(str)
+
+    def __init__(self, file_path: str, acrobat_path: str, position: int, search_terms: List[str],
+                 page_window: int = DEFAULT_HIGHLIGHT_PAGE_WINDOW,
+                 highlight_cache: Optional[HighlightCache] = None,
+                 match_mode: str = MATCH_MODE_LITERAL,
+                 fold_kana: bool = DEFAULT_FOLD_KANA) -> None:
+        """初期化
+
+        Args:
+            file_path: PDFファイルパス
+            acrobat_path: Acrobatの実行ファイルパス
+            position: 表示するページ番号
+            search_terms: 検索語リスト
+            page_window: 表示するページの前後でハイライトするページ数
+            highlight_cache: ハイライトしたPDFを再利用するキャッシュ
+            match_mode: ハイライトする検索語の照合方法
+            fold_kana: ハイライトでカタカナとひらがなを同一視する場合True
+        """
+        super().__init__()
+        self.file_path = file_path
+        self.acrobat_path = acrobat_path
+        self.position = position
+        self.search_terms = list(search_terms)
+        self.page_window = page_window
+        self.highlight_cache = highlight_cache
+        self.match_mode = match_mode
+        self.fold_kana = fold_kana
+
+    def run(self) -> None:
+        try:
+            open_pdf(self.file_path, self.acrobat_path, self.position, self.search_terms,
+                     self.page_window, self.highlight_cache, self.match_mode, self.fold_kana)
+        except Exception as e:
+            logger.error(f"PDFを開く処理でエラー: {self.file_path} - {e}")
+            self.open_failed.emit(FILE_OPEN_ERROR_TEMPLATES['PDF_OPERATION_ERROR'].format(error=e))
+            return
+
+        if self.highlight_cache is None:
+            return
+        try:
+            self.highlight_cache.complete_highlights(
+                self.file_path, self.search_terms, self.match_mode, self.fold_kana, self.isInterruptionRequested
+            )
+        except Exception as e:
+            # 表示中のPDFには影響しないため、通知せずに記録だけする
+            logger.warning(f"残りのページのハイライトに失敗: {self.file_path} - {e}")
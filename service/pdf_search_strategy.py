@@ -4,6 +4,7 @@ from typing import List, Optional, Tuple, cast
 import fitz
 
 from service.search_matcher import SearchMatcher
+from service.snippet_provider import SearchHit
 from utils.constants import MAX_SEARCH_RESULTS_PER_FILE
 
 logger = logging.getLogger(__name__)
@@ -20,8 +21,15 @@ class PDFSearchStrategy:
         """
         self.matcher = matcher
 
-    def search(self, file_path: str) -> Optional[Tuple[str, List[Tuple[int, str]]]]:
-        results = []
+    def search(self, file_path: str) -> Optional[Tuple[str, List[SearchHit]]]:
+        """PDFファイルを検索する
+
+        Returns:
+            いずれかのページが検索条件に一致した場合は(ファイルパス, 一致箇所)。
+            一致箇所がない場合も、絞り込みの候補に使うため空のリストで返す
+        """
+        results: List[SearchHit] = []
+        matched = False
 
         try:
             with fitz.open(file_path) as doc:
@@ -38,11 +46,10 @@ class PDFSearchStrategy:
 
                     if not self.matcher.match_search_terms(text):
                         continue
+                    matched = True
 
                     for search_term in self.matcher.search_terms:
-                        contexts = self.matcher.extract_contexts(text, search_term)
-                        for context in contexts:
-                            results.append((page_num + 1, context))
+                        results.extend(self.matcher.find_hits(text, search_term, page_num + 1))
 
                         if len(results) >= MAX_SEARCH_RESULTS_PER_FILE:
                             break
@@ -54,4 +61,4 @@ class PDFSearchStrategy:
             logger.error(f"PDFの処理中にエラーが発生しました: {file_path} - {e}")
             return None
 
-        return (file_path, results) if results else None
+        return (file_path, results) if matched else None
@@ -0,0 +1,71 @@
+import logging
+import os
+from typing import List, Optional
+
+from PyQt5.QtWidgets import QWidget
+
+from utils.constants import (
+    DEFAULT_FOLD_KANA,
+    MATCH_MODE_LITERAL,
+    TEXT_VIEWER_DEFAULT_HEIGHT,
+    TEXT_VIEWER_DEFAULT_WIDTH,
+)
+from widgets.pdf_viewer_widget import PDFViewerWindow
+
+logger = logging.getLogger(__name__)
+
+# ウィンドウがGCで破棄されないよう参照を保持する
+_active_viewers: List[PDFViewerWindow] = []
+
+
+def open_pdf_in_viewer(
+    file_path: str,
+    search_terms: List[str],
+    position: int = 0,
+    parent: Optional[QWidget] = None,
+    width: int = TEXT_VIEWER_DEFAULT_WIDTH,
+    height: int = TEXT_VIEWER_DEFAULT_HEIGHT,
+    match_mode: str = MATCH_MODE_LITERAL,
+    fold_kana: bool = DEFAULT_FOLD_KANA,
+) -> None:
+    """PDFをアプリ内の別ウィンドウで、検索語をハイライトして開く
+
+    Args:
+        file_path: PDFファイルパス
+        search_terms: 検索語リスト
+        position: 検索ヒットのページ番号(1始まり、0で先頭)
+        parent: 親ウィジェット
+        width: ウィンドウ幅
+        height: ウィンドウ高さ
+        match_mode: ハイライトする検索語の照合方法
+        fold_kana: ハイライトでカタカナとひらがなを同一視する場合True
+
+    Raises:
+        Exception: PDFを開けない場合
+    """
+    try:
+        viewer = PDFViewerWindow(
+            title=os.path.basename(file_path),
+            file_path=file_path,
+            search_terms=search_terms,
+            position=position,
+            width=width,
+            height=height,
+            parent=parent,
+            match_mode=match_mode,
+            fold_kana=fold_kana,
+        )
+        viewer.destroyed.connect(lambda: _remove_viewer(viewer))
+        _active_viewers.append(viewer)
+
+        viewer.show()
+        viewer.raise_()
+        viewer.activateWindow()
+
+    except Exception as e:
+        raise Exception(f"PDFを開けませんでした: {str(e)}")
+
+
+def _remove_viewer(viewer: PDFViewerWindow) -> None:
+    if viewer in _active_viewers:
+        _active_viewers.remove(viewer)
@@ -0,0 +1,69 @@
+import time
+from typing import Callable, List, Optional, Tuple
+
+from service.snippet_provider import SearchHit
+from utils.constants import RESULT_BATCH_INTERVAL, RESULT_BATCH_MAX_HITS
+
+ResultBatch = List[Tuple[str, List[SearchHit]]]
+
+
+class ResultBatcher:
+    """検索スレッドからGUIへ送る結果と進捗をまとめて送る
+
+    ファイルごとの結果をためておき、前回の送信から一定時間が経つか、
+    たまった一致箇所が一定数を超えた時点でまとめて送る。進捗も同じ間隔に間引き、
+    完了（100%）は必ず送る。送信の判定は結果や進捗を受け取ったときに行うため
+    （一致のないファイルが続く間も、進捗を受け取った時点でたまった結果を送る）、
+    検索の最後には必ずflushを呼ぶ。
+    """
+
+    def __init__(self, emit_results: Callable[[ResultBatch], None],
+                 emit_progress: Optional[Callable[[int], None]] = None,
+                 interval: float = RESULT_BATCH_INTERVAL,
+                 max_hits: int = RESULT_BATCH_MAX_HITS) -> None:
+        """初期化
+
+        Args:
+            emit_results: まとめた結果を送る関数
+            emit_progress: 進捗を送る関数
+            interval: 送信の間隔（秒）
+            max_hits: 間隔を待たずに送る一致箇所の数
+        """
+        self.emit_results = emit_results
+        self.emit_progress = emit_progress
+        self.interval = interval
+        self.max_hits = max_hits
+        self._pending: ResultBatch = []
+        self._pending_hits = 0
+        self._last_flush = time.monotonic()
+        self._last_progress_time = self._last_flush - interval  # 最初の進捗はすぐに送る
+        self._last_progress: Optional[int] = None
+
+    def add(self, file_path: str, hits: List[SearchHit]) -> None:
+        """1ファイル分の結果を加え、必要なら送る"""
+        self._pending.append((file_path, hits))
+        self._pending_hits += len(hits)
+        if self._pending_hits >= self.max_hits or self._is_due(self._last_flush):
+            self.flush()
+
+    def progress(self, value: int) -> None:
+        """進捗を受け取り、前回の送信から一定時間が経っていれば、進捗とたまっている結果を送る"""
+        if self._pending and self._is_due(self._last_flush):
+            self.flush()
+        if self.emit_progress is None or value == self._last_progress:
+            return
+        if value >= 100 or self._is_due(self._last_progress_time):
+            self._last_progress = value
+            self._last_progress_time = time.monotonic()
+            self.emit_progress(value)
+
+    def flush(self) -> None:
+        """たまっている結果をすべて送る"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_hits = self._pending, [], 0
+        self.emit_results(batch)
+
+    def _is_due(self, last: float) -> bool:
+        return time.monotonic() - last >= self.interval
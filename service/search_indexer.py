@@ -1,40 +1,79 @@
+import copy
 import hashlib
 import logging
 import os
+import time
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Callable, Dict, List, Optional, Tuple
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from service.compressed_text import CompressedText, compress_text, text_separator
 from service.content_extractor import ContentExtractor
-from service.index_storage import IndexStorage
+from service.corpus_columns import CorpusColumns
+from service.index_handle import IndexHandle
+from service.ngram_signature import NgramSignature, build_signature
+from service.path_prefix_tree import PathPrefixTree
+from service.search_query import QueryClause, SearchQuery
+from service.snippet_provider import SearchHit
+from service.text_normalizer import normalize_text
 from utils.constants import (
-    FILE_EXTENSION_PDF,
-    INDEX_DEFAULT_CONTEXT_LENGTH,
+    DEFAULT_FOLD_KANA,
     INDEX_HASH_READ_CHUNK_SIZE,
     INDEX_MAX_RESULTS,
-    PDF_TEXT_PAGE_SEPARATOR,
+    MATCH_MODE_LITERAL,
     SEARCH_TYPE_AND,
     SUPPORTED_FILE_EXTENSIONS,
-    TEXT_LINE_SEPARATOR,
 )
 
 logger = logging.getLogger(__name__)
 
 
 class SearchIndexer:
-    """検索インデックスの作成と管理"""
+    """検索インデックスの作成と管理
 
-    def __init__(self, index_file_path: str = "search_index.json") -> None:
+    インデックスの本体は同じファイルを使うインスタンス間で共有し、最初の検索時に読み込む。
+    更新は本体のコピーに対して行い、完了時に共有中の本体と差し替える。
+    """
+
+    def __init__(self, index_file_path: str = "search_index.json",
+                 local_cache_dir: Optional[str] = None) -> None:
         """初期化
 
         Args:
             index_file_path: インデックスファイルパス
+            local_cache_dir: 共有インデックスを複製するローカルのフォルダ。Noneの場合は複製しない
         """
-        self.storage = IndexStorage(index_file_path)
+        self._handle = IndexHandle.acquire(index_file_path, local_cache_dir)
+        weakref.finalize(self, self._handle.release)
+        self.storage = self._handle.storage
         self.content_extractor = ContentExtractor()
-        self.index_data = self.storage.load()
+        self._working: Optional[Dict] = None
+        self._path_tree: Optional[PathPrefixTree] = None
+        self._path_tree_files: Optional[Dict] = None
+        self._path_tree_signature: Tuple = ()
+        self._doc_shards: List[Optional[str]] = []
+        self._columns: Optional[CorpusColumns] = None
+        self._columns_tree: Optional[PathPrefixTree] = None
+
+    @property
+    def index_data(self) -> Dict:
+        return self._working if self._working is not None else self._handle.index_data
+
+    @index_data.setter
+    def index_data(self, index_data: Dict) -> None:
+        self._handle.publish(index_data)
 
     def create_index(self, directories: List[str], include_subdirs: bool = True,
                     progress_callback: Optional[Callable[[int, int], None]] = None) -> None:
+        start = time.perf_counter()
+        with self._updating():
+            self._create_index(directories, include_subdirs, progress_callback, start)
+
+    def _create_index(self, directories: List[str], include_subdirs: bool,
+                      progress_callback: Optional[Callable[[int, int], None]], start: float) -> None:
+        dirty_roots = set(self._register_shards(directories))
         file_list = self._get_file_list(directories, include_subdirs)
         total_files = len(file_list)
         logger.info(f"対象ファイル数: {total_files}")
@@ -46,6 +85,7 @@ class SearchIndexer:
             try:
                 if self._should_update_file(file_path):
                     self._process_file(file_path)
+                    dirty_roots.add(self.storage.find_shard_root(file_path, self.index_data["shards"]))
                     updated_files += 1
 
                 processed += 1
@@ -59,28 +99,247 @@ class SearchIndexer:
             except Exception as e:
                 logger.error(f"ファイル処理エラー: {file_path} - {e}")
 
-        self.storage.save(self.index_data)
+        self.storage.ensure_summary(self.index_data)["last_build_seconds"] = time.perf_counter() - start
+        self.storage.save(self.index_data, roots=[root for root in dirty_roots if root is not None])
 
         logger.info(f"インデックス作成完了: {updated_files} ファイルを更新")
 
-    def search_in_index(self, search_terms: List[str], search_type: str = SEARCH_TYPE_AND) -> List[Tuple[str, List[Tuple[int, str]]]]:
-        results = []
+    def reset_index(self, roots: Optional[Iterable[str]] = None) -> None:
+        """インデックスを空にする
 
-        for file_path, file_info in self.index_data["files"].items():
-            content = file_info.get("content", "")
+        Args:
+            roots: 空にするシャードのルート。Noneの場合はインデックス全体
+        """
+        self._path_tree = None
+
+        if roots is None:
+            self.index_data = self.storage._create_new_index()
+            return
+
+        root_list = list(roots)
+        with self._updating():
+            shards = self.index_data["shards"]
+            summary = self.storage.ensure_summary(self.index_data)
+            kept_files = {}
+
+            for file_path, file_info in self.index_data["files"].items():
+                if self.storage.find_shard_root(file_path, root_list) is None:
+                    kept_files[file_path] = file_info
+                else:
+                    self.storage.update_summary(summary, file_path, file_info,
+                                                self.storage.find_shard_root(file_path, shards), -1)
+
+            self.index_data["files"] = kept_files
+            for root in root_list:
+                shards.pop(root, None)
+
+    def search_in_index(self, search_terms: List[str], search_type: str = SEARCH_TYPE_AND,
+                        directories: Optional[List[str]] = None,
+                        include_subdirs: bool = True,
+                        match_mode: str = MATCH_MODE_LITERAL,
+                        fold_kana: bool = DEFAULT_FOLD_KANA,
+                        max_results_per_file: int = INDEX_MAX_RESULTS,
+                        cancel_check: Optional[Callable[[], bool]] = None,
+                        candidates: Optional[Iterable[str]] = None) -> List[Tuple[str, List[SearchHit]]]:
+        """シャードごとに順に検索し、結果をまとめて返す
+
+        照合はPythonのコードで行うためGILによりスレッドでは速くならず、シャードは1つずつ検索する。
+
+        フォルダの指定は接頭辞木で文書IDの範囲に変換し、本文の照合前に候補を絞り込む。
+        ワイルドカード・正規表現は、パターンに必ず含まれる文字列を含む文書だけを照合する。
+        フレーズ・NOT・NEAR/nの演算子はSearchQueryの書式に従う。
+        本文は展開したブロックごとに検索語と同じ方法で正規化してから照合する。
+        結果は一致箇所の位置だけを返し、コンテキストは表示時にSnippetProviderで作る。
+        一致箇所はファイルごとに先頭から上限の数まで見つけた時点で打ち切る。
+        候補のファイルを指定した場合（前回の検索の絞り込みなど）は、そのファイルだけを照合する。
 
-            if self._match_search_terms(content, search_terms, search_type):
-                matches = self._find_matches_in_content(content, search_terms, file_path)
-                if matches:
-                    results.append((file_path, matches))
+        Args:
+            search_terms: 検索語リスト
+            search_type: 検索タイプ（AND/OR）
+            directories: 検索対象フォルダ。Noneの場合はインデックス全体
+            include_subdirs: サブフォルダの文書を含める場合True
+            match_mode: 照合方法（通常/ワイルドカード/正規表現）
+            fold_kana: カタカナとひらがなを同一視する場合True
+            max_results_per_file: 1ファイルあたりの一致箇所の上限
+            cancel_check: Trueを返したらファイルの照合を打ち切る関数（打ち切った場合の結果は途中まで）
+            candidates: 照合するファイルパス。Noneの場合は範囲内のすべての文書
+
+        Returns:
+            (ファイルパス, [一致箇所])のリスト。文書として一致したがページ/行ごとの一致箇所がないファイルは空のリスト
+        """
+        query = SearchQuery(search_terms, search_type, match_mode, fold_kana)
+
+        if self._working is None:
+            self._handle.refresh_if_stale()
+        tree = self._get_path_tree()
+        doc_ids = range(len(tree)) if directories is None else tree.select(directories, include_subdirs)
+        if candidates is not None:
+            candidate_paths = set(candidates)
+            doc_ids = [doc_id for doc_id in doc_ids if tree.doc_paths[doc_id] in candidate_paths]
+
+        grouped: Dict[Optional[str], List[str]] = {}
+        for doc_id in doc_ids:
+            grouped.setdefault(self._doc_shards[doc_id], []).append(tree.doc_paths[doc_id])
+
+        return [
+            result
+            for file_paths in grouped.values()
+            for result in self._search_files(file_paths, query, max_results_per_file, cancel_check)
+        ]
+
+    def count_terms(self, terms: List[str], directories: Optional[List[str]] = None,
+                    include_subdirs: bool = True,
+                    fold_kana: bool = DEFAULT_FOLD_KANA) -> Dict[str, Dict[str, int]]:
+        """検索語ごとに、含む文書数と出現回数の合計をコーパス全体でまとめて数える（分析用）
+
+        全文書を正規化して連結した列形式の表現を作り、以後の呼び出しで再利用する。
+        文書の追加・削除があった場合は作り直す。出現回数は重なり合う出現もそれぞれ数える。
 
-        return results
+        Args:
+            terms: 検索語リスト（演算子は解釈せず、文字列として数える）
+            directories: 集計対象フォルダ。Noneの場合はインデックス全体
+            include_subdirs: サブフォルダの文書を含める場合True
+            fold_kana: カタカナとひらがなを同一視する場合True
+
+        Returns:
+            {検索語: {"documents": 文書数, "occurrences": 出現回数}}
+        """
+        if self._working is None:
+            self._handle.refresh_if_stale()
+        tree = self._get_path_tree()
+
+        if self._columns is None or self._columns_tree is not tree or self._columns.fold_kana != fold_kana:
+            start = time.perf_counter()
+            self._columns = CorpusColumns.from_files(self.index_data["files"], tree.doc_paths, fold_kana)
+            self._columns_tree = tree
+            logger.info(f"列形式のコーパスを作成: {len(self._columns)} 文書, "
+                        f"{self._columns.nbytes} バイト, {time.perf_counter() - start:.2f} 秒")
+
+        doc_ids = None if directories is None else list(tree.select(directories, include_subdirs))
+        return self._columns.count_terms(terms, doc_ids)
 
     def get_index_stats(self) -> Dict:
+        """インデックスの統計情報を返す
+
+        本体が未読み込みの場合はマニフェストの要約だけを読み、本体は読み込まない。
+
+        Returns:
+            統計情報
+        """
+        if self._working is None and not self._handle.is_loaded:
+            header = self.storage.load_header()
+            if header is not None:
+                return self.storage.get_stats(header)
+
         return self.storage.get_stats(self.index_data)
 
+    def compact_index(self) -> Dict:
+        """元ファイルを読み直さずにインデックスを最適化する
+
+        Returns:
+            回収したバイト数と読み込み時間の変化をまとめたレポート
+        """
+        self._path_tree = None
+        with self._updating():
+            return self.storage.compact(self.index_data)
+
     def remove_missing_files(self) -> int:
-        return self.storage.remove_missing_files(self.index_data)
+        self._path_tree = None
+        with self._updating():
+            return self.storage.remove_missing_files(self.index_data)
+
+    @contextmanager
+    def _updating(self) -> Iterator[Dict]:
+        """共有中の本体のコピーを更新し、正常に終了したら差し替える
+
+        更新中も他のインスタンスの検索は差し替え前の本体を参照し続ける。
+        """
+        current = self._handle.index_data
+        self._working = dict(
+            current,
+            files=dict(current.get("files", {})),
+            shards=dict(current.get("shards", {})),
+            summary=copy.deepcopy(self.storage.ensure_summary(current))
+        )
+        try:
+            yield self._working
+            self._handle.publish(self._working)
+        finally:
+            self._working = None
+
+    def _search_files(self, file_paths: List[str], query: SearchQuery,
+                      max_results: int = INDEX_MAX_RESULTS,
+                      cancel_check: Optional[Callable[[], bool]] = None) -> List[Tuple[str, List[SearchHit]]]:
+        results = []
+        files = self.index_data["files"]
+        if query.is_fuzzy:
+            file_paths = self._rank_fuzzy_candidates(file_paths, query)
+
+        for file_path in file_paths:
+            if cancel_check is not None and cancel_check():
+                break
+            text = CompressedText(files[file_path].get("content", ""))
+            if not self._match_search_terms_in_blocks(text, query):
+                continue
+
+            # ページ/行ごとの一致箇所がなくても文書としては一致しているため、絞り込みの候補として返す
+            matches = list(islice(self._iter_matches(text, query, file_path), max_results))
+            results.append((file_path, matches))
+
+        return results
+
+    def _rank_fuzzy_candidates(self, file_paths: List[str], query: SearchQuery) -> List[str]:
+        """n-gram署名だけで一致し得ない文書を除き、残りを近い順に並べる
+
+        署名のない旧形式の文書は候補に残し、最後に照合する。
+        """
+        files = self.index_data["files"]
+        candidates: List[Tuple[float, str]] = []
+
+        for file_path in file_paths:
+            signature = NgramSignature.from_file_info(files[file_path])
+            score = query.signature_score(signature) if signature is not None else -1.0
+            if score is not None:
+                candidates.append((score, file_path))
+
+        logger.debug(f"あいまい検索の候補: {len(candidates)} / {len(file_paths)} 件")
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        return [file_path for _, file_path in candidates]
+
+    def _get_path_tree(self) -> PathPrefixTree:
+        """文書IDの接頭辞木を返す（文書の追加・削除があった場合は作り直す）"""
+        files = self.index_data["files"]
+        shards = self.index_data.get("shards", {})
+        signature = (len(files), tuple(shards))
+
+        # idは解放された辞書のものが再利用されうるため、辞書への参照を保持して同一性で比べる
+        if self._path_tree is None or self._path_tree_files is not files or self._path_tree_signature != signature:
+            self._path_tree = PathPrefixTree(files)
+            self._path_tree_files = files
+            self._path_tree_signature = signature
+            self._doc_shards = [None] * len(self._path_tree)
+
+            # 入れ子のルートでは深いルートを優先するため、浅い順に上書きする
+            for root in sorted(shards, key=lambda r: len(os.path.normpath(r))):
+                for doc_id in self._path_tree.get_range(root):
+                    self._doc_shards[doc_id] = root
+
+        return self._path_tree
+
+    def _register_shards(self, directories: List[str]) -> List[str]:
+        """検索フォルダをシャードとして登録し、新規登録したルートを返す"""
+        shards = self.index_data.setdefault("shards", {})
+        new_roots = [directory for directory in directories if directory not in shards]
+
+        for directory in new_roots:
+            shards[directory] = self.storage.shard_file_name(directory)
+
+        if new_roots and self.index_data["files"]:
+            # 入れ子のルートを追加すると既存の文書の所属が変わるため、ルート別の集計を数え直す
+            summary = self.storage.ensure_summary(self.index_data)
+            summary["roots"] = self.storage.summarize_files(self.index_data["files"], shards)["roots"]
+
+        return new_roots
 
     def _get_file_list(self, directories: List[str], include_subdirs: bool) -> List[str]:
         file_list = []
@@ -127,16 +386,26 @@ class SearchIndexer:
         try:
             content = self.content_extractor.extract_text_content(file_path)
             if content:
+                files = self.index_data["files"]
+                summary = self.storage.ensure_summary(self.index_data)
+                root = self.storage.find_shard_root(file_path, self.index_data.get("shards", {}))
+
+                if file_path in files:
+                    self.storage.update_summary(summary, file_path, files[file_path], root, -1)
+                else:
+                    self._path_tree = None
                 file_stats = os.stat(file_path)
                 file_hash = self._calculate_file_hash(file_path)
 
-                self.index_data["files"][file_path] = {
-                    "content": content,
+                files[file_path] = {
+                    "content": compress_text(content, text_separator(file_path)),
+                    "ngrams": build_signature(normalize_text(content, fold_kana=True)),
                     "mtime": file_stats.st_mtime,
                     "size": file_stats.st_size,
                     "hash": file_hash,
                     "indexed_at": datetime.now().isoformat()
                 }
+                self.storage.update_summary(summary, file_path, files[file_path], root)
 
         except Exception as e:
             logger.error(f"ファイル処理エラー: {file_path} - {e}")
@@ -153,42 +422,81 @@ class SearchIndexer:
         return hash_md5.hexdigest()
 
     def _match_search_terms(self, content: str, search_terms: List[str], search_type: str) -> bool:
-        content_lower = content.lower()
+        normalized = normalize_text(content)
 
         if search_type == SEARCH_TYPE_AND:
-            return all(term.lower() in content_lower for term in search_terms)
+            return all(normalize_text(term) in normalized for term in search_terms)
         else:  # OR
-            return any(term.lower() in content_lower for term in search_terms)
-
-    def _find_matches_in_content(self, content: str, search_terms: List[str],
-                               file_path: str, context_length: int = INDEX_DEFAULT_CONTEXT_LENGTH) -> List[Tuple[int, str]]:
-        matches = []
-
-        if file_path.lower().endswith(FILE_EXTENSION_PDF):
-            pages = content.split(PDF_TEXT_PAGE_SEPARATOR)
-            for page_num, page_content in enumerate(pages, 1):
-                for term in search_terms:
-                    if term.lower() in page_content.lower():
-                        context = self._extract_context(page_content, term, context_length)
-                        matches.append((page_num, context))
-                        break  # ページごとに1つのマッチのみ
-        else:
-            lines = content.split(TEXT_LINE_SEPARATOR)
-            for line_num, line in enumerate(lines, 1):
-                for term in search_terms:
-                    if term.lower() in line.lower():
-                        context = self._extract_context(line, term, context_length)
-                        matches.append((line_num, context))
-                        break  # 行ごとに1つのマッチのみ
-
-        return matches[:INDEX_MAX_RESULTS]
-
-    def _extract_context(self, text: str, search_term: str, context_length: int) -> str:
-        term_index = text.lower().find(search_term.lower())
-        if term_index == -1:
-            return text[:context_length * 2]
-
-        start = max(0, term_index - context_length)
-        end = min(len(text), term_index + len(search_term) + context_length)
-
-        return text[start:end]
+            return any(normalize_text(term) in normalized for term in search_terms)
+
+    def _match_search_terms_in_blocks(self, text: CompressedText, query: SearchQuery) -> bool:
+        """圧縮ブロックを先頭から展開しながら検索語を照合する
+
+        OR検索は最初に見つかった時点、AND検索はすべての検索語が見つかった時点で
+        残りのブロックを展開せずに打ち切る。NOTで除外する語がある場合は、
+        除外する語が見つかった時点で打ち切り、それ以外は全ブロックを調べる。
+
+        Args:
+            text: 文書テキスト
+            query: 検索条件
+
+        Returns:
+            条件を満たす場合True
+        """
+        remaining = set(query.required)
+        satisfied = not remaining and query.search_type == SEARCH_TYPE_AND
+
+        if satisfied and not query.excluded:
+            return True
+
+        for _, block in text.iter_blocks():
+            normalized = query.normalize(block)
+            if any(clause.matches(block, normalized) for clause in query.excluded):
+                return False
+
+            found = {clause for clause in remaining if clause.matches(block, normalized)}
+            remaining -= found
+            if found and (query.search_type != SEARCH_TYPE_AND or not remaining):
+                satisfied = True
+            if satisfied and not query.excluded:
+                return True
+
+        return satisfied
+
+    def _iter_matches(self, text: CompressedText, query: SearchQuery, file_path: str) -> Iterator[SearchHit]:
+        """ブロックを先頭から展開しながら一致箇所を順に返す（打ち切った後のブロックは展開しない）"""
+        for first_unit, block in text.iter_blocks():
+            yield from self._find_matches_in_content(block, query, file_path, first_number=first_unit)
+
+    def _find_matches_in_content(self, content: str, query: SearchQuery,
+                                 file_path: str, first_number: int = 1) -> Iterator[SearchHit]:
+        """ページ/行ごとに最初の一致箇所を順に返す（ページ/行ごとに1つのマッチのみ）
+
+        ブロック全体を1度だけ正規化し、ブロックに現れ得ない検索語はページ/行ごとの照合から除く。
+        ページ/行は呼び出し側が必要とする分だけ切り出す。
+        """
+        normalized = query.normalize(content)
+        terms: List[Tuple[str, QueryClause]] = [
+            (term, clause) for term, clause in query.required_terms if clause.may_match(normalized)
+        ]
+        if not terms:
+            return
+
+        for number, unit in enumerate(self._iter_units(content, text_separator(file_path)), first_number):
+            for term, clause in terms:
+                span = clause.search(unit)
+                if span is not None:
+                    yield SearchHit(number, span[0], span[1], term, indexed=True)
+                    break
+
+    @staticmethod
+    def _iter_units(content: str, separator: str) -> Iterator[str]:
+        """区切り文字で分けたページ/行を先頭から順に返す（str.splitと同じ結果）"""
+        start = 0
+        while True:
+            end = content.find(separator, start)
+            if end == -1:
+                yield content[start:]
+                return
+            yield content[start:end]
+            start = end + len(separator)
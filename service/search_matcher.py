@@ -1,23 +1,29 @@
-import re
 from typing import List, Tuple
 
-from utils.constants import SEARCH_TYPE_AND, SEARCH_TYPE_OR
+from service.search_query import SearchQuery
+from service.snippet_provider import SearchHit, extract_snippet
+from utils.constants import DEFAULT_FOLD_KANA, MATCH_MODE_LITERAL
 
 
 class SearchMatcher:
     """検索語マッチング処理を実行"""
 
-    def __init__(self, search_terms: List[str], search_type: str, context_length: int) -> None:
+    def __init__(self, search_terms: List[str], search_type: str, context_length: int,
+                 match_mode: str = MATCH_MODE_LITERAL, fold_kana: bool = DEFAULT_FOLD_KANA) -> None:
         """初期化
 
         Args:
             search_terms: 検索語リスト
             search_type: 検索タイプ（AND/OR）
             context_length: コンテキスト長
+            match_mode: 照合方法（通常/ワイルドカード/正規表現）
+            fold_kana: カタカナとひらがなを同一視する場合True
         """
         self.search_terms = search_terms
         self.search_type = search_type
         self.context_length = context_length
+        self.match_mode = match_mode
+        self.query = SearchQuery(search_terms, search_type, match_mode, fold_kana)
 
     def match_search_terms(self, text: str) -> bool:
         """検索語がテキストにマッチするか判定
@@ -28,26 +34,54 @@ class SearchMatcher:
         Returns:
             マッチした場合True
         """
-        text_lower = text.lower()
+        return self.query.matches(text)
 
-        if self.search_type == SEARCH_TYPE_AND:
-            return all(term.lower() in text_lower for term in self.search_terms)
-        elif self.search_type == SEARCH_TYPE_OR:
-            return any(term.lower() in text_lower for term in self.search_terms)
+    def find_hits(self, text: str, search_term: str, position: int) -> List[SearchHit]:
+        """検索語の一致箇所を返す（NOTで除外する検索語の場合は空）
 
-        return False
+        Args:
+            text: 対象テキスト（PDFの1ページなど）
+            search_term: 検索語
+            position: 一致箇所に記録するページ番号
 
-    def extract_contexts(self, text: str, search_term: str) -> List[str]:
-        """検索語の周辺コンテキストを抽出"""
-        contexts = []
+        Returns:
+            一致箇所のリスト
+        """
+        clause = self.query.get_clause(search_term)
+        if clause is None:
+            return []
+        return [SearchHit(position, start, end, search_term) for start, end in clause.finditer(text)]
 
-        for match in re.finditer(re.escape(search_term), text, re.IGNORECASE):
-            start = max(0, match.start() - self.context_length)
-            end = min(len(text), match.end() + self.context_length)
-            context = text[start:end]
-            contexts.append(context)
+    def find_hits_with_line_numbers(self, content: str, search_term: str) -> List[SearchHit]:
+        """検索語の一致箇所を、行番号とコンテンツ全体での位置で返す
 
-        return contexts
+        Args:
+            content: 対象コンテンツ
+            search_term: 検索語
+
+        Returns:
+            一致箇所のリスト
+        """
+        clause = self.query.get_clause(search_term)
+        if clause is None:
+            return []
+
+        hits = []
+        line_number, line_counted = 1, 0
+        for start, end in clause.finditer(content):
+            if start < line_counted:
+                line_number, line_counted = 1, 0
+            line_number += content.count('\n', line_counted, start)
+            line_counted = start
+            hits.append(SearchHit(line_number, start, end, search_term))
+        return hits
+
+    def extract_contexts(self, text: str, search_term: str) -> List[str]:
+        """検索語の周辺コンテキストを抽出（NOTで除外する検索語の場合は空）"""
+        return [
+            extract_snippet(text, hit.start, hit.end, self.context_length)
+            for hit in self.find_hits(text, search_term, 0)
+        ]
 
     def extract_contexts_with_line_numbers(
         self,
@@ -63,13 +97,7 @@ class SearchMatcher:
         Returns:
             (行番号、コンテキスト)のタプルリスト
         """
-        contexts = []
-
-        for match in re.finditer(re.escape(search_term), content, re.IGNORECASE):
-            line_number = content.count('\n', 0, match.start()) + 1
-            start = max(0, match.start() - self.context_length)
-            end = min(len(content), match.end() + self.context_length)
-            context = content[start:end]
-            contexts.append((line_number, context))
-
-        return contexts
+        return [
+            (hit.position, extract_snippet(content, hit.start, hit.end, self.context_length))
+            for hit in self.find_hits_with_line_numbers(content, search_term)
+        ]
@@ -0,0 +1,175 @@
+import logging
+import re
+import string
+import unicodedata
+from typing import Iterator, List, Optional, Tuple
+
+from service.text_normalizer import NormalizedText, normalize_text, to_hiragana
+from utils.constants import DEFAULT_FOLD_KANA, MATCH_MODE_LITERAL, MATCH_MODE_REGEX, MATCH_MODE_WILDCARD
+
+try:
+    from re import _parser as sre_parse  # Python 3.11以降
+except ImportError:  # pragma: no cover
+    import sre_parse  # type: ignore[no-redef]
+
+logger = logging.getLogger(__name__)
+
+
+class SearchPattern:
+    """検索語を通常・ワイルドカード・正規表現のいずれかとして照合する
+
+    パターンから一致に必ず含まれる文字列（リテラル断片）を取り出しておき、
+    断片がすべて含まれる文書だけを正規表現で照合する。
+    検索語と対象テキストはどちらもnormalize_textで正規化してから照合し、
+    一致位置は元のテキストの位置に戻して返す。
+    """
+
+    def __init__(self, term: str, mode: str = MATCH_MODE_LITERAL,
+                 fold_kana: bool = DEFAULT_FOLD_KANA) -> None:
+        """初期化
+
+        Args:
+            term: 検索語
+            mode: 照合方法（通常/ワイルドカード/正規表現）
+            fold_kana: カタカナとひらがなを同一視する場合True
+
+        Raises:
+            re.error: 正規表現として解釈できない場合
+        """
+        self.term = term
+        self.mode = mode
+        self.fold_kana = fold_kana
+        source = self._normalize_term(term, mode, fold_kana)
+        self.regex = re.compile(self._to_regex(source, mode), re.IGNORECASE)
+        self.required_literals = [
+            normalize_text(literal, fold_kana)
+            for literal in self._extract_required_literals(source, mode)
+        ]
+
+    @property
+    def is_literal(self) -> bool:
+        return self.mode == MATCH_MODE_LITERAL
+
+    def may_match(self, normalized: str) -> bool:
+        """リテラル断片だけで一致する可能性があるか判定する
+
+        Args:
+            normalized: 正規化した対象テキスト
+
+        Returns:
+            すべての断片を含む場合True（Trueでも一致するとは限らない）
+        """
+        return all(literal in normalized for literal in self.required_literals)
+
+    def matches(self, text: str, normalized: Optional[str] = None) -> bool:
+        """テキストに一致するか判定する
+
+        Args:
+            text: 対象テキスト
+            normalized: 正規化済みの対象テキスト（省略時はここで正規化）
+
+        Returns:
+            一致する場合True
+        """
+        if normalized is None:
+            normalized = normalize_text(text, self.fold_kana)
+        if not self.may_match(normalized):
+            return False
+        if self.is_literal:
+            return True
+        return any(match.end() > match.start() for match in self.regex.finditer(normalized))
+
+    def search(self, text: str) -> Optional[Tuple[int, int]]:
+        """最初の一致の位置を返す
+
+        Args:
+            text: 対象テキスト
+
+        Returns:
+            (開始位置, 終了位置)。一致しない場合None
+        """
+        for start, end in self.finditer(text):
+            return start, end
+        return None
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int]]:
+        """空文字列以外の一致の、元のテキストでの位置を順に返す"""
+        normalized = NormalizedText(text, self.fold_kana)
+        if not self.may_match(normalized.text):
+            return
+        for match in self.regex.finditer(normalized.text):
+            if match.end() > match.start():
+                yield normalized.to_original(match.start(), match.end())
+
+    def highlight_patterns(self) -> List['SearchPattern']:
+        return [self]
+
+    @staticmethod
+    def _normalize_term(term: str, mode: str, fold_kana: bool) -> str:
+        if mode != MATCH_MODE_REGEX:
+            # 全角の＊・？もワイルドカードとして扱う
+            return normalize_text(term, fold_kana)
+
+        # 全角記号が正規表現の演算子に変わらないよう、正規化で記号になる文字はエスケープする
+        # 小文字への変換は\Dなどの意味を変えるため行わない（照合は大文字小文字を区別しない）
+        protected = []
+        for char in term:
+            normalized = unicodedata.normalize('NFKC', char)
+            if normalized != char and any(c in string.punctuation for c in normalized):
+                protected.append(re.escape(normalized))
+            else:
+                protected.append(char)
+
+        normalized = unicodedata.normalize('NFKC', ''.join(protected))
+        return to_hiragana(normalized) if fold_kana else normalized
+
+    @staticmethod
+    def _to_regex(term: str, mode: str) -> str:
+        if mode == MATCH_MODE_REGEX:
+            return term
+        if mode == MATCH_MODE_WILDCARD:
+            return ''.join(
+                '.*?' if char == '*' else '.' if char == '?' else re.escape(char)
+                for char in term
+            )
+        return re.escape(term)
+
+    @classmethod
+    def _extract_required_literals(cls, term: str, mode: str) -> List[str]:
+        if mode == MATCH_MODE_LITERAL:
+            return [term]
+        if mode == MATCH_MODE_WILDCARD:
+            return [part for part in re.split(r'[*?]', term) if part]
+
+        try:
+            literals = cls._collect_literals(sre_parse.parse(term))
+        except Exception as e:
+            # 断片を取り出せない場合は絞り込まずに正規表現だけで照合する
+            logger.warning(f"正規表現からリテラル断片を取り出せません: {term} - {e}")
+            return []
+        return literals
+
+    @classmethod
+    def _collect_literals(cls, parsed) -> List[str]:
+        """解析済みの正規表現から、一致に必ず含まれる連続したリテラルを取り出す
+
+        分岐（|）の中や0回を許す繰り返しは必須でないため対象外とする。
+        """
+        literals: List[str] = []
+        run: List[str] = []
+
+        for op, av in parsed:
+            if op == sre_parse.LITERAL:
+                run.append(chr(av))
+                continue
+
+            literals.append(''.join(run))
+            run = []
+
+            if op == sre_parse.SUBPATTERN:
+                literals.extend(cls._collect_literals(av[-1]))
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+                literals.extend(cls._collect_literals(av[2]))
+
+        literals.append(''.join(run))
+        return [literal for literal in literals if literal]
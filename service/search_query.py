@@ -0,0 +1,260 @@
+import bisect
+import re
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from service.fuzzy_pattern import FuzzyPattern
+from service.ngram_signature import NgramSignature
+from service.search_pattern import SearchPattern
+from service.text_normalizer import normalize_text
+from utils.constants import (
+    DEFAULT_FOLD_KANA,
+    MATCH_MODE_FUZZY,
+    MATCH_MODE_LITERAL,
+    MATCH_MODE_REGEX,
+    QUERY_NEAR_OPERATOR_PATTERN,
+    QUERY_NOT_OPERATOR,
+    QUERY_PHRASE_QUOTE,
+    SEARCH_TYPE_AND,
+)
+
+
+class QuerySyntaxError(ValueError):
+    """検索語の演算子の書き方が正しくない"""
+
+
+class NearClause:
+    """2つの検索語がn文字以内に現れる箇所に一致する（NEAR/n）
+
+    両方の一致位置を先頭から求め、片方の各位置に最も近いもう片方の位置を二分探索で探す。
+    """
+
+    def __init__(self, left: 'QueryClause', right: 'QueryClause', distance: int) -> None:
+        """初期化
+
+        Args:
+            left: 左側の検索語
+            right: 右側の検索語
+            distance: 2つの一致の間に許す文字数
+        """
+        self.left = left
+        self.right = right
+        self.distance = distance
+
+    def may_match(self, normalized: str) -> bool:
+        return self.left.may_match(normalized) and self.right.may_match(normalized)
+
+    def matches(self, text: str, normalized: Optional[str] = None) -> bool:
+        if normalized is not None and not self.may_match(normalized):
+            return False
+        return self.search(text) is not None
+
+    def search(self, text: str) -> Optional[Tuple[int, int]]:
+        for start, end in self.finditer(text):
+            return start, end
+        return None
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int]]:
+        """左側の一致ごとに、n文字以内で最も近い右側の一致と合わせた範囲を返す"""
+        left_spans = list(self.left.finditer(text))
+        if not left_spans:
+            return
+        right_spans = list(self.right.finditer(text))
+        right_starts = [start for start, _ in right_spans]
+
+        for left_start, left_end in left_spans:
+            nearest = self._find_nearest(left_start, left_end, right_spans, right_starts)
+            if nearest is not None:
+                yield min(left_start, nearest[0]), max(left_end, nearest[1])
+
+    def _find_nearest(self, left_start: int, left_end: int, right_spans: List[Tuple[int, int]],
+                      right_starts: List[int]) -> Optional[Tuple[int, int]]:
+        index = bisect.bisect_left(right_starts, left_start)
+        best: Optional[Tuple[int, int]] = None
+        best_gap = self.distance + 1
+
+        # 開始位置が左側より後ろの一致は最初の1件、前の一致は直前から遡って調べる
+        for candidate in right_spans[index:index + 1]:
+            gap = max(0, candidate[0] - left_end)
+            if gap < best_gap:
+                best, best_gap = candidate, gap
+        for position in range(index - 1, -1, -1):
+            candidate = right_spans[position]
+            if left_start - candidate[1] > self.distance:
+                break
+            gap = max(0, left_start - candidate[1])
+            if gap < best_gap:
+                best, best_gap = candidate, gap
+
+        return best
+
+    def highlight_patterns(self) -> List[Union[SearchPattern, FuzzyPattern]]:
+        return self.left.highlight_patterns() + self.right.highlight_patterns()
+
+
+QueryClause = Union[SearchPattern, FuzzyPattern, NearClause]
+
+
+class SearchQuery:
+    """検索語リストを演算子付きの検索条件として解釈する
+
+    各検索語には次の演算子を使える。演算子を含まない検索語はこれまでどおり照合する。
+
+    - "安全 弁": 空白を任意の空白・改行とみなして語を順に照合するフレーズ
+    - NOT ガス: その語を含む対象を除外する
+    - バルブ NEAR/10 交換: 2つの語が10文字以内に現れる箇所に一致する
+
+    照合方法があいまい検索の場合、フレーズ以外の語はFuzzyPatternで照合する。
+    """
+
+    def __init__(self, search_terms: List[str], search_type: str = SEARCH_TYPE_AND,
+                 match_mode: str = MATCH_MODE_LITERAL, fold_kana: bool = DEFAULT_FOLD_KANA) -> None:
+        """初期化
+
+        Args:
+            search_terms: 検索語リスト
+            search_type: 検索タイプ（AND/OR）
+            match_mode: 照合方法（通常/ワイルドカード/正規表現/あいまい）
+            fold_kana: カタカナとひらがなを同一視する場合True
+
+        Raises:
+            QuerySyntaxError: 演算子の書き方が正しくない場合
+            re.error: 正規表現として解釈できない場合
+        """
+        self.search_terms = list(search_terms)
+        self.search_type = search_type
+        self.match_mode = match_mode
+        self.fold_kana = fold_kana
+        self.clauses: Dict[str, QueryClause] = {}
+        self.required: List[QueryClause] = []
+        self.excluded: List[QueryClause] = []
+
+        for term in search_terms:
+            excluded, clause = self.parse_term(term, match_mode, fold_kana)
+            self.clauses[term] = clause
+            (self.excluded if excluded else self.required).append(clause)
+
+    def matches(self, text: str) -> bool:
+        """テキストが検索条件を満たすか判定
+
+        Args:
+            text: 対象テキスト
+
+        Returns:
+            条件を満たす場合True
+        """
+        normalized = self.normalize(text)
+
+        if any(clause.matches(text, normalized) for clause in self.excluded):
+            return False
+        if self.search_type == SEARCH_TYPE_AND:
+            return all(clause.matches(text, normalized) for clause in self.required)
+        return any(clause.matches(text, normalized) for clause in self.required)
+
+    def normalize(self, text: str) -> str:
+        """検索語と同じ方法でテキストを正規化する"""
+        return normalize_text(text, self.fold_kana)
+
+    @property
+    def is_fuzzy(self) -> bool:
+        return any(isinstance(clause, FuzzyPattern) for clause in self.required)
+
+    def signature_score(self, signature: NgramSignature) -> Optional[float]:
+        """n-gram署名から、文書があいまい検索の条件を満たし得るか判定する
+
+        Args:
+            signature: 文書のn-gram署名
+
+        Returns:
+            検索語ごとの近さの合計。条件を満たし得ない文書の場合None
+        """
+        scores = [
+            clause.signature_score(signature)
+            for clause in self.required
+            if isinstance(clause, FuzzyPattern)
+        ]
+        if self.search_type == SEARCH_TYPE_AND:
+            if any(score is None for score in scores):
+                return None
+        elif len(scores) == len(self.required) and all(score is None for score in scores):
+            return None
+        return sum(score for score in scores if score is not None)
+
+    def is_refinement_of(self, previous: 'SearchQuery') -> bool:
+        """前回の検索条件にAND条件を加えただけの検索か判定する
+
+        Trueの場合、この検索に一致する対象は前回の検索にも一致する。
+
+        Args:
+            previous: 前回の検索条件
+
+        Returns:
+            前回と同じ照合方法のAND検索で、前回の検索語をすべて含む場合True
+        """
+        return (
+            self.search_type == previous.search_type == SEARCH_TYPE_AND
+            and self.match_mode == previous.match_mode
+            and self.fold_kana == previous.fold_kana
+            and bool(previous.required)
+            and set(previous.search_terms) <= set(self.search_terms)
+        )
+
+    @property
+    def required_terms(self) -> List[Tuple[str, QueryClause]]:
+        """除外しない検索語と条件の組を、検索語の順に返す"""
+        return [(term, clause) for term, clause in self.clauses.items()
+                if not any(clause is other for other in self.excluded)]
+
+    def get_clause(self, term: str) -> Optional[QueryClause]:
+        """検索語に対応する条件を返す（除外する検索語の場合はNone）"""
+        clause = self.clauses.get(term)
+        if clause is None:
+            excluded, clause = self.parse_term(term, self.match_mode, self.fold_kana)
+            self.clauses[term] = clause
+            if excluded:
+                self.excluded.append(clause)
+        return None if any(clause is other for other in self.excluded) else clause
+
+    @classmethod
+    def parse_term(cls, term: str, match_mode: str,
+                   fold_kana: bool = DEFAULT_FOLD_KANA) -> Tuple[bool, QueryClause]:
+        """1つの検索語を解釈する
+
+        Args:
+            term: 検索語
+            match_mode: 照合方法
+            fold_kana: カタカナとひらがなを同一視する場合True
+
+        Returns:
+            (除外する検索語の場合True, 条件)
+        """
+        excluded = term.startswith(QUERY_NOT_OPERATOR)
+        if excluded:
+            term = term[len(QUERY_NOT_OPERATOR):].strip()
+            if not term:
+                raise QuerySyntaxError(f"{QUERY_NOT_OPERATOR.strip()} の後に検索語がありません")
+
+        parts = re.split(QUERY_NEAR_OPERATOR_PATTERN, term)
+        clause: QueryClause = cls._parse_operand(parts[0], match_mode, fold_kana)
+        for distance, operand in zip(parts[1::2], parts[2::2]):
+            clause = NearClause(clause, cls._parse_operand(operand, match_mode, fold_kana), int(distance))
+
+        return excluded, clause
+
+    @staticmethod
+    def _parse_operand(operand: str, match_mode: str,
+                       fold_kana: bool) -> Union[SearchPattern, FuzzyPattern]:
+        operand = operand.strip()
+        if not operand:
+            raise QuerySyntaxError("NEAR の前後に検索語がありません")
+
+        if operand.startswith(QUERY_PHRASE_QUOTE):
+            if len(operand) < 2 or not operand.endswith(QUERY_PHRASE_QUOTE):
+                raise QuerySyntaxError(f"フレーズの引用符が閉じられていません: {operand}")
+            words = operand[1:-1].split()
+            if not words:
+                raise QuerySyntaxError("空のフレーズは検索できません")
+            return SearchPattern(r'\s*'.join(re.escape(word) for word in words), MATCH_MODE_REGEX, fold_kana)
+
+        if match_mode == MATCH_MODE_FUZZY:
+            return FuzzyPattern(operand, fold_kana)
+        return SearchPattern(operand, match_mode, fold_kana)
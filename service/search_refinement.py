@@ -0,0 +1,117 @@
+import os
+from typing import List, Optional, Sequence, Set
+
+from service.search_query import SearchQuery
+
+
+def _normalize_directory(directory: str) -> str:
+    return os.path.normcase(os.path.normpath(directory))
+
+
+def _is_under(path: str, directory: str) -> bool:
+    """pathがdirectory以下にあればTrue（いずれも正規化済み）"""
+    return path == directory or path.startswith(directory.rstrip(os.sep) + os.sep)
+
+
+class SearchScope:
+    """検索対象の範囲（フォルダとサブフォルダを含むか）
+
+    directoriesがNoneの場合はインデックス全体を表す。
+    """
+
+    def __init__(self, directories: Optional[Sequence[str]] = None, include_subdirs: bool = True) -> None:
+        self.directories = None if directories is None else [_normalize_directory(d) for d in directories]
+        self.include_subdirs = include_subdirs
+
+    def contains_file(self, file_path: str) -> bool:
+        if self.directories is None:
+            return True
+        path = _normalize_directory(file_path)
+        parent = os.path.dirname(path)
+        return any(
+            _is_under(parent, directory) if self.include_subdirs else parent == directory
+            for directory in self.directories
+        )
+
+    def is_within(self, other: 'SearchScope') -> bool:
+        """この範囲がotherの範囲に含まれる場合True"""
+        if other.directories is None:
+            return True
+        if self.directories is None:
+            return False
+        if self.include_subdirs and not other.include_subdirs:
+            return False
+        return all(
+            any(_is_under(directory, outer) if other.include_subdirs else directory == outer
+                for outer in other.directories)
+            for directory in self.directories
+        )
+
+
+class SearchRefinement:
+    """直前の検索で一致したファイルを覚え、次の検索が絞り込みなら候補として返す
+
+    新しい検索が前回の検索にAND条件を加えただけで、範囲も同じか狭い場合、
+    一致するファイルは前回一致したファイルに限られるため、そのファイルだけを照合すればよい。
+    一致は文書単位で記録するため、一致箇所が0件のファイル（空のリストの結果）も候補に含める。
+    候補は検索が最後まで終わった場合だけ使い、打ち切った検索の結果は使わない。
+    インデックスの検索と通常の検索は一致するファイルが異なり得るため、方式が同じ場合だけ使う。
+    """
+
+    INDEX = "index"
+    FILES = "files"
+
+    def __init__(self) -> None:
+        self._query: Optional[SearchQuery] = None
+        self._scope: Optional[SearchScope] = None
+        self._source: Optional[str] = None
+        self._matched_files: Set[str] = set()
+        self._complete = False
+
+    def begin(self, query: SearchQuery, scope: SearchScope, source: str) -> Optional[List[str]]:
+        """新しい検索を始める
+
+        Args:
+            query: 新しい検索条件
+            scope: 新しい検索の範囲
+            source: 検索の方式（INDEX/FILES）
+
+        Returns:
+            前回の検索の絞り込みの場合は照合するファイルのリスト、それ以外はNone
+        """
+        candidates = None
+        if self._is_refinement(query, scope, source):
+            candidates = sorted(path for path in self._matched_files if scope.contains_file(path))
+
+        self._query = query
+        self._scope = scope
+        self._source = source
+        self._matched_files = set()
+        self._complete = False
+        return candidates
+
+    def add(self, file_path: str) -> None:
+        """一致したファイルを記録する"""
+        self._matched_files.add(file_path)
+
+    def complete(self) -> None:
+        """検索が最後まで終わったことを記録する"""
+        self._complete = self._query is not None
+
+    def reset(self) -> None:
+        """記録した検索を捨てる（インデックスの更新後など）"""
+        self._query = None
+        self._scope = None
+        self._source = None
+        self._matched_files = set()
+        self._complete = False
+
+    def _is_refinement(self, query: SearchQuery, scope: SearchScope, source: str) -> bool:
+        return (
+            self._complete
+            and self._query is not None
+            and self._scope is not None
+            and source == self._source
+            and scope.is_within(self._scope)
+            and query.is_refinement_of(self._query)
+        )
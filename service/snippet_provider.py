@@ -0,0 +1,131 @@
+import logging
+from collections import OrderedDict
+from typing import Hashable, NamedTuple
+
+from service.compressed_text import CompressedText, text_separator
+from service.content_extractor import ContentExtractor
+from utils.constants import (
+    FILE_EXTENSION_PDF,
+    SNIPPET_CACHE_SIZE,
+    SNIPPET_SOURCE_CACHE_SIZE,
+)
+from utils.helpers import read_file_with_auto_encoding
+
+logger = logging.getLogger(__name__)
+
+
+class SearchHit(NamedTuple):
+    """検索の一致箇所
+
+    コンテキストは持たず、表示する時点でSnippetProviderが一致位置の周辺を切り出す。
+    start/endはインデックス検索ではページ/行のテキスト、通常検索ではPDFのページの
+    テキストまたはテキストファイル全体での位置。
+    """
+
+    position: int  # ページ/行番号
+    start: int
+    end: int
+    term: str
+    indexed: bool = False
+
+
+def extract_snippet(text: str, start: int, end: int, context_length: int) -> str:
+    """一致箇所の前後context_length文字を含むテキストを返す"""
+    return text[max(0, start - context_length):min(len(text), end + context_length)]
+
+
+class SnippetProvider:
+    """検索結果のコンテキストを必要になった時点で作り、最近使ったものを保持する
+
+    一致箇所の元のテキストは、インデックス検索ではインデックスの本文、
+    通常検索では元ファイルから読み直す。
+    """
+
+    def __init__(self, context_length: int, indexer=None,
+                 cache_size: int = SNIPPET_CACHE_SIZE) -> None:
+        """初期化
+
+        Args:
+            context_length: 一致箇所の前後に含める文字数
+            indexer: インデックス検索の結果に使うSearchIndexer
+            cache_size: 保持するコンテキストの数
+        """
+        self.context_length = context_length
+        self.indexer = indexer
+        self.cache_size = cache_size
+        self._snippets: OrderedDict = OrderedDict()
+        self._sources: OrderedDict = OrderedDict()
+
+    def get_snippet(self, file_path: str, hit: SearchHit) -> str:
+        """一致箇所のコンテキストを返す
+
+        Args:
+            file_path: ファイルパス
+            hit: 一致箇所
+
+        Returns:
+            一致箇所の前後を含むテキスト。元のテキストを読めない場合は空文字
+        """
+        key = (file_path, hit)
+        snippet = self._get_cached(self._snippets, key)
+        if snippet is None:
+            text = self._get_source_text(file_path, hit)
+            snippet = extract_snippet(text, hit.start, hit.end, self.context_length)
+            self._remember(self._snippets, key, snippet, self.cache_size)
+        return snippet
+
+    def clear(self) -> None:
+        self._snippets.clear()
+        self._sources.clear()
+
+    def _get_source_text(self, file_path: str, hit: SearchHit) -> str:
+        if hit.indexed:
+            return self._get_indexed_unit(file_path, hit.position)
+
+        is_pdf = file_path.lower().endswith(FILE_EXTENSION_PDF)
+        key = (file_path, hit.position if is_pdf else None)
+        text = self._get_cached(self._sources, key)
+        if text is None:
+            if is_pdf:
+                text = ContentExtractor.extract_pdf_page_text(file_path, hit.position)
+            else:
+                try:
+                    text = read_file_with_auto_encoding(file_path) or ""
+                except (OSError, ValueError) as e:
+                    logger.error(f"コンテキストの読み込みに失敗しました: {file_path} - {e}")
+                    text = ""
+            self._remember(self._sources, key, text, SNIPPET_SOURCE_CACHE_SIZE)
+        return text
+
+    def _get_indexed_unit(self, file_path: str, position: int) -> str:
+        """インデックスの本文から、必要なブロックだけを展開してページ/行のテキストを返す"""
+        if self.indexer is None:
+            return ""
+
+        key = (file_path, None, True)
+        document = self._get_cached(self._sources, key)
+        if document is None:
+            file_info = self.indexer.index_data["files"].get(file_path, {})
+            document = CompressedText(file_info.get("content", ""))
+            self._remember(self._sources, key, document, SNIPPET_SOURCE_CACHE_SIZE)
+
+        separator = text_separator(file_path)
+        for first_unit, block in document.iter_blocks():
+            units = block.split(separator)
+            if position < first_unit + len(units):
+                return units[position - first_unit] if position >= first_unit else ""
+        return ""
+
+    @staticmethod
+    def _get_cached(cache: OrderedDict, key: Hashable):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    @staticmethod
+    def _remember(cache: OrderedDict, key: Hashable, value, limit: int) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > limit:
+            cache.popitem(last=False)
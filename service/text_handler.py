@@ -4,7 +4,15 @@ from typing import List, Optional
 
 from PyQt5.QtWidgets import QWidget
 
-from utils.constants import FILE_EXTENSION_MD, TEXT_VIEWER_DEFAULT_HEIGHT, TEXT_VIEWER_DEFAULT_WIDTH
+from service.mapped_text_file import MappedTextFile
+from utils.constants import (
+    DEFAULT_FOLD_KANA,
+    FILE_EXTENSION_MD,
+    LARGE_TEXT_FILE_THRESHOLD,
+    MATCH_MODE_LITERAL,
+    TEXT_VIEWER_DEFAULT_HEIGHT,
+    TEXT_VIEWER_DEFAULT_WIDTH,
+)
 from utils.helpers import read_file_with_auto_encoding
 from widgets.text_viewer_widget import TextViewerWindow
 
@@ -22,9 +30,15 @@ def open_text_file(
     parent: Optional[QWidget] = None,
     width: int = TEXT_VIEWER_DEFAULT_WIDTH,
     height: int = TEXT_VIEWER_DEFAULT_HEIGHT,
+    match_mode: str = MATCH_MODE_LITERAL,
+    fold_kana: bool = DEFAULT_FOLD_KANA,
 ) -> None:
     """テキストファイルをアプリ内の別ウィンドウでハイライト付きで開く
 
+    LARGE_TEXT_FILE_THRESHOLD以上のテキストファイルは全体を読み込まず、
+    メモリマップで開いて表示位置の前後の行だけを読み込む。
+    Markdownファイルは別スレッドで描画し、描画後に該当行へ移動する。
+
     Args:
         file_path: ファイルパス
         search_terms: 検索語リスト
@@ -33,17 +47,23 @@ def open_text_file(
         parent: 親ウィジェット
         width: ウィンドウ幅
         height: ウィンドウ高さ
+        match_mode: ハイライトする検索語の照合方法
+        fold_kana: ハイライトでカタカナとひらがなを同一視する場合True
 
     Raises:
         Exception: ファイル処理エラー
     """
     try:
-        content = read_file_with_auto_encoding(file_path)
-        if content is None:
-            content = ""
-
         is_markdown = os.path.splitext(file_path)[1].lower() == FILE_EXTENSION_MD
 
+        text_file = None
+        if not is_markdown and os.path.getsize(file_path) >= LARGE_TEXT_FILE_THRESHOLD:
+            text_file = _open_mapped_text_file(file_path)
+
+        content = ""
+        if text_file is None and not is_markdown:
+            content = read_file_with_auto_encoding(file_path) or ""
+
         viewer = TextViewerWindow(
             title=os.path.basename(file_path),
             content=content,
@@ -55,7 +75,12 @@ def open_text_file(
             height=height,
             file_path=file_path,
             parent=parent,
+            text_file=text_file,
+            match_mode=match_mode,
+            fold_kana=fold_kana,
         )
+        if is_markdown:
+            viewer.load_markdown_file(file_path, position)
         viewer.destroyed.connect(lambda: _remove_viewer(viewer))
         _active_viewers.append(viewer)
 
@@ -67,6 +92,15 @@ def open_text_file(
         raise Exception(f"テキストファイルを開けませんでした: {str(e)}")
 
 
+def _open_mapped_text_file(file_path: str) -> Optional[MappedTextFile]:
+    """大きなテキストファイルをメモリマップで開く（開けない場合は全体を読み込むためNone）"""
+    try:
+        return MappedTextFile(file_path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"メモリマップで開けないため全体を読み込みます: {file_path} - {e}")
+        return None
+
+
 def _remove_viewer(viewer: TextViewerWindow) -> None:
     if viewer in _active_viewers:
         _active_viewers.remove(viewer)
@@ -0,0 +1,95 @@
+import unicodedata
+from typing import List, Optional, Tuple
+
+from utils.constants import DEFAULT_FOLD_KANA
+
+# カタカナ（ァ〜ヶ）をひらがな（ぁ〜ゖ）に変換する表
+_KANA_FOLD_TABLE = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+# 半角カタカナの濁点・半濁点（NFKCで直前の文字と合成される）
+_HALFWIDTH_VOICED_MARKS = 'ﾞﾟ'
+
+
+def normalize_text(text: str, fold_kana: bool = DEFAULT_FOLD_KANA) -> str:
+    """照合用にテキストを正規化する
+
+    NFKCで全角英数字・半角カタカナなどを統一し、小文字に変換する。
+    fold_kanaがTrueの場合はカタカナをひらがなにそろえる。
+
+    Args:
+        text: 対象テキスト
+        fold_kana: カタカナとひらがなを同一視する場合True
+
+    Returns:
+        正規化したテキスト
+    """
+    normalized = unicodedata.normalize('NFKC', text).lower()
+    return to_hiragana(normalized) if fold_kana else normalized
+
+
+def to_hiragana(text: str) -> str:
+    """カタカナをひらがなに変換する（文字数は変わらない）"""
+    return text.translate(_KANA_FOLD_TABLE)
+
+
+class NormalizedText:
+    """正規化したテキストと、元のテキストの位置への対応
+
+    対応表は正規化で文字数が変わる場合だけ、最初に位置を変換する時点で作る。
+    """
+
+    def __init__(self, original: str, fold_kana: bool = DEFAULT_FOLD_KANA) -> None:
+        """初期化
+
+        Args:
+            original: 元のテキスト
+            fold_kana: カタカナとひらがなを同一視する場合True
+        """
+        self.original = original
+        self.fold_kana = fold_kana
+        self.text = normalize_text(original, fold_kana)
+        self._identity = len(self.text) == len(original) and unicodedata.is_normalized('NFKC', original)
+        self._starts: Optional[List[int]] = None
+        self._ends: Optional[List[int]] = None
+
+    def to_original(self, start: int, end: int) -> Tuple[int, int]:
+        """正規化後の範囲を元のテキストの範囲に変換する
+
+        Args:
+            start: 正規化後の開始位置
+            end: 正規化後の終了位置
+
+        Returns:
+            元のテキストでの(開始位置, 終了位置)
+        """
+        if self._identity or start >= end:
+            return start, end
+        if self._starts is None:
+            self._build_offsets()
+
+        last = len(self._starts) - 1
+        return self._starts[min(start, last)], self._ends[min(end - 1, last)]
+
+    def _build_offsets(self) -> None:
+        """結合文字を含む1文字ずつを正規化し、正規化後の各文字に元の範囲を割り当てる"""
+        starts: List[int] = []
+        ends: List[int] = []
+        original = self.original
+        position = 0
+
+        while position < len(original):
+            cluster_end = position + 1
+            while cluster_end < len(original) and (
+                unicodedata.combining(original[cluster_end])
+                or original[cluster_end] in _HALFWIDTH_VOICED_MARKS
+            ):
+                cluster_end += 1
+
+            length = len(normalize_text(original[position:cluster_end], self.fold_kana))
+            starts.extend([position] * length)
+            ends.extend([cluster_end] * length)
+            position = cluster_end
+
+        if not starts:
+            starts, ends = [0], [0]
+        self._starts, self._ends = starts, ends
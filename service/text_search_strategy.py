@@ -2,6 +2,7 @@ import logging
 from typing import List, Optional, Tuple
 
 from service.search_matcher import SearchMatcher
+from service.snippet_provider import SearchHit
 from utils.helpers import read_file_with_auto_encoding
 
 logger = logging.getLogger(__name__)
@@ -18,8 +19,14 @@ class TextSearchStrategy:
         """
         self.matcher = matcher
 
-    def search(self, file_path: str) -> Optional[Tuple[str, List[Tuple[int, str]]]]:
-        results = []
+    def search(self, file_path: str) -> Optional[Tuple[str, List[SearchHit]]]:
+        """ファイルを検索する
+
+        Returns:
+            ファイルが検索条件に一致した場合は(ファイルパス, 一致箇所)。
+            行ごとの一致箇所がない場合（行をまたぐフレーズなど）も、絞り込みの候補に使うため空のリストで返す
+        """
+        results: List[SearchHit] = []
 
         try:
             content = read_file_with_auto_encoding(file_path)
@@ -31,12 +38,13 @@ class TextSearchStrategy:
                 return None
 
             for search_term in self.matcher.search_terms:
-                contexts = self.matcher.extract_contexts_with_line_numbers(content, search_term)
-                results.extend(contexts)
+                results.extend(self.matcher.find_hits_with_line_numbers(content, search_term))
 
         except UnicodeDecodeError as e:
             logger.error(f"ファイルのデコードエラー: {file_path} - {e}")
+            return None
         except ValueError as e:
             logger.error(f"ファイルの読み込みに失敗しました: {file_path} - {e}")
+            return None
 
-        return (file_path, results) if results else None
+        return file_path, results
@@ -236,6 +236,23 @@ def sample_json_file(temp_dir):
     yield json_path
 
 
+@pytest.fixture
+def make_page_text():
+    """PyMuPDFのget_text('rawdict')と同じ形式のページのテキストを、1行ずつの文字列から作る"""
+    def _make(*lines):
+        rawdict_lines = []
+        for line_number, line in enumerate(lines):
+            top = 100 + 20 * line_number
+            chars = [
+                {'c': char, 'bbox': (72 + 10 * i, top, 82 + 10 * i, top + 12)}
+                for i, char in enumerate(line)
+            ]
+            rawdict_lines.append({'spans': [{'chars': chars}]})
+        return {'blocks': [{'lines': rawdict_lines}]}
+
+    return _make
+
+
 @pytest.fixture
 def sample_pdf_mock_content():
     """PDFファイルのモックコンテンツ（強化版）"""
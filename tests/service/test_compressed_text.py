@@ -0,0 +1,47 @@
+from service.compressed_text import CompressedText, compress_text, is_compressed, text_separator
+from utils.constants import PDF_TEXT_PAGE_SEPARATOR, TEXT_LINE_SEPARATOR
+
+
+class TestCompressedText:
+    """文書テキストのブロック圧縮のテスト"""
+
+    def test_round_trip(self):
+        """圧縮したテキストが元どおりに展開されること"""
+        text = '\n'.join(f'{i}行目: 安全弁の点検手順' for i in range(1000))
+
+        stored = compress_text(text, TEXT_LINE_SEPARATOR, block_size=1024)
+
+        assert is_compressed(stored)
+        assert len(stored['blocks']) > 1
+        assert sum(stored['units']) == 1000
+        assert CompressedText(stored).text == text
+
+    def test_iter_blocks_reports_first_line_number(self):
+        """各ブロックが先頭のページ/行番号とともに返されること"""
+        text = '\n'.join(f'line{i}' for i in range(1, 101))
+        stored = compress_text(text, TEXT_LINE_SEPARATOR, block_size=100)
+
+        for first_unit, block in CompressedText(stored).iter_blocks():
+            assert block.split('\n')[0] == f'line{first_unit}'
+
+    def test_blocks_are_decompressed_on_demand(self):
+        """先頭のブロックだけを読んだ場合、残りのブロックは展開されないこと"""
+        text = '\n'.join('x' * 50 for _ in range(100))
+        compressed = CompressedText(compress_text(text, TEXT_LINE_SEPARATOR, block_size=200))
+
+        next(compressed.iter_blocks())
+
+        assert compressed._blocks[0] is not None
+        assert all(block is None for block in compressed._blocks[1:])
+
+    def test_plain_string_is_single_block(self):
+        """旧形式の文字列がそのまま1つのブロックとして扱われること"""
+        compressed = CompressedText('旧形式のテキスト')
+
+        assert list(compressed.iter_blocks()) == [(1, '旧形式のテキスト')]
+        assert compressed.text == '旧形式のテキスト'
+
+    def test_text_separator(self):
+        """PDFはページ区切り、その他は行区切りを使うこと"""
+        assert text_separator('manual.PDF') == PDF_TEXT_PAGE_SEPARATOR
+        assert text_separator('manual.txt') == TEXT_LINE_SEPARATOR
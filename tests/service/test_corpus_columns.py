@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from service.compressed_text import compress_text
+from service.corpus_columns import CorpusColumns
+
+
+class TestCorpusColumns:
+    """CorpusColumnsクラスのテスト"""
+
+    @pytest.fixture
+    def columns(self):
+        texts = ['ポンプの点検。ポンプを停止する', 'バルブ交換', 'ﾎﾟﾝﾌﾟ P-12']
+        return CorpusColumns(['a.txt', 'b.txt', 'c.txt'], texts)
+
+    def test_term_frequencies_per_document(self, columns):
+        """文書ごとの出現回数が文書IDの順に返ること"""
+        assert columns.term_frequencies('ポンプ').tolist() == [2, 0, 1]
+
+    def test_count_terms(self, columns):
+        """検索語ごとに文書数と出現回数の合計が返ること"""
+        counts = columns.count_terms(['ポンプ', 'バルブ', '配管'])
+
+        assert counts['ポンプ'] == {'documents': 2, 'occurrences': 3}
+        assert counts['バルブ'] == {'documents': 1, 'occurrences': 1}
+        assert counts['配管'] == {'documents': 0, 'occurrences': 0}
+
+    def test_count_terms_in_selected_documents(self, columns):
+        """指定した文書IDだけを集計すること"""
+        assert columns.count_terms(['ポンプ'], doc_ids=[1, 2])['ポンプ'] == {'documents': 1, 'occurrences': 1}
+
+    def test_normalizes_width_case_and_kana(self, columns):
+        """全角・半角、大文字・小文字、カタカナ・ひらがなを区別しないこと"""
+        assert columns.term_frequencies('ぽんぷ').tolist() == [2, 0, 1]
+        assert columns.term_frequencies('ｐ－１２').tolist() == [0, 0, 1]
+
+    def test_match_does_not_cross_documents(self):
+        """文書の末尾と次の文書の先頭にまたがって一致しないこと"""
+        columns = CorpusColumns(['a.txt', 'b.txt'], ['手順', '書'])
+
+        assert columns.term_frequencies('手順書').tolist() == [0, 0]
+
+    def test_overlapping_occurrences_are_counted(self):
+        """重なり合う出現もそれぞれ数えること"""
+        columns = CorpusColumns(['a.txt'], ['ああああ'])
+
+        assert columns.term_frequencies('ああ').tolist() == [3]
+
+    def test_empty_corpus(self):
+        """文書がない場合は空の結果を返すこと"""
+        columns = CorpusColumns([], [])
+
+        assert columns.term_frequencies('ポンプ').tolist() == []
+        assert columns.count_terms(['ポンプ'])['ポンプ'] == {'documents': 0, 'occurrences': 0}
+
+    def test_from_files_reads_compressed_content(self):
+        """圧縮した文書テキストから作成できること"""
+        files = {'a.txt': {'content': compress_text('ポンプ\n' * 3, '\n')}}
+
+        columns = CorpusColumns.from_files(files, ['a.txt'])
+
+        assert columns.term_frequencies('ポンプ').dtype.kind == 'i'
+        assert np.array_equal(columns.term_frequencies('ポンプ'), [3])
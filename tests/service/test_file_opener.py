@@ -5,8 +5,9 @@ from unittest.mock import patch, MagicMock
 import pytest
 
 from service.file_opener import FileOpener
+from service.pdf_open_worker import PDFOpenWorker
 from utils.constants import (
-    FILE_HANDLER_MAPPING, ERROR_MESSAGES, PROCESS_CLEANUP_DELAY
+    FILE_HANDLER_MAPPING, ERROR_MESSAGES, MATCH_MODE_LITERAL, MATCH_MODE_WILDCARD
 )
 
 
@@ -21,6 +22,8 @@ class TestFileOpener:
         mock_config.get_text_viewer_font_size.return_value = 16
         mock_config.get_text_viewer_width.return_value = 800
         mock_config.get_text_viewer_height.return_value = 600
+        mock_config.get_fold_kana.return_value = True
+        mock_config.get_highlight_page_window.return_value = 5
         return mock_config
     
     @pytest.fixture
@@ -94,17 +97,16 @@ class TestFileOpener:
     @patch('service.file_opener.temp_file_manager.cleanup_all')
     @patch('time.sleep')
     def test_open_file_same_pdf_twice(self, mock_sleep, mock_cleanup, file_opener, sample_files):
-        """同じPDFファイルを2回開く場合のテスト"""
+        """同じPDFファイルを2回開いても、一時ファイルの削除や待機でGUIを止めないこと"""
         pdf_path = sample_files['pdf']
         
-        # 最初の呼び出し
         with patch.object(file_opener, '_open_pdf_file') as mock_open_pdf:
             file_opener.open_file(pdf_path, 1, ['test'])
             file_opener.open_file(pdf_path, 2, ['test'])  # 同じファイルを再度開く
             
             assert mock_open_pdf.call_count == 2
-            mock_cleanup.assert_called()
-            mock_sleep.assert_called_with(PROCESS_CLEANUP_DELAY)
+            mock_cleanup.assert_not_called()
+            mock_sleep.assert_not_called()
 
     def test_open_file_pdf_success(self, file_opener, sample_files):
         """PDFファイル正常オープンのテスト"""
@@ -113,7 +115,7 @@ class TestFileOpener:
         with patch.object(file_opener, '_open_pdf_file') as mock_open_pdf:
             file_opener.open_file(pdf_path, 1, ['test'])
 
-            mock_open_pdf.assert_called_once_with(pdf_path, 1, ['test'])
+            mock_open_pdf.assert_called_once_with(pdf_path, 1, ['test'], MATCH_MODE_LITERAL)
             assert file_opener._last_opened_file == pdf_path
 
     def test_open_file_text_success(self, file_opener, sample_files):
@@ -123,9 +125,20 @@ class TestFileOpener:
         with patch.object(file_opener, '_open_text_file') as mock_open_text:
             file_opener.open_file(txt_path, 1, ['test'])
 
-            mock_open_text.assert_called_once_with(txt_path, ['test'], 1)
+            mock_open_text.assert_called_once_with(txt_path, ['test'], 1, MATCH_MODE_LITERAL)
             assert file_opener._last_opened_file == txt_path
 
+    def test_open_file_passes_match_mode(self, file_opener, sample_files):
+        """検索したときの照合方法をビューアまで渡すこと"""
+        txt_path = sample_files['txt']
+
+        with patch('service.file_opener.open_text_file') as mock_open_text:
+            file_opener.open_file(txt_path, 1, ['te*t'], MATCH_MODE_WILDCARD)
+
+            mock_open_text.assert_called_once_with(
+                txt_path, ['te*t'], 16, 1, None, 800, 600, MATCH_MODE_WILDCARD, True
+            )
+
     def test_open_file_markdown_success(self, file_opener, sample_files):
         """Markdownファイル正常オープンのテスト"""
         md_path = sample_files['md']
@@ -133,7 +146,7 @@ class TestFileOpener:
         with patch.object(file_opener, '_open_text_file') as mock_open_text:
             file_opener.open_file(md_path, 1, ['test'])
 
-            mock_open_text.assert_called_once_with(md_path, ['test'], 1)
+            mock_open_text.assert_called_once_with(md_path, ['test'], 1, MATCH_MODE_LITERAL)
             assert file_opener._last_opened_file == md_path
 
     @patch('service.file_opener.temp_file_manager.cleanup_all')
@@ -147,7 +160,8 @@ class TestFileOpener:
             file_opener.open_file(pdf_path, 1, ['test'])
             
             mock_show_error.assert_called_once()
-            mock_cleanup.assert_called_once()
+            # キャッシュした一時ファイルは先に起動したAcrobatが開いている可能性があるため削除しない
+            mock_cleanup.assert_not_called()
 
     # =============================================================================
     # _open_pdf_file() メソッドのテスト
@@ -174,31 +188,59 @@ class TestFileOpener:
             
             file_opener._open_pdf_file(pdf_path, 1, ['test'])
 
-    @patch('service.file_opener.open_pdf')
+    @patch('service.file_opener.PDFOpenWorker')
     @patch('os.path.exists')
-    def test_open_pdf_file_success(self, mock_exists, mock_open_pdf, file_opener, sample_files):
-        """PDF正常オープンのテスト"""
+    def test_open_pdf_file_success(self, mock_exists, mock_worker_class, file_opener, sample_files):
+        """PDFを開く処理を別スレッドで開始し、完了を待たずに戻ること"""
         pdf_path = sample_files['pdf']
         mock_exists.return_value = True
 
         with patch.object(file_opener, '_check_pdf_accessibility', return_value=True):
             file_opener._open_pdf_file(pdf_path, 1, ['test'])
 
-            mock_open_pdf.assert_called_once_with(pdf_path, file_opener.acrobat_path, 1, ['test'])
-
-    @patch('service.file_opener.open_pdf')  
-    @patch('os.path.exists')
-    def test_open_pdf_file_subprocess_error(self, mock_exists, mock_open_pdf, file_opener, sample_files):
-        """PDF開く際のサブプロセスエラーテスト"""
+            mock_worker_class.assert_called_once_with(
+                pdf_path, file_opener.acrobat_path, 1, ['test'], 5, file_opener.highlight_cache, MATCH_MODE_LITERAL, True
+            )
+            mock_worker_class.return_value.start.assert_called_once()
+            mock_worker_class.return_value.wait.assert_not_called()
+
+    @patch('service.file_opener.PDFOpenWorker')
+    @patch('service.file_opener.open_pdf_in_viewer')
+    def test_open_pdf_file_with_builtin_viewer(self, mock_open_viewer, mock_worker_class,
+                                               file_opener, config_manager_mock, sample_files):
+        """アプリ内ビューアの設定ではAcrobatを使わずにビューアで開くこと"""
         pdf_path = sample_files['pdf']
-        mock_exists.return_value = True
+        config_manager_mock.get_pdf_viewer.return_value = 'builtin'
+
+        file_opener._open_pdf_file(pdf_path, 3, ['test'])
+
+        mock_open_viewer.assert_called_once_with(pdf_path, ['test'], 3, None, 800, 600, MATCH_MODE_LITERAL, True)
+        mock_worker_class.assert_not_called()
+
+    @patch('service.pdf_open_worker.open_pdf')
+    def test_pdf_worker_reports_subprocess_error(self, mock_open_pdf, qapp):
+        """別スレッドでAcrobatの起動に失敗した場合はエラーメッセージを通知すること"""
         mock_open_pdf.side_effect = subprocess.SubprocessError("Process failed")
-        
-        with patch.object(file_opener, '_check_pdf_accessibility', return_value=True), \
-             patch.object(file_opener, '_show_error') as mock_show_error, \
-             pytest.raises(subprocess.SubprocessError):
-            
-            file_opener._open_pdf_file(pdf_path, 1, ['test'])
+        worker = PDFOpenWorker('/test/file.pdf', 'acrobat.exe', 1, ['test'])
+        messages = []
+        worker.open_failed.connect(messages.append)
+
+        worker.run()
+
+        assert len(messages) == 1 and 'Process failed' in messages[0]
+
+    @patch('service.pdf_open_worker.open_pdf')
+    def test_pdf_worker_completes_highlights_after_opening(self, mock_open_pdf, qapp):
+        """Acrobatを起動した後、キャッシュの残りのページをハイライトすること"""
+        cache = MagicMock()
+        worker = PDFOpenWorker('/test/file.pdf', 'acrobat.exe', 1, ['test'], 5, cache, MATCH_MODE_WILDCARD, True)
+
+        worker.run()
+
+        mock_open_pdf.assert_called_once()
+        cache.complete_highlights.assert_called_once_with(
+            '/test/file.pdf', ['test'], MATCH_MODE_WILDCARD, True, worker.isInterruptionRequested
+        )
 
     # =============================================================================
     # _check_pdf_accessibility() メソッドのテスト
@@ -244,7 +286,7 @@ class TestFileOpener:
         
         file_opener._open_text_file(txt_path, ['test'])
 
-        mock_open_text.assert_called_once_with(txt_path, ['test'], 16, 0, None, 800, 600)
+        mock_open_text.assert_called_once_with(txt_path, ['test'], 16, 0, None, 800, 600, MATCH_MODE_LITERAL, True)
 
     @patch('service.file_opener.open_text_file')
     def test_open_text_file_io_error(self, mock_open_text, file_opener, sample_files):
@@ -374,8 +416,8 @@ class TestFileOpener:
             # 同じファイルを再オープン
             file_opener.open_file(pdf_path, 2, ['different_terms'])
             
-            # クリーンアップが呼ばれることを確認
-            mock_cleanup.assert_called()
+            # 表示中の一時ファイルは削除しないことを確認
+            mock_cleanup.assert_not_called()
 
     def test_multiple_file_types_handling(self, file_opener, sample_files):
         """複数ファイル形式の処理テスト"""
@@ -408,6 +450,7 @@ class TestFileOpenerEdgeCases:
         mock_config.get_text_viewer_font_size.return_value = 0  # 無効なフォントサイズ
         mock_config.get_text_viewer_width.return_value = 800
         mock_config.get_text_viewer_height.return_value = 600
+        mock_config.get_fold_kana.return_value = True
         return FileOpener(mock_config)
 
     def test_empty_acrobat_path(self, file_opener_edge, temp_dir):
@@ -432,7 +475,7 @@ class TestFileOpenerEdgeCases:
             file_opener_edge._open_text_file(txt_path, ['test'])
             
             # フォントサイズ0でも処理が続行されることを確認
-            mock_open_text.assert_called_once_with(txt_path, ['test'], 0, 0, None, 800, 600)
+            mock_open_text.assert_called_once_with(txt_path, ['test'], 0, 0, None, 800, 600, MATCH_MODE_LITERAL, True)
 
     def test_large_position_value(self, temp_dir):
         """大きなposition値でのテスト"""
@@ -446,18 +489,22 @@ class TestFileOpenerEdgeCases:
         mock_config.get_text_viewer_font_size.return_value = 16
         mock_config.get_text_viewer_width.return_value = 800
         mock_config.get_text_viewer_height.return_value = 600
+        mock_config.get_fold_kana.return_value = True
+        mock_config.get_highlight_page_window.return_value = 5
         file_opener = FileOpener(mock_config)
 
         large_position = 999999
 
         with patch.object(file_opener, '_check_pdf_accessibility', return_value=True), \
              patch('os.path.exists', return_value=True), \
-             patch('service.file_opener.open_pdf') as mock_open_pdf:
+             patch('service.file_opener.PDFOpenWorker') as mock_worker_class:
 
             file_opener._open_pdf_file(pdf_path, large_position, ['test'])
 
             # 大きなposition値でも正常に処理されることを確認
-            mock_open_pdf.assert_called_once_with(pdf_path, r'C:\Program Files\Adobe\Acrobat.exe', large_position, ['test'])
+            mock_worker_class.assert_called_once_with(
+                pdf_path, r'C:\Program Files\Adobe\Acrobat.exe', large_position, ['test'], 5, file_opener.highlight_cache, MATCH_MODE_LITERAL, True
+            )
 
     def test_empty_search_terms(self, file_opener_edge, temp_dir):
         """空の検索語リストでのテスト"""
@@ -469,7 +516,7 @@ class TestFileOpenerEdgeCases:
             file_opener_edge._open_text_file(txt_path, [])
             
             # 空の検索語でも処理が続行されることを確認
-            mock_open_text.assert_called_once_with(txt_path, [], 0, 0, None, 800, 600)
+            mock_open_text.assert_called_once_with(txt_path, [], 0, 0, None, 800, 600, MATCH_MODE_LITERAL, True)
 
     def test_unicode_file_paths(self, file_opener_edge, temp_dir):
         """Unicode文字を含むファイルパスのテスト"""
@@ -480,7 +527,7 @@ class TestFileOpenerEdgeCases:
         with patch('service.file_opener.open_text_file') as mock_open_text:
             file_opener_edge._open_text_file(unicode_filename, ['test'])
             
-            mock_open_text.assert_called_once_with(unicode_filename, ['test'], 0, 0, None, 800, 600)
+            mock_open_text.assert_called_once_with(unicode_filename, ['test'], 0, 0, None, 800, 600, MATCH_MODE_LITERAL, True)
 
     def test_special_characters_in_search_terms(self, file_opener_edge, temp_dir):
         """検索語に特殊文字が含まれる場合のテスト"""
@@ -493,4 +540,4 @@ class TestFileOpenerEdgeCases:
         with patch('service.file_opener.open_text_file') as mock_open_text:
             file_opener_edge._open_text_file(txt_path, special_terms)
             
-            mock_open_text.assert_called_once_with(txt_path, special_terms, 0, 0, None, 800, 600)
\ No newline at end of file
+            mock_open_text.assert_called_once_with(txt_path, special_terms, 0, 0, None, 800, 600, MATCH_MODE_LITERAL, True)
\ No newline at end of file
@@ -5,6 +5,7 @@ import pytest
 
 from utils.constants import SEARCH_TYPE_AND, SEARCH_TYPE_OR
 from service.file_searcher import FileSearcher
+from service.snippet_provider import SnippetProvider
 
 
 class TestFileSearcher:
@@ -92,7 +93,7 @@ class TestFileSearcher:
         assert result is not None
         assert result[0] == file_path
         assert len(result[1]) > 0
-        assert 'Python' in result[1][0][1]
+        assert 'Python' in SnippetProvider(30).get_snippet(file_path, result[1][0])
     
     @patch('fitz.open')
     def test_search_pdf_file(self, mock_fitz_open, sample_directory, qapp):
@@ -137,14 +138,14 @@ class TestFileSearcher:
         """サブディレクトリを含む検索のテスト"""
         results = []
         
-        def collect_result(file_path, matches):
-            results.append((file_path, matches))
+        def collect_result(batch):
+            results.extend(batch)
         
         searcher = FileSearcher(
             sample_directory, ['Python'], True,
             SEARCH_TYPE_OR, ['.txt', '.md'], 50
         )
-        searcher.result_found.connect(collect_result)
+        searcher.results_batch.connect(collect_result)
         
         # 検索実行（同期的にテスト）
         searcher.run()
@@ -155,18 +156,35 @@ class TestFileSearcher:
         assert any('sub1.txt' in p for p in file_paths)
         assert any('sub2.md' in p for p in file_paths)
     
+    def test_search_only_candidate_files(self, sample_directory, qapp):
+        """候補のファイルを指定した場合はフォルダを走査せずそのファイルだけを検索すること"""
+        results = []
+        candidate = os.path.join(sample_directory, 'subdir', 'sub1.txt')
+        searcher = FileSearcher(
+            sample_directory, ['Python'], True,
+            SEARCH_TYPE_OR, ['.txt', '.md'], 50,
+            candidate_files=[candidate]
+        )
+        searcher.results_batch.connect(lambda batch: results.extend(file_path for file_path, _ in batch))
+
+        with patch('os.walk') as mock_walk:
+            searcher.run()
+
+        mock_walk.assert_not_called()
+        assert len(results) == 1 and results[0].endswith('sub1.txt')
+
     def test_search_without_subdirs(self, sample_directory, qapp):
         """サブディレクトリを除外した検索のテスト"""
         results = []
         
-        def collect_result(file_path, matches):
-            results.append((file_path, matches))
+        def collect_result(batch):
+            results.extend(batch)
         
         searcher = FileSearcher(
             sample_directory, ['Python'], False,
             SEARCH_TYPE_OR, ['.txt', '.md'], 50
         )
-        searcher.result_found.connect(collect_result)
+        searcher.results_batch.connect(collect_result)
         
         # 検索実行
         searcher.run()
@@ -193,7 +211,9 @@ class TestFileSearcher:
         result = searcher.search_text(file_path)
         assert result is not None
         
-        context = result[1][0][1]
+        hit = result[1][0]
+        assert (hit.position, hit.start, hit.end, hit.term) == (1, 101, 107, 'Python')
+        context = SnippetProvider(20).get_snippet(file_path, hit)
         # 前後のコンテキストが含まれることを確認
         assert len(context) > len('Python')
         assert 'Python' in context
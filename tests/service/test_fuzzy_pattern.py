@@ -0,0 +1,45 @@
+from service.fuzzy_pattern import FuzzyPattern
+from service.ngram_signature import NgramSignature, build_signature, text_ngrams
+from service.search_query import SearchQuery
+from utils.constants import MATCH_MODE_FUZZY, SEARCH_TYPE_AND
+
+
+class TestFuzzyPattern:
+    """n-gramと編集距離によるあいまい検索のテスト"""
+
+    def test_matches_typo_and_width_variants(self):
+        """表記ゆれと1文字の誤りを含む検索語が一致すること"""
+        text = 'エアコンプレッサーの点検'
+
+        for term in ['ｺﾝﾌﾟﾚｯｻ', 'コンプレツサー', 'コンプレサー']:
+            spans = list(FuzzyPattern(term).finditer(text))
+            assert [text[start:end] for start, end in spans][0].startswith('コンプレ')
+
+    def test_short_terms_require_exact_match(self):
+        """短い検索語は編集を許さず完全一致のみとすること"""
+        pattern = FuzzyPattern('弁')
+
+        assert pattern.max_distance == 0
+        assert pattern.matches('安全弁')
+        assert not pattern.matches('安全板')
+
+    def test_unrelated_text_does_not_match(self):
+        """共通のn-gramが少ないテキストには一致しないこと"""
+        assert not FuzzyPattern('コンプレッサー').matches('ポンプの分解手順')
+
+    def test_signature_excludes_documents(self):
+        """n-gram署名で一致し得ない文書が除外され、近い文書ほど点数が高いこと"""
+        close = NgramSignature(build_signature('えあこんぷれっさーのてんけん'))
+        far = NgramSignature(build_signature('ぽんぷのぶんかいてじゅん'))
+        pattern = FuzzyPattern('コンプレツサー')
+
+        assert all(gram in close for gram in text_ngrams('こんぷれっさー'))
+        assert pattern.signature_score(close) > 0.5
+        assert pattern.signature_score(far) is None
+
+    def test_query_uses_fuzzy_mode(self):
+        """照合方法があいまいの場合、SearchQueryがFuzzyPatternで照合すること"""
+        query = SearchQuery(['コンプレツサー'], SEARCH_TYPE_AND, MATCH_MODE_FUZZY)
+
+        assert query.is_fuzzy
+        assert query.matches('コンプレッサーの点検')
@@ -0,0 +1,53 @@
+from service.highlight_matcher import HighlightMatcher
+from utils.constants import MATCH_MODE_FUZZY, MATCH_MODE_REGEX
+
+
+def _highlighted(matcher, text):
+    return [(text[start:end], term_index) for start, end, term_index in sorted(matcher.finditer(text))]
+
+
+class TestHighlightMatcher:
+    """ビューアのハイライト位置を求めるHighlightMatcherのテスト"""
+
+    def test_excluded_terms_are_not_highlighted(self):
+        """NOTで除外した検索語はハイライトしないこと"""
+        matcher = HighlightMatcher(['バルブ', 'NOT ガス'])
+
+        assert _highlighted(matcher, 'ガスバルブの交換') == [('バルブ', 0)]
+
+    def test_near_highlights_both_operands(self):
+        """NEARは前後の検索語をそれぞれハイライトすること"""
+        matcher = HighlightMatcher(['バルブ NEAR/3 交換'])
+
+        assert _highlighted(matcher, 'バルブを交換する') == [('バルブ', 0), ('交換', 0)]
+
+    def test_phrase_matches_across_whitespace(self):
+        """フレーズは語の間の空白・改行をまたいでハイライトすること"""
+        matcher = HighlightMatcher(['"安全 弁"'])
+
+        assert _highlighted(matcher, '安全\n弁の点検') == [('安全\n弁', 0)]
+
+    def test_longer_overlapping_term_wins(self):
+        """重なる検索語では長い方が一致すること"""
+        matcher = HighlightMatcher(['test', 'testing'])
+
+        assert _highlighted(matcher, 'test testing') == [('test', 0), ('testing', 1)]
+
+    def test_regex_with_groups_is_matched_separately(self):
+        """グループを含む正規表現は、まとめずに照合しても一致すること"""
+        matcher = HighlightMatcher([r'(\d)-\1', 'ab'], MATCH_MODE_REGEX)
+
+        assert _highlighted(matcher, 'ab 1-1 1-2') == [('ab', 1), ('1-1', 0)]
+
+    def test_fuzzy_highlights_approximate_match(self):
+        """あいまい検索では、編集距離が上限以下の箇所を検索語の位置の色でハイライトすること"""
+        matcher = HighlightMatcher(['NOT ガス', 'ｺﾝﾌﾟﾚｯｻｰ', 'valve'], MATCH_MODE_FUZZY)
+
+        assert _highlighted(matcher, '空気コンプレッサの点検 valv') == [('コンプレッサ', 1), ('valv', 2)]
+
+    def test_invalid_and_empty_terms_are_skipped(self):
+        """解釈できない検索語と空の検索語はハイライトしないこと"""
+        matcher = HighlightMatcher(['', '(', 'NOT ガス'], MATCH_MODE_REGEX)
+
+        assert not matcher
+        assert _highlighted(matcher, 'ガス(') == []
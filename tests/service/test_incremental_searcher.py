@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from service.incremental_searcher import IncrementalSearchWorker
+
+
+class TestIncrementalSearchWorker:
+    """IncrementalSearchWorkerクラスのテスト"""
+
+    @pytest.fixture
+    def worker(self, temp_dir, qapp):
+        for name, text in (('pump.txt', 'ポンプの点検'), ('valve.txt', 'バルブの交換')):
+            with open(os.path.join(temp_dir, name), 'w', encoding='utf-8') as f:
+                f.write(text)
+        worker = IncrementalSearchWorker(os.path.join(temp_dir, 'search_index.json'))
+        worker.indexer.create_index([temp_dir])
+        yield worker
+        worker.stop()
+
+    def test_search_runs_on_persistent_thread(self, qtbot, worker):
+        """同じスレッドで続けて検索し、検索IDとともに結果を返すこと"""
+        with qtbot.waitSignal(worker.results_ready, timeout=3000) as first:
+            first_id = worker.submit(['ポンプ'])
+        with qtbot.waitSignal(worker.results_ready, timeout=3000) as second:
+            second_id = worker.submit(['バルブ'])
+
+        assert first.args[0] == first_id
+        assert [os.path.basename(path) for path, _ in first.args[1]] == ['pump.txt']
+        assert second.args[0] == second_id
+        assert [os.path.basename(path) for path, _ in second.args[1]] == ['valve.txt']
+
+    def test_superseded_search_is_cancelled(self, worker):
+        """新しい検索を依頼すると前の検索IDは最新でなくなること"""
+        first_id = worker.submit(['ポンプ'])
+        second_id = worker.submit(['バルブ'])
+
+        assert not worker.is_current(first_id)
+        assert worker.is_current(second_id)
+
+        worker.cancel()
+        assert not worker.is_current(second_id)
+
+    def test_stop_finishes_thread(self, qtbot, worker):
+        """stopでスレッドが終了すること"""
+        with qtbot.waitSignal(worker.results_ready, timeout=3000):
+            worker.submit(['ポンプ'])
+
+        worker.stop()
+
+        assert worker.isFinished()
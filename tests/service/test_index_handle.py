@@ -0,0 +1,89 @@
+import gc
+import os
+from unittest.mock import patch
+
+import pytest
+
+from service.index_handle import IndexHandle
+from service.index_storage import IndexStorage
+from service.search_indexer import SearchIndexer
+
+
+class TestIndexHandle:
+    """共有インデックスハンドルのテスト"""
+
+    @pytest.fixture
+    def index_path(self, temp_dir):
+        root = os.path.join(temp_dir, 'root')
+        os.makedirs(root)
+        with open(os.path.join(root, 'manual.txt'), 'w', encoding='utf-8') as f:
+            f.write('ポンプの分解手順')
+
+        index_path = os.path.join(temp_dir, 'search_index.json')
+        indexer = SearchIndexer(index_path)
+        indexer.create_index([root])
+        del indexer
+        gc.collect()
+        return index_path
+
+    def test_instances_share_one_handle(self, index_path):
+        """同じインデックスファイルのインスタンスが本体を1度だけ読み込むこと"""
+        with patch.object(IndexStorage, 'load', autospec=True, side_effect=IndexStorage.load) as mock_load:
+            first = SearchIndexer(index_path)
+            second = SearchIndexer(index_path)
+
+            assert first.search_in_index(['ポンプ']) == second.search_in_index(['ポンプ'])
+            assert first._handle is second._handle
+            assert mock_load.call_count == 1
+
+    def test_later_local_cache_dir_applies_to_shared_handle(self, index_path, temp_dir):
+        """作成済みのハンドルにも、後から渡した複製先のフォルダの設定が反映されること"""
+        cache_dir = os.path.join(temp_dir, 'cache')
+        first = SearchIndexer(index_path)
+        second = SearchIndexer(index_path, cache_dir)
+
+        assert first._handle is second._handle
+        assert first.storage.local_cache_dir == cache_dir
+
+        SearchIndexer(index_path)
+        assert first.storage.local_cache_dir == cache_dir
+        SearchIndexer(index_path, '')
+        assert first.storage.local_cache_dir is None
+
+    def test_stats_read_header_only(self, index_path):
+        """統計情報の取得で本体を読み込まないこと"""
+        indexer = SearchIndexer(index_path)
+
+        stats = indexer.get_index_stats()
+
+        assert stats['files_count'] == 1
+        assert stats['total_size_mb'] > 0
+        assert not indexer._handle.is_loaded
+
+    def test_release_drops_body(self, index_path):
+        """最後の参照が解放されたら本体を破棄すること"""
+        indexer = SearchIndexer(index_path)
+        handle = indexer._handle
+        indexer.search_in_index(['ポンプ'])
+
+        del indexer
+        gc.collect()
+
+        assert handle.ref_count == 0
+        assert not handle.is_loaded
+        new_handle = IndexHandle.acquire(index_path)
+        assert new_handle is not handle
+        new_handle.release()
+
+    def test_update_does_not_mutate_published_body(self, index_path, temp_dir):
+        """更新中も他のインスタンスが参照する本体は書き換えないこと"""
+        reader = SearchIndexer(index_path)
+        writer = SearchIndexer(index_path)
+        published_files = reader.index_data['files']
+
+        writer.reset_index()
+        writer.create_index([os.path.join(temp_dir, 'root')])
+
+        assert len(published_files) == 1
+        assert reader.index_data['files'] is not published_files
+        assert len(reader.index_data['files']) == 1
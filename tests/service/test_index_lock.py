@@ -0,0 +1,67 @@
+import json
+import os
+import time
+
+import pytest
+
+from service.index_lock import IndexLockTimeoutError, IndexWriteLock
+
+
+class TestIndexWriteLock:
+    """共有インデックスの書き込みロックのテスト"""
+
+    @pytest.fixture
+    def index_path(self, temp_dir):
+        return os.path.join(temp_dir, 'search_index.json')
+
+    def test_lock_file_exists_while_held(self, index_path):
+        """ロック中はロックファイルが存在し、解放で削除されること"""
+        lock = IndexWriteLock(index_path)
+
+        with lock:
+            assert os.path.exists(lock.lock_path)
+
+        assert not os.path.exists(lock.lock_path)
+
+    def test_second_writer_times_out(self, index_path):
+        """他のプロセスがロック中の場合、待ち時間を過ぎるとエラーになること"""
+        with IndexWriteLock(index_path):
+            with pytest.raises(IndexLockTimeoutError):
+                IndexWriteLock(index_path, timeout=0).acquire()
+
+    def test_stale_lock_is_broken(self, index_path):
+        """異常終了で残った古いロックは破棄して取得できること"""
+        lock = IndexWriteLock(index_path, timeout=0, stale_seconds=60)
+        with open(lock.lock_path, 'w', encoding='utf-8') as f:
+            f.write('{}')
+        old = time.time() - 120
+        os.utime(lock.lock_path, (old, old))
+
+        with lock:
+            assert os.path.getmtime(lock.lock_path) > old
+
+    def test_release_keeps_lock_taken_over_by_other_process(self, index_path):
+        """破棄されて他のプロセスが取得し直したロックは、解放時に削除しないこと"""
+        lock = IndexWriteLock(index_path)
+        lock.acquire()
+        with open(lock.lock_path, 'w', encoding='utf-8') as f:
+            json.dump({"token": "other"}, f)
+
+        lock.release()
+
+        with open(lock.lock_path, encoding='utf-8') as f:
+            assert json.load(f) == {"token": "other"}
+
+    def test_lock_file_is_touched_while_held(self, index_path):
+        """ロック中はロックファイルの更新日時が更新され、古いロックとして破棄されないこと"""
+        lock = IndexWriteLock(index_path, refresh_interval=0.01)
+        with lock:
+            old = time.time() - 120
+            os.utime(lock.lock_path, (old, old))
+            deadline = time.monotonic() + 5
+            while os.path.getmtime(lock.lock_path) <= old and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert os.path.getmtime(lock.lock_path) > old
+            with pytest.raises(IndexLockTimeoutError):
+                IndexWriteLock(index_path, timeout=0, stale_seconds=60).acquire()
@@ -4,7 +4,7 @@ from unittest.mock import patch, MagicMock
 
 import pytest
 
-from utils.constants import SEARCH_TYPE_AND, SEARCH_TYPE_OR
+from utils.constants import MATCH_MODE_LITERAL, SEARCH_TYPE_AND, SEARCH_TYPE_OR
 from service.indexed_file_searcher import (
     IndexedFileSearcher, SmartFileSearcher, SearchMode
 )
@@ -95,11 +95,15 @@ class TestIndexedFileSearcher:
         ]
         mock_search.return_value = mock_results
         
-        # _should_include_fileも常にTrueを返すようにモック
-        with patch.object(searcher, '_should_include_file', return_value=True):
-            searcher._search_with_index()
+        searcher._search_with_index()
         
-        mock_search.assert_called_once_with(['Python', 'テスト'], SEARCH_TYPE_AND)
+        mock_search.assert_called_once_with(
+            ['Python', 'テスト'], SEARCH_TYPE_AND,
+            directories=[searcher.directory], include_subdirs=True,
+            match_mode=MATCH_MODE_LITERAL, fold_kana=True, max_results_per_file=200,
+            candidates=None
+        )
+        assert searcher.index_search_succeeded
     
     @patch.object(SearchIndexer, 'search_in_index')
     def test_search_with_index_exception_fallback(self, mock_search, searcher):
@@ -109,36 +113,45 @@ class TestIndexedFileSearcher:
         with patch.object(searcher, '_search_without_index') as mock_fallback:
             searcher._search_with_index()
             mock_fallback.assert_called_once()
+        assert not searcher.index_search_succeeded
     
-    def test_should_include_file_with_subdirs(self, searcher, temp_dir):
-        """サブディレクトリ含む設定でのファイルフィルタリングテスト"""
-        # テストファイルパス
-        file_in_subdir = os.path.join(temp_dir, 'subdir', 'test.txt')
+    @pytest.fixture
+    def scoped_index(self, searcher, temp_dir):
+        """直下とサブフォルダに文書を持つインデックス"""
         file_in_root = os.path.join(temp_dir, 'test.txt')
-        
-        searcher.include_subdirs = True
-        searcher.directory = temp_dir
-        
-        assert searcher._should_include_file(file_in_subdir) == True
-        assert searcher._should_include_file(file_in_root) == True
-    
-    def test_should_include_file_without_subdirs(self, searcher, temp_dir):
-        """サブディレクトリ除外設定でのファイルフィルタリングテスト"""
-        # テストファイルパス
         file_in_subdir = os.path.join(temp_dir, 'subdir', 'test.txt')
-        file_in_root = os.path.join(temp_dir, 'test.txt')
-        
+        searcher.indexer.index_data['files'] = {
+            file_in_root: {'content': 'Python テスト'},
+            file_in_subdir: {'content': 'Python テスト'},
+            '/other/root/test.txt': {'content': 'Python テスト'},
+        }
+        return file_in_root, file_in_subdir
+
+    def _collect_results(self, searcher):
+        results = []
+        searcher.results_batch.connect(lambda batch: results.extend(file_path for file_path, _ in batch))
+        searcher._search_with_index()
+        return results
+
+    def test_search_with_index_scoped_with_subdirs(self, searcher, scoped_index):
+        """サブフォルダを含む設定ではフォルダ配下の文書のみが結果になること"""
+        file_in_root, file_in_subdir = scoped_index
+        searcher.include_subdirs = True
+
+        assert sorted(self._collect_results(searcher)) == sorted([file_in_root, file_in_subdir])
+
+    def test_search_with_index_scoped_without_subdirs(self, searcher, scoped_index):
+        """サブフォルダを含まない設定では直下の文書のみが結果になること"""
+        file_in_root, _ = scoped_index
         searcher.include_subdirs = False
-        searcher.directory = temp_dir
-        
-        assert searcher._should_include_file(file_in_subdir) == False
-        assert searcher._should_include_file(file_in_root) == True
-    
-    def test_should_include_file_exception_handling(self, searcher):
-        """ファイルフィルタリング中の例外処理テスト"""
-        # 不正なパスでも例外を発生させずTrueを返すことを確認
-        result = searcher._should_include_file('/invalid/path/test.txt')
-        assert result == True
+
+        assert self._collect_results(searcher) == [file_in_root]
+
+    def test_search_with_index_cross_folder(self, searcher, scoped_index):
+        """フォルダ横断検索ではインデックス全体が対象になること"""
+        searcher.cross_folder_search = True
+
+        assert len(self._collect_results(searcher)) == 3
     
     def test_cancel_search_basic(self, searcher):
         """基本的な検索キャンセル機能テスト"""
@@ -269,6 +282,7 @@ class TestSmartFileSearcher:
         with patch.object(smart_searcher, '_is_index_available', return_value=False):
             smart_searcher.run()
             # 検索が実行されないことを確認（search_completedシグナルのみ発出）
+        assert not smart_searcher.index_search_succeeded
 
     def test_search_mode_fallback(self, smart_searcher):
         """FALLBACKモードのテスト（親クラスの動作）"""
@@ -385,15 +399,15 @@ class TestIndexedFileSearcherIntegration:
         # 検索結果を収集するリスト
         results = []
         
-        def collect_result(file_path, matches):
-            results.append((file_path, matches))
+        def collect_result(batch):
+            results.extend(batch)
         
         # IndexedFileSearcher作成
         searcher = IndexedFileSearcher(directory=setup['temp_dir'], search_terms=['Python'], include_subdirs=True,
                                        search_type=SEARCH_TYPE_OR, file_extensions=['.txt'], context_length=50,
                                        index_file_path=setup['index_path'])
         
-        searcher.result_found.connect(collect_result)
+        searcher.results_batch.connect(collect_result)
         
         # 検索実行
         searcher.run()
@@ -413,15 +427,15 @@ class TestIndexedFileSearcherIntegration:
         
         results = []
         
-        def collect_result(file_path, matches):
-            results.append((file_path, matches))
+        def collect_result(batch):
+            results.extend(batch)
         
         # IndexedFileSearcher作成
         searcher = IndexedFileSearcher(directory=setup['temp_dir'], search_terms=['Python'], include_subdirs=True,
                                        search_type=SEARCH_TYPE_OR, file_extensions=['.txt'], context_length=50,
                                        index_file_path=fake_index_path)
         
-        searcher.result_found.connect(collect_result)
+        searcher.results_batch.connect(collect_result)
         
         # 検索実行（フォールバックされることを期待）
         searcher.run()
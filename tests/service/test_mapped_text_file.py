@@ -0,0 +1,68 @@
+import pytest
+
+from service.mapped_text_file import MappedTextFile
+
+
+@pytest.fixture
+def make_file(tmp_path):
+    def _make_file(content: bytes, name: str = 'large.txt') -> str:
+        path = tmp_path / name
+        path.write_bytes(content)
+        return str(path)
+    return _make_file
+
+
+class TestMappedTextFile:
+    """MappedTextFileのテスト"""
+
+    @pytest.mark.parametrize("chunk_size", [7, 64, 1024 * 1024])
+    def test_lines_across_chunks(self, make_file, chunk_size):
+        """チャンクの境界をまたいでも行の範囲を正しく読み出せること"""
+        lines = [f'行{i} テキスト' for i in range(50)]
+        path = make_file('\n'.join(lines).encode('utf-8'))
+
+        text_file = MappedTextFile(path, chunk_size=chunk_size)
+        try:
+            assert text_file.line_count == 50
+            assert text_file.lines(0, 3) == '\n'.join(lines[0:3])
+            assert text_file.lines(20, 25) == '\n'.join(lines[20:25])
+            assert text_file.lines(48, 60) == '\n'.join(lines[48:50])
+        finally:
+            text_file.close()
+
+    def test_trailing_newline_and_crlf(self, make_file):
+        """末尾の改行は行として数えず、CRLFはLFとして読み出すこと"""
+        path = make_file(b'first\r\nsecond\r\nthird\r\n')
+
+        text_file = MappedTextFile(path)
+        try:
+            assert text_file.line_count == 3
+            assert text_file.lines(1, 3) == 'second\nthird'
+        finally:
+            text_file.close()
+
+    def test_shift_jis(self, make_file):
+        """Shift_JISのファイルを判定して読み出せること"""
+        path = make_file('検索対象の文書です\n二行目の日本語テキスト\n'.encode('cp932') * 200)
+
+        text_file = MappedTextFile(path)
+        try:
+            assert text_file.lines(1, 2) == '二行目の日本語テキスト'
+        finally:
+            text_file.close()
+
+    def test_empty_file(self, make_file):
+        """空のファイルは1行の空文字列として扱うこと"""
+        text_file = MappedTextFile(make_file(b''))
+        try:
+            assert text_file.line_count == 1
+            assert text_file.lines(0, 1) == ''
+        finally:
+            text_file.close()
+
+    def test_utf16_not_supported(self, make_file):
+        """改行が1バイトでないエンコーディングはValueErrorになること"""
+        path = make_file('テキスト\n'.encode('utf-16') * 100)
+
+        with pytest.raises(ValueError):
+            MappedTextFile(path)
@@ -0,0 +1,77 @@
+import os
+
+from service.markdown_renderer import MarkdownRenderCache, build_line_map, render_markdown
+
+MARKDOWN = """# 取扱説明書
+
+これは説明書です。
+二行目があります。
+
+| 項目 | 説明 |
+|------|------|
+| 電源 | 電源ボタンを**押す** |
+
+- [リンク](http://example.com) の項目
+
+```python
+def test_function():
+```
+"""
+
+
+class TestBuildLineMap:
+    """Markdownの行と描画後のブロックの対応付けのテスト"""
+
+    def test_lines_map_to_rendered_blocks(self, qapp):
+        """見出し・段落・表・リスト・コードの行が、表示されるブロックに対応すること"""
+        rendered = render_markdown(MARKDOWN)
+        document = rendered.document
+
+        def block_text(line):
+            return document.findBlockByNumber(rendered.line_blocks[line - 1]).text()
+
+        assert len(rendered.line_blocks) == len(MARKDOWN.splitlines())
+        assert block_text(1) == '取扱説明書'
+        assert block_text(4).startswith('これは説明書です。')
+        assert block_text(8) == '電源'
+        assert block_text(10) == 'リンク の項目'
+        assert block_text(13) == 'def test_function():'
+
+    def test_unmatched_lines_keep_previous_block(self):
+        """見つからない行は直前の行と同じブロックになること"""
+        assert build_line_map(['a', '', 'zzz', 'b'], ['a', 'b']) == [0, 0, 0, 1]
+
+
+class TestMarkdownRenderCache:
+    """MarkdownRenderCacheのテスト"""
+
+    def test_cache_is_invalidated_when_file_changes(self, qapp, tmp_path):
+        """ファイルが更新されると描画済みの文書を返さないこと"""
+        path = tmp_path / 'manual.md'
+        path.write_text('# title', encoding='utf-8')
+        cache = MarkdownRenderCache()
+        rendered = render_markdown('# title')
+
+        cache.put(MarkdownRenderCache.make_key(str(path)), rendered)
+        assert cache.get(str(path)) is rendered
+
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert cache.get(str(path)) is None
+
+    def test_least_recently_used_is_evicted(self, qapp, tmp_path):
+        """上限を超えると最も長く使っていない文書から破棄すること"""
+        cache = MarkdownRenderCache(max_entries=2)
+        paths = []
+        for name in 'abc':
+            path = tmp_path / f'{name}.md'
+            path.write_text(name, encoding='utf-8')
+            paths.append(str(path))
+
+        cache.put(MarkdownRenderCache.make_key(paths[0]), render_markdown('a'))
+        cache.put(MarkdownRenderCache.make_key(paths[1]), render_markdown('b'))
+        assert cache.get(paths[0]) is not None
+        cache.put(MarkdownRenderCache.make_key(paths[2]), render_markdown('c'))
+
+        assert cache.get(paths[0]) is not None
+        assert cache.get(paths[1]) is None
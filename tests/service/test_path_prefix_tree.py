@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from service.path_prefix_tree import PathPrefixTree
+
+
+class TestPathPrefixTree:
+    """PathPrefixTreeクラスのテスト"""
+
+    @pytest.fixture
+    def base_dir(self, temp_dir):
+        return os.path.join(temp_dir, 'manuals')
+
+    @pytest.fixture
+    def tree(self, base_dir):
+        paths = [
+            os.path.join(base_dir, 'b.txt'),
+            os.path.join(base_dir, 'sub', 'deep', 'c.pdf'),
+            os.path.join(base_dir, 'a.txt'),
+            os.path.join(base_dir, 'sub', 'd.md'),
+            os.path.join(base_dir + '_other', 'e.txt'),
+        ]
+        return PathPrefixTree(paths)
+
+    def _names(self, tree, doc_ids):
+        return sorted(os.path.basename(tree.doc_paths[doc_id]) for doc_id in doc_ids)
+
+    def test_subtree_is_contiguous_range(self, tree, base_dir):
+        """サブフォルダを含む文書が連続したIDの範囲になること"""
+        doc_range = tree.get_range(base_dir, include_subdirs=True)
+
+        assert self._names(tree, doc_range) == ['a.txt', 'b.txt', 'c.pdf', 'd.md']
+
+    def test_direct_children_only(self, tree, base_dir):
+        """サブフォルダを含まない場合は直下の文書だけになること"""
+        doc_range = tree.get_range(base_dir, include_subdirs=False)
+
+        assert self._names(tree, doc_range) == ['a.txt', 'b.txt']
+
+    def test_sibling_with_common_prefix_is_excluded(self, tree, base_dir):
+        """名前の先頭が同じ別フォルダの文書を含まないこと"""
+        assert 'e.txt' not in self._names(tree, tree.get_range(base_dir))
+        assert self._names(tree, tree.get_range(base_dir + '_other')) == ['e.txt']
+
+    def test_unknown_directory_returns_empty_range(self, tree, temp_dir):
+        """文書のないフォルダでは空の範囲になること"""
+        assert len(tree.get_range(os.path.join(temp_dir, 'missing'))) == 0
+
+    def test_trailing_separator_is_ignored(self, tree, base_dir):
+        """末尾の区切り文字の有無で結果が変わらないこと"""
+        assert tree.get_range(base_dir + os.sep) == tree.get_range(base_dir)
+
+    def test_select_deduplicates_overlapping_directories(self, tree, base_dir):
+        """重なるフォルダを指定しても文書が重複しないこと"""
+        doc_ids = tree.select([base_dir, os.path.join(base_dir, 'sub')])
+
+        assert self._names(tree, doc_ids) == ['a.txt', 'b.txt', 'c.pdf', 'd.md']
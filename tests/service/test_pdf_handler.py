@@ -2,31 +2,28 @@ import atexit
 import os
 import subprocess
 import tempfile
-import time
-from unittest.mock import MagicMock, Mock, call, mock_open, patch
+from unittest.mock import MagicMock, Mock, mock_open, patch
 
 import fitz
-import psutil
 import pytest
 
+from service.highlight_matcher import HighlightMatcher
 from service.pdf_handler import (
-    AcrobatProcessManager,
+    HighlightCache,
     PDFHighlighter,
-    PDFNavigator,
     TempFileManager,
+    build_acrobat_command,
     open_pdf,
     temp_file_manager,
 )
 from utils.constants import (
-    ACROBAT_PROCESS_NAMES,
-    ACROBAT_WAIT_INTERVAL,
-    ACROBAT_WAIT_TIMEOUT,
-    PAGE_NAVIGATION_DELAY,
-    PAGE_NAVIGATION_RETRY_COUNT,
+    DEFAULT_FOLD_KANA,
+    DEFAULT_HIGHLIGHT_PAGE_WINDOW,
+    MATCH_MODE_FUZZY,
+    MATCH_MODE_LITERAL,
+    MATCH_MODE_WILDCARD,
     PDF_ANNOT_FLAG_SCREEN_ONLY,
     PDF_HIGHLIGHT_COLORS,
-    PROCESS_CLEANUP_DELAY,
-    PROCESS_TERMINATE_TIMEOUT,
 )
 
 
@@ -154,325 +151,18 @@ class TestTempFileManager:
             mock_remove.assert_called_once_with(file_path)
 
 
-@pytest.mark.unit
-class TestAcrobatProcessManager:
-    """AcrobatProcessManagerクラスのテスト"""
-
-    def test_is_acrobat_process_valid_names(self):
-        """Acrobatプロセス名の判定が正しく動作することを確認"""
-        valid_names = [
-            'acrobat',
-            'acrobat.exe',
-            'acrord32',
-            'acrord32.exe',
-            'acrord64',
-            'acrord64.exe',
-            'reader_sl',
-            'ACROBAT.EXE',  # 大文字小文字を無視
-        ]
-
-        for name in valid_names:
-            assert AcrobatProcessManager._is_acrobat_process(name.lower()) is True
-
-    def test_is_acrobat_process_invalid_names(self):
-        """Acrobat以外のプロセス名が正しく判定されることを確認"""
-        invalid_names = [
-            'chrome.exe',
-            'notepad.exe',
-            'python.exe',
-            'explorer.exe',
-            'acrobat_fake.exe',
-        ]
-
-        for name in invalid_names:
-            assert AcrobatProcessManager._is_acrobat_process(name.lower()) is False
-
-    @patch('psutil.process_iter')
-    def test_find_processes_no_acrobat(self, mock_process_iter):
-        """Acrobatプロセスが存在しない場合"""
-        mock_processes = [
-            Mock(info={'pid': 1234, 'name': 'chrome.exe'}),
-            Mock(info={'pid': 5678, 'name': 'notepad.exe'}),
-        ]
-        mock_process_iter.return_value = mock_processes
-
-        result = AcrobatProcessManager._find_processes()
-
-        assert len(result) == 0
-
-    @patch('psutil.process_iter')
-    def test_find_processes_with_acrobat(self, mock_process_iter):
-        """Acrobatプロセスが存在する場合"""
-        mock_acrobat_proc = Mock(info={'pid': 9999, 'name': 'Acrobat.exe'})
-        mock_reader_proc = Mock(info={'pid': 8888, 'name': 'AcroRd32.exe'})
-        mock_other_proc = Mock(info={'pid': 1234, 'name': 'chrome.exe'})
-
-        mock_process_iter.return_value = [
-            mock_acrobat_proc,
-            mock_reader_proc,
-            mock_other_proc,
-        ]
-
-        result = AcrobatProcessManager._find_processes()
-
-        assert len(result) == 2
-        assert mock_acrobat_proc in result
-        assert mock_reader_proc in result
-        assert mock_other_proc not in result
-
-    def test_terminate_process_normal_termination(self):
-        """プロセスが正常に終了する場合"""
-        mock_proc = Mock()
-        mock_proc.info = {'name': 'Acrobat.exe'}
-        mock_proc.pid = 1234
-        mock_proc.wait.return_value = None
-
-        AcrobatProcessManager._terminate_process(mock_proc)
-
-        mock_proc.terminate.assert_called_once()
-        mock_proc.wait.assert_called_once_with(timeout=PROCESS_TERMINATE_TIMEOUT)
-        mock_proc.kill.assert_not_called()
-
-    def test_terminate_process_timeout_force_kill(self):
-        """プロセス終了がタイムアウトした場合の強制終了"""
-        mock_proc = Mock()
-        mock_proc.info = {'name': 'Acrobat.exe'}
-        mock_proc.pid = 1234
-        mock_proc.wait.side_effect = psutil.TimeoutExpired(PROCESS_TERMINATE_TIMEOUT)
-
-        AcrobatProcessManager._terminate_process(mock_proc)
-
-        mock_proc.terminate.assert_called_once()
-        mock_proc.wait.assert_called_once_with(timeout=PROCESS_TERMINATE_TIMEOUT)
-        mock_proc.kill.assert_called_once()
-
-    def test_terminate_process_no_such_process(self):
-        """プロセスが既に存在しない場合のエラーハンドリング"""
-        mock_proc = Mock()
-        mock_proc.info = {'name': 'Acrobat.exe'}
-        mock_proc.pid = 1234
-        mock_proc.terminate.side_effect = psutil.NoSuchProcess(1234)
-
-        # エラーが発生しても例外が外部に伝搬しないことを確認
-        AcrobatProcessManager._terminate_process(mock_proc)
-
-        mock_proc.terminate.assert_called_once()
-
-    def test_terminate_process_access_denied(self):
-        """プロセスへのアクセスが拒否された場合のエラーハンドリング"""
-        mock_proc = Mock()
-        mock_proc.info = {'name': 'Acrobat.exe'}
-        mock_proc.pid = 1234
-        mock_proc.terminate.side_effect = psutil.AccessDenied(1234)
-
-        # エラーが発生しても例外が外部に伝搬しないことを確認
-        AcrobatProcessManager._terminate_process(mock_proc)
-
-        mock_proc.terminate.assert_called_once()
-
-    @patch('time.sleep')
-    @patch.object(AcrobatProcessManager, '_terminate_process')
-    @patch.object(AcrobatProcessManager, '_find_processes')
-    def test_close_all_processes_no_processes(self, mock_find, mock_terminate, mock_sleep):
-        """Acrobatプロセスが存在しない場合"""
-        mock_find.return_value = []
-
-        AcrobatProcessManager.close_all_processes()
-
-        mock_find.assert_called_once()
-        mock_terminate.assert_not_called()
-        mock_sleep.assert_not_called()
-
-    @patch('time.sleep')
-    @patch.object(AcrobatProcessManager, '_terminate_process')
-    @patch.object(AcrobatProcessManager, '_find_processes')
-    def test_close_all_processes_with_processes(self, mock_find, mock_terminate, mock_sleep):
-        """Acrobatプロセスが存在する場合"""
-        mock_processes = [Mock(), Mock(), Mock()]
-        mock_find.return_value = mock_processes
-
-        AcrobatProcessManager.close_all_processes()
-
-        mock_find.assert_called_once()
-        assert mock_terminate.call_count == 3
-        mock_sleep.assert_called_once_with(PROCESS_CLEANUP_DELAY)
-
-    @patch.object(AcrobatProcessManager, '_find_processes')
-    def test_close_all_processes_exception_handling(self, mock_find):
-        """プロセス検索中の例外処理"""
-        mock_find.side_effect = Exception("Unexpected error")
-
-        # エラーが発生しても例外が外部に伝搬しないことを確認
-        AcrobatProcessManager.close_all_processes()
-
-        mock_find.assert_called_once()
-
-    @patch('time.sleep')
-    @patch('pyautogui.getActiveWindowTitle')
-    @patch('psutil.Process')
-    def test_wait_for_startup_success(self, mock_process_class, mock_get_window, mock_sleep):
-        """Acrobat起動待機が成功する場合"""
-        mock_process = Mock()
-        mock_process.status.return_value = psutil.STATUS_RUNNING
-        mock_process_class.return_value = mock_process
-
-        mock_get_window.return_value = "Adobe Acrobat Reader DC"
-
-        result = AcrobatProcessManager.wait_for_startup(1234, timeout=5)
-
-        assert result is True
-        mock_process_class.assert_called_with(1234)
-
-    @patch('time.sleep')
-    @patch('psutil.Process')
-    def test_wait_for_startup_process_not_running(self, mock_process_class, mock_sleep):
-        """プロセスがRUNNING状態でない場合"""
-        mock_process = Mock()
-        mock_process.status.return_value = psutil.STATUS_SLEEPING
-        mock_process_class.return_value = mock_process
-
-        # タイムアウトを短く設定
-        with patch('service.pdf_handler.ACROBAT_WAIT_TIMEOUT', 1):
-            result = AcrobatProcessManager.wait_for_startup(1234, timeout=1)
-
-        assert result is False
-
-    @patch('time.sleep')
-    @patch('psutil.Process')
-    def test_wait_for_startup_no_such_process(self, mock_process_class, mock_sleep):
-        """プロセスが存在しない場合"""
-        mock_process_class.side_effect = psutil.NoSuchProcess(1234)
-
-        result = AcrobatProcessManager.wait_for_startup(1234, timeout=5)
-
-        assert result is False
-
-    @patch('time.sleep')
-    @patch('pyautogui.getActiveWindowTitle')
-    @patch('psutil.Process')
-    def test_wait_for_startup_window_title_exception(self, mock_process_class, mock_get_window, mock_sleep):
-        """ウィンドウタイトル取得時の例外処理"""
-        mock_process = Mock()
-        mock_process.status.return_value = psutil.STATUS_RUNNING
-        mock_process_class.return_value = mock_process
-
-        # 最初は例外、その後成功
-        mock_get_window.side_effect = [
-            Exception("Window access error"),
-            "Adobe Acrobat Reader DC",
-        ]
-
-        result = AcrobatProcessManager.wait_for_startup(1234, timeout=5)
-
-        assert result is True
-
-    @patch('service.pdf_handler.time.sleep')
-    @patch('service.pdf_handler.time.time')
-    @patch('psutil.Process')
-    def test_wait_for_startup_timeout(self, mock_process_class, mock_time, mock_sleep):
-        """起動待機がタイムアウトする場合"""
-        # time.time()をモック化してタイムアウトをシミュレート
-        # start_timeが0、whileループチェック時に2.0でタイムアウト、loggerでも使われるので十分な値を用意
-        mock_time.side_effect = [0, 2.0, 2.0, 2.0, 2.0]
-
-        mock_process = Mock()
-        mock_process.status.return_value = psutil.STATUS_ZOMBIE  # RUNNINGではない状態
-        mock_process_class.return_value = mock_process
-
-        result = AcrobatProcessManager.wait_for_startup(1234, timeout=1)
-
-        assert result is False
-
-
-@pytest.mark.unit
-class TestPDFNavigator:
-    """PDFNavigatorクラスのテスト"""
-
-    @patch('pyautogui.press')
-    @patch('pyautogui.write')
-    @patch('pyautogui.hotkey')
-    @patch('time.sleep')
-    def test_navigate_to_page_one(self, mock_sleep, mock_hotkey, mock_write, mock_press):
-        """1ページ目への移動は何もしないことを確認"""
-        PDFNavigator.navigate_to_page(1)
-
-        mock_hotkey.assert_not_called()
-        mock_write.assert_not_called()
-        mock_press.assert_not_called()
-
-    @patch('pyautogui.press')
-    @patch('pyautogui.write')
-    @patch('pyautogui.hotkey')
-    @patch('time.sleep')
-    def test_navigate_to_page_success(self, mock_sleep, mock_hotkey, mock_write, mock_press):
-        """ページ移動が正常に実行されることを確認"""
-        page_number = 42
-
-        PDFNavigator.navigate_to_page(page_number)
-
-        assert mock_hotkey.call_args_list[0] == call('ctrl', 'shift', 'n')
-        # 既存の入力をクリア
-        assert mock_hotkey.call_args_list[1] == call('ctrl', 'a')
-        # ページ番号を入力
-        mock_write.assert_called_once_with(str(page_number))
-        # Enter で確定
-        mock_press.assert_called_once_with('enter')
-
-    @patch('time.sleep')
-    @patch.object(PDFNavigator, '_execute_navigation')
-    def test_navigate_to_page_with_retry_on_error(self, mock_execute, mock_sleep):
-        """ページ移動でエラーが発生した場合のリトライ"""
-        page_number = 10
-        # 最初の2回は失敗、3回目で成功
-        mock_execute.side_effect = [
-            Exception("Navigation error 1"),
-            Exception("Navigation error 2"),
-            None,
-        ]
-
-        PDFNavigator.navigate_to_page(page_number)
-
-        assert mock_execute.call_count == 3
-        # リトライ間隔でsleepが呼ばれることを確認
-        assert mock_sleep.call_count >= 2
-
-    @patch('time.sleep')
-    @patch.object(PDFNavigator, '_execute_navigation')
-    def test_navigate_to_page_all_retries_fail(self, mock_execute, mock_sleep):
-        """すべてのリトライが失敗する場合"""
-        page_number = 10
-        mock_execute.side_effect = Exception("Navigation error")
-
-        # 例外が外部に伝搬しないことを確認
-        PDFNavigator.navigate_to_page(page_number)
-
-        assert mock_execute.call_count == PAGE_NAVIGATION_RETRY_COUNT
-
-    @patch('pyautogui.press')
-    @patch('pyautogui.write')
-    @patch('pyautogui.hotkey')
-    @patch('time.sleep')
-    def test_execute_navigation_timing(self, mock_sleep, mock_hotkey, mock_write, mock_press):
-        """ナビゲーション実行時のタイミング確認"""
-        PDFNavigator._execute_navigation(99)
-
-        # 適切なタイミングでsleepが呼ばれることを確認
-        sleep_calls = [call[0][0] for call in mock_sleep.call_args_list]
-        assert PAGE_NAVIGATION_DELAY in sleep_calls
-
-
 @pytest.mark.unit
 class TestPDFHighlighter:
     """PDFHighlighterクラスのテスト"""
 
     @pytest.fixture
-    def mock_pdf_document(self):
+    def mock_pdf_document(self, make_page_text):
         """モックPDFドキュメント"""
         mock_pages = []
 
         for i in range(3):
             mock_page = Mock(spec=fitz.Page)
-            mock_page.search_for.return_value = []
+            mock_page.get_text.return_value = make_page_text()
             mock_pages.append(mock_page)
 
         mock_doc = MagicMock()
@@ -538,38 +228,39 @@ class TestPDFHighlighter:
 
         assert 'PDFのハイライト処理中にエラー' in str(exc_info.value)
 
-    def test_add_highlights_empty_terms(self, mock_pdf_document):
+    def test_add_highlights_empty_terms(self, mock_pdf_document, make_page_text):
         """空の検索語が適切にスキップされることを確認"""
         mock_doc, mock_pages = mock_pdf_document
+        for mock_page in mock_pages:
+            mock_page.get_text.return_value = make_page_text('valid and another')
         search_terms = ['valid', '', '  ', 'another']
 
-        PDFHighlighter._add_highlights(mock_doc, search_terms)
+        PDFHighlighter._add_highlights(mock_doc, HighlightMatcher(search_terms))
 
-        # 空でない検索語のみが処理されることを確認
-        # 各ページで'valid'と'another'が検索される
+        # 空でない検索語の一致箇所だけがハイライトされる
         for mock_page in mock_pages:
-            calls = [str(c) for c in mock_page.search_for.call_args_list]
-            assert any('valid' in str(c) for c in calls)
-            assert any('another' in str(c) for c in calls)
-            # 空文字列は検索されない
-            assert not any("''" in str(c) or '""' in str(c) for c in calls if 'search_for' not in str(c))
+            assert mock_page.add_highlight_annot.call_count == 2
 
-    def test_add_highlights_with_results(self, mock_pdf_document):
-        """検索結果がある場合のハイライト追加"""
+    def test_add_highlights_without_terms_does_not_read_pages(self, mock_pdf_document):
+        """ハイライトする検索語がない場合はページのテキストを読まない"""
         mock_doc, mock_pages = mock_pdf_document
 
-        # 検索結果のモック（矩形領域）
-        mock_rect1 = fitz.Rect(100, 100, 200, 120)
-        mock_rect2 = fitz.Rect(150, 150, 250, 170)
+        PDFHighlighter._add_highlights(mock_doc, HighlightMatcher(['', '  ']))
 
-        mock_pages[0].search_for.return_value = [mock_rect1, mock_rect2]
+        for mock_page in mock_pages:
+            mock_page.get_text.assert_not_called()
+
+    def test_add_highlights_with_results(self, mock_pdf_document, make_page_text):
+        """検索結果がある場合のハイライト追加"""
+        mock_doc, mock_pages = mock_pdf_document
+        mock_pages[0].get_text.return_value = make_page_text('keyword one', 'keyword two')
 
         mock_highlight = Mock()
         mock_pages[0].add_highlight_annot.return_value = mock_highlight
 
         search_terms = ['keyword']
 
-        PDFHighlighter._add_highlights(mock_doc, search_terms)
+        PDFHighlighter._add_highlights(mock_doc, HighlightMatcher(search_terms))
 
         # ハイライトが2回追加されることを確認
         assert mock_pages[0].add_highlight_annot.call_count == 2
@@ -577,12 +268,45 @@ class TestPDFHighlighter:
         assert mock_highlight.set_colors.call_count == 2
         assert mock_highlight.update.call_count == 2
 
-    def test_highlight_term_in_page_color_rotation(self):
-        """複数の検索語で色がローテーションされることを確認"""
+    def test_find_highlights_returns_match_rects(self, make_page_text):
+        """一致した文字の矩形を行ごとにまとめて返す"""
         mock_page = Mock(spec=fitz.Page)
-        mock_rect = fitz.Rect(0, 0, 100, 20)
-        mock_page.search_for.return_value = [mock_rect]
+        mock_page.get_text.return_value = make_page_text('safety valve')
+
+        highlights = PDFHighlighter.find_highlights(mock_page, HighlightMatcher(['check', 'valve']))
+
+        assert highlights == [([fitz.Rect(142, 100, 192, 112)], 1)]
+
+    def test_find_highlights_splits_match_across_lines(self, make_page_text):
+        """行をまたぐ一致は行ごとの矩形に分ける"""
+        mock_page = Mock(spec=fitz.Page)
+        mock_page.get_text.return_value = make_page_text('safety', 'valve')
+
+        highlights = PDFHighlighter.find_highlights(mock_page, HighlightMatcher(['"safety valve"']))
+
+        assert highlights == [([fitz.Rect(72, 100, 132, 112), fitz.Rect(72, 120, 122, 132)], 0)]
 
+    def test_find_highlights_folds_character_width(self, make_page_text):
+        """半角カナの検索語でも、全角カナの文字の矩形を返す"""
+        mock_page = Mock(spec=fitz.Page)
+        mock_page.get_text.return_value = make_page_text('空気コンプレッサ')
+
+        highlights = PDFHighlighter.find_highlights(mock_page, HighlightMatcher(['ｺﾝﾌﾟﾚｯｻ']))
+
+        assert highlights == [([fitz.Rect(92, 100, 152, 112)], 0)]
+
+    def test_find_highlights_fuzzy_match(self, make_page_text):
+        """あいまい検索では、検索語に近い箇所の文字の矩形を返す"""
+        mock_page = Mock(spec=fitz.Page)
+        mock_page.get_text.return_value = make_page_text('safety valve')
+
+        highlights = PDFHighlighter.find_highlights(mock_page, HighlightMatcher(['safty'], MATCH_MODE_FUZZY))
+
+        assert highlights == [([fitz.Rect(72, 100, 132, 112)], 0)]
+
+    def test_highlight_annot_color_rotation(self):
+        """複数の検索語で色がローテーションされることを確認"""
+        mock_page = Mock(spec=fitz.Page)
         mock_highlight = Mock()
         mock_page.add_highlight_annot.return_value = mock_highlight
 
@@ -590,42 +314,36 @@ class TestPDFHighlighter:
         num_colors = len(PDF_HIGHLIGHT_COLORS)
 
         for color_index in range(num_colors + 3):
-            PDFHighlighter._highlight_term_in_page(mock_page, 'test', color_index)
+            PDFHighlighter._add_highlight_annot(mock_page, [fitz.Rect(0, 0, 100, 20)], color_index)
 
             expected_color = PDF_HIGHLIGHT_COLORS[color_index % num_colors]
             mock_highlight.set_colors.assert_called_with(stroke=expected_color)
 
-    def test_highlight_term_in_page_exception_handling(self):
+    def test_highlight_annot_exception_handling(self):
         """ハイライト追加時の例外処理"""
         mock_page = Mock(spec=fitz.Page)
-        mock_rect = fitz.Rect(0, 0, 100, 20)
-        mock_page.search_for.return_value = [mock_rect]
+        mock_page.number = 0
         mock_page.add_highlight_annot.side_effect = Exception("Highlight error")
 
         # 例外が発生しても処理が続行されることを確認
-        PDFHighlighter._highlight_term_in_page(mock_page, 'test', 0)
+        PDFHighlighter._add_highlight_annot(mock_page, [fitz.Rect(0, 0, 100, 20)], 0)
 
         mock_page.add_highlight_annot.assert_called_once()
 
-    def test_highlight_term_in_page_no_matches(self):
+    def test_find_highlights_no_matches(self, make_page_text):
         """検索結果がない場合"""
         mock_page = Mock(spec=fitz.Page)
-        mock_page.search_for.return_value = []
+        mock_page.get_text.return_value = make_page_text('safety valve')
 
-        PDFHighlighter._highlight_term_in_page(mock_page, 'nonexistent', 0)
+        assert PDFHighlighter.find_highlights(mock_page, HighlightMatcher(['nonexistent'])) == []
 
-        mock_page.search_for.assert_called_once_with('nonexistent')
-        mock_page.add_highlight_annot.assert_not_called()
-
-    def test_highlight_term_in_page_sets_screen_only_flag(self):
+    def test_highlight_annot_sets_screen_only_flag(self):
         """ハイライト注釈が印刷対象外フラグで作成されることを確認"""
         mock_page = Mock(spec=fitz.Page)
-        mock_page.search_for.return_value = [fitz.Rect(0, 0, 100, 20)]
-
         mock_highlight = Mock()
         mock_page.add_highlight_annot.return_value = mock_highlight
 
-        PDFHighlighter._highlight_term_in_page(mock_page, 'test', 0)
+        PDFHighlighter._add_highlight_annot(mock_page, [fitz.Rect(0, 0, 100, 20)], 0)
 
         mock_highlight.set_flags.assert_called_once_with(PDF_ANNOT_FLAG_SCREEN_ONLY)
 
@@ -648,49 +366,219 @@ class TestPDFHighlighter:
         finally:
             temp_file_manager.cleanup_single(highlighted_path)
 
+    @pytest.mark.parametrize("page_count,page_number,page_window,expected", [
+        (20, 10, 2, range(7, 12)),
+        (20, 1, 2, range(0, 3)),
+        (20, 20, 2, range(17, 20)),
+        (20, 999, 0, range(19, 20)),
+        (20, 0, 1, range(0, 2)),
+        (0, 1, 2, range(0)),
+    ])
+    def test_page_window_range(self, page_count, page_number, page_window, expected):
+        """表示ページの前後だけがハイライト範囲になり、範囲外のページ番号は丸められることを確認"""
+        assert PDFHighlighter.page_window_range(page_count, page_number, page_window) == expected
+
+    def test_highlight_pdf_only_page_window(self, tmp_path):
+        """ページを指定した場合は前後のページだけをハイライトし、追記保存することを確認"""
+        source_path = str(tmp_path / 'source.pdf')
+        with fitz.open() as source_doc:
+            for i in range(10):
+                page = source_doc.new_page()
+                page.insert_text((72, 72), f'keyword page {i + 1}')
+            source_doc.save(source_path)
+        source_size = os.path.getsize(source_path)
+
+        highlighted_path = PDFHighlighter.highlight_pdf(source_path, ['keyword'], page_number=5, page_window=1)
+
+        try:
+            with fitz.open(highlighted_path) as doc:
+                highlighted_pages = [page.number for page in doc if page.first_annot is not None]
+            assert highlighted_pages == [3, 4, 5]
+            # 追記保存のため、元のPDFの内容がそのまま先頭に残る
+            with open(source_path, 'rb') as source, open(highlighted_path, 'rb') as highlighted:
+                assert highlighted.read(source_size) == source.read()
+        finally:
+            temp_file_manager.cleanup_single(highlighted_path)
+
+    def test_highlight_pdf_repaired_file_is_saved_once(self, tmp_path):
+        """追記保存できない（修復した）PDFでも、範囲のページをハイライトした一時ファイルを作ることを確認"""
+        with fitz.open() as source_doc:
+            for i in range(5):
+                source_doc.new_page().insert_text((72, 72), f'keyword page {i + 1}')
+            data = source_doc.tobytes()
+        # 相互参照表の位置を壊し、開くときに修復が必要なPDFにする
+        source_path = tmp_path / 'broken.pdf'
+        source_path.write_bytes(data[:data.rfind(b'startxref')] + b'startxref\n999999\n%%EOF\n')
+
+        highlighted_path = PDFHighlighter.highlight_pdf(str(source_path), ['keyword'], page_number=1, page_window=1)
+
+        try:
+            with fitz.open(highlighted_path) as doc:
+                assert [page.number for page in doc if page.first_annot is not None] == [0, 1]
+                assert doc.can_save_incrementally()
+            assert not os.path.exists(f"{highlighted_path}.rewrite")
+        finally:
+            temp_file_manager.cleanup_single(highlighted_path)
+
+
+class TestHighlightCache:
+    """HighlightCacheのテスト"""
+
+    @pytest.fixture
+    def make_pdf(self, tmp_path):
+        def _make_pdf(name, page_count=10):
+            path = str(tmp_path / name)
+            with fitz.open() as doc:
+                for i in range(page_count):
+                    doc.new_page().insert_text((72, 72), f'keyword page {i + 1}')
+                doc.save(path)
+            return path
+        return _make_pdf
+
+    @pytest.fixture
+    def cache(self):
+        cache = HighlightCache(TempFileManager(), max_files=2)
+        yield cache
+        cache.clear()
+
+    def test_reuses_copy_for_same_file_and_terms(self, cache, make_pdf):
+        """同じファイルと検索語では、範囲内のページなら作り直さずに同じ一時ファイルを返すこと"""
+        pdf_path = make_pdf('a.pdf')
+
+        first = cache.highlight_pdf(pdf_path, ['keyword'], 5, 2)
+        with patch.object(PDFHighlighter, 'highlight_pdf') as mock_highlight:
+            assert cache.highlight_pdf(pdf_path, [' keyword '], 4, 1) == first
+            mock_highlight.assert_not_called()
+
+    def test_rebuilds_when_page_outside_range_or_file_changed(self, cache, make_pdf):
+        """範囲外のページや更新されたファイルでは作り直し、Acrobatに渡した古い一時ファイルは残すこと"""
+        pdf_path = make_pdf('a.pdf')
+
+        first = cache.highlight_pdf(pdf_path, ['keyword'], 1, 1)
+        second = cache.highlight_pdf(pdf_path, ['keyword'], 9, 1)
+        assert second != first
+        assert os.path.exists(first)
+
+        stat = os.stat(pdf_path)
+        os.utime(pdf_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        third = cache.highlight_pdf(pdf_path, ['keyword'], 9, 1)
+        assert third != second
+        assert os.path.exists(second)
+        for path in (first, second):
+            temp_file_manager.cleanup_single(path)
+
+    def test_rebuilds_when_match_mode_changed(self, cache, make_pdf):
+        """同じ検索語でも照合方法が異なれば作り直すこと"""
+        pdf_path = make_pdf('a.pdf')
+
+        first = cache.highlight_pdf(pdf_path, ['key*'], 5, 2, MATCH_MODE_LITERAL)
+        second = cache.highlight_pdf(pdf_path, ['key*'], 5, 2, MATCH_MODE_WILDCARD)
+
+        assert second != first
+        with fitz.open(second) as doc:
+            assert doc[4].first_annot is not None
+
+    def test_complete_highlights_covers_pages_outside_window(self, cache, make_pdf):
+        """範囲外のページは最初の一時ファイルではハイライトせず、complete_highlightsの後は再利用できること"""
+        pdf_path = make_pdf('a.pdf')
+        first = cache.highlight_pdf(pdf_path, ['keyword'], 5, 1)
+        with fitz.open(first) as doc:
+            assert doc[8].first_annot is None
+
+        cache.complete_highlights(pdf_path, ['keyword'])
+
+        with patch.object(PDFHighlighter, 'highlight_pdf') as mock_highlight:
+            completed = cache.highlight_pdf(pdf_path, ['keyword'], 9, 1)
+            mock_highlight.assert_not_called()
+        assert completed != first
+        # Acrobatが開いている可能性があるため、置き換える前の一時ファイルは残す
+        assert os.path.exists(first)
+        with fitz.open(completed) as doc:
+            assert [len(list(page.annots())) for page in doc] == [1] * 10
+        temp_file_manager.cleanup_single(first)
+
+    def test_complete_highlights_cancelled(self, cache, make_pdf):
+        """中断した場合はキャッシュを置き換えないこと"""
+        pdf_path = make_pdf('a.pdf')
+        first = cache.highlight_pdf(pdf_path, ['keyword'], 5, 1)
+
+        cache.complete_highlights(pdf_path, ['keyword'], is_cancelled=lambda: True)
+
+        with patch.object(PDFHighlighter, 'highlight_pdf', return_value=first) as mock_highlight:
+            cache.highlight_pdf(pdf_path, ['keyword'], 9, 1)
+            mock_highlight.assert_called_once()
+
+    def test_evicts_least_recently_used(self, cache, make_pdf):
+        """上限を超えると最も長く使っていない一時ファイルからキャッシュから外すこと"""
+        paths = [make_pdf(f'{name}.pdf') for name in 'abc']
+
+        a = cache.highlight_pdf(paths[0], ['keyword'])
+        b = cache.highlight_pdf(paths[1], ['keyword'])
+        assert cache.highlight_pdf(paths[0], ['keyword']) == a
+        cache.highlight_pdf(paths[2], ['keyword'])
+
+        with patch.object(PDFHighlighter, 'highlight_pdf', side_effect=RuntimeError) as mock_highlight:
+            assert cache.highlight_pdf(paths[0], ['keyword']) == a
+            with pytest.raises(RuntimeError):
+                cache.highlight_pdf(paths[1], ['keyword'])
+            mock_highlight.assert_called_once()
+        # Acrobatに渡した一時ファイルはキャッシュから外しても削除しない
+        assert os.path.exists(b)
+        temp_file_manager.cleanup_single(b)
+
+    def test_evicts_and_deletes_copy_not_handed_out(self, cache, make_pdf):
+        """Acrobatに渡していないcomplete_highlightsの一時ファイルは、キャッシュから外すときに削除すること"""
+        paths = [make_pdf(f'{name}.pdf') for name in 'abc']
+        first = cache.highlight_pdf(paths[0], ['keyword'], 5, 1)
+        cache.complete_highlights(paths[0], ['keyword'])
+        completed = next(iter(cache._entries.values())).path
+        assert completed != first
+
+        cache.highlight_pdf(paths[1], ['keyword'])
+        cache.highlight_pdf(paths[2], ['keyword'])
+
+        assert not os.path.exists(completed)
+        assert os.path.exists(first)
+        temp_file_manager.cleanup_single(first)
+
+    def test_evicts_by_total_size(self, make_pdf):
+        """合計サイズの上限を超えると古い一時ファイルをキャッシュから外し、直前のものは残すこと"""
+        cache = HighlightCache(TempFileManager(), max_files=10, max_bytes=1)
+        a = cache.highlight_pdf(make_pdf('a.pdf'), ['keyword'])
+        b = cache.highlight_pdf(make_pdf('b.pdf'), ['keyword'])
+        try:
+            assert len(cache._entries) == 1
+            assert cache._total_bytes == os.path.getsize(b)
+        finally:
+            cache.clear()
+            for path in (a, b):
+                temp_file_manager.cleanup_single(path)
+
 
 @pytest.mark.unit
 class TestOpenPdfFunction:
     """open_pdf関数のテスト"""
 
-    @patch('time.sleep')
-    @patch.object(PDFNavigator, 'navigate_to_page')
-    @patch.object(AcrobatProcessManager, 'wait_for_startup')
     @patch('subprocess.Popen')
     @patch.object(PDFHighlighter, 'highlight_pdf')
-    @patch.object(AcrobatProcessManager, 'close_all_processes')
-    def test_open_pdf_success(
-        self,
-        mock_close_processes,
-        mock_highlight,
-        mock_popen,
-        mock_wait,
-        mock_navigate,
-        mock_sleep
-    ):
-        """PDFを正常に開けることを確認"""
+    def test_open_pdf_success(self, mock_highlight, mock_popen):
+        """起動中のAcrobatを終了せず、ページを指定して開くことを確認"""
         file_path = '/test/document.pdf'
         acrobat_path = 'C:\\Program Files\\Adobe\\Acrobat.exe'
         current_position = 5
         search_terms = ['keyword1', 'keyword2']
 
         mock_highlight.return_value = '/tmp/highlighted.pdf'
-        mock_process = Mock()
-        mock_process.pid = 1234
-        mock_popen.return_value = mock_process
-        mock_wait.return_value = True
 
         open_pdf(file_path, acrobat_path, current_position, search_terms)
 
-        mock_close_processes.assert_called_once()
-        mock_highlight.assert_called_once_with(file_path, search_terms)
-        mock_popen.assert_called_once_with([acrobat_path, '/tmp/highlighted.pdf'])
-        mock_wait.assert_called_once_with(1234)
-        mock_navigate.assert_called_once_with(current_position)
+        mock_highlight.assert_called_once_with(
+            file_path, search_terms, current_position, DEFAULT_HIGHLIGHT_PAGE_WINDOW, MATCH_MODE_LITERAL, DEFAULT_FOLD_KANA
+        )
+        mock_popen.assert_called_once_with([acrobat_path, '/A', 'page=5', '/tmp/highlighted.pdf'])
 
-    @patch.object(AcrobatProcessManager, 'close_all_processes')
     @patch.object(PDFHighlighter, 'highlight_pdf')
-    def test_open_pdf_file_not_found(self, mock_highlight, mock_close_processes):
+    def test_open_pdf_file_not_found(self, mock_highlight):
         """存在しないファイルでFileNotFoundErrorが発生することを確認"""
         mock_highlight.side_effect = FileNotFoundError("File not found")
 
@@ -699,11 +587,11 @@ class TestOpenPdfFunction:
 
         assert '指定されたファイルが見つかりません' in str(exc_info.value)
 
+    @patch.object(temp_file_manager, 'cleanup_single')
     @patch('subprocess.Popen')
     @patch.object(PDFHighlighter, 'highlight_pdf')
-    @patch.object(AcrobatProcessManager, 'close_all_processes')
-    def test_open_pdf_subprocess_error(self, mock_close, mock_highlight, mock_popen):
-        """サブプロセス起動エラーの処理"""
+    def test_open_pdf_subprocess_error(self, mock_highlight, mock_popen, mock_cleanup):
+        """サブプロセス起動エラーの処理（作成した一時ファイルは削除する）"""
         mock_highlight.return_value = '/tmp/temp.pdf'
         mock_popen.side_effect = subprocess.SubprocessError("Failed to start")
 
@@ -711,11 +599,11 @@ class TestOpenPdfFunction:
             open_pdf('/test/file.pdf', 'invalid_acrobat.exe', 1, ['term'])
 
         assert 'Acrobat Readerの起動に失敗しました' in str(exc_info.value)
+        mock_cleanup.assert_called_once_with('/tmp/temp.pdf')
 
     @patch('subprocess.Popen')
     @patch.object(PDFHighlighter, 'highlight_pdf')
-    @patch.object(AcrobatProcessManager, 'close_all_processes')
-    def test_open_pdf_general_exception(self, mock_close, mock_highlight, mock_popen):
+    def test_open_pdf_general_exception(self, mock_highlight, mock_popen):
         """一般的な例外の処理"""
         mock_highlight.return_value = '/tmp/temp.pdf'
         mock_popen.side_effect = Exception("Unexpected error")
@@ -725,85 +613,20 @@ class TestOpenPdfFunction:
 
         assert '予期せぬエラーが発生しました' in str(exc_info.value)
 
-    @patch('time.sleep')
-    @patch.object(PDFNavigator, 'navigate_to_page')
-    @patch.object(AcrobatProcessManager, 'wait_for_startup')
-    @patch('subprocess.Popen')
-    @patch.object(PDFHighlighter, 'highlight_pdf')
-    @patch.object(AcrobatProcessManager, 'close_all_processes')
-    def test_open_pdf_wait_for_startup_fails(
-        self,
-        mock_close,
-        mock_highlight,
-        mock_popen,
-        mock_wait,
-        mock_navigate,
-        mock_sleep
-    ):
-        """Acrobat起動待機が失敗する場合"""
-        mock_highlight.return_value = '/tmp/temp.pdf'
-        mock_process = Mock()
-        mock_process.pid = 1234
-        mock_popen.return_value = mock_process
-        mock_wait.return_value = False  # 起動失敗
-
-        # 例外が発生しないことを確認（警告ログのみ）
-        open_pdf('/test/file.pdf', 'acrobat.exe', 5, ['term'])
-
-        mock_navigate.assert_not_called()
-
-    @patch('time.sleep')
-    @patch.object(PDFNavigator, 'navigate_to_page')
-    @patch.object(AcrobatProcessManager, 'wait_for_startup')
-    @patch('subprocess.Popen')
-    @patch.object(PDFHighlighter, 'highlight_pdf')
-    @patch.object(AcrobatProcessManager, 'close_all_processes')
-    def test_open_pdf_page_one_no_navigation(
-        self,
-        mock_close,
-        mock_highlight,
-        mock_popen,
-        mock_wait,
-        mock_navigate,
-        mock_sleep
-    ):
-        """1ページ目の場合はナビゲーションが実行されないことを確認"""
-        mock_highlight.return_value = '/tmp/temp.pdf'
-        mock_process = Mock()
-        mock_process.pid = 1234
-        mock_popen.return_value = mock_process
-        mock_wait.return_value = True
-
-        open_pdf('/test/file.pdf', 'acrobat.exe', 1, ['term'])
-
-        # navigate_to_pageは呼ばれるが、内部で何もしない
-        mock_navigate.assert_called_once_with(1)
+    @pytest.mark.parametrize('page_number, expected', [(1, 'page=1'), (0, 'page=1'), (12, 'page=12')])
+    def test_build_acrobat_command(self, page_number, expected):
+        """オープンパラメータでページを指定すること（1未満は1ページ目）"""
+        assert build_acrobat_command('acrobat.exe', 'a.pdf', page_number) == ['acrobat.exe', '/A', expected, 'a.pdf']
 
-    @patch('time.sleep')
-    @patch.object(PDFNavigator, 'navigate_to_page')
-    @patch.object(AcrobatProcessManager, 'wait_for_startup')
     @patch('subprocess.Popen')
     @patch.object(PDFHighlighter, 'highlight_pdf')
-    @patch.object(AcrobatProcessManager, 'close_all_processes')
-    def test_open_pdf_empty_search_terms(
-        self,
-        mock_close,
-        mock_highlight,
-        mock_popen,
-        mock_wait,
-        mock_navigate,
-        mock_sleep
-    ):
+    def test_open_pdf_empty_search_terms(self, mock_highlight, mock_popen):
         """空の検索語リストでも正常に動作することを確認"""
         mock_highlight.return_value = '/tmp/temp.pdf'
-        mock_process = Mock()
-        mock_process.pid = 1234
-        mock_popen.return_value = mock_process
-        mock_wait.return_value = True
 
         open_pdf('/test/file.pdf', 'acrobat.exe', 1, [])
 
-        mock_highlight.assert_called_once_with('/test/file.pdf', [])
+        mock_highlight.assert_called_once_with('/test/file.pdf', [], 1, DEFAULT_HIGHLIGHT_PAGE_WINDOW, MATCH_MODE_LITERAL, DEFAULT_FOLD_KANA)
 
 
 @pytest.mark.unit
@@ -812,10 +635,11 @@ class TestEdgeCases:
 
     @patch('fitz.open')
     @patch.object(PDFHighlighter, '_create_temp_file')
-    def test_highlight_pdf_with_unicode_search_terms(self, mock_create_temp, mock_fitz_open):
+    def test_highlight_pdf_with_unicode_search_terms(self, mock_create_temp, mock_fitz_open, make_page_text):
         """Unicode文字を含む検索語のテスト"""
+        unicode_terms = ['日本語', 'Русский', '中文', '한국어', 'العربية']
         mock_page = Mock(spec=fitz.Page)
-        mock_page.search_for.return_value = []
+        mock_page.get_text.return_value = make_page_text(*unicode_terms)
 
         mock_doc = MagicMock()
         mock_doc.__iter__.return_value = iter([mock_page])
@@ -825,37 +649,10 @@ class TestEdgeCases:
         mock_fitz_open.return_value = mock_doc
         mock_create_temp.return_value = '/tmp/temp.pdf'
 
-        unicode_terms = ['日本語', 'Русский', '中文', '한국어', 'العربية']
-
         PDFHighlighter.highlight_pdf('/test/file.pdf', unicode_terms)
 
-        # すべての検索語が処理されることを確認
-        for term in unicode_terms:
-            mock_page.search_for.assert_any_call(term)
-
-    @patch('time.sleep')
-    @patch('psutil.Process')
-    def test_wait_for_startup_with_zero_timeout(self, mock_process_class, mock_sleep):
-        """タイムアウト0での起動待機"""
-        result = AcrobatProcessManager.wait_for_startup(1234, timeout=0)
-
-        assert result is False
-
-    @patch('psutil.process_iter')
-    def test_find_processes_with_process_access_error(self, mock_process_iter):
-        """プロセス情報取得時のAccessDeniedエラー処理"""
-        mock_accessible_proc = Mock(info={'pid': 1234, 'name': 'Acrobat.exe'})
-
-        # 2番目のプロセスでAccessDeniedエラーが発生
-        def process_generator():
-            yield mock_accessible_proc
-            raise psutil.AccessDenied(5678)
-
-        mock_process_iter.return_value = process_generator()
-
-        # エラーが発生しても例外が外部に伝搬しないことを確認
-        with pytest.raises(psutil.AccessDenied):
-            AcrobatProcessManager._find_processes()
+        # すべての検索語がハイライトされることを確認
+        assert mock_page.add_highlight_annot.call_count == len(unicode_terms)
 
     def test_temp_file_manager_cleanup_with_empty_list(self):
         """空のファイルリストでのクリーンアップ"""
@@ -867,78 +664,37 @@ class TestEdgeCases:
 
         assert len(manager._temp_files) == 0
 
-    @patch('pyautogui.press')
-    @patch('pyautogui.write')
-    @patch('pyautogui.hotkey')
-    @patch('time.sleep')
-    def test_navigate_to_large_page_number(self, mock_sleep, mock_hotkey, mock_write, mock_press):
-        """非常に大きなページ番号への移動"""
-        large_page = 999999
-
-        PDFNavigator.navigate_to_page(large_page)
-
-        mock_write.assert_called_once_with(str(large_page))
-
-    @patch('pyautogui.press')
-    @patch('pyautogui.write')
-    @patch('pyautogui.hotkey')
-    @patch('time.sleep')
-    def test_navigate_to_negative_page_number(self, mock_sleep, mock_hotkey, mock_write, mock_press):
-        """負のページ番号への移動（pyautoguiに渡される）"""
-        negative_page = -5
-
-        PDFNavigator.navigate_to_page(negative_page)
-
-        # 負のページ番号も文字列として渡される
-        mock_write.assert_called_once_with(str(negative_page))
-
 
 @pytest.mark.integration
 class TestIntegrationScenarios:
     """統合テストシナリオ"""
 
-    @patch('time.sleep')
-    @patch.object(PDFNavigator, 'navigate_to_page')
-    @patch.object(AcrobatProcessManager, 'wait_for_startup')
     @patch('subprocess.Popen')
     @patch('fitz.open')
+    @patch('shutil.copyfile')
     @patch.object(PDFHighlighter, '_create_temp_file')
-    @patch.object(AcrobatProcessManager, 'close_all_processes')
-    def test_full_pdf_opening_workflow(
-        self,
-        mock_close,
-        mock_create_temp,
-        mock_fitz_open,
-        mock_popen,
-        mock_wait,
-        mock_navigate,
-        mock_sleep
-    ):
+    def test_full_pdf_opening_workflow(self, mock_create_temp, mock_copyfile, mock_fitz_open, mock_popen,
+                                       make_page_text):
         """完全なPDFオープンワークフローの統合テスト"""
         # PDFページのモック
         mock_page = Mock(spec=fitz.Page)
 
-        # 検索結果を返す
-        mock_rect = fitz.Rect(100, 100, 200, 120)
-        mock_page.search_for.return_value = [mock_rect]
+        # 検索語を含むテキストを返す
+        mock_page.get_text.return_value = make_page_text('important keyword')
         mock_highlight = Mock()
         mock_page.add_highlight_annot.return_value = mock_highlight
 
         # PDFドキュメントのモック
         mock_doc = MagicMock()
-        mock_doc.__iter__.return_value = iter([mock_page])
+        mock_doc.page_count = 20
+        mock_doc.__getitem__.return_value = mock_page
+        mock_doc.can_save_incrementally.return_value = True
         mock_doc.__enter__.return_value = mock_doc
         mock_doc.__exit__.return_value = False
 
         mock_fitz_open.return_value = mock_doc
         mock_create_temp.return_value = '/tmp/highlighted.pdf'
 
-        # プロセスのモック
-        mock_process = Mock()
-        mock_process.pid = 1234
-        mock_popen.return_value = mock_process
-        mock_wait.return_value = True
-
         # 実行
         file_path = '/test/document.pdf'
         acrobat_path = 'C:\\Program Files\\Adobe\\Acrobat.exe'
@@ -948,12 +704,9 @@ class TestIntegrationScenarios:
         open_pdf(file_path, acrobat_path, page_number, search_terms)
 
         # 全ての工程が実行されたことを確認
-        mock_close.assert_called_once()
-        mock_fitz_open.assert_called_once_with(file_path)
-        mock_page.search_for.assert_any_call('important')
-        mock_page.search_for.assert_any_call('keyword')
+        mock_copyfile.assert_called_once_with(file_path, '/tmp/highlighted.pdf')
+        mock_fitz_open.assert_called_once_with('/tmp/highlighted.pdf')
         mock_page.add_highlight_annot.assert_called()
-        mock_doc.save.assert_called_once_with('/tmp/highlighted.pdf')
-        mock_popen.assert_called_once_with([acrobat_path, '/tmp/highlighted.pdf'])
-        mock_wait.assert_called_once_with(1234)
-        mock_navigate.assert_called_once_with(page_number)
+        mock_doc.saveIncr.assert_called_once_with()
+        mock_doc.save.assert_not_called()
+        mock_popen.assert_called_once_with([acrobat_path, '/A', 'page=10', '/tmp/highlighted.pdf'])
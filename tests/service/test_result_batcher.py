@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+from service.result_batcher import ResultBatcher
+from service.snippet_provider import SearchHit
+
+
+def _hits(count):
+    return [SearchHit(i + 1, 0, 1, 'a') for i in range(count)]
+
+
+class TestResultBatcher:
+    """ResultBatcherクラスのテスト"""
+
+    def test_results_are_held_until_flush(self):
+        """間隔・件数の上限に達するまでは結果をためておくこと"""
+        batches = []
+        batcher = ResultBatcher(batches.append, interval=60, max_hits=100)
+
+        batcher.add('a.txt', _hits(2))
+        batcher.add('b.txt', _hits(3))
+        assert batches == []
+
+        batcher.flush()
+        assert batches == [[('a.txt', _hits(2)), ('b.txt', _hits(3))]]
+
+    def test_flush_when_hit_count_reached(self):
+        """一致箇所の数が上限に達したら間隔を待たずに送ること"""
+        batches = []
+        batcher = ResultBatcher(batches.append, interval=60, max_hits=5)
+
+        batcher.add('a.txt', _hits(3))
+        batcher.add('b.txt', _hits(2))
+
+        assert [len(batch) for batch in batches] == [2]
+
+    def test_flush_when_interval_elapsed(self):
+        """前回の送信から間隔が経っていれば送ること"""
+        batches = []
+        with patch('service.result_batcher.time.monotonic', side_effect=[0.0, 0.01, 0.1, 0.1]):
+            batcher = ResultBatcher(batches.append, interval=0.05, max_hits=100)
+            batcher.add('a.txt', _hits(1))
+            batcher.add('b.txt', _hits(1))
+
+        assert batches == [[('a.txt', _hits(1)), ('b.txt', _hits(1))]]
+
+    def test_empty_flush_sends_nothing(self):
+        """結果がない場合は送らないこと"""
+        batches = []
+        ResultBatcher(batches.append).flush()
+
+        assert batches == []
+
+    def test_progress_is_throttled(self):
+        """進捗は間隔ごとに間引き、完了は必ず送ること"""
+        progress = []
+        batcher = ResultBatcher(lambda batch: None, progress.append, interval=60)
+
+        for value in (10, 20, 30, 100):
+            batcher.progress(value)
+
+        assert progress == [10, 100]
+
+    def test_progress_flushes_pending_results_after_interval(self):
+        """一致のないファイルが続いても、間隔が経てば進捗の通知時にたまった結果を送ること"""
+        batches = []
+        clock = [0.0]
+        with patch('service.result_batcher.time.monotonic', side_effect=lambda: clock[0]):
+            batcher = ResultBatcher(batches.append, interval=0.05, max_hits=100)
+            batcher.add('a.txt', _hits(1))
+            batcher.progress(10)
+            assert batches == []
+
+            clock[0] = 0.1
+            batcher.progress(20)
+
+        assert batches == [[('a.txt', _hits(1))]]
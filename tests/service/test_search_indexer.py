@@ -1,9 +1,18 @@
+import json
 import os
+import shutil
+import stat
 from unittest.mock import patch, MagicMock
 
 import pytest
 
+from service.compressed_text import CompressedText
+from service.index_lock import IndexLockTimeoutError, IndexWriteLock
+from service.index_storage import IndexStorage
 from service.search_indexer import SearchIndexer
+from service.search_query import SearchQuery
+from service.snippet_provider import SearchHit, SnippetProvider
+from utils.constants import MATCH_MODE_FUZZY, MATCH_MODE_REGEX, MATCH_MODE_WILDCARD
 
 
 class TestSearchIndexer:
@@ -179,3 +188,517 @@ class TestSearchIndexer:
         
         # 大文字小文字を区別しない
         assert indexer._match_search_terms(content, ['python', 'テスト'], 'AND') == True
+
+
+class TestShardedIndex:
+    """検索フォルダごとのシャード分割のテスト"""
+
+    @pytest.fixture
+    def roots(self, temp_dir):
+        """2つの検索フォルダ"""
+        root_paths = []
+        for name, text in (('root_a', 'バルブ交換の手順'), ('root_b', 'バルブ点検の記録')):
+            root = os.path.join(temp_dir, name)
+            os.makedirs(root)
+            with open(os.path.join(root, f'{name}.txt'), 'w', encoding='utf-8') as f:
+                f.write(text)
+            root_paths.append(root)
+        return root_paths
+
+    @pytest.fixture
+    def indexer(self, temp_dir):
+        return SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+
+    def test_create_index_writes_one_shard_per_root(self, indexer, roots):
+        """ルートごとにシャードファイルが作成されること"""
+        indexer.create_index(roots)
+
+        shard_files = os.listdir(indexer.storage.shard_dir)
+        assert sorted(shard_files) == sorted(indexer.storage.shard_file_name(root, 1) for root in roots)
+        assert indexer.get_index_stats()['shards_count'] == 2
+
+    def test_update_rewrites_only_changed_shard(self, indexer, roots):
+        """更新されたルートのシャードだけが書き直されること"""
+        indexer.create_index(roots)
+
+        shard_b = os.path.join(indexer.storage.shard_dir, indexer.index_data['shards'][roots[1]])
+        os.utime(shard_b, (0, 0))
+
+        with open(os.path.join(roots[0], 'added.txt'), 'w', encoding='utf-8') as f:
+            f.write('追加の手順書')
+        indexer.create_index(roots)
+
+        assert indexer.index_data['shards'][roots[1]] == os.path.basename(shard_b)
+        assert os.path.getmtime(shard_b) == 0
+        assert len(indexer.index_data['files']) == 3
+
+    def test_search_merges_results_from_all_shards(self, indexer, roots):
+        """全シャードの検索結果がまとめて返ること"""
+        indexer.create_index(roots)
+
+        found_files = sorted(os.path.basename(path) for path, _ in indexer.search_in_index(['バルブ']))
+
+        assert found_files == ['root_a.txt', 'root_b.txt']
+
+    def test_search_only_candidates(self, indexer, roots):
+        """候補を指定した場合はその文書だけを照合すること"""
+        indexer.create_index(roots)
+        candidate = os.path.join(roots[1], 'root_b.txt')
+
+        results = indexer.search_in_index(['バルブ'], candidates=[candidate])
+
+        assert [path for path, _ in results] == [candidate]
+
+    def test_count_terms_across_shards(self, indexer, roots):
+        """全シャードの文書を対象に検索語を数えること"""
+        indexer.create_index(roots)
+
+        counts = indexer.count_terms(['バルブ', '点検'])
+
+        assert counts == {'バルブ': {'documents': 2, 'occurrences': 2},
+                          '点検': {'documents': 1, 'occurrences': 1}}
+
+    def test_count_terms_in_directory_and_after_update(self, indexer, roots):
+        """フォルダで集計対象を絞り込め、文書の追加後は数え直すこと"""
+        indexer.create_index(roots)
+        assert indexer.count_terms(['バルブ'], directories=[roots[0]])['バルブ']['documents'] == 1
+
+        with open(os.path.join(roots[0], 'added.txt'), 'w', encoding='utf-8') as f:
+            f.write('バルブの予備')
+        indexer.create_index(roots)
+
+        assert indexer.count_terms(['バルブ'], directories=[roots[0]])['バルブ']['documents'] == 2
+
+    def test_path_tree_rebuilt_when_files_replaced(self, indexer, roots):
+        """文書数とルートが同じでも、文書の辞書が置き換えられた場合は接頭辞木を作り直すこと"""
+        indexer.create_index(roots)
+        assert indexer.count_terms(['バルブ'])['バルブ']['documents'] == 2
+
+        old_path = os.path.join(roots[1], 'root_b.txt')
+        new_path = os.path.join(roots[1], 'renamed.txt')
+        items = [(new_path if path == old_path else path, info) for path, info in indexer.index_data['files'].items()]
+        # 古い辞書を解放してから作ると、解放された辞書と同じidになりやすい
+        indexer.index_data['files'] = None
+        files = {}
+        files.update(items)
+        indexer.index_data['files'] = files
+
+        found_files = sorted(os.path.basename(path) for path, _ in indexer.search_in_index(['バルブ']))
+
+        assert found_files == ['renamed.txt', 'root_a.txt']
+
+    def test_load_selected_shard_only(self, indexer, roots):
+        """指定したルートのシャードだけを読み込めること"""
+        indexer.create_index(roots)
+
+        index_data = indexer.storage.load(roots=[roots[1]])
+
+        assert [os.path.basename(path) for path in index_data['files']] == ['root_b.txt']
+
+    def test_reset_single_root(self, indexer, roots):
+        """1つのルートだけを空にできること"""
+        indexer.create_index(roots)
+
+        indexer.reset_index([roots[0]])
+
+        assert roots[0] not in indexer.index_data['shards']
+        assert [os.path.basename(path) for path in indexer.index_data['files']] == ['root_b.txt']
+
+    def test_load_legacy_single_file_index(self, temp_dir):
+        """シャードを持たない旧形式のインデックスも読み込めること"""
+        index_path = os.path.join(temp_dir, 'legacy.json')
+        file_path = os.path.join(temp_dir, 'legacy.txt')
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': '1.0', 'files': {file_path: {'content': 'バルブ'}}}, f, ensure_ascii=False)
+
+        indexer = SearchIndexer(index_path)
+
+        assert [path for path, _ in indexer.search_in_index(['バルブ'])] == [file_path]
+
+
+class TestIndexCompaction:
+    """インデックス最適化のテスト"""
+
+    @pytest.fixture
+    def indexer(self, temp_dir):
+        root = os.path.join(temp_dir, 'root')
+        os.makedirs(root)
+        with open(os.path.join(root, 'manual.txt'), 'w', encoding='utf-8') as f:
+            f.write('ポンプの分解手順')
+
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.create_index([root])
+        return indexer
+
+    def test_compact_merges_duplicate_entries(self, indexer):
+        """表記違いで重複した文書が最新のものに統合されること"""
+        file_path = next(iter(indexer.index_data['files']))
+        duplicate_path = os.path.join(os.path.dirname(file_path), '.', os.path.basename(file_path))
+        indexer.index_data['files'][duplicate_path] = dict(
+            indexer.index_data['files'][file_path], indexed_at='2000-01-01T00:00:00'
+        )
+
+        report = indexer.compact_index()
+
+        assert report['removed_duplicates'] == 1
+        assert list(indexer.index_data['files']) == [file_path]
+
+    def test_compact_removes_orphan_shards(self, indexer):
+        """参照されていないシャードファイルが削除され、回収量が報告されること"""
+        orphan_path = os.path.join(indexer.storage.shard_dir, 'orphan.json')
+        with open(orphan_path, 'w', encoding='utf-8') as f:
+            f.write('{"files": {}}' + ' ' * 4096)
+
+        report = indexer.compact_index()
+
+        assert not os.path.exists(orphan_path)
+        assert report['reclaimed_bytes'] >= 4096
+        assert report['size_after'] == report['size_before'] - report['reclaimed_bytes']
+        assert report['load_seconds_before'] >= 0
+        assert report['load_seconds_after'] >= 0
+
+    def test_compact_keeps_documents_searchable(self, indexer):
+        """最適化後も元ファイルを読まずに検索できること"""
+        indexer.compact_index()
+
+        with patch.object(indexer.content_extractor, 'extract_text_content') as mock_extract:
+            indexer.index_data = IndexStorage(indexer.storage.index_file_path).load()
+            assert len(indexer.search_in_index(['ポンプ'])) == 1
+            mock_extract.assert_not_called()
+
+
+class TestCompressedIndex:
+    """文書テキストの圧縮保存のテスト"""
+
+    @pytest.fixture
+    def manual_path(self, temp_dir):
+        file_path = os.path.join(temp_dir, 'manual.txt')
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(['ポンプの分解手順'] * 20000 + ['安全弁の点検']))
+        return file_path
+
+    def test_index_stores_compressed_text(self, temp_dir, manual_path):
+        """圧縮したテキストが保存され、インデックスが元ファイルより小さくなること"""
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.create_index([temp_dir])
+
+        assert isinstance(indexer.index_data['files'][manual_path]['content'], dict)
+        assert indexer.storage._get_index_size() < os.path.getsize(manual_path) / 4
+
+    def test_search_reports_line_numbers_across_blocks(self, temp_dir, manual_path):
+        """後方のブロックで見つかった語の行番号が文書全体の行番号になること"""
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.create_index([temp_dir])
+
+        results = indexer.search_in_index(['安全弁'])
+
+        assert results == [(manual_path, [SearchHit(20001, 0, 3, '安全弁', indexed=True)])]
+
+    def test_search_stops_at_per_file_cap(self, temp_dir, manual_path):
+        """一致箇所が上限に達した時点で残りのブロックを展開しないこと"""
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.create_index([temp_dir])
+
+        with patch.object(CompressedText, 'get_block', autospec=True,
+                          side_effect=CompressedText.get_block) as mock_get_block:
+            results = indexer.search_in_index(['分解'], max_results_per_file=5)
+
+        assert [hit.position for hit in results[0][1]] == [1, 2, 3, 4, 5]
+        assert {call.args[1] for call in mock_get_block.call_args_list} == {0}
+
+    def test_search_stops_when_cancelled(self, temp_dir, manual_path):
+        """打ち切りを指示された場合は残りのファイルを照合しないこと"""
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.create_index([temp_dir])
+
+        assert indexer.search_in_index(['安全弁'], cancel_check=lambda: True) == []
+
+    def test_iter_units_matches_split(self):
+        """ページ/行の切り出しがstr.splitと同じ結果になること"""
+        for content in ('', 'a', 'a\n', '\nb\n\nc'):
+            assert list(SearchIndexer._iter_units(content, '\n')) == content.split('\n')
+
+    def test_snippet_is_built_from_indexed_line(self, temp_dir, manual_path):
+        """一致箇所のコンテキストがインデックスの本文から作られること"""
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.create_index([temp_dir])
+        (file_path, (hit,)), = indexer.search_in_index(['点検'])
+
+        assert SnippetProvider(2, indexer).get_snippet(file_path, hit) == '弁の点検'
+
+    def test_compact_compresses_plain_text(self, temp_dir, manual_path):
+        """最適化で旧形式の非圧縮テキストが圧縮されること"""
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.index_data['files'][manual_path] = {'content': 'ポンプ\n安全弁'}
+
+        indexer.compact_index()
+
+        assert isinstance(indexer.index_data['files'][manual_path]['content'], dict)
+        assert indexer.search_in_index(['安全弁']) == [(manual_path, [SearchHit(2, 0, 3, '安全弁', indexed=True)])]
+
+    def test_search_with_regex_and_wildcard(self, temp_dir, manual_path):
+        """正規表現・ワイルドカードで圧縮したテキストを検索できること"""
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.create_index([temp_dir])
+
+        assert indexer.search_in_index(['安全.の点検'], match_mode=MATCH_MODE_REGEX) == \
+            [(manual_path, [SearchHit(20001, 0, 6, '安全.の点検', indexed=True)])]
+        assert indexer.search_in_index(['安全*点検'], match_mode=MATCH_MODE_WILDCARD) == \
+            [(manual_path, [SearchHit(20001, 0, 6, '安全*点検', indexed=True)])]
+        assert indexer.search_in_index(['安全弁$'], match_mode=MATCH_MODE_REGEX) == []
+
+    def test_search_with_near_and_not(self, temp_dir, manual_path):
+        """NEAR/nとNOTが全ブロックを通して評価されること"""
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.create_index([temp_dir])
+
+        assert indexer.search_in_index(['安全弁 NEAR/1 点検']) == \
+            [(manual_path, [SearchHit(20001, 0, 6, '安全弁 NEAR/1 点検', indexed=True)])]
+        assert indexer.search_in_index(['ポンプ NEAR/1 点検']) == []
+        assert indexer.search_in_index(['ポンプ', 'NOT 安全弁']) == []
+
+    def test_fuzzy_search_ranks_and_prefilters_by_signature(self, temp_dir, manual_path):
+        """あいまい検索がn-gram署名で候補を絞り、誤記を含む検索語でも見つかること"""
+        other_path = os.path.join(temp_dir, 'other.txt')
+        with open(other_path, 'w', encoding='utf-8') as f:
+            f.write('配管の洗浄')
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.create_index([temp_dir])
+        query = SearchQuery(['安全便の点検'], match_mode=MATCH_MODE_FUZZY)
+
+        assert indexer._rank_fuzzy_candidates([other_path, manual_path], query) == [manual_path]
+        assert indexer.search_in_index(['安全便の点検'], match_mode=MATCH_MODE_FUZZY) == \
+            [(manual_path, [SearchHit(20001, 0, 6, '安全便の点検', indexed=True)])]
+
+    def test_compact_adds_missing_signatures(self, temp_dir, manual_path):
+        """最適化でn-gram署名のない旧形式の文書に署名が加わること"""
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.index_data['files'][manual_path] = {'content': 'ポンプ\n安全弁'}
+
+        indexer.compact_index()
+
+        assert 'ngrams' in indexer.index_data['files'][manual_path]
+
+
+class TestIndexSummary:
+    """インデックスの要約（集計値）のテスト"""
+
+    @pytest.fixture
+    def roots(self, temp_dir):
+        root_paths = []
+        for name, files in (('root_a', ('a1.txt', 'a2.md')), ('root_b', ('b1.txt',))):
+            root = os.path.join(temp_dir, name)
+            os.makedirs(root)
+            for file_name in files:
+                with open(os.path.join(root, file_name), 'w', encoding='utf-8') as f:
+                    f.write('点検手順')
+            root_paths.append(root)
+        return root_paths
+
+    @pytest.fixture
+    def indexer(self, temp_dir, roots):
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.create_index(roots)
+        return indexer
+
+    def test_summary_is_saved_with_manifest(self, indexer, roots):
+        """作成時に集計値がマニフェストへ保存されること"""
+        header = indexer.storage.load_header()
+        summary = header['summary']
+
+        assert summary['files_count'] == 3
+        assert summary['total_size'] == 3 * len('点検手順'.encode('utf-8'))
+        assert summary['extensions'] == {'.txt': 2, '.md': 1}
+        assert summary['roots'] == {roots[0]: 2, roots[1]: 1}
+        assert summary['last_build_seconds'] >= 0
+
+    def test_stats_do_not_iterate_files(self, indexer):
+        """統計情報の取得で文書を走査しないこと"""
+        with patch.object(IndexStorage, 'summarize_files') as mock_summarize:
+            stats = indexer.get_index_stats()
+
+        mock_summarize.assert_not_called()
+        assert stats['files_count'] == 3
+        assert stats['extension_counts'] == {'.txt': 2, '.md': 1}
+
+    def test_summary_follows_updates(self, indexer, roots):
+        """文書の削除とシャードのリセットが集計値に反映されること"""
+        os.remove(os.path.join(roots[0], 'a2.md'))
+        indexer.remove_missing_files()
+
+        assert indexer.get_index_stats()['extension_counts'] == {'.txt': 2}
+
+        indexer.reset_index([roots[1]])
+
+        stats = indexer.get_index_stats()
+        assert stats['files_count'] == 1
+        assert stats['root_counts'] == {roots[0]: 1}
+
+    def test_legacy_index_is_summarized_on_load(self, temp_dir):
+        """要約を持たない旧形式のインデックスは読み込み時に集計されること"""
+        index_path = os.path.join(temp_dir, 'legacy.json')
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': '1.0', 'files': {'/legacy/a.txt': {'content': 'x', 'size': 10}}}, f)
+
+        storage = IndexStorage(index_path)
+
+        assert storage.load_header() is None
+        assert storage.get_stats(storage.load())['files_count'] == 1
+
+
+class TestIndexGenerations:
+    """世代ごとのインデックス公開のテスト"""
+
+    @pytest.fixture
+    def root(self, temp_dir):
+        root = os.path.join(temp_dir, 'root')
+        os.makedirs(root)
+        with open(os.path.join(root, 'manual.txt'), 'w', encoding='utf-8') as f:
+            f.write('ポンプの分解手順')
+        return root
+
+    @pytest.fixture
+    def storage(self, temp_dir, root):
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.create_index([root])
+        return indexer.storage
+
+    def _save_generation(self, storage):
+        index_data = storage.load()
+        storage.save(index_data)
+        return index_data
+
+    def test_previous_generation_is_kept(self, storage, root):
+        """直前の世代のシャードは残り、それより古い世代は削除されること"""
+        self._save_generation(storage)
+        index_data = self._save_generation(storage)
+
+        assert index_data['generation'] == 3
+        assert sorted(os.listdir(storage.shard_dir)) == [
+            storage.shard_file_name(root, 2), storage.shard_file_name(root, 3)
+        ]
+
+    def test_failed_write_keeps_published_index(self, storage):
+        """書き込みに失敗しても公開中のインデックスと一時ファイルが残らないこと"""
+        with open(storage.index_file_path, encoding='utf-8') as f:
+            published = f.read()
+
+        with patch('service.index_storage.os.fsync', side_effect=OSError('disk full')):
+            storage.save(storage.load())
+
+        with open(storage.index_file_path, encoding='utf-8') as f:
+            assert f.read() == published
+        assert not [name for name in os.listdir(os.path.dirname(storage.index_file_path)) if name.endswith('.tmp')]
+
+    @pytest.mark.skipif(os.name == 'nt', reason='POSIXの権限のテスト')
+    def test_written_files_keep_permissions(self, storage, root):
+        """置き換えたファイルは元の権限を保ち、新しいファイルはumaskに従った権限になること"""
+        os.chmod(storage.index_file_path, 0o644)
+        umask = os.umask(0o022)
+        try:
+            self._save_generation(storage)
+        finally:
+            os.umask(umask)
+
+        assert stat.S_IMODE(os.stat(storage.index_file_path).st_mode) == 0o644
+        shard_path = os.path.join(storage.shard_dir, storage.shard_file_name(root, 2))
+        assert stat.S_IMODE(os.stat(shard_path).st_mode) == 0o644
+
+    def test_load_retries_when_generation_changes(self, storage):
+        """読み込み中に世代が切り替わってシャードが消えた場合は読み直すこと"""
+        original_read_shard = storage._read_shard
+        calls = []
+
+        def read_shard(shard_file):
+            calls.append(shard_file)
+            if len(calls) == 1:
+                raise FileNotFoundError(shard_file)
+            return original_read_shard(shard_file)
+
+        with patch.object(storage, '_read_shard', side_effect=read_shard):
+            index_data = storage.load()
+
+        assert len(calls) == 2
+        assert len(index_data['files']) == 1
+
+
+class TestSharedIndex:
+    """複数のPCで共有するインデックスのテスト"""
+
+    @pytest.fixture
+    def roots(self, temp_dir):
+        root_paths = []
+        for name in ('root_a', 'root_b'):
+            root = os.path.join(temp_dir, name)
+            os.makedirs(root)
+            with open(os.path.join(root, f'{name}.txt'), 'w', encoding='utf-8') as f:
+                f.write('バルブの点検')
+            root_paths.append(root)
+        return root_paths
+
+    @pytest.fixture
+    def index_path(self, temp_dir, roots):
+        index_path = os.path.join(temp_dir, 'shared', 'search_index.json')
+        indexer = SearchIndexer(index_path)
+        indexer.create_index(roots)
+        return index_path
+
+    def _add_file(self, index_data, root, name):
+        file_path = os.path.join(root, name)
+        index_data['files'][file_path] = {'content': 'バルブ', 'size': 1}
+        return file_path
+
+    def test_save_fails_while_other_writer_holds_lock(self, index_path):
+        """他のプロセスが保存中の場合、待ち時間を過ぎると保存がエラーになること"""
+        storage = IndexStorage(index_path, lock_timeout=0)
+
+        with IndexWriteLock(index_path):
+            with pytest.raises(IndexLockTimeoutError):
+                storage.save(storage.load())
+
+    def test_concurrent_writers_keep_each_others_shards(self, index_path, roots):
+        """別々に読み込んだ2つのプロセスの更新が、どちらも失われないこと"""
+        first, second = IndexStorage(index_path), IndexStorage(index_path)
+        first_data, second_data = first.load(), second.load()
+
+        added_b = self._add_file(second_data, roots[1], 'second.txt')
+        second.save(second_data, roots=[roots[1]])
+        added_a = self._add_file(first_data, roots[0], 'first.txt')
+        first.save(first_data, roots=[roots[0]])
+
+        merged = IndexStorage(index_path).load()
+        assert added_a in merged['files']
+        assert added_b in merged['files']
+        assert merged['generation'] == 3
+        assert merged['summary']['files_count'] == 4
+
+    def test_local_cache_copies_only_new_shards(self, index_path, roots, temp_dir):
+        """ローカルの複製は共有の世代が変わったときだけ、増えたシャードを複製すること"""
+        cache_dir = os.path.join(temp_dir, 'cache')
+        reader = IndexStorage(index_path, local_cache_dir=cache_dir)
+        assert len(reader.load()['files']) == 2
+
+        with patch('service.index_storage.shutil.copyfile') as mock_copy:
+            reader.load()
+        mock_copy.assert_not_called()
+
+        writer = IndexStorage(index_path)
+        writer_data = writer.load()
+        self._add_file(writer_data, roots[0], 'added.txt')
+        writer.save(writer_data, roots=[roots[0]])
+
+        with patch('service.index_storage.shutil.copyfile', side_effect=shutil.copyfile) as mock_copy:
+            assert len(reader.load()['files']) == 3
+        assert mock_copy.call_count == 1
+
+    def test_search_picks_up_published_generation(self, index_path, roots):
+        """他のプロセスが公開した新しい世代を次の検索で読み直すこと"""
+        indexer = SearchIndexer(index_path)
+        assert len(indexer.search_in_index(['バルブ'])) == 2
+
+        other = IndexStorage(index_path)
+        other_data = other.load()
+        added = self._add_file(other_data, roots[1], 'other.txt')
+        other.save(other_data, roots=[roots[1]])
+
+        assert added in [path for path, _ in indexer.search_in_index(['バルブ'])]
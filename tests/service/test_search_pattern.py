@@ -0,0 +1,63 @@
+import re
+
+import pytest
+
+from service.search_matcher import SearchMatcher
+from service.search_pattern import SearchPattern
+from utils.constants import (
+    MATCH_MODE_LITERAL,
+    MATCH_MODE_REGEX,
+    MATCH_MODE_WILDCARD,
+    SEARCH_TYPE_AND,
+)
+
+
+class TestSearchPattern:
+    """ワイルドカード・正規表現による照合のテスト"""
+
+    def test_literal_escapes_special_characters(self):
+        """通常の検索では記号がそのまま照合されること"""
+        pattern = SearchPattern('C++', MATCH_MODE_LITERAL)
+
+        assert pattern.search('言語はc++です') == (3, 6)
+        assert pattern.search('言語はCです') is None
+
+    def test_wildcard(self):
+        """*が任意の文字列、?が任意の1文字に一致すること"""
+        pattern = SearchPattern('安全*点検', MATCH_MODE_WILDCARD)
+
+        assert pattern.required_literals == ['安全', '点検']
+        assert pattern.matches('安全弁の点検手順')
+        assert not pattern.matches('安全弁の交換手順')
+        assert SearchPattern('バル?', MATCH_MODE_WILDCARD).search('バルブ') == (0, 3)
+
+    @pytest.mark.parametrize('term, expected', [
+        (r'pump-\d+', ['pump-']),
+        (r'(?:安全)+弁', ['安全', '弁']),
+        (r'valve|pump', []),
+        (r'x?abc', ['abc']),
+        (r'[0-9]{3}', []),
+    ])
+    def test_required_literals_from_regex(self, term, expected):
+        """正規表現から一致に必ず含まれる文字列だけが取り出されること"""
+        assert SearchPattern(term, MATCH_MODE_REGEX).required_literals == expected
+
+    def test_prefilter_skips_regex(self):
+        """必須の文字列を含まないテキストでは正規表現を実行しないこと"""
+        pattern = SearchPattern(r'pump-\d+', MATCH_MODE_REGEX)
+        pattern.regex = None  # 実行されればAttributeErrorになる
+
+        assert not pattern.matches('valve-100 の点検')
+
+    def test_invalid_regex_raises(self):
+        """解釈できない正規表現はre.errorになること"""
+        with pytest.raises(re.error):
+            SearchPattern('(abc', MATCH_MODE_REGEX)
+
+    def test_matcher_extracts_regex_contexts(self):
+        """SearchMatcherが正規表現の一致箇所のコンテキストを返すこと"""
+        matcher = SearchMatcher([r'P-\d+'], SEARCH_TYPE_AND, 2, MATCH_MODE_REGEX)
+        content = 'line1\nポンプP-12を停止\nP-x'
+
+        assert matcher.match_search_terms(content)
+        assert matcher.extract_contexts_with_line_numbers(content, r'P-\d+') == [(2, 'ンプP-12を停')]
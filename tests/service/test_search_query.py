@@ -0,0 +1,79 @@
+import pytest
+
+from service.search_matcher import SearchMatcher
+from service.search_query import NearClause, QuerySyntaxError, SearchQuery
+from utils.constants import SEARCH_TYPE_AND, SEARCH_TYPE_OR
+
+
+class TestSearchQuery:
+    """フレーズ・NOT・NEAR/n演算子のテスト"""
+
+    def test_plain_terms_are_unchanged(self):
+        """演算子を含まない検索語はこれまでどおり照合されること"""
+        query = SearchQuery(['安全弁', 'safety valve'], SEARCH_TYPE_OR)
+
+        assert query.matches('SAFETY VALVE の点検')
+        assert not query.matches('safety-valve の点検')
+
+    def test_phrase_allows_line_breaks(self):
+        """フレーズの空白が任意の空白・改行に一致すること"""
+        query = SearchQuery(['"安全 弁"'])
+
+        assert query.matches('安全\n弁の点検')
+        assert query.matches('安全弁の点検')
+        assert not query.matches('安全な弁の点検')
+
+    def test_not_excludes_target(self):
+        """NOTで指定した語を含む対象が除外されること"""
+        query = SearchQuery(['バルブ', 'NOT ガス'], SEARCH_TYPE_AND)
+
+        assert query.matches('バルブの交換')
+        assert not query.matches('ガスバルブの交換')
+
+    @pytest.mark.parametrize('text, expected', [
+        ('バルブを交換する', True),
+        ('交換用のバルブ', True),
+        ('バルブは点検後に半年ごとに交換', False),
+        ('交換', False),
+    ])
+    def test_near(self, text, expected):
+        """2つの語がn文字以内に現れる場合だけ一致すること"""
+        query = SearchQuery(['バルブ NEAR/5 交換'])
+
+        assert isinstance(query.required[0], NearClause)
+        assert query.matches(text) == expected
+
+    def test_near_picks_closest_occurrence(self):
+        """離れた出現があっても近い出現の組を見つけること"""
+        clause = SearchQuery(['A NEAR/2 B']).required[0]
+
+        assert list(clause.finditer('B..........A.B')) == [(11, 14)]
+
+    @pytest.mark.parametrize('previous_terms, terms, search_type, expected', [
+        (['バルブ'], ['バルブ', '交換'], SEARCH_TYPE_AND, True),
+        (['バルブ'], ['バルブ', 'NOT ガス'], SEARCH_TYPE_AND, True),
+        (['バルブ'], ['バルブ'], SEARCH_TYPE_AND, True),
+        (['バルブ', '交換'], ['バルブ'], SEARCH_TYPE_AND, False),
+        (['バルブ'], ['バルブ', '交換'], SEARCH_TYPE_OR, False),
+        (['NOT ガス'], ['NOT ガス', 'バルブ'], SEARCH_TYPE_AND, False),
+    ])
+    def test_is_refinement_of(self, previous_terms, terms, search_type, expected):
+        """前回の検索語にAND条件を加えた検索だけが絞り込みと判定されること"""
+        previous = SearchQuery(previous_terms, search_type)
+
+        assert SearchQuery(terms, search_type).is_refinement_of(previous) is expected
+
+    @pytest.mark.parametrize('term', ['NOT ', 'バルブ NEAR/5 ""', '"安全 弁'])
+    def test_syntax_errors(self, term):
+        """演算子の書き方が正しくない場合QuerySyntaxErrorになること"""
+        with pytest.raises(QuerySyntaxError):
+            SearchQuery([term])
+
+    def test_matcher_skips_contexts_for_excluded_terms(self):
+        """SearchMatcherがNOTの語のコンテキストを返さないこと"""
+        matcher = SearchMatcher(['ポンプ NEAR/3 停止', 'NOT 点検'], SEARCH_TYPE_AND, 1)
+        content = 'line1\nポンプを停止する'
+
+        assert matcher.match_search_terms(content)
+        assert matcher.extract_contexts_with_line_numbers(content, 'ポンプ NEAR/3 停止') == [(2, '\nポンプを停止す')]
+        assert matcher.extract_contexts_with_line_numbers(content, 'NOT 点検') == []
@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from service.search_indexer import SearchIndexer
+from service.search_query import SearchQuery
+from service.search_refinement import SearchRefinement, SearchScope
+from utils.constants import MATCH_MODE_WILDCARD
+
+
+class TestSearchScope:
+    """検索範囲の包含判定のテスト"""
+
+    @pytest.mark.parametrize('directories, include_subdirs, expected', [
+        (['/docs'], True, True),
+        (['/docs/a'], True, True),
+        (['/docs/a'], False, True),
+        (['/docsx'], True, False),
+        (None, True, False),
+    ])
+    def test_is_within(self, directories, include_subdirs, expected):
+        """同じフォルダかその下のフォルダだけが範囲内と判定されること"""
+        outer = SearchScope(['/docs'], include_subdirs=True)
+
+        assert SearchScope(directories, include_subdirs).is_within(outer) is expected
+
+    def test_subdirs_are_not_within_flat_scope(self):
+        """サブフォルダを含まない範囲は、サブフォルダを含む同じフォルダを含まないこと"""
+        assert not SearchScope(['/docs'], True).is_within(SearchScope(['/docs'], False))
+        assert SearchScope(['/docs'], False).is_within(SearchScope(['/docs'], True))
+
+    def test_contains_file(self):
+        """サブフォルダを含まない範囲は直下のファイルだけを含むこと"""
+        scope = SearchScope(['/docs'], include_subdirs=False)
+
+        assert scope.contains_file(os.path.join('/docs', 'a.txt'))
+        assert not scope.contains_file(os.path.join('/docs', 'sub', 'b.txt'))
+
+
+class TestSearchRefinement:
+    """前回の検索結果を候補にする絞り込みのテスト"""
+
+    @pytest.fixture
+    def refinement(self):
+        refinement = SearchRefinement()
+        refinement.begin(SearchQuery(['バルブ']), SearchScope(), SearchRefinement.INDEX)
+        refinement.add('/docs/a.txt')
+        refinement.add('/docs/b.txt')
+        return refinement
+
+    def test_refinement_returns_previous_matches(self, refinement):
+        """AND条件を加えた検索では前回一致したファイルが候補になること"""
+        refinement.complete()
+
+        candidates = refinement.begin(SearchQuery(['バルブ', '交換']), SearchScope(), SearchRefinement.INDEX)
+
+        assert candidates == ['/docs/a.txt', '/docs/b.txt']
+
+    def test_narrower_scope_filters_candidates(self, refinement):
+        """範囲を狭めた検索では範囲内の候補だけを返すこと"""
+        refinement.complete()
+
+        candidates = refinement.begin(SearchQuery(['バルブ']), SearchScope(['/docs/sub']), SearchRefinement.INDEX)
+
+        assert candidates == []
+
+    def test_incomplete_search_is_not_reused(self, refinement):
+        """最後まで終わっていない検索の結果は候補にしないこと"""
+        assert refinement.begin(SearchQuery(['バルブ', '交換']), SearchScope(), SearchRefinement.INDEX) is None
+
+    @pytest.mark.parametrize('query, source', [
+        (SearchQuery(['交換']), SearchRefinement.INDEX),
+        (SearchQuery(['バルブ', '交換'], match_mode=MATCH_MODE_WILDCARD), SearchRefinement.INDEX),
+        (SearchQuery(['バルブ', '交換']), SearchRefinement.FILES),
+    ])
+    def test_other_searches_are_not_refinements(self, refinement, query, source):
+        """検索語・照合方法・検索の方式が異なる場合は候補を返さないこと"""
+        refinement.complete()
+
+        assert refinement.begin(query, SearchScope(), source) is None
+
+    def test_reset_discards_previous_search(self, refinement):
+        """記録を捨てた後は候補を返さないこと"""
+        refinement.complete()
+        refinement.reset()
+
+        assert refinement.begin(SearchQuery(['バルブ', '交換']), SearchScope(), SearchRefinement.INDEX) is None
+
+    def test_document_match_without_hits_is_candidate(self, temp_dir):
+        """一致箇所のない文書単位の一致も記録し、絞り込みで見落とさないこと"""
+        root = os.path.join(temp_dir, 'root')
+        os.makedirs(root)
+        file_path = os.path.join(root, 'manual.txt')
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write('ポンプの点検\n安全\n弁を交換する')
+        indexer = SearchIndexer(os.path.join(temp_dir, 'search_index.json'))
+        indexer.create_index([root])
+
+        refinement = SearchRefinement()
+        terms = ['"安全 弁"']
+        refinement.begin(SearchQuery(terms), SearchScope(), SearchRefinement.INDEX)
+        # 行をまたぐフレーズは文書としては一致するが、行ごとの一致箇所はない
+        results = indexer.search_in_index(terms)
+        assert results == [(file_path, [])]
+        for path, _ in results:
+            refinement.add(path)
+        refinement.complete()
+
+        terms = ['"安全 弁"', 'ポンプ']
+        candidates = refinement.begin(SearchQuery(terms), SearchScope(), SearchRefinement.INDEX)
+        assert candidates == [file_path]
+        assert [hit.term for _, hits in indexer.search_in_index(terms, candidates=candidates) for hit in hits] == ['ポンプ']
@@ -0,0 +1,62 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from service.snippet_provider import SearchHit, SnippetProvider, extract_snippet
+
+
+class TestSnippetProvider:
+    """SnippetProviderクラスのテスト"""
+
+    @pytest.fixture
+    def text_path(self, temp_dir):
+        file_path = os.path.join(temp_dir, 'manual.txt')
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write('ポンプの点検\n安全弁の交換')
+        return file_path
+
+    def test_extract_snippet(self):
+        """一致箇所の前後context_length文字を切り出すこと"""
+        assert extract_snippet('あいうえおかきくけこ', 4, 6, 2) == 'うえおかきく'
+        assert extract_snippet('あいう', 0, 1, 5) == 'あいう'
+
+    def test_snippet_from_text_file(self, text_path):
+        """テキストファイルの一致箇所の周辺を返すこと"""
+        provider = SnippetProvider(2)
+
+        assert provider.get_snippet(text_path, SearchHit(2, 7, 10, '安全弁')) == '検\n安全弁の交'
+
+    def test_snippet_is_cached(self, text_path):
+        """同じ一致箇所は元のテキストを読み直さずに返すこと"""
+        provider = SnippetProvider(2)
+        hit = SearchHit(1, 0, 3, 'ポンプ')
+        provider.get_snippet(text_path, hit)
+
+        with patch('service.snippet_provider.read_file_with_auto_encoding') as mock_read:
+            assert provider.get_snippet(text_path, hit) == 'ポンプの点'
+            assert provider.get_snippet(text_path, SearchHit(2, 7, 10, '安全弁')) == '検\n安全弁の交'
+        mock_read.assert_not_called()
+
+    def test_cache_size_is_limited(self, text_path):
+        """保持するコンテキストの数が上限を超えないこと"""
+        provider = SnippetProvider(1, cache_size=2)
+
+        for start in range(5):
+            provider.get_snippet(text_path, SearchHit(1, start, start + 1, 'x'))
+
+        assert len(provider._snippets) == 2
+
+    def test_snippet_from_pdf_page(self):
+        """PDFは一致したページのテキストだけを読み込むこと"""
+        provider = SnippetProvider(1)
+
+        with patch('service.snippet_provider.ContentExtractor.extract_pdf_page_text',
+                   return_value='バルブ交換') as mock_extract:
+            assert provider.get_snippet('manual.pdf', SearchHit(3, 3, 5, '交換')) == 'ブ交換'
+
+        mock_extract.assert_called_once_with('manual.pdf', 3)
+
+    def test_indexed_hit_without_indexer(self):
+        """インデックスがない場合、インデックス検索の結果は空のコンテキストになること"""
+        assert SnippetProvider(10).get_snippet('manual.txt', SearchHit(1, 0, 1, 'x', indexed=True)) == ''
@@ -1,4 +1,5 @@
 import os
+import time
 
 import pytest
 from PyQt5.QtCore import QEvent
@@ -8,6 +9,10 @@ from PyQt5.QtWidgets import QApplication
 from service.text_handler import _active_viewers, open_text_file
 from utils.constants import (
     HIGHLIGHT_COLORS,
+    MATCH_MODE_FUZZY,
+    MATCH_MODE_LITERAL,
+    MATCH_MODE_REGEX,
+    MATCH_MODE_WILDCARD,
     MAX_FONT_SIZE,
     MIN_FONT_SIZE,
     TEXT_VIEWER_CLOSE_LABEL,
@@ -83,6 +88,17 @@ class TestOpenTextFile:
 
         assert len(_active_viewers) == 1
 
+    def test_open_text_file_markdown_scrolls_to_line(self, sample_markdown_file):
+        """Markdownは別スレッドで描画し、描画後に該当行のブロックへ移動する"""
+        open_text_file(sample_markdown_file, ['Python'], 16, position=7)
+        viewer = _active_viewers[0]
+
+        deadline = time.monotonic() + 5
+        while viewer._line_blocks is None and time.monotonic() < deadline:
+            QApplication.processEvents()
+
+        assert viewer.text_browser.textCursor().block().text() == 'Python'
+
     def test_open_text_file_not_found(self):
         """存在しないファイルの場合は例外"""
         with pytest.raises(Exception) as exc_info:
@@ -123,6 +139,82 @@ class TestSearchHighlighter:
         assert first_color == QColor(HIGHLIGHT_COLORS[0])
         assert cycled_color == QColor(HIGHLIGHT_COLORS[0])
 
+    def test_longer_overlapping_term_wins(self, make_viewer):
+        """重なる検索語では長い方の色になる"""
+        viewer = make_viewer('t', 'test testing', ['test', 'testing'], 16)
+        viewer.highlighter.rehighlight()
+
+        formats = viewer.text_browser.document().firstBlock().layout().formats()
+        spans = [(f.start, f.length, f.format.background().color()) for f in formats]
+        assert spans == [(0, 4, QColor(HIGHLIGHT_COLORS[0])), (5, 7, QColor(HIGHLIGHT_COLORS[1]))]
+
+    def test_operator_terms_are_parsed(self, make_viewer):
+        """NOTの検索語はハイライトせず、NEARとフレーズは結果一覧と同じ解釈でハイライトする"""
+        viewer = make_viewer('t', 'ガスバルブを安全\u3000弁と交換', ['NOT ガス', 'バルブ NEAR/5 交換', '"安全 弁"'], 16)
+        viewer.highlighter.rehighlight()
+
+        formats = viewer.text_browser.document().firstBlock().layout().formats()
+        spans = [(f.start, f.length, f.format.background().color()) for f in formats]
+        assert spans == [
+            (2, 3, QColor(HIGHLIGHT_COLORS[1])),
+            (6, 4, QColor(HIGHLIGHT_COLORS[2])),
+            (11, 2, QColor(HIGHLIGHT_COLORS[1])),
+        ]
+
+    def test_half_width_term_highlights_full_width_text(self, make_viewer):
+        """半角カナの検索語でも、全角カナの一致箇所をハイライトする"""
+        viewer = make_viewer('t', '空気コンプレッサの点検', ['ｺﾝﾌﾟﾚｯｻ'], 16)
+        viewer.highlighter.rehighlight()
+
+        formats = viewer.text_browser.document().firstBlock().layout().formats()
+        assert [(f.start, f.length) for f in formats] == [(2, 6)]
+
+    @pytest.mark.parametrize('match_mode, term, expected', [
+        (MATCH_MODE_WILDCARD, 'バ*ブ', [(2, 3)]),
+        (MATCH_MODE_REGEX, r'バル.?\s*ブ', [(2, 3)]),
+        (MATCH_MODE_LITERAL, 'バ*ブ', []),
+        (MATCH_MODE_FUZZY, 'ガスバルブー', [(0, 5)]),
+    ])
+    def test_match_mode_is_applied(self, make_viewer, match_mode, term, expected):
+        """検索語は検索したときの照合方法でハイライトする"""
+        viewer = make_viewer('t', 'ガスバルブの交換', [term], 16, match_mode=match_mode)
+        viewer.highlighter.rehighlight()
+
+        formats = viewer.text_browser.document().firstBlock().layout().formats()
+        assert [(f.start, f.length) for f in formats] == expected
+
+    @pytest.mark.parametrize('fold_kana, expected', [(True, [(0, 6)]), (False, [])])
+    def test_fold_kana_setting(self, make_viewer, fold_kana, expected):
+        """カタカナとひらがなの同一視は設定に従う"""
+        viewer = make_viewer('t', 'こんぷれっさ', ['コンプレッサ'], 16, fold_kana=fold_kana)
+        viewer.highlighter.rehighlight()
+
+        formats = viewer.text_browser.document().firstBlock().layout().formats()
+        assert [(f.start, f.length) for f in formats] == expected
+
+    def test_positions_after_surrogate_pairs(self, make_viewer):
+        """サロゲートペアになる文字の後ろでも、一致箇所の位置がずれないこと"""
+        viewer = make_viewer('t', '\U0001F600 Python', ['Python'], 16)
+        viewer.highlighter.rehighlight()
+
+        formats = viewer.text_browser.document().firstBlock().layout().formats()
+        assert [(f.start, f.length) for f in formats] == [(3, 6)]
+
+    def test_block_matches_are_reused(self, make_viewer, monkeypatch):
+        """内容が変わらないブロックは再ハイライトで照合し直さない"""
+        viewer = make_viewer('t', 'Python\ntesting', ['Python'], 16)
+        highlighter = viewer.highlighter
+        highlighter.rehighlight()
+
+        calls = []
+        original_match = highlighter._match
+        monkeypatch.setattr(highlighter, '_match', lambda text: calls.append(text) or original_match(text))
+        highlighter.rehighlight()
+        assert calls == []
+
+        viewer.text_browser.setPlainText('Python 3')
+        assert calls == ['Python 3']
+
 
 @pytest.mark.unit
 class TestTextViewerWindow:
@@ -184,6 +276,26 @@ class TestTextViewerWindow:
         # カーソルが3行目(0始まりで2)にあることを確認
         assert viewer.text_browser.textCursor().blockNumber() == 2
 
+    def test_large_file_loads_only_window(self, tmp_path, monkeypatch):
+        """大きなファイルは表示位置の前後の行だけを読み込み、範囲外の行へ移動すると読み直すこと"""
+        path = tmp_path / 'large.txt'
+        path.write_text('\n'.join(f'line{i + 1}' for i in range(1000)), encoding='utf-8')
+        monkeypatch.setattr('service.text_handler.LARGE_TEXT_FILE_THRESHOLD', 1)
+        monkeypatch.setattr(text_viewer_widget, 'TEXT_VIEWER_WINDOW_LINES', 100)
+        monkeypatch.setattr(text_viewer_widget, 'TEXT_VIEWER_WINDOW_MARGIN', 20)
+
+        open_text_file(str(path), ['line'], 16, position=500)
+        viewer = _active_viewers[0]
+
+        document = viewer.text_browser.document()
+        assert document.blockCount() == 100
+        assert document.firstBlock().text() == 'line480'
+        assert viewer.text_browser.textCursor().block().text() == 'line500'
+
+        viewer._scroll_to_line(990)
+        assert document.firstBlock().text() == 'line901'
+        assert viewer.text_browser.textCursor().block().text() == 'line990'
+
     def test_no_highlighter_when_no_terms(self, make_viewer):
         """検索語がない場合ハイライタは生成されない"""
         viewer = make_viewer('t', 'content', [], 16)
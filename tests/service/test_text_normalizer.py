@@ -0,0 +1,52 @@
+import pytest
+
+from service.search_matcher import SearchMatcher
+from service.search_pattern import SearchPattern
+from service.text_normalizer import NormalizedText, normalize_text
+from utils.constants import MATCH_MODE_REGEX, MATCH_MODE_WILDCARD, SEARCH_TYPE_AND
+
+
+class TestTextNormalizer:
+    """全角・半角とカタカナ・ひらがなの正規化のテスト"""
+
+    @pytest.mark.parametrize('text, expected', [
+        ('ＡＢＣ１２３', 'abc123'),
+        ('ﾊﾞﾙﾌﾞ', 'ばるぶ'),
+        ('バルブ', 'ばるぶ'),
+        ('ばるぶ', 'ばるぶ'),
+    ])
+    def test_normalize_text(self, text, expected):
+        """全角英数字・半角カタカナ・カタカナが同じ文字列になること"""
+        assert normalize_text(text) == expected
+
+    def test_fold_kana_can_be_disabled(self):
+        """カタカナとひらがなを区別する設定ではカタカナのまま残ること"""
+        assert normalize_text('ﾊﾞﾙﾌﾞ', fold_kana=False) == 'バルブ'
+
+    def test_offsets_map_back_to_original(self):
+        """文字数が変わる正規化でも元のテキストの位置に戻せること"""
+        original = '点検:ﾊﾞﾙﾌﾞの交換'
+        normalized = NormalizedText(original)
+
+        start = normalized.text.index('ばるぶ')
+        begin, end = normalized.to_original(start, start + 3)
+        assert original[begin:end] == 'ﾊﾞﾙﾌﾞ'
+
+    def test_pattern_spans_are_in_original_text(self):
+        """一致位置が元のテキストの位置で返されること"""
+        text = 'ﾎﾟﾝﾌﾟとＰＵＭＰ'
+
+        assert list(SearchPattern('ぽんぷ').finditer(text)) == [(0, 5)]
+        assert list(SearchPattern('pump').finditer(text)) == [(6, 10)]
+
+    def test_fullwidth_regex_symbols_stay_literal(self):
+        """正規表現の全角記号は演算子にならず、全角の＊はワイルドカードになること"""
+        assert SearchPattern('（注）', MATCH_MODE_REGEX).matches('(注)の記載')
+        assert not SearchPattern('（注）', MATCH_MODE_REGEX).matches('注の記載')
+        assert SearchPattern('安全＊点検', MATCH_MODE_WILDCARD).matches('安全弁の点検')
+
+    def test_matcher_contexts_use_original_text(self):
+        """コンテキストが正規化前の元のテキストから切り出されること"""
+        matcher = SearchMatcher(['バルブ'], SEARCH_TYPE_AND, 1)
+
+        assert matcher.extract_contexts('旧ﾊﾞﾙﾌﾞ交換', 'バルブ') == ['旧ﾊﾞﾙﾌﾞ交']
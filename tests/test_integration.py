@@ -4,12 +4,13 @@ from unittest.mock import patch
 import pytest
 
 from utils.constants import (
-    SEARCH_TYPE_AND, SEARCH_TYPE_OR
+    MATCH_MODE_LITERAL, SEARCH_TYPE_AND, SEARCH_TYPE_OR
 )
 from service.file_opener import FileOpener
 from service.file_searcher import FileSearcher
 from service.indexed_file_searcher import SmartFileSearcher, SearchMode
 from service.search_indexer import SearchIndexer
+from service.snippet_provider import SnippetProvider
 from service.text_handler import open_text_file
 from utils.config_manager import ConfigManager
 from utils.helpers import normalize_path
@@ -87,8 +88,8 @@ list = {temp_dir}
         # 検索結果収集
         search_results = []
 
-        def collect_results(file_path, matches):
-            search_results.append((file_path, matches))
+        def collect_results(batch):
+            search_results.extend(batch)
 
         # FileSearcher作成・実行
         searcher = FileSearcher(
@@ -100,7 +101,7 @@ list = {temp_dir}
             context_length=config_manager.get_context_length()
         )
 
-        searcher.result_found.connect(collect_results)
+        searcher.results_batch.connect(collect_results)
         searcher.run()
 
         # 結果検証
@@ -109,7 +110,8 @@ list = {temp_dir}
         # 各結果にPythonが含まれることを確認
         for file_path, matches in search_results:
             assert len(matches) > 0
-            for position, context in matches:
+            for hit in matches:
+                context = SnippetProvider(100).get_snippet(file_path, hit)
                 assert 'Python' in context or 'python' in context.lower()
 
         # サブディレクトリのファイルも含まれることを確認
@@ -131,8 +133,8 @@ list = {temp_dir}
         # インデックス検索実行
         search_results = []
         
-        def collect_results(file_path, matches):
-            search_results.append((file_path, matches))
+        def collect_results(batch):
+            search_results.extend(batch)
         
         index_searcher = SmartFileSearcher(
             directory=setup['root_dir'],
@@ -146,7 +148,7 @@ list = {temp_dir}
             search_mode=SearchMode.INDEX_ONLY
         )
         
-        index_searcher.result_found.connect(collect_results)
+        index_searcher.results_batch.connect(collect_results)
         index_searcher.run()
         
         # 結果検証
@@ -181,8 +183,8 @@ list = {temp_dir}
         # 従来検索実行
         traditional_results = []
         traditional_searcher = FileSearcher(**search_params)
-        traditional_searcher.result_found.connect(
-            lambda f, m: traditional_results.append((f, len(m)))
+        traditional_searcher.results_batch.connect(
+            lambda batch: traditional_results.extend((f, len(m)) for f, m in batch)
         )
         traditional_searcher.run()
         
@@ -194,8 +196,8 @@ list = {temp_dir}
             search_mode=SearchMode.INDEX_ONLY,
             **search_params
         )
-        index_searcher.result_found.connect(
-            lambda f, m: index_results.append((f, len(m)))
+        index_searcher.results_batch.connect(
+            lambda batch: index_results.extend((f, len(m)) for f, m in batch)
         )
         index_searcher.run()
         
@@ -225,7 +227,8 @@ list = {temp_dir}
             
             mock_open_text.assert_called_once_with(
                 txt_file, ['Python'], config_manager.get_text_viewer_font_size(), 1, None,
-                config_manager.get_text_viewer_width(), config_manager.get_text_viewer_height()
+                config_manager.get_text_viewer_width(), config_manager.get_text_viewer_height(),
+                MATCH_MODE_LITERAL, config_manager.get_fold_kana()
             )
             assert file_opener._last_opened_file == txt_file
         
@@ -237,7 +240,8 @@ list = {temp_dir}
             
             mock_open_text.assert_called_once_with(
                 md_file, ['Python', '上級'], config_manager.get_text_viewer_font_size(), 1, None,
-                config_manager.get_text_viewer_width(), config_manager.get_text_viewer_height()
+                config_manager.get_text_viewer_width(), config_manager.get_text_viewer_height(),
+                MATCH_MODE_LITERAL, config_manager.get_fold_kana()
             )
 
 
@@ -341,7 +345,8 @@ use_index_search = False
             # 新しいフォントサイズが使用されることを確認
             mock_open.assert_called_with(
                 test_file, ['test'], 20, 0, None,
-                config_manager2.get_text_viewer_width(), config_manager2.get_text_viewer_height()
+                config_manager2.get_text_viewer_width(), config_manager2.get_text_viewer_height(),
+                MATCH_MODE_LITERAL, config_manager2.get_fold_kana()
             )
     
     def test_context_length_change_impact(self, config_setup):
@@ -444,14 +449,14 @@ class TestErrorRecoveryIntegration:
         # SmartFileSearcherがフォールバックすることを確認
         results = []
         
-        def collect_results(file_path, matches):
-            results.append((file_path, matches))
+        def collect_results(batch):
+            results.extend(batch)
         
         searcher = SmartFileSearcher(directory=setup['temp_dir'], search_terms=['Python'], include_subdirs=False,
                                      search_type=SEARCH_TYPE_OR, file_extensions=['.txt'], context_length=100,
                                      use_index=True, index_file_path=setup['index_file'])
         
-        searcher.result_found.connect(collect_results)
+        searcher.results_batch.connect(collect_results)
         searcher.run()
         
         # フォールバック検索で結果が得られることを確認
@@ -574,7 +579,7 @@ use_index_search = True
         
         # 検索実行
         results = []
-        searcher.result_found.connect(lambda f, m: results.append((f, m)))
+        searcher.results_batch.connect(results.extend)
         searcher.run()
         
         # 設定された拡張子のファイルのみが検索されることを確認
@@ -597,7 +602,7 @@ use_index_search = True
         )
         
         search_results = []
-        searcher.result_found.connect(lambda f, m: search_results.append((f, m)))
+        searcher.results_batch.connect(search_results.extend)
         searcher.run()
         
         # 検索結果からファイルオープン
@@ -613,7 +618,8 @@ use_index_search = True
             # FileOpenerが正しいパラメータで呼ばれることを確認
             mock_open.assert_called_once_with(
                 file_path, ['Python'], config_manager.get_text_viewer_font_size(), position, None,
-                config_manager.get_text_viewer_width(), config_manager.get_text_viewer_height()
+                config_manager.get_text_viewer_width(), config_manager.get_text_viewer_height(),
+                MATCH_MODE_LITERAL, config_manager.get_fold_kana()
             )
     
     def test_indexer_to_searcher_integration(self, cross_module_setup):
@@ -644,13 +650,14 @@ use_index_search = True
         )
         
         index_results = []
-        index_searcher.result_found.connect(lambda f, m: index_results.append((f, m)))
+        index_searcher.results_batch.connect(index_results.extend)
         index_searcher.run()
         
         # インデックスから正しく結果が取得されることを確認
         assert len(index_results) == 2
+        snippets = SnippetProvider(config_manager.get_context_length(), index_searcher.indexer)
         for file_path, matches in index_results:
-            assert 'Python' in matches[0][1]  # コンテキストにPythonが含まれる
+            assert 'Python' in snippets.get_snippet(file_path, matches[0])  # コンテキストにPythonが含まれる
     
     def test_config_to_text_handler_integration(self, cross_module_setup):
         """ConfigManager → TextHandler連携テスト"""
@@ -695,7 +702,7 @@ use_index_search = True
         )
         
         search_results = []
-        searcher.result_found.connect(lambda f, m: search_results.append((f, m)))
+        searcher.results_batch.connect(search_results.extend)
         searcher.run()
         
         # 4. ファイルオープン準備
@@ -710,7 +717,8 @@ use_index_search = True
             
             # マッチ内容の確認
             assert len(matches) > 0
-            position, context = matches[0]
+            position = matches[0].position
+            context = SnippetProvider(config_manager.get_context_length(), searcher.indexer).get_snippet(file_path, matches[0])
             assert 'Python' in context
             assert 'integration' in context.lower() or 'Integration' in context
             
@@ -725,7 +733,9 @@ use_index_search = True
                     position,
                     None,
                     config_manager.get_text_viewer_width(),
-                    config_manager.get_text_viewer_height()
+                    config_manager.get_text_viewer_height(),
+                    MATCH_MODE_LITERAL,
+                    config_manager.get_fold_kana()
                 )
         
         # インデックス統計確認
@@ -136,6 +136,42 @@ class TestConfigManager:
         assert config.get_cleanup_temp_files() == True
         assert config.get_max_temp_files() == 10
 
+    def test_max_results_per_file(self, temp_config_file):
+        """1ファイルあたりの一致箇所の上限が既定値と範囲内に丸めた値で返ること"""
+        config = ConfigManager(temp_config_file)
+        assert config.get_max_results_per_file() == 200
+
+        config.config['SearchSettings'] = {'max_results_per_file': '0'}
+        assert config.get_max_results_per_file() == 1
+
+    def test_pdf_viewer(self, temp_config_file):
+        """PDFビューアの既定値がアプリ内ビューアで、不明な値は既定値に戻ること"""
+        config = ConfigManager(temp_config_file)
+        assert config.get_pdf_viewer() == 'builtin'
+
+        config.config['PDFSettings'] = {'pdf_viewer': 'Acrobat'}
+        assert config.get_pdf_viewer() == 'acrobat'
+
+        config.config['PDFSettings'] = {'pdf_viewer': 'unknown'}
+        assert config.get_pdf_viewer() == 'builtin'
+
+    def test_highlight_page_window(self, temp_config_file):
+        """ハイライトするページ範囲が既定値と範囲内に丸めた値で返ること"""
+        config = ConfigManager(temp_config_file)
+        assert config.get_highlight_page_window() == 5
+
+        config.config['PDFSettings'] = {'highlight_page_window': '-3'}
+        assert config.get_highlight_page_window() == 0
+
+    def test_temp_file_limits(self, temp_config_file):
+        """ハイライトしたPDFの一時ファイルの上限が既定値と範囲内に丸めた値で返ること"""
+        config = ConfigManager(temp_config_file)
+        assert config.get_max_temp_files() == 10
+        assert config.get_max_temp_size_mb() == 200
+
+        config.config['PDFSettings'] = {'max_temp_size_mb': '1'}
+        assert config.get_max_temp_size_mb() == 10
+
     def test_save_and_load(self, temp_dir):
         """設定の保存と読み込みテスト"""
         config_path = os.path.join(temp_dir, 'save_test.ini')
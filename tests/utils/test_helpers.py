@@ -12,7 +12,7 @@ from utils.constants import (
 from utils.helpers import (
     normalize_path, is_network_file, check_file_accessibility,
     read_file_with_auto_encoding, create_confirmation_dialog,
-    move_cursor_to_yes_button
+    move_cursor_to_yes_button, format_compaction_report
 )
 
 
@@ -386,6 +386,27 @@ class TestMoveCursorToYesButton:
         mock_set_pos.assert_not_called()
 
 
+class TestFormatCompactionReport:
+    """format_compaction_report関数のテスト"""
+
+    def test_format_compaction_report(self):
+        """バイト数をMB単位に変換して表示すること"""
+        report = {
+            'size_before': 3 * 1024 * 1024,
+            'size_after': 1024 * 1024,
+            'reclaimed_bytes': 2 * 1024 * 1024,
+            'removed_duplicates': 4,
+            'load_seconds_before': 0.5,
+            'load_seconds_after': 0.25,
+        }
+
+        text = format_compaction_report(report)
+
+        assert '3.0MB → 1.0MB' in text
+        assert '2.0MB削減' in text
+        assert '重複 4 件' in text
+
+
 class TestHelpersIntegration:
     """helpers.py の統合テスト"""
     
@@ -0,0 +1,93 @@
+import os
+
+import fitz
+import pytest
+
+from utils.constants import MATCH_MODE_FUZZY, MATCH_MODE_REGEX, MATCH_MODE_WILDCARD, PDF_VIEWER_PAGE_CACHE_SIZE
+from widgets.pdf_viewer_widget import PDFViewerWindow
+
+
+@pytest.mark.gui
+class TestPDFViewerWindow:
+    """アプリ内PDFビューアのテスト"""
+
+    PAGE_COUNT = 40
+
+    @pytest.fixture
+    def pdf_path(self, temp_dir):
+        """各ページに検索語を含むPDF"""
+        path = os.path.join(temp_dir, 'manual.pdf')
+        with fitz.open() as doc:
+            for i in range(self.PAGE_COUNT):
+                page = doc.new_page()
+                page.insert_text((72, 100), f'page {i + 1} safety valve check')
+            doc.save(path)
+        return path
+
+    @pytest.fixture
+    def viewer(self, qtbot, pdf_path):
+        window = PDFViewerWindow('manual.pdf', pdf_path, ['valve', 'check'], position=20)
+        qtbot.addWidget(window)
+        window.show()
+        qtbot.waitUntil(lambda: window.current_page() == 20)
+        return window
+
+    def test_opens_at_hit_page_and_renders_only_nearby_pages(self, viewer, qtbot):
+        """指定ページを表示し、描画するのは表示範囲と前後の先読みのページだけであること"""
+        qtbot.waitUntil(lambda: 21 in viewer._rendered)
+
+        assert 19 in viewer._rendered
+        assert len(viewer._rendered) < self.PAGE_COUNT
+        assert viewer._page_images[0].pixmap().isNull()
+
+    def test_highlights_are_overlaid_on_page(self, viewer):
+        """検索語の位置にハイライトの矩形が重ねられること"""
+        assert len(viewer._highlights[19]) == 2
+        assert len(viewer._page_frames[19].childItems()) == 3  # 画像 + ハイライト2つ
+
+    def test_highlights_follow_query_operators(self, qtbot, pdf_path):
+        """NOTの検索語はハイライトせず、フレーズは語の並びだけをハイライトすること"""
+        window = PDFViewerWindow('manual.pdf', pdf_path, ['NOT check', '"safety valve"'], position=1)
+        qtbot.addWidget(window)
+
+        highlights = window._find_highlights(window.document[0])
+
+        assert [color_index for _, color_index in highlights] == [1]
+        assert highlights[0][0].width > window.document[0].search_for('valve')[0].width
+
+    def test_full_width_term_highlights_half_width_text(self, qtbot, pdf_path):
+        """全角英字の検索語でも、半角の一致箇所をハイライトすること"""
+        window = PDFViewerWindow('manual.pdf', pdf_path, ['ＶＡＬＶＥ'], position=1)
+        qtbot.addWidget(window)
+
+        highlights = window._find_highlights(window.document[0])
+
+        assert [rect for rect, _ in highlights] == window.document[0].search_for('valve')
+
+    @pytest.mark.parametrize('match_mode, term', [
+        (MATCH_MODE_WILDCARD, 'saf*ty'), (MATCH_MODE_REGEX, r'saf\w+'), (MATCH_MODE_FUZZY, 'safty'),
+    ])
+    def test_highlights_use_match_mode(self, qtbot, pdf_path, match_mode, term):
+        """ワイルドカード・正規表現・あいまい検索の検索語は、その照合方法でハイライトすること"""
+        window = PDFViewerWindow('manual.pdf', pdf_path, [term], position=1, match_mode=match_mode)
+        qtbot.addWidget(window)
+
+        highlights = window._find_highlights(window.document[0])
+
+        assert [rect for rect, _ in highlights] == window.document[0].search_for('safety')
+
+    def test_page_cache_is_bounded(self, viewer, qtbot):
+        """描画したページの保持数が上限を超えないこと"""
+        for page_number in range(1, self.PAGE_COUNT + 1):
+            viewer.go_to_page(page_number)
+
+        assert len(viewer._rendered) <= PDF_VIEWER_PAGE_CACHE_SIZE
+        assert viewer.current_page() == self.PAGE_COUNT
+
+    def test_zoom_keeps_current_page(self, viewer):
+        """拡大・縮小しても表示中のページが変わらないこと"""
+        viewer.zoom_in()
+        assert viewer.current_page() == 20
+
+        viewer.zoom_out()
+        assert viewer.current_page() == 20
@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from service.search_refinement import SearchRefinement, SearchScope
+from utils.constants import MATCH_MODE_LITERAL, SEARCH_TYPE_AND
+from widgets.results_widget import ResultsWidget
+
+
+@pytest.mark.unit
+@pytest.mark.gui
+class TestResultsWidgetRefinement:
+    """ResultsWidgetが検索を絞り込みの候補として記録する条件のテスト"""
+
+    @pytest.fixture
+    def mock_config_manager(self):
+        """ConfigManagerのモックを作成"""
+        config_mock = MagicMock()
+        config_mock.get_font_size.return_value = 14
+        config_mock.get_context_length.return_value = 100
+        config_mock.get_fold_kana.return_value = True
+        return config_mock
+
+    @pytest.fixture
+    def results_widget(self, qtbot, mock_config_manager):
+        """ResultsWidgetインスタンスを作成"""
+        widget = ResultsWidget(mock_config_manager)
+        qtbot.addWidget(widget)
+        return widget
+
+    def _search_index(self, widget, search_terms, index_search_succeeded):
+        candidates = widget._begin_search(
+            search_terms, SEARCH_TYPE_AND, MATCH_MODE_LITERAL, SearchScope(), SearchRefinement.INDEX
+        )
+        widget.index_searcher = MagicMock(index_search_succeeded=index_search_succeeded)
+        widget.add_results([('/docs/manual.txt', [])])
+        # 状態表示を消すタイマーはウィジェットの破棄後に動くため止める
+        with patch('widgets.results_widget.QTimer.singleShot'):
+            widget._on_index_search_completed()
+        return candidates
+
+    def test_index_search_recorded(self, results_widget):
+        """インデックスで検索できた場合は、次の検索の候補に使うこと"""
+        self._search_index(results_widget, ['バルブ'], True)
+
+        candidates = self._search_index(results_widget, ['バルブ', '交換'], True)
+
+        assert candidates == ['/docs/manual.txt']
+
+    def test_fallback_search_not_recorded(self, results_widget):
+        """インデックスを使えず通常の検索に切り替えた場合は、次の検索の候補に使わないこと"""
+        self._search_index(results_widget, ['バルブ'], False)
+
+        candidates = self._search_index(results_widget, ['バルブ', '交換'], True)
+
+        assert candidates is None
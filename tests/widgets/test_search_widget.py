@@ -72,6 +72,29 @@ class TestSearchWidget:
             search_widget.search_input.setFocus()
             qtbot.keyPress(search_widget.search_input, Qt.Key_Return)
 
+    def test_incremental_search_is_debounced(self, qtbot, search_widget):
+        """入力中の検索が有効な場合、入力が止まってから1回だけ要求されること"""
+        search_widget.set_incremental_search_available(True)
+        search_widget.incremental_checkbox.setChecked(True)
+        requests = []
+        search_widget.incremental_search_requested.connect(lambda: requests.append(True))
+
+        for text in ('ポ', 'ポン', 'ポンプ'):
+            search_widget.search_input.setText(text)
+
+        qtbot.waitUntil(lambda: requests == [True], timeout=2000)
+        qtbot.wait(100)
+        assert requests == [True]
+
+    def test_incremental_search_requires_availability(self, qtbot, search_widget):
+        """インデックス検索が無効な場合は入力中の検索を要求しないこと"""
+        search_widget.incremental_checkbox.setChecked(True)
+
+        search_widget.search_input.setText('ポンプ')
+
+        assert not search_widget.is_incremental_search()
+        assert not search_widget.incremental_timer.isActive()
+
     def test_search_requested_signal_defined(self, search_widget):
         """search_requestedシグナルが定義されていることを検証"""
         assert hasattr(search_widget, 'search_requested')
@@ -10,11 +10,15 @@ from utils.constants import (
     CONFIG_SECTIONS,
     DEFAULT_ACROBAT_PATH,
     DEFAULT_CONTEXT_LENGTH,
+    DEFAULT_FOLD_KANA,
     DEFAULT_FONT_SIZE,
+    DEFAULT_HIGHLIGHT_PAGE_WINDOW,
     DEFAULT_HTML_FONT_SIZE,
     DEFAULT_INDEX_FILE,
     DEFAULT_MAX_TEMP_FILES,
+    DEFAULT_MAX_TEMP_SIZE_MB,
     DEFAULT_PDF_TIMEOUT,
+    DEFAULT_PDF_VIEWER,
     DEFAULT_USE_INDEX_SEARCH,
     DIRECTORY_MANAGEMENT_DIALOG_HEIGHT,
     DIRECTORY_MANAGEMENT_DIALOG_WIDTH,
@@ -22,16 +26,24 @@ from utils.constants import (
     DEFAULT_WINDOW_WIDTH,
     DEFAULT_WINDOW_X,
     DEFAULT_WINDOW_Y,
+    INDEX_MAX_RESULTS,
     MAX_FONT_SIZE,
+    MAX_HIGHLIGHT_PAGE_WINDOW,
+    MAX_MAX_RESULTS_PER_FILE,
     MAX_MAX_TEMP_FILES,
+    MAX_MAX_TEMP_SIZE_MB,
     MAX_PDF_TIMEOUT,
     MAX_WINDOW_HEIGHT,
     MAX_WINDOW_WIDTH,
     MIN_FONT_SIZE,
+    MIN_HIGHLIGHT_PAGE_WINDOW,
+    MIN_MAX_RESULTS_PER_FILE,
     MIN_MAX_TEMP_FILES,
+    MIN_MAX_TEMP_SIZE_MB,
     MIN_PDF_TIMEOUT,
     MIN_WINDOW_HEIGHT,
     MIN_WINDOW_WIDTH,
+    PDF_VIEWERS,
     SUPPORTED_FILE_EXTENSIONS,
     TEXT_VIEWER_DEFAULT_HEIGHT,
     TEXT_VIEWER_DEFAULT_WIDTH,
@@ -72,6 +84,9 @@ class ConfigValueValidator:
         'text_viewer_font_size': (MIN_FONT_SIZE, MAX_FONT_SIZE),
         'timeout': (MIN_PDF_TIMEOUT, MAX_PDF_TIMEOUT),
         'max_temp_files': (MIN_MAX_TEMP_FILES, MAX_MAX_TEMP_FILES),
+        'max_temp_size_mb': (MIN_MAX_TEMP_SIZE_MB, MAX_MAX_TEMP_SIZE_MB),
+        'max_results_per_file': (MIN_MAX_RESULTS_PER_FILE, MAX_MAX_RESULTS_PER_FILE),
+        'highlight_page_window': (MIN_HIGHLIGHT_PAGE_WINDOW, MAX_HIGHLIGHT_PAGE_WINDOW),
     }
     
     @classmethod
@@ -106,12 +121,18 @@ class ConfigManager:
         'folder_settings_dialog_width': DIRECTORY_MANAGEMENT_DIALOG_WIDTH,
         'folder_settings_dialog_height': DIRECTORY_MANAGEMENT_DIALOG_HEIGHT,
         'context_length': DEFAULT_CONTEXT_LENGTH,
+        'fold_kana': DEFAULT_FOLD_KANA,
+        'max_results_per_file': INDEX_MAX_RESULTS,
         'timeout': DEFAULT_PDF_TIMEOUT,
         'max_temp_files': DEFAULT_MAX_TEMP_FILES,
+        'max_temp_size_mb': DEFAULT_MAX_TEMP_SIZE_MB,
         'cleanup_temp_files': True,
+        'pdf_viewer': DEFAULT_PDF_VIEWER,
+        'highlight_page_window': DEFAULT_HIGHLIGHT_PAGE_WINDOW,
         'acrobat_path': DEFAULT_ACROBAT_PATH,
         'index_file_path': DEFAULT_INDEX_FILE,
         'use_index_search': DEFAULT_USE_INDEX_SEARCH,
+        'local_cache_dir': '',
         'extensions': ','.join(SUPPORTED_FILE_EXTENSIONS),
     }
 
@@ -319,6 +340,14 @@ class ConfigManager:
     def set_context_length(self, length: int) -> None:
         self._set_int(CONFIG_SECTIONS['SEARCH_SETTINGS'], CONFIG_KEYS['CONTEXT_LENGTH'], length, validate=False)
     
+    def get_fold_kana(self) -> bool:
+        """検索でカタカナとひらがなを同一視するか"""
+        return self._get_bool(CONFIG_SECTIONS['SEARCH_SETTINGS'], CONFIG_KEYS['FOLD_KANA'])
+
+    def get_max_results_per_file(self) -> int:
+        """インデックス検索で1ファイルあたりに返す一致箇所の上限"""
+        return self._get_int(CONFIG_SECTIONS['SEARCH_SETTINGS'], CONFIG_KEYS['MAX_RESULTS_PER_FILE'])
+
     def get_pdf_timeout(self) -> int:
         return self._get_int(CONFIG_SECTIONS['PDF_SETTINGS'], CONFIG_KEYS['TIMEOUT'])
     
@@ -336,13 +365,30 @@ class ConfigManager:
     
     def set_max_temp_files(self, max_files: int) -> None:
         self._set_int(CONFIG_SECTIONS['PDF_SETTINGS'], CONFIG_KEYS['MAX_TEMP_FILES'], max_files)
-    
+
+    def get_max_temp_size_mb(self) -> int:
+        """ハイライトしたPDFの一時ファイルの合計サイズの上限（MB）"""
+        return self._get_int(CONFIG_SECTIONS['PDF_SETTINGS'], CONFIG_KEYS['MAX_TEMP_SIZE_MB'])
+    
+    def get_pdf_viewer(self) -> str:
+        """PDFを表示するビューア（builtin: アプリ内ビューア、acrobat: Adobe Acrobat）"""
+        viewer = self._get_str(CONFIG_SECTIONS['PDF_SETTINGS'], CONFIG_KEYS['PDF_VIEWER']).strip().lower()
+        return viewer if viewer in PDF_VIEWERS else DEFAULT_PDF_VIEWER
+
+    def get_highlight_page_window(self) -> int:
+        """Acrobatで開くPDFで、該当ページの前後何ページまでハイライトするか"""
+        return self._get_int(CONFIG_SECTIONS['PDF_SETTINGS'], CONFIG_KEYS['HIGHLIGHT_PAGE_WINDOW'])
+
     def get_index_file_path(self) -> str:
         return self._get_str(CONFIG_SECTIONS['INDEX_SETTINGS'], CONFIG_KEYS['INDEX_FILE_PATH'])
     
     def set_index_file_path(self, path: str) -> None:
         self._set_str(CONFIG_SECTIONS['INDEX_SETTINGS'], CONFIG_KEYS['INDEX_FILE_PATH'], path)
     
+    def get_index_local_cache_dir(self) -> str:
+        """共有インデックスを複製するローカルのフォルダ（空の場合は複製しない）"""
+        return self._get_str(CONFIG_SECTIONS['INDEX_SETTINGS'], CONFIG_KEYS['INDEX_LOCAL_CACHE_DIR'])
+
     def get_use_index_search(self) -> bool:
         return self._get_bool(CONFIG_SECTIONS['INDEX_SETTINGS'], CONFIG_KEYS['USE_INDEX_SEARCH'])
     
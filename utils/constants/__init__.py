@@ -11,7 +11,23 @@ from .config import (
     DEFAULT_INDEX_FILE,
     SEARCH_TYPE_AND,
     SEARCH_TYPE_OR,
+    MATCH_MODE_LITERAL,
+    MATCH_MODE_WILDCARD,
+    MATCH_MODE_REGEX,
+    MATCH_MODE_FUZZY,
+    FUZZY_CHARS_PER_EDIT,
+    FUZZY_NGRAM_SIZE,
+    QUERY_NOT_OPERATOR,
+    QUERY_NEAR_OPERATOR_PATTERN,
+    QUERY_PHRASE_QUOTE,
+    DEFAULT_FOLD_KANA,
     MAX_SEARCH_RESULTS_PER_FILE,
+    SNIPPET_CACHE_SIZE,
+    SNIPPET_SOURCE_CACHE_SIZE,
+    RESULT_BATCH_INTERVAL,
+    RESULT_BATCH_MAX_HITS,
+    MIN_MAX_RESULTS_PER_FILE,
+    MAX_MAX_RESULTS_PER_FILE,
     DEFAULT_CONTEXT_LENGTH,
     DEFAULT_USE_INDEX_SEARCH,
     INDEX_UPDATE_THRESHOLD_DAYS,
@@ -22,6 +38,16 @@ from .config import (
     DEFAULT_MAX_TEMP_FILES,
     MIN_MAX_TEMP_FILES,
     MAX_MAX_TEMP_FILES,
+    DEFAULT_MAX_TEMP_SIZE_MB,
+    MIN_MAX_TEMP_SIZE_MB,
+    MAX_MAX_TEMP_SIZE_MB,
+    PDF_VIEWER_BUILTIN,
+    PDF_VIEWER_ACROBAT,
+    PDF_VIEWERS,
+    DEFAULT_PDF_VIEWER,
+    DEFAULT_HIGHLIGHT_PAGE_WINDOW,
+    MIN_HIGHLIGHT_PAGE_WINDOW,
+    MAX_HIGHLIGHT_PAGE_WINDOW,
     LOG_RETENTION_DAYS,
     CONFIG_SECTIONS,
     CONFIG_KEYS,
@@ -33,12 +59,35 @@ from .config import (
     FILE_TYPES,
     ENCODING_CANDIDATES,
     ENCODING_FALLBACK,
+    LARGE_TEXT_FILE_THRESHOLD,
+    LARGE_TEXT_ENCODING_SAMPLE_SIZE,
+    LARGE_TEXT_LINE_INDEX_CHUNK_SIZE,
+    MARKDOWN_RENDER_CACHE_SIZE,
+    MARKDOWN_LINE_KEY_LENGTH,
+    MARKDOWN_LINE_MATCH_LOOKAHEAD,
     PDF_TEXT_PAGE_SEPARATOR,
     TEXT_LINE_SEPARATOR,
     INDEX_DEFAULT_CONTEXT_LENGTH,
     INDEX_MAX_RESULTS,
     INDEX_HASH_READ_CHUNK_SIZE,
     INDEX_PROGRESS_LOG_INTERVAL,
+    INDEX_SHARD_DIR_SUFFIX,
+    INDEX_SHARD_ID_LENGTH,
+    INDEX_COMPRESSION_BLOCK_SIZE,
+    INDEX_COMPRESSION_LEVEL,
+    INDEX_TEMP_FILE_SUFFIX,
+    INDEX_LOAD_RETRY_COUNT,
+    INDEX_REPLACE_RETRY_COUNT,
+    INDEX_REPLACE_RETRY_DELAY,
+    INDEX_LOCK_FILE_SUFFIX,
+    INDEX_LOCK_TIMEOUT,
+    INDEX_LOCK_STALE_SECONDS,
+    INDEX_LOCK_POLL_INTERVAL,
+    INDEX_LOCK_REFRESH_INTERVAL,
+    INDEX_NGRAM_BITS_PER_GRAM,
+    INDEX_NGRAM_MIN_BITS,
+    INDEX_NGRAM_MAX_BITS,
+    CORPUS_DOCUMENT_SEPARATOR,
 )
 
 from .ui import (
@@ -87,15 +136,30 @@ from .ui import (
     TEXT_VIEWER_OPEN_FILE_LABEL,
     TEXT_VIEWER_PRINT_LABEL,
     TEXT_VIEWER_CLOSE_LABEL,
-    ACROBAT_KEYBINDS,
-    ACROBAT_KEYSTROKE_DELAY,
-    ACROBAT_ACTION_DELAY,
+    TEXT_VIEWER_WINDOW_LINES,
+    TEXT_VIEWER_WINDOW_MARGIN,
+    TEXT_VIEWER_LINE_RANGE_TEMPLATE,
+    TEXT_VIEWER_MARKDOWN_LOADING_MESSAGE,
+    PDF_VIEWER_ZOOM_IN_LABEL,
+    PDF_VIEWER_ZOOM_OUT_LABEL,
+    PDF_VIEWER_PAGE_LABEL_TEMPLATE,
+    PDF_VIEWER_DEFAULT_ZOOM,
+    PDF_VIEWER_MIN_ZOOM,
+    PDF_VIEWER_MAX_ZOOM,
+    PDF_VIEWER_ZOOM_STEP,
+    PDF_VIEWER_PAGE_GAP,
+    PDF_VIEWER_BACKGROUND_COLOR,
+    PDF_VIEWER_PAGE_CACHE_SIZE,
+    PDF_VIEWER_PREFETCH_PAGES,
+    PDF_VIEWER_HIGHLIGHT_ALPHA,
     INDEX_STATS_GROUP_TITLE,
     INDEX_OPERATIONS_GROUP_TITLE,
     INDEX_LOG_GROUP_TITLE,
     INDEX_STATS_UPDATE_INTERVAL,
     INDEX_THREAD_WAIT_TIMEOUT,
     INDEX_STATUS_DISPLAY_TIMEOUT,
+    INCREMENTAL_SEARCH_DEBOUNCE,
+    INCREMENTAL_SEARCH_STOP_TIMEOUT,
 )
 
 from .error import (
@@ -114,13 +178,9 @@ from .error import (
 
 from .paths import (
     DEFAULT_ACROBAT_PATH,
-    ACROBAT_PROCESS_NAMES,
-    ACROBAT_WAIT_TIMEOUT,
-    ACROBAT_WAIT_INTERVAL,
-    PAGE_NAVIGATION_RETRY_COUNT,
-    PAGE_NAVIGATION_DELAY,
-    PROCESS_TERMINATE_TIMEOUT,
-    PROCESS_CLEANUP_DELAY,
+    ACROBAT_OPEN_PARAMETERS_OPTION,
+    ACROBAT_PAGE_PARAMETER_TEMPLATE,
+    PDF_OPEN_STOP_TIMEOUT,
     NETWORK_TIMEOUT,
     DNS_TEST_HOST,
     DNS_TEST_PORT,
@@ -136,7 +196,23 @@ __all__ = [
     'DEFAULT_INDEX_FILE',
     'SEARCH_TYPE_AND',
     'SEARCH_TYPE_OR',
+    'MATCH_MODE_LITERAL',
+    'MATCH_MODE_WILDCARD',
+    'MATCH_MODE_REGEX',
+    'MATCH_MODE_FUZZY',
+    'FUZZY_CHARS_PER_EDIT',
+    'FUZZY_NGRAM_SIZE',
+    'QUERY_NOT_OPERATOR',
+    'QUERY_NEAR_OPERATOR_PATTERN',
+    'QUERY_PHRASE_QUOTE',
+    'DEFAULT_FOLD_KANA',
     'MAX_SEARCH_RESULTS_PER_FILE',
+    'SNIPPET_CACHE_SIZE',
+    'SNIPPET_SOURCE_CACHE_SIZE',
+    'RESULT_BATCH_INTERVAL',
+    'RESULT_BATCH_MAX_HITS',
+    'MIN_MAX_RESULTS_PER_FILE',
+    'MAX_MAX_RESULTS_PER_FILE',
     'DEFAULT_CONTEXT_LENGTH',
     'DEFAULT_USE_INDEX_SEARCH',
     'INDEX_UPDATE_THRESHOLD_DAYS',
@@ -147,6 +223,16 @@ __all__ = [
     'DEFAULT_MAX_TEMP_FILES',
     'MIN_MAX_TEMP_FILES',
     'MAX_MAX_TEMP_FILES',
+    'DEFAULT_MAX_TEMP_SIZE_MB',
+    'MIN_MAX_TEMP_SIZE_MB',
+    'MAX_MAX_TEMP_SIZE_MB',
+    'PDF_VIEWER_BUILTIN',
+    'PDF_VIEWER_ACROBAT',
+    'PDF_VIEWERS',
+    'DEFAULT_PDF_VIEWER',
+    'DEFAULT_HIGHLIGHT_PAGE_WINDOW',
+    'MIN_HIGHLIGHT_PAGE_WINDOW',
+    'MAX_HIGHLIGHT_PAGE_WINDOW',
     'LOG_RETENTION_DAYS',
     'CONFIG_SECTIONS',
     'CONFIG_KEYS',
@@ -158,12 +244,35 @@ __all__ = [
     'FILE_TYPES',
     'ENCODING_CANDIDATES',
     'ENCODING_FALLBACK',
+    'LARGE_TEXT_FILE_THRESHOLD',
+    'LARGE_TEXT_ENCODING_SAMPLE_SIZE',
+    'LARGE_TEXT_LINE_INDEX_CHUNK_SIZE',
+    'MARKDOWN_RENDER_CACHE_SIZE',
+    'MARKDOWN_LINE_KEY_LENGTH',
+    'MARKDOWN_LINE_MATCH_LOOKAHEAD',
     'PDF_TEXT_PAGE_SEPARATOR',
     'TEXT_LINE_SEPARATOR',
     'INDEX_DEFAULT_CONTEXT_LENGTH',
     'INDEX_MAX_RESULTS',
     'INDEX_HASH_READ_CHUNK_SIZE',
     'INDEX_PROGRESS_LOG_INTERVAL',
+    'INDEX_SHARD_DIR_SUFFIX',
+    'INDEX_SHARD_ID_LENGTH',
+    'INDEX_COMPRESSION_BLOCK_SIZE',
+    'INDEX_COMPRESSION_LEVEL',
+    'INDEX_TEMP_FILE_SUFFIX',
+    'INDEX_LOAD_RETRY_COUNT',
+    'INDEX_REPLACE_RETRY_COUNT',
+    'INDEX_REPLACE_RETRY_DELAY',
+    'INDEX_LOCK_FILE_SUFFIX',
+    'INDEX_LOCK_TIMEOUT',
+    'INDEX_LOCK_STALE_SECONDS',
+    'INDEX_LOCK_POLL_INTERVAL',
+    'INDEX_LOCK_REFRESH_INTERVAL',
+    'INDEX_NGRAM_BITS_PER_GRAM',
+    'INDEX_NGRAM_MIN_BITS',
+    'INDEX_NGRAM_MAX_BITS',
+    'CORPUS_DOCUMENT_SEPARATOR',
     # UI
     'DEFAULT_WINDOW_WIDTH',
     'DEFAULT_WINDOW_HEIGHT',
@@ -210,15 +319,30 @@ __all__ = [
     'TEXT_VIEWER_OPEN_FILE_LABEL',
     'TEXT_VIEWER_PRINT_LABEL',
     'TEXT_VIEWER_CLOSE_LABEL',
-    'ACROBAT_KEYBINDS',
-    'ACROBAT_KEYSTROKE_DELAY',
-    'ACROBAT_ACTION_DELAY',
+    'TEXT_VIEWER_WINDOW_LINES',
+    'TEXT_VIEWER_WINDOW_MARGIN',
+    'TEXT_VIEWER_LINE_RANGE_TEMPLATE',
+    'TEXT_VIEWER_MARKDOWN_LOADING_MESSAGE',
+    'PDF_VIEWER_ZOOM_IN_LABEL',
+    'PDF_VIEWER_ZOOM_OUT_LABEL',
+    'PDF_VIEWER_PAGE_LABEL_TEMPLATE',
+    'PDF_VIEWER_DEFAULT_ZOOM',
+    'PDF_VIEWER_MIN_ZOOM',
+    'PDF_VIEWER_MAX_ZOOM',
+    'PDF_VIEWER_ZOOM_STEP',
+    'PDF_VIEWER_PAGE_GAP',
+    'PDF_VIEWER_BACKGROUND_COLOR',
+    'PDF_VIEWER_PAGE_CACHE_SIZE',
+    'PDF_VIEWER_PREFETCH_PAGES',
+    'PDF_VIEWER_HIGHLIGHT_ALPHA',
     'INDEX_STATS_GROUP_TITLE',
     'INDEX_OPERATIONS_GROUP_TITLE',
     'INDEX_LOG_GROUP_TITLE',
     'INDEX_STATS_UPDATE_INTERVAL',
     'INDEX_THREAD_WAIT_TIMEOUT',
     'INDEX_STATUS_DISPLAY_TIMEOUT',
+    'INCREMENTAL_SEARCH_DEBOUNCE',
+    'INCREMENTAL_SEARCH_STOP_TIMEOUT',
     # Error
     'ERROR_MESSAGES',
     'LOG_MESSAGE_TEMPLATES',
@@ -233,13 +357,9 @@ __all__ = [
     'TEXT_VIEWER_PRINT_ERROR_TEMPLATES',
     # Paths
     'DEFAULT_ACROBAT_PATH',
-    'ACROBAT_PROCESS_NAMES',
-    'ACROBAT_WAIT_TIMEOUT',
-    'ACROBAT_WAIT_INTERVAL',
-    'PAGE_NAVIGATION_RETRY_COUNT',
-    'PAGE_NAVIGATION_DELAY',
-    'PROCESS_TERMINATE_TIMEOUT',
-    'PROCESS_CLEANUP_DELAY',
+    'ACROBAT_OPEN_PARAMETERS_OPTION',
+    'ACROBAT_PAGE_PARAMETER_TEMPLATE',
+    'PDF_OPEN_STOP_TIMEOUT',
     'NETWORK_TIMEOUT',
     'DNS_TEST_HOST',
     'DNS_TEST_PORT',
@@ -38,13 +38,40 @@ DEFAULT_INDEX_FILE = "search_index.json"
 SEARCH_TYPE_AND = 'AND'
 SEARCH_TYPE_OR = 'OR'
 
+MATCH_MODE_LITERAL = 'literal'
+MATCH_MODE_WILDCARD = 'wildcard'
+MATCH_MODE_REGEX = 'regex'
+MATCH_MODE_FUZZY = 'fuzzy'
+
+# あいまい検索：検索語の何文字につき1回の編集（挿入・削除・置換）を許すか
+FUZZY_CHARS_PER_EDIT = 4
+FUZZY_NGRAM_SIZE = 2
+
+QUERY_NOT_OPERATOR = 'NOT '
+QUERY_NEAR_OPERATOR_PATTERN = r'\s+NEAR/(\d+)\s+'
+QUERY_PHRASE_QUOTE = '"'
+
+DEFAULT_FOLD_KANA = True
+
 MAX_SEARCH_RESULTS_PER_FILE = 100
 
+# 検索結果のコンテキストは表示時に作り、最近使った分だけ保持する
+SNIPPET_CACHE_SIZE = 256
+SNIPPET_SOURCE_CACHE_SIZE = 8
+
+# 検索スレッドからGUIへ結果・進捗を送る間隔（秒）と、間隔を待たずに送る一致箇所の数
+RESULT_BATCH_INTERVAL = 0.05
+RESULT_BATCH_MAX_HITS = 500
+
 DEFAULT_CONTEXT_LENGTH = 100
 DEFAULT_USE_INDEX_SEARCH = False
 
 INDEX_UPDATE_THRESHOLD_DAYS = 7
 
+# インデックス検索で1ファイルあたりに返す一致箇所の上限（[SearchSettings] max_results_per_file）
+MIN_MAX_RESULTS_PER_FILE = 1
+MAX_MAX_RESULTS_PER_FILE = 10000
+
 SEARCH_TERM_SEPARATOR_PATTERN = r'[,、]'
 
 
@@ -60,6 +87,22 @@ DEFAULT_MAX_TEMP_FILES = 10
 MIN_MAX_TEMP_FILES = 1
 MAX_MAX_TEMP_FILES = 50
 
+# ハイライトしたPDFの一時ファイルの合計サイズの上限（[PDFSettings] max_temp_size_mb）
+DEFAULT_MAX_TEMP_SIZE_MB = 200
+MIN_MAX_TEMP_SIZE_MB = 10
+MAX_MAX_TEMP_SIZE_MB = 5000
+
+# PDFを表示するビューア（[PDFSettings] pdf_viewer）
+PDF_VIEWER_BUILTIN = 'builtin'
+PDF_VIEWER_ACROBAT = 'acrobat'
+PDF_VIEWERS = (PDF_VIEWER_BUILTIN, PDF_VIEWER_ACROBAT)
+DEFAULT_PDF_VIEWER = PDF_VIEWER_BUILTIN
+
+# Acrobatで開くPDFで、該当ページの前後何ページまでハイライトするか（[PDFSettings] highlight_page_window）
+DEFAULT_HIGHLIGHT_PAGE_WINDOW = 5
+MIN_HIGHLIGHT_PAGE_WINDOW = 0
+MAX_HIGHLIGHT_PAGE_WINDOW = 1000
+
 
 # ============================================================================
 # ログ関連
@@ -95,13 +138,19 @@ CONFIG_KEYS = {
     'ACROBAT_READER_X86_PATH': 'acrobat_reader_x86_path',
     'DIRECTORY_LIST': 'list',
     'CONTEXT_LENGTH': 'context_length',
+    'FOLD_KANA': 'fold_kana',
+    'MAX_RESULTS_PER_FILE': 'max_results_per_file',
     'FILENAME_FONT_SIZE': 'filename_font_size',
     'RESULT_DETAIL_FONT_SIZE': 'result_detail_font_size',
     'TIMEOUT': 'timeout',
     'CLEANUP_TEMP_FILES': 'cleanup_temp_files',
     'MAX_TEMP_FILES': 'max_temp_files',
+    'MAX_TEMP_SIZE_MB': 'max_temp_size_mb',
+    'PDF_VIEWER': 'pdf_viewer',
+    'HIGHLIGHT_PAGE_WINDOW': 'highlight_page_window',
     'INDEX_FILE_PATH': 'index_file_path',
     'USE_INDEX_SEARCH': 'use_index_search',
+    'INDEX_LOCAL_CACHE_DIR': 'local_cache_dir',
     'TEXT_VIEWER_WIDTH': 'text_viewer_width',
     'TEXT_VIEWER_HEIGHT': 'text_viewer_height',
     'TEXT_VIEWER_FONT_SIZE': 'text_viewer_font_size',
@@ -136,6 +185,18 @@ FILE_TYPES = {
 ENCODING_CANDIDATES = ['utf-8', 'cp932']
 ENCODING_FALLBACK = 'utf-8'
 
+# このサイズ以上のテキストファイルはメモリマップで開き、表示する範囲の行だけを読み込む
+LARGE_TEXT_FILE_THRESHOLD = 20 * 1024 * 1024
+LARGE_TEXT_ENCODING_SAMPLE_SIZE = 64 * 1024
+# 行の開始位置は、このサイズのチャンクごとに必要になった時点で求める
+LARGE_TEXT_LINE_INDEX_CHUNK_SIZE = 1024 * 1024
+
+# 描画したMarkdownを保持するファイル数
+MARKDOWN_RENDER_CACHE_SIZE = 8
+# Markdownの行と描画後のブロックの対応付け：行の先頭から比べる文字数と、先を探すブロック数
+MARKDOWN_LINE_KEY_LENGTH = 20
+MARKDOWN_LINE_MATCH_LOOKAHEAD = 200
+
 PDF_TEXT_PAGE_SEPARATOR = '\n\n'
 TEXT_LINE_SEPARATOR = '\n'
 
@@ -148,3 +209,25 @@ INDEX_DEFAULT_CONTEXT_LENGTH = 100
 INDEX_MAX_RESULTS = 200
 INDEX_HASH_READ_CHUNK_SIZE = 8192
 INDEX_PROGRESS_LOG_INTERVAL = 10
+INDEX_SHARD_DIR_SUFFIX = '.shards'
+INDEX_SHARD_ID_LENGTH = 16
+# 文書テキストはこの文字数を目安にページ/行の区切りでブロックに分けて圧縮する
+INDEX_COMPRESSION_BLOCK_SIZE = 64 * 1024
+INDEX_COMPRESSION_LEVEL = 6
+INDEX_TEMP_FILE_SUFFIX = '.tmp'
+INDEX_LOAD_RETRY_COUNT = 3
+INDEX_REPLACE_RETRY_COUNT = 5
+INDEX_REPLACE_RETRY_DELAY = 0.1
+# 共有インデックスの書き込みロック（秒）
+INDEX_LOCK_FILE_SUFFIX = '.lock'
+INDEX_LOCK_TIMEOUT = 60
+INDEX_LOCK_STALE_SECONDS = 300
+INDEX_LOCK_POLL_INTERVAL = 0.5
+# ロック中にロックファイルの更新日時を更新する間隔（INDEX_LOCK_STALE_SECONDSより十分短くする）
+INDEX_LOCK_REFRESH_INTERVAL = 60
+# あいまい検索用のn-gram署名：n-gramの種類数×この値のビット数（上下限あり）
+INDEX_NGRAM_BITS_PER_GRAM = 8
+INDEX_NGRAM_MIN_BITS = 1024
+INDEX_NGRAM_MAX_BITS = 1 << 20
+# 列形式のコーパスで文書の間に挟む区切り（検索語にまたがる一致を防ぐ）
+CORPUS_DOCUMENT_SEPARATOR = '\x00'
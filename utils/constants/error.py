@@ -34,13 +34,6 @@ LOG_MESSAGE_TEMPLATES = {
     'FOLDER_NOT_FOUND': 'フォルダが見つかりません',
     'FOLDER_OPEN_ERROR': 'フォルダを開く際にエラーが発生しました: {error}',
     'APP_EXIT': 'アプリケーションを終了します',
-    'NO_ACROBAT_PROCESSES': '既存のAcrobatプロセスは見つかりませんでした',
-    'FOUND_ACROBAT_PROCESSES': '既存のAcrobatプロセスが{count}個見つかりました',
-    'PROCESS_TERMINATING': 'プロセス終了中: {process_name} (PID: {pid})',
-    'PROCESS_TERMINATED': 'Acrobatプロセス (PID: {pid}) を正常に終了しました',
-    'PROCESS_FORCE_KILLED': 'Acrobatプロセス (PID: {pid}) を強制終了しました',
-    'ACROBAT_WAIT_ERROR': 'Acrobat待機中にエラー: {error}',
-    'ACROBAT_TIMEOUT': 'Acrobat起動のタイムアウト（{timeout}秒）',
     'UNSUPPORTED_FILE_TYPE': 'サポートされていないファイル形式: {extension}',
     'SEARCH_ERROR_DETAIL': '検索エラー: {path} - {error}',
     'INDEX_OPERATION_START': 'インデックス{operation_name}を開始します...',
@@ -64,7 +57,8 @@ INDEX_OPERATION_LABELS = {
     'CREATE': '初回作成',
     'ADD': 'ファイル追加更新',
     'DELETE': 'ファイル削除更新',
-    'REBUILD': '完全再構築'
+    'REBUILD': '完全再構築',
+    'COMPACT': '最適化'
 }
 
 
@@ -96,6 +90,12 @@ INDEX_STATUS_TEMPLATES = {
     'CLEANUP_COMPLETE': 'インデックスクリーンアップ完了: {count} ファイルを削除',
     'CLEANUP_ERROR': 'インデックスクリーンアップエラー: {error}',
     'REBUILD_ERROR': 'インデックス再構築エラー: {error}',
+    'COMPACT_COMPLETE': (
+        'インデックス最適化完了: {size_before_mb:.1f}MB → {size_after_mb:.1f}MB '
+        '({reclaimed_mb:.1f}MB削減, 重複 {removed_duplicates} 件を統合), '
+        '読み込み時間 {load_seconds_before:.2f}秒 → {load_seconds_after:.2f}秒'
+    ),
+    'COMPACT_ERROR': 'インデックス最適化エラー: {error}',
 }
 
 
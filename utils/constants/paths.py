@@ -10,37 +10,15 @@ DEFAULT_ACROBAT_PATH = r'C:\Program Files\Adobe\Acrobat DC\Acrobat\Acrobat.exe'
 
 
 # ============================================================================
-# Acrobatプロセス管理
+# Acrobatの起動
 # ============================================================================
 
-ACROBAT_PROCESS_NAMES = [
-    'acrobat',      # Adobe Acrobat (フルバージョン)
-    'acrord32',     # Adobe Acrobat Reader DC (32ビット版)
-    'acrord64',     # Adobe Acrobat Reader DC (64ビット版)
-    'acrobat.exe',  # 拡張子付きのパターン
-    'acrord32.exe', # 拡張子付きのパターン (32ビット版)
-    'acrord64.exe', # 拡張子付きのパターン (64ビット版)
-    'reader_sl',    # Reader起動用の一部プロセス
-]
+# 起動時に表示するページを指定するオープンパラメータ（Acrobat.exe /A "page=N" ファイル）
+ACROBAT_OPEN_PARAMETERS_OPTION = '/A'
+ACROBAT_PAGE_PARAMETER_TEMPLATE = 'page={page}'
 
-ACROBAT_WAIT_TIMEOUT = 30
-ACROBAT_WAIT_INTERVAL = 0.5
-
-
-# ============================================================================
-# ページナビゲーション
-# ============================================================================
-
-PAGE_NAVIGATION_RETRY_COUNT = 3
-PAGE_NAVIGATION_DELAY = 0.5
-
-
-# ============================================================================
-# プロセス管理
-# ============================================================================
-
-PROCESS_TERMINATE_TIMEOUT = 3
-PROCESS_CLEANUP_DELAY = 1.0
+# 終了時にPDFを開く処理の完了を待つ時間（ミリ秒）
+PDF_OPEN_STOP_TIMEOUT = 5000
 
 
 # ============================================================================
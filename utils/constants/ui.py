@@ -149,10 +149,15 @@ UI_LABELS = {
     'EDIT_BUTTON': '編集',
     'DELETE_BUTTON': '削除',
     'INCLUDE_SUBDIRS': 'サブフォルダ含む',
+    'INCREMENTAL_SEARCH': '入力中に検索',
     'FOLDER_SETTINGS': '検索フォルダ設定',
     'OPEN_FOLDER': 'フォルダを開く',
     'AND_SEARCH_LABEL': 'AND検索(複数の検索語をすべて含む)',
     'OR_SEARCH_LABEL': 'OR検索(複数の検索語のいずれかを含む)',
+    'MATCH_MODE_LITERAL_LABEL': '通常',
+    'MATCH_MODE_WILDCARD_LABEL': 'ワイルドカード(* ?)',
+    'MATCH_MODE_REGEX_LABEL': '正規表現',
+    'MATCH_MODE_FUZZY_LABEL': 'あいまい',
     'YES_BUTTON': 'はい',
     'NO_BUTTON': 'いいえ',
     'CONFIRM_EXIT': '検索を終了しますか?',
@@ -183,19 +188,37 @@ TEXT_VIEWER_OPEN_FILE_LABEL = 'ファイルを開く'
 TEXT_VIEWER_PRINT_LABEL = 'ハイライトなし印刷'
 TEXT_VIEWER_CLOSE_LABEL = '閉じる'
 
+# 大きなテキストファイルで一度に表示する行数と、表示位置より前に読み込む行数
+TEXT_VIEWER_WINDOW_LINES = 2000
+TEXT_VIEWER_WINDOW_MARGIN = 500
+TEXT_VIEWER_LINE_RANGE_TEMPLATE = '{start}-{end}行目 / {count}行'
+TEXT_VIEWER_MARKDOWN_LOADING_MESSAGE = 'Markdownを表示しています...'
+
 
 # ============================================================================
-# PDF処理：pyautogui キーバインド
+# PDFビューア（アプリ内別ウィンドウ）
 # ============================================================================
 
-ACROBAT_KEYBINDS = {
-    'FIND_AND_REPLACE': ['ctrl', 'shift', 'n'],
-    'SELECT_ALL': ['ctrl', 'a'],
-    'CONFIRM': ['enter']
-}
+PDF_VIEWER_ZOOM_IN_LABEL = '拡大'
+PDF_VIEWER_ZOOM_OUT_LABEL = '縮小'
+PDF_VIEWER_PAGE_LABEL_TEMPLATE = '{page} / {count}ページ'
+
+# 表示倍率（1.0 = 72dpi）と、拡大・縮小1回あたりの倍率
+PDF_VIEWER_DEFAULT_ZOOM = 1.5
+PDF_VIEWER_MIN_ZOOM = 0.5
+PDF_VIEWER_MAX_ZOOM = 4.0
+PDF_VIEWER_ZOOM_STEP = 1.25
+
+# ページの間隔（ピクセル）と背景色
+PDF_VIEWER_PAGE_GAP = 12
+PDF_VIEWER_BACKGROUND_COLOR = '#808080'
+
+# 描画したページを保持する数と、表示中のページの前後に先読みするページ数
+PDF_VIEWER_PAGE_CACHE_SIZE = 16
+PDF_VIEWER_PREFETCH_PAGES = 2
 
-ACROBAT_KEYSTROKE_DELAY = 0.2
-ACROBAT_ACTION_DELAY = 0.5
+# 検索語のハイライトの不透明度（0-255）
+PDF_VIEWER_HIGHLIGHT_ALPHA = 110
 
 
 # ============================================================================
@@ -214,3 +237,12 @@ INDEX_LOG_GROUP_TITLE = 'ログ'
 INDEX_STATS_UPDATE_INTERVAL = 5000
 INDEX_THREAD_WAIT_TIMEOUT = 3000
 INDEX_STATUS_DISPLAY_TIMEOUT = 3000
+
+
+# ============================================================================
+# 入力中の検索タイマー（ミリ秒）
+# ============================================================================
+
+# 最後の入力からこの時間が経ってから検索する
+INCREMENTAL_SEARCH_DEBOUNCE = 300
+INCREMENTAL_SEARCH_STOP_TIMEOUT = 3000
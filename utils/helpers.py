@@ -2,6 +2,7 @@ import logging
 import os
 import re
 import socket
+from typing import Dict
 
 import chardet
 from PyQt5.QtCore import QTimer
@@ -14,6 +15,7 @@ from utils.constants import (
     DNS_TEST_PORT,
     CURSOR_MOVE_DELAY,
     ERROR_MESSAGES,
+    INDEX_STATUS_TEMPLATES,
     UI_LABELS
 )
 
@@ -135,6 +137,26 @@ def read_file_with_auto_encoding(file_path: str) -> str:
         raise ValueError(f"{ERROR_MESSAGES['FILE_DECODE_FAILED']}: {file_path}") from e
 
 
+def format_compaction_report(report: Dict) -> str:
+    """インデックス最適化のレポートを表示用の文字列にする
+
+    Args:
+        report: SearchIndexer.compact_indexの戻り値
+
+    Returns:
+        表示用メッセージ
+    """
+    bytes_per_mb = 1024 * 1024
+    return INDEX_STATUS_TEMPLATES['COMPACT_COMPLETE'].format(
+        size_before_mb=report['size_before'] / bytes_per_mb,
+        size_after_mb=report['size_after'] / bytes_per_mb,
+        reclaimed_mb=report['reclaimed_bytes'] / bytes_per_mb,
+        removed_duplicates=report['removed_duplicates'],
+        load_seconds_before=report['load_seconds_before'],
+        load_seconds_after=report['load_seconds_after'],
+    )
+
+
 def create_confirmation_dialog(
     parent,
     title: str,
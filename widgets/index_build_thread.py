@@ -1,8 +1,10 @@
-from typing import List
+from typing import List, Optional
 
 from PyQt5.QtCore import QThread, pyqtSignal
 
 from service.search_indexer import SearchIndexer
+from utils.constants import INDEX_STATUS_TEMPLATES
+from utils.helpers import format_compaction_report
 
 
 class IndexBuildThread(QThread):
@@ -12,16 +14,17 @@ class IndexBuildThread(QThread):
     status_updated = pyqtSignal(str)  # ステータスメッセージ
     completed = pyqtSignal(bool)  # 成功/失敗
 
-    def __init__(self, directories: List[str], index_file_path: str):
+    def __init__(self, directories: List[str], index_file_path: str, local_cache_dir: Optional[str] = None):
         """初期化
 
         Args:
             directories: インデックス対象のディレクトリリスト
             index_file_path: インデックスファイルパス
+            local_cache_dir: 共有インデックスを複製するローカルのフォルダ
         """
         super().__init__()
         self.directories = directories
-        self.indexer = SearchIndexer(index_file_path)
+        self.indexer = SearchIndexer(index_file_path, local_cache_dir)
         self.should_cancel = False
 
     def run(self) -> None:
@@ -51,3 +54,31 @@ class IndexBuildThread(QThread):
     def cancel(self) -> None:
         """インデックス作成をキャンセル"""
         self.should_cancel = True
+
+
+class IndexCompactThread(QThread):
+    """インデックスの最適化をバックグラウンドで実行するスレッド"""
+    status_updated = pyqtSignal(str)  # ステータスメッセージ
+    completed = pyqtSignal(bool)  # 成功/失敗
+
+    def __init__(self, index_file_path: str, local_cache_dir: Optional[str] = None):
+        """初期化
+
+        Args:
+            index_file_path: インデックスファイルパス
+            local_cache_dir: 共有インデックスを複製するローカルのフォルダ
+        """
+        super().__init__()
+        self.indexer = SearchIndexer(index_file_path, local_cache_dir)
+
+    def run(self) -> None:
+        """インデックス最適化処理を実行"""
+        try:
+            self.status_updated.emit("インデックス最適化開始...")
+            report = self.indexer.compact_index()
+            self.status_updated.emit(format_compaction_report(report))
+            self.completed.emit(True)
+
+        except Exception as e:
+            self.status_updated.emit(INDEX_STATUS_TEMPLATES['COMPACT_ERROR'].format(error=e))
+            self.completed.emit(False)
@@ -25,7 +25,7 @@ from utils.constants import (
     LOG_DATETIME_FORMAT,
     LOG_MESSAGE_TEMPLATES
 )
-from widgets.index_build_thread import IndexBuildThread
+from widgets.index_build_thread import IndexBuildThread, IndexCompactThread
 
 
 class IndexManagementWidget(QWidget):
@@ -44,8 +44,9 @@ class IndexManagementWidget(QWidget):
         self.config_manager = config_manager
 
         index_file_path = self.config_manager.get_index_file_path()
-        self.indexer = SearchIndexer(index_file_path)
+        self.indexer = SearchIndexer(index_file_path, self.config_manager.get_index_local_cache_dir())
         self.build_thread: Optional[IndexBuildThread] = None
+        self.compact_thread: Optional[IndexCompactThread] = None
 
         self._setup_ui()
         self._update_display()
@@ -93,6 +94,10 @@ class IndexManagementWidget(QWidget):
         self.rebuild_button.clicked.connect(self._rebuild_index)
         button_layout.addWidget(self.rebuild_button)
 
+        self.compact_button = QPushButton(INDEX_OPERATION_LABELS['COMPACT'])
+        self.compact_button.clicked.connect(self._compact_index)
+        button_layout.addWidget(self.compact_button)
+
         operations_layout.addLayout(button_layout)
 
         # 進捗表示
@@ -123,9 +128,17 @@ class IndexManagementWidget(QWidget):
         try:
             stats = self.indexer.get_index_stats()
 
+            extension_counts = ', '.join(
+                f"{extension or INDEX_NOT_SET_TEXT}: {count:,}"
+                for extension, count in sorted(stats['extension_counts'].items())
+            )
+            last_build = stats['last_build_seconds']
+
             stats_text = f"""
-ファイル数: {stats['files_count']:,} 個
+ファイル数: {stats['files_count']:,} 個 ({extension_counts or INDEX_NOT_SET_TEXT})
 総サイズ: {stats['total_size_mb']:.1f} MB
+シャード数: {stats['shards_count']} 個
+前回の作成時間: {f'{last_build:.1f} 秒' if last_build is not None else INDEX_NOT_SET_TEXT}
 インデックスファイルサイズ: {stats['index_file_size_mb']:.1f} MB
 インデックスファイルパス: {self.indexer.storage.index_file_path}
 作成日時: {self._format_datetime(stats['created_at'])}
@@ -185,7 +198,7 @@ class IndexManagementWidget(QWidget):
 
         if reply == QMessageBox.Yes:
             # インデックスをリセット
-            self.indexer.index_data = self.indexer.storage._create_new_index()
+            self.indexer.reset_index()
             self.indexer.storage.save(self.indexer.index_data)
 
             directories = self.config_manager.get_directories()
@@ -198,7 +211,7 @@ class IndexManagementWidget(QWidget):
             operation_name: 操作名（作成、更新など）
             directories: インデックス対象のディレクトリリスト
         """
-        if self.build_thread and self.build_thread.isRunning():
+        if self._is_operation_running():
             QMessageBox.information(self, "情報", "インデックス操作を実行中です。")
             return
 
@@ -210,12 +223,43 @@ class IndexManagementWidget(QWidget):
 
         # インデックス作成スレッドを開始
         index_file_path = self.config_manager.get_index_file_path()
-        self.build_thread = IndexBuildThread(directories, index_file_path)
+        self.build_thread = IndexBuildThread(
+            directories, index_file_path, self.config_manager.get_index_local_cache_dir()
+        )
         self.build_thread.progress_updated.connect(self._on_progress_updated)
         self.build_thread.status_updated.connect(self._on_status_updated)
         self.build_thread.completed.connect(self._on_operation_completed)
         self.build_thread.start()
 
+    def _compact_index(self) -> None:
+        """元ファイルを読み直さずにインデックスを最適化"""
+        if self._is_operation_running():
+            QMessageBox.information(self, "情報", "インデックス操作を実行中です。")
+            return
+
+        self._log(LOG_MESSAGE_TEMPLATES['INDEX_OPERATION_START'].format(
+            operation_name=INDEX_OPERATION_LABELS['COMPACT']
+        ))
+        self._set_buttons_enabled(False)
+
+        self.compact_thread = IndexCompactThread(
+            self.config_manager.get_index_file_path(), self.config_manager.get_index_local_cache_dir()
+        )
+        self.compact_thread.status_updated.connect(self._on_status_updated)
+        self.compact_thread.completed.connect(self._on_operation_completed)
+        self.compact_thread.start()
+
+    def _is_operation_running(self) -> bool:
+        """インデックス操作スレッドが実行中か判定
+
+        Returns:
+            実行中の場合True
+        """
+        return any(
+            thread is not None and thread.isRunning()
+            for thread in (self.build_thread, self.compact_thread)
+        )
+
     def _cleanup_index(self) -> None:
         """削除されたファイルをインデックスから削除"""
         try:
@@ -278,6 +322,7 @@ class IndexManagementWidget(QWidget):
         self.update_button.setEnabled(enabled)
         self.cleanup_button.setEnabled(enabled)
         self.rebuild_button.setEnabled(enabled)
+        self.compact_button.setEnabled(enabled)
 
     def _log(self, message: str) -> None:
         """ログテキストにメッセージを追加
@@ -295,6 +340,9 @@ class IndexManagementWidget(QWidget):
             self.build_thread.cancel()
             self.build_thread.wait(INDEX_THREAD_WAIT_TIMEOUT)
 
+        if self.compact_thread and self.compact_thread.isRunning():
+            self.compact_thread.wait(INDEX_THREAD_WAIT_TIMEOUT)
+
         # タイマーを停止
         if self.update_timer:
             self.update_timer.stop()
@@ -0,0 +1,325 @@
+import bisect
+import logging
+import math
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+import fitz
+from PyQt5.QtCore import QRectF, Qt, QTimer
+from PyQt5.QtGui import QBrush, QColor, QImage, QPen, QPixmap
+from PyQt5.QtWidgets import (
+    QGraphicsPixmapItem,
+    QGraphicsRectItem,
+    QGraphicsScene,
+    QGraphicsView,
+    QHBoxLayout,
+    QLabel,
+    QMainWindow,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from service.highlight_matcher import HighlightMatcher
+from service.pdf_handler import PDFHighlighter
+from utils.constants import (
+    AUTO_CLOSE_MESSAGE_DURATION,
+    DEFAULT_FOLD_KANA,
+    FILE_OPEN_ERROR_TEMPLATES,
+    HIGHLIGHT_COLORS,
+    MATCH_MODE_LITERAL,
+    PDF_VIEWER_BACKGROUND_COLOR,
+    PDF_VIEWER_DEFAULT_ZOOM,
+    PDF_VIEWER_HIGHLIGHT_ALPHA,
+    PDF_VIEWER_MAX_ZOOM,
+    PDF_VIEWER_MIN_ZOOM,
+    PDF_VIEWER_PAGE_CACHE_SIZE,
+    PDF_VIEWER_PAGE_GAP,
+    PDF_VIEWER_PAGE_LABEL_TEMPLATE,
+    PDF_VIEWER_PREFETCH_PAGES,
+    PDF_VIEWER_ZOOM_IN_LABEL,
+    PDF_VIEWER_ZOOM_OUT_LABEL,
+    PDF_VIEWER_ZOOM_STEP,
+    TEXT_VIEWER_CLOSE_LABEL,
+    TEXT_VIEWER_DEFAULT_HEIGHT,
+    TEXT_VIEWER_DEFAULT_WIDTH,
+    TEXT_VIEWER_OPEN_FILE_LABEL,
+)
+from widgets.auto_close_message_widget import AutoCloseMessage
+
+logger = logging.getLogger(__name__)
+
+HighlightRects = List[Tuple[fitz.Rect, int]]
+
+
+def render_page(page: fitz.Page, zoom: float) -> QPixmap:
+    """PDFのページを指定倍率の画像にする"""
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    image = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
+    return QPixmap.fromImage(image.copy())  # pix.samplesの寿命に依存しないよう複製する
+
+
+class PDFViewerWindow(QMainWindow):
+    """アプリ内のPDFビューアウィンドウ
+
+    ハイライトしたPDFを保存して外部のビューアで開く代わりに、表示範囲のページだけを
+    PyMuPDFで画像にしてQGraphicsViewに並べる。検索語のハイライトは画像の上に重ねて描く。
+    描画したページは最近表示した分を保持し、表示中のページの前後はGUIの手が空いたときに先読みする。
+    """
+
+    def __init__(
+        self,
+        title: str,
+        file_path: str,
+        search_terms: List[str],
+        position: int = 0,
+        width: int = TEXT_VIEWER_DEFAULT_WIDTH,
+        height: int = TEXT_VIEWER_DEFAULT_HEIGHT,
+        parent: Optional[QWidget] = None,
+        match_mode: str = MATCH_MODE_LITERAL,
+        fold_kana: bool = DEFAULT_FOLD_KANA,
+    ) -> None:
+        """初期化
+
+        Args:
+            title: ウィンドウタイトル
+            file_path: PDFファイルパス
+            search_terms: ハイライトする検索語リスト
+            position: 表示するページ番号(1始まり、0は先頭)
+            width: ウィンドウ幅
+            height: ウィンドウ高さ
+            parent: 親ウィジェット
+            match_mode: ハイライトする検索語の照合方法
+            fold_kana: ハイライトでカタカナとひらがなを同一視する場合True
+
+        Raises:
+            RuntimeError: PDFを開けない場合
+        """
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.setWindowTitle(title)
+        self.resize(width, height)
+        self._file_path = file_path
+        self.auto_close_message = AutoCloseMessage(self)
+
+        self.document = fitz.open(file_path)
+        self.search_terms = [term.strip() for term in search_terms if term and term.strip()]
+        self.matcher = HighlightMatcher(search_terms, match_mode, fold_kana)
+        self.zoom = PDF_VIEWER_DEFAULT_ZOOM
+
+        self._page_sizes = [(page.rect.width, page.rect.height) for page in self.document]
+        self._page_tops: List[float] = []
+        self._page_frames: List[QGraphicsRectItem] = []
+        self._page_images: List[QGraphicsPixmapItem] = []
+        self._rendered: OrderedDict = OrderedDict()
+        self._highlights: Dict[int, HighlightRects] = {}
+        self._highlighted_pages: Set[int] = set()
+        self._prefetch_queue: List[int] = []
+
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(0)
+        self._prefetch_timer.timeout.connect(self._prefetch_next)
+
+        central = QWidget()
+        self.setCentralWidget(central)
+        layout = QVBoxLayout(central)
+        layout.addLayout(self._create_control_bar())
+
+        self.scene = QGraphicsScene(self)
+        self.view = QGraphicsView(self.scene)
+        self.view.setBackgroundBrush(QColor(PDF_VIEWER_BACKGROUND_COLOR))
+        self.view.setAlignment(Qt.AlignHCenter | Qt.AlignTop)
+        self.view.verticalScrollBar().valueChanged.connect(self._update_visible_pages)
+        layout.addWidget(self.view)
+
+        self._initial_page = position
+        self._layout_pages()
+        self.go_to_page(position)
+        # 表示前はビューの大きさが決まっていないため、表示後にもう一度移動する
+        QTimer.singleShot(0, self._go_to_initial_page)
+
+    def _create_control_bar(self) -> QHBoxLayout:
+        bar = QHBoxLayout()
+        zoom_in_button = QPushButton(PDF_VIEWER_ZOOM_IN_LABEL)
+        zoom_out_button = QPushButton(PDF_VIEWER_ZOOM_OUT_LABEL)
+        open_file_button = QPushButton(TEXT_VIEWER_OPEN_FILE_LABEL)
+        close_button = QPushButton(TEXT_VIEWER_CLOSE_LABEL)
+        zoom_in_button.clicked.connect(self.zoom_in)
+        zoom_out_button.clicked.connect(self.zoom_out)
+        open_file_button.clicked.connect(self._open_file)
+        close_button.clicked.connect(self.close)
+        self.page_label = QLabel("")
+        bar.addWidget(zoom_in_button)
+        bar.addWidget(zoom_out_button)
+        bar.addWidget(open_file_button)
+        bar.addWidget(close_button)
+        bar.addStretch()
+        bar.addWidget(self.page_label)
+        return bar
+
+    @property
+    def page_count(self) -> int:
+        return len(self._page_sizes)
+
+    def go_to_page(self, page_number: int) -> None:
+        """1始まりのページ番号のページを先頭に表示する"""
+        if not self._page_tops:
+            return
+        page_index = min(max(page_number, 1), self.page_count) - 1
+        self.view.verticalScrollBar().setValue(math.ceil(self._page_tops[page_index]))
+        self._update_visible_pages()
+
+    def _go_to_initial_page(self) -> None:
+        self.go_to_page(self._initial_page)
+
+    def current_page(self) -> int:
+        """表示範囲の先頭にあるページの番号(1始まり)"""
+        first_index, _ = self._visible_page_range()
+        return first_index + 1
+
+    def zoom_in(self) -> None:
+        self._set_zoom(self.zoom * PDF_VIEWER_ZOOM_STEP)
+
+    def zoom_out(self) -> None:
+        self._set_zoom(self.zoom / PDF_VIEWER_ZOOM_STEP)
+
+    def _set_zoom(self, zoom: float) -> None:
+        zoom = min(max(zoom, PDF_VIEWER_MIN_ZOOM), PDF_VIEWER_MAX_ZOOM)
+        if zoom == self.zoom:
+            return
+        page_number = self.current_page()
+        self.zoom = zoom
+        self._layout_pages()
+        self.go_to_page(page_number)
+
+    def _layout_pages(self) -> None:
+        """全ページの枠を縦に並べる（画像は表示するときに描画する）"""
+        self._prefetch_timer.stop()
+        self._prefetch_queue = []
+        self._rendered.clear()
+        self._highlighted_pages = set()
+        self.scene.clear()
+        self._page_tops = []
+        self._page_frames = []
+        self._page_images = []
+
+        top = 0.0
+        max_width = 0.0
+        for width, height in self._page_sizes:
+            frame = QGraphicsRectItem(0, 0, width * self.zoom, height * self.zoom)
+            frame.setBrush(QBrush(Qt.white))
+            frame.setPos(0, top)
+            self.scene.addItem(frame)
+            self._page_frames.append(frame)
+            self._page_images.append(QGraphicsPixmapItem(frame))
+            self._page_tops.append(top)
+            top += height * self.zoom + PDF_VIEWER_PAGE_GAP
+            max_width = max(max_width, width * self.zoom)
+
+        self.scene.setSceneRect(QRectF(0, 0, max_width, max(top - PDF_VIEWER_PAGE_GAP, 0)))
+
+    def _visible_page_range(self) -> Tuple[int, int]:
+        """表示範囲にかかるページの添字の範囲(両端を含む)"""
+        if not self._page_tops:
+            return 0, -1
+        visible = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        first = max(bisect.bisect_right(self._page_tops, visible.top()) - 1, 0)
+        last = max(bisect.bisect_right(self._page_tops, visible.bottom()) - 1, first)
+        return first, min(last, self.page_count - 1)
+
+    def _update_visible_pages(self) -> None:
+        """表示範囲のページを描画し、前後のページの先読みを予約する"""
+        first, last = self._visible_page_range()
+        if last < first:
+            return
+
+        for page_index in range(first, last + 1):
+            self._ensure_rendered(page_index)
+
+        self.page_label.setText(PDF_VIEWER_PAGE_LABEL_TEMPLATE.format(page=first + 1, count=self.page_count))
+
+        start = max(first - PDF_VIEWER_PREFETCH_PAGES, 0)
+        end = min(last + PDF_VIEWER_PREFETCH_PAGES, self.page_count - 1)
+        self._prefetch_queue = [i for i in range(start, end + 1) if i not in self._rendered]
+        if self._prefetch_queue:
+            self._prefetch_timer.start()
+
+    def _prefetch_next(self) -> None:
+        """先読みを1ページずつ行い、次のページは再びイベントループに戻ってから描画する"""
+        if not self._prefetch_queue:
+            return
+        self._ensure_rendered(self._prefetch_queue.pop(0))
+        if self._prefetch_queue:
+            self._prefetch_timer.start()
+
+    def _ensure_rendered(self, page_index: int) -> None:
+        if page_index in self._rendered:
+            self._rendered.move_to_end(page_index)
+            return
+
+        try:
+            page = self.document[page_index]
+            self._page_images[page_index].setPixmap(render_page(page, self.zoom))
+            self._add_highlight_items(page_index, page)
+        except Exception as e:
+            logger.error(f"PDFのページを描画できませんでした: {self._file_path} p.{page_index + 1} - {e}")
+            return
+
+        self._rendered[page_index] = True
+        while len(self._rendered) > PDF_VIEWER_PAGE_CACHE_SIZE:
+            evicted, _ = self._rendered.popitem(last=False)
+            self._page_images[evicted].setPixmap(QPixmap())
+
+    def _add_highlight_items(self, page_index: int, page: fitz.Page) -> None:
+        """検索語の位置に半透明の矩形を重ねる（一度重ねた矩形は画像を捨てても残す）"""
+        if page_index in self._highlighted_pages:
+            return
+        self._highlighted_pages.add(page_index)
+
+        rects = self._highlights.get(page_index)
+        if rects is None:
+            rects = self._highlights[page_index] = self._find_highlights(page)
+        frame = self._page_frames[page_index]
+        for rect, color_index in rects:
+            item = QGraphicsRectItem(
+                rect.x0 * self.zoom, rect.y0 * self.zoom, rect.width * self.zoom, rect.height * self.zoom, frame
+            )
+            color = QColor(HIGHLIGHT_COLORS[color_index % len(HIGHLIGHT_COLORS)])
+            color.setAlpha(PDF_VIEWER_HIGHLIGHT_ALPHA)
+            item.setBrush(QBrush(color))
+            item.setPen(QPen(Qt.NoPen))
+
+    def _find_highlights(self, page: fitz.Page) -> HighlightRects:
+        try:
+            return [
+                (rect, color_index)
+                for line_rects, color_index in PDFHighlighter.find_highlights(page, self.matcher)
+                for rect in line_rects
+            ]
+        except Exception as e:
+            logger.warning(f"ハイライト位置の検索エラー (page: {page.number + 1}): {e}")
+            return []
+
+    def resizeEvent(self, a0) -> None:
+        super().resizeEvent(a0)
+        if self._page_tops:
+            self._update_visible_pages()
+
+    def _open_file(self) -> None:
+        """既定のアプリケーションでファイルを開く"""
+        native_path = os.path.normpath(self._file_path)
+        try:
+            os.startfile(native_path)
+        except OSError as e:
+            logger.error(f"ファイルを開けませんでした: {native_path} - {e}")
+            self.auto_close_message.show_message(
+                FILE_OPEN_ERROR_TEMPLATES['FILE_OPEN_ERROR'].format(error=e),
+                AUTO_CLOSE_MESSAGE_DURATION,
+            )
+
+    def closeEvent(self, a0) -> None:
+        self._prefetch_timer.stop()
+        self.document.close()
+        super().closeEvent(a0)
@@ -11,10 +11,14 @@ from PyQt5.QtWidgets import (
 )
 
 from service.file_searcher import FileSearcher
+from service.incremental_searcher import IncrementalSearchWorker
 from service.indexed_file_searcher import SmartFileSearcher
+from service.search_query import SearchQuery
+from service.search_refinement import SearchRefinement, SearchScope
+from service.snippet_provider import SearchHit, SnippetProvider
 from utils.constants import (
     FILE_EXTENSION_PDF, HIGHLIGHT_COLORS, INDEX_STATUS_DISPLAY_TIMEOUT, INDEX_STATUS_ICON,
-    PDF_PAGE_LABEL, STYLESHEETS, TEXT_LINE_LABEL, UI_LABELS
+    MATCH_MODE_LITERAL, PDF_PAGE_LABEL, STYLESHEETS, TEXT_LINE_LABEL, UI_LABELS
 )
 
 logger = logging.getLogger(__name__)
@@ -37,11 +41,18 @@ class ResultsWidget(QWidget):
         self._setup_fonts()
 
         self.search_term_colors: Dict[str, str] = {}
+        self.match_mode = MATCH_MODE_LITERAL
+        self.fold_kana = self.config_manager.get_fold_kana()
         self.current_file_path: Optional[str] = None
         self.current_position: Optional[int] = None
         self.searcher: Optional[FileSearcher] = None
         self.progress_dialog: Optional[QProgressDialog] = None
         self.index_searcher: Optional[SmartFileSearcher] = None
+        self.snippet_provider = SnippetProvider(self.config_manager.get_context_length())
+        self.incremental_worker: Optional[IncrementalSearchWorker] = None
+        self._incremental_query_id: Optional[int] = None
+        self.refinement = SearchRefinement()
+        self._search_cancelled = False
 
     def _setup_ui(self) -> None:
         layout = QVBoxLayout()
@@ -73,18 +84,28 @@ class ResultsWidget(QWidget):
         self.result_display.setFont(self.result_detail_font)
 
     def perform_global_search(self, directories: List[str], search_terms: List[str],
-                              include_subdirs: bool, search_type: str) -> None:
+                              include_subdirs: bool, search_type: str,
+                              match_mode: str = MATCH_MODE_LITERAL) -> None:
         self._setup_search_colors(search_terms)
+        self.match_mode = match_mode
 
         base_directory = directories[0] if directories else ""
+        candidate_files = self._begin_search(
+            search_terms, search_type, match_mode,
+            SearchScope(directories, include_subdirs), SearchRefinement.FILES
+        )
         self.searcher = FileSearcher(
             base_directory, search_terms, include_subdirs, search_type,
             self.config_manager.get_file_extensions(),
             self.config_manager.get_context_length(),
             global_search=True,
-            global_directories=directories
+            global_directories=directories,
+            match_mode=match_mode,
+            fold_kana=self.fold_kana,
+            candidate_files=candidate_files
         )
-        self.searcher.result_found.connect(self.add_result)
+        self.snippet_provider = SnippetProvider(self.config_manager.get_context_length())
+        self.searcher.results_batch.connect(self.add_results)
         self.searcher.progress_update.connect(self.update_progress)
         self.searcher.search_completed.connect(self.search_completed)
 
@@ -92,10 +113,15 @@ class ResultsWidget(QWidget):
         self.searcher.start()
 
     def perform_global_index_search(self, directories: List[str], search_terms: List[str],
-                                    include_subdirs: bool, search_type: str) -> None:
+                                    include_subdirs: bool, search_type: str,
+                                    match_mode: str = MATCH_MODE_LITERAL) -> None:
         self._setup_search_colors(search_terms)
+        self.match_mode = match_mode
 
         base_directory = directories[0] if directories else ""
+        candidate_files = self._begin_search(
+            search_terms, search_type, match_mode, SearchScope(), SearchRefinement.INDEX
+        )
         self.index_searcher = SmartFileSearcher(
             directory=base_directory,
             search_terms=search_terms,
@@ -105,16 +131,86 @@ class ResultsWidget(QWidget):
             context_length=self.config_manager.get_context_length(),
             use_index=True,
             index_file_path=self.config_manager.get_index_file_path(),
-            cross_folder_search=True
+            cross_folder_search=True,
+            local_cache_dir=self.config_manager.get_index_local_cache_dir(),
+            match_mode=match_mode,
+            fold_kana=self.fold_kana,
+            max_results_per_file=self.config_manager.get_max_results_per_file(),
+            candidate_files=candidate_files
         )
-        self.index_searcher.result_found.connect(self.add_result)
+        self.snippet_provider = SnippetProvider(self.config_manager.get_context_length(),
+                                                self.index_searcher.indexer)
+        self.index_searcher.results_batch.connect(self.add_results)
         self.index_searcher.progress_update.connect(self.update_progress)
-        self.index_searcher.search_completed.connect(self.search_completed)
+        self.index_searcher.search_completed.connect(self._on_index_search_completed)
         self.index_searcher.index_status_changed.connect(self.update_index_status)
 
         self._setup_progress_dialog()
         self.index_searcher.start()
 
+    def perform_incremental_search(self, search_terms: List[str], search_type: str,
+                                   match_mode: str = MATCH_MODE_LITERAL) -> None:
+        """入力中の検索語でインデックスを検索する
+
+        検索用のスレッドとインデックスは検索をまたいで使い回し、進捗ダイアログは表示しない。
+        """
+        self._setup_search_colors(search_terms)
+        self.match_mode = match_mode
+
+        candidate_files = self._begin_search(
+            search_terms, search_type, match_mode, SearchScope(), SearchRefinement.INDEX
+        )
+        worker = self._get_incremental_worker()
+        self.snippet_provider = SnippetProvider(self.config_manager.get_context_length(), worker.indexer)
+        self._incremental_query_id = worker.submit(
+            search_terms, search_type, match_mode, self.fold_kana,
+            self.config_manager.get_max_results_per_file(), candidate_files
+        )
+
+    def _begin_search(self, search_terms: List[str], search_type: str, match_mode: str,
+                      scope: SearchScope, source: str) -> Optional[List[str]]:
+        """新しい検索を記録し、前回の検索の絞り込みなら照合するファイルを返す"""
+        self._search_cancelled = False
+        query = SearchQuery(search_terms, search_type, match_mode, self.fold_kana)
+        candidate_files = self.refinement.begin(query, scope, source)
+        if candidate_files is not None:
+            logger.info(f"前回の検索結果を絞り込みます: {len(candidate_files)}ファイル")
+        return candidate_files
+
+    def reset_refinement(self) -> None:
+        """前回の検索結果を次の検索の候補に使わないようにする（インデックスの更新時など）"""
+        self.refinement.reset()
+
+    def cancel_incremental_search(self) -> None:
+        if self.incremental_worker is not None:
+            self.incremental_worker.cancel()
+        self._incremental_query_id = None
+
+    def shutdown(self) -> None:
+        """入力中の検索に使うスレッドを終了する"""
+        if self.incremental_worker is not None:
+            self.incremental_worker.stop()
+            self.incremental_worker = None
+
+    def _get_incremental_worker(self) -> IncrementalSearchWorker:
+        index_file_path = self.config_manager.get_index_file_path()
+        if self.incremental_worker is not None and \
+                self.incremental_worker.indexer.storage.index_file_path != index_file_path:
+            self.shutdown()
+
+        if self.incremental_worker is None:
+            self.incremental_worker = IncrementalSearchWorker(
+                index_file_path, self.config_manager.get_index_local_cache_dir()
+            )
+            self.incremental_worker.results_ready.connect(self._on_incremental_results)
+        return self.incremental_worker
+
+    def _on_incremental_results(self, query_id: int, results: List[Tuple[str, List[SearchHit]]]) -> None:
+        if query_id != self._incremental_query_id:
+            return  # 新しい検索を始める前に送られた結果は捨てる
+        self.add_results(results)
+        self.refinement.complete()
+
     def _setup_search_colors(self, search_terms: List[str]) -> None:
         self.search_term_colors = {
             term: HIGHLIGHT_COLORS[i % len(HIGHLIGHT_COLORS)]
@@ -142,25 +238,53 @@ class ResultsWidget(QWidget):
             self.index_status_label.setVisible(bool(status.strip()))
 
     def cancel_search(self) -> None:
+        self._search_cancelled = True
         if self.searcher:
             self.searcher.cancel_search()
 
         if self.index_searcher:
             self.index_searcher.cancel_search()
 
+    def _on_index_search_completed(self) -> None:
+        """インデックスを使えなかった検索の結果は、インデックス全体の検索として記録しない
+
+        インデックスがない場合や検索でエラーになった場合は、最初のフォルダだけを通常の方法で検索しているか、
+        何も検索していないため、次の検索の候補に使うと一致するファイルを取りこぼす。
+        """
+        if self.index_searcher is not None and not self.index_searcher.index_search_succeeded:
+            self.refinement.reset()
+        self.search_completed()
+
     def search_completed(self) -> None:
+        if not self._search_cancelled:
+            self.refinement.complete()
+
         if self.progress_dialog:
             self.progress_dialog.close()
 
         if self.index_status_label:
             QTimer.singleShot(INDEX_STATUS_DISPLAY_TIMEOUT, lambda: self.index_status_label.setVisible(False))
 
-    def add_result(self, file_path: str, results: List[Tuple[int, str]]) -> None:
-        for i, (position, context) in enumerate(results):
+    def add_results(self, batch: List[Tuple[str, List[SearchHit]]]) -> None:
+        """検索スレッドがまとめて送った複数ファイルの結果を、再描画を1回にして追加する
+
+        一致箇所のないファイル（空のリスト）は一覧に加えず、絞り込みの候補としてだけ記録する。
+        """
+        self.results_list.setUpdatesEnabled(False)
+        try:
+            for file_path, results in batch:
+                self.add_result(file_path, results)
+                self.refinement.add(file_path)
+        finally:
+            self.results_list.setUpdatesEnabled(True)
+
+    def add_result(self, file_path: str, results: List[SearchHit]) -> None:
+        """一致箇所を一覧に追加する（コンテキストは選択されたときに作る）"""
+        for i, hit in enumerate(results):
             file_name = os.path.basename(file_path)
-            item_text = self._create_item_text(file_name, file_path, position, i)
+            item_text = self._create_item_text(file_name, file_path, hit.position, i)
             list_item = QListWidgetItem(item_text)
-            list_item.setData(Qt.UserRole, (file_path, position, context))
+            list_item.setData(Qt.UserRole, (file_path, hit))
             list_item.setFont(self.filename_font)
             self.results_list.addItem(list_item)
 
@@ -172,9 +296,9 @@ class ResultsWidget(QWidget):
 
     def on_item_double_clicked(self, item: QListWidgetItem) -> None:
         try:
-            file_path, position, context = item.data(Qt.UserRole)
+            file_path, hit = item.data(Qt.UserRole)
             self.current_file_path = file_path
-            self.current_position = position
+            self.current_position = hit.position
             self.file_open_requested.emit()
         except (AttributeError, TypeError) as e:
             logger.error(f"ダブルクリック処理中にエラーが発生しました: {e}")
@@ -183,13 +307,14 @@ class ResultsWidget(QWidget):
 
     def show_result(self, item: QListWidgetItem) -> None:
         try:
-            file_path, position, context = item.data(Qt.UserRole)
+            file_path, hit = item.data(Qt.UserRole)
+            context = self.snippet_provider.get_snippet(file_path, hit)
             highlighted_content = self._highlight_content(context)
-            result_html = self._create_result_html(file_path, position, highlighted_content)
+            result_html = self._create_result_html(file_path, hit.position, highlighted_content)
             self.result_display.setHtml(result_html)
 
             self.current_file_path = file_path
-            self.current_position = position
+            self.current_position = hit.position
             self.result_selected.emit()
         except AttributeError:
             logger.error("無効な項目データ")
@@ -206,22 +331,38 @@ class ResultsWidget(QWidget):
         return result_html
 
     def _highlight_content(self, content: str) -> str:
-        highlighted = content
+        """検索語の一致箇所を色付けする
+
+        一致位置は正規化したテキストから元のテキストに戻した位置を使うため、
+        全角・半角やカタカナ・ひらがなが検索語と異なる箇所もそのまま色付けされる。
+        """
+        spans: List[Tuple[int, int, str]] = []
         for term, color in self.search_term_colors.items():
             try:
-                highlighted = re.sub(
-                    f'({re.escape(term)})',
-                    f'<span style="background-color: {color};">\\1</span>',
-                    highlighted,
-                    flags=re.IGNORECASE
-                )
-            except re.error:
+                excluded, clause = SearchQuery.parse_term(term, self.match_mode, self.fold_kana)
+                if excluded:
+                    continue
+                for pattern in clause.highlight_patterns():
+                    spans.extend((start, end, color) for start, end in pattern.finditer(content))
+            except (re.error, ValueError):
                 logger.error(f"正規表現エラー: term={term}")
-        return highlighted
+
+        highlighted = []
+        position = 0
+        for start, end, color in sorted(spans, key=lambda span: span[0]):
+            if start < position:
+                continue  # 先に色付けした箇所と重なる一致は飛ばす
+            highlighted.append(content[position:start])
+            highlighted.append(f'<span style="background-color: {color};">{content[start:end]}</span>')
+            position = end
+        highlighted.append(content[position:])
+        return ''.join(highlighted)
 
     def clear_results(self) -> None:
+        self.cancel_incremental_search()
         self.results_list.clear()
         self.result_display.clear()
+        self.snippet_provider.clear()
 
         if self.index_status_label:
             self.index_status_label.setText("")
@@ -2,14 +2,15 @@ import logging
 import re
 from typing import List
 
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import QTimer, pyqtSignal
 from PyQt5.QtWidgets import (
     QCheckBox, QComboBox, QHBoxLayout, QLineEdit, QPushButton, QVBoxLayout, QWidget
 )
 
 from utils.config_manager import ConfigManager
 from utils.constants import (
-    SEARCH_TERM_SEPARATOR_PATTERN, SEARCH_TYPE_AND, SEARCH_TYPE_OR, UI_LABELS
+    INCREMENTAL_SEARCH_DEBOUNCE, MATCH_MODE_FUZZY, MATCH_MODE_LITERAL, MATCH_MODE_REGEX,
+    MATCH_MODE_WILDCARD, SEARCH_TERM_SEPARATOR_PATTERN, SEARCH_TYPE_AND, SEARCH_TYPE_OR, UI_LABELS
 )
 from widgets.directory_management_widget import DirectoryManagementDialog
 
@@ -20,6 +21,7 @@ class SearchWidget(QWidget):
     """検索入力と検索オプション（検索フォルダ設定を含む）のUI"""
 
     search_requested = pyqtSignal()
+    incremental_search_requested = pyqtSignal()
     clear_requested = pyqtSignal()
     open_folder_requested = pyqtSignal()
 
@@ -38,6 +40,13 @@ class SearchWidget(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(layout)
 
+        # 入力のたびに待ち時間をやり直し、入力が止まってから検索する
+        self.incremental_timer = QTimer(self)
+        self.incremental_timer.setSingleShot(True)
+        self.incremental_timer.setInterval(INCREMENTAL_SEARCH_DEBOUNCE)
+        self.incremental_timer.timeout.connect(self.incremental_search_requested.emit)
+        self.search_requested.connect(self.incremental_timer.stop)
+
         search_layout = self._create_search_layout()
         layout.addLayout(search_layout)
 
@@ -49,6 +58,7 @@ class SearchWidget(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText(UI_LABELS['SEARCH_PLACEHOLDER'])
         self.search_input.returnPressed.connect(self.search_requested.emit)
+        self.search_input.textChanged.connect(self._schedule_incremental_search)
 
         search_button = QPushButton(UI_LABELS['SEARCH_BUTTON'])
         search_button.clicked.connect(self.search_requested.emit)
@@ -63,6 +73,9 @@ class SearchWidget(QWidget):
         self.search_type_combo = self._create_search_type_combo()
         options_layout.addWidget(self.search_type_combo)
 
+        self.match_mode_combo = self._create_match_mode_combo()
+        options_layout.addWidget(self.match_mode_combo)
+
         settings_button = QPushButton(UI_LABELS['FOLDER_SETTINGS'])
         settings_button.clicked.connect(self.open_directory_settings)
         options_layout.addWidget(settings_button)
@@ -71,6 +84,14 @@ class SearchWidget(QWidget):
         self.include_subdirs_checkbox.setChecked(True)
         options_layout.addWidget(self.include_subdirs_checkbox)
 
+        # 入力中の検索はインデックス検索が有効な場合だけ使える
+        self.incremental_checkbox = QCheckBox(UI_LABELS['INCREMENTAL_SEARCH'])
+        self.incremental_checkbox.setEnabled(False)
+        options_layout.addWidget(self.incremental_checkbox)
+
+        self.search_type_combo.currentIndexChanged.connect(self._schedule_incremental_search)
+        self.match_mode_combo.currentIndexChanged.connect(self._schedule_incremental_search)
+
         options_layout.addStretch()
 
         self.open_folder_button = QPushButton(UI_LABELS['OPEN_FOLDER'])
@@ -93,14 +114,27 @@ class SearchWidget(QWidget):
         ])
         return search_type_combo
 
+    @staticmethod
+    def _create_match_mode_combo() -> QComboBox:
+        match_mode_combo = QComboBox()
+        match_mode_combo.addItem(UI_LABELS['MATCH_MODE_LITERAL_LABEL'], MATCH_MODE_LITERAL)
+        match_mode_combo.addItem(UI_LABELS['MATCH_MODE_WILDCARD_LABEL'], MATCH_MODE_WILDCARD)
+        match_mode_combo.addItem(UI_LABELS['MATCH_MODE_REGEX_LABEL'], MATCH_MODE_REGEX)
+        match_mode_combo.addItem(UI_LABELS['MATCH_MODE_FUZZY_LABEL'], MATCH_MODE_FUZZY)
+        return match_mode_combo
 
     def get_search_terms(self) -> List[str]:
         """検索語を取得
 
+        正規表現では区切り文字もパターンの一部になり得るため、入力全体を1つの検索語とする。
+
         Returns:
             検索語リスト
         """
         try:
+            if self.get_match_mode() == MATCH_MODE_REGEX:
+                term = self.search_input.text().strip()
+                return [term] if term else []
             return [
                 term.strip()
                 for term in re.split(SEARCH_TERM_SEPARATOR_PATTERN, self.search_input.text())
@@ -125,6 +159,32 @@ class SearchWidget(QWidget):
             logger.error("検索タイプコンボボックスが正しく初期化されていません")
             return SEARCH_TYPE_AND
 
+    def get_match_mode(self) -> str:
+        """検索語の照合方法を取得
+
+        Returns:
+            照合方法（通常/ワイルドカード/正規表現/あいまい）
+        """
+        try:
+            return self.match_mode_combo.currentData() or MATCH_MODE_LITERAL
+        except AttributeError:
+            logger.error("照合方法コンボボックスが正しく初期化されていません")
+            return MATCH_MODE_LITERAL
+
+    def is_incremental_search(self) -> bool:
+        """入力中に検索するかを取得"""
+        return self.incremental_checkbox.isEnabled() and self.incremental_checkbox.isChecked()
+
+    def set_incremental_search_available(self, available: bool) -> None:
+        """入力中の検索を使えるかを切り替える"""
+        self.incremental_checkbox.setEnabled(available)
+        if not available:
+            self.incremental_timer.stop()
+
+    def _schedule_incremental_search(self, *_args) -> None:
+        if self.is_incremental_search():
+            self.incremental_timer.start()
+
     def clear_input(self) -> None:
         """検索入力をクリア"""
         self.search_input.clear()
@@ -1,11 +1,13 @@
 import logging
 import os
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from PyQt5.QtCore import QRegularExpression, Qt
+from PyQt5.QtCore import QPoint, Qt
 from PyQt5.QtGui import (
+    QCloseEvent,
     QColor,
     QSyntaxHighlighter,
+    QTextBlockUserData,
     QTextCharFormat,
     QTextCursor,
     QTextDocument,
@@ -13,6 +15,7 @@ from PyQt5.QtGui import (
 from PyQt5.QtPrintSupport import QPrintDialog, QPrinter, QPrinterInfo
 from PyQt5.QtWidgets import (
     QHBoxLayout,
+    QLabel,
     QMainWindow,
     QPushButton,
     QTextBrowser,
@@ -20,18 +23,27 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
+from service.highlight_matcher import HighlightMatcher
+from service.mapped_text_file import MappedTextFile
+from service.markdown_renderer import RenderedMarkdown, markdown_cache, start_markdown_render
 from utils.constants import (
     AUTO_CLOSE_MESSAGE_DURATION,
+    DEFAULT_FOLD_KANA,
     FILE_OPEN_ERROR_TEMPLATES,
     HIGHLIGHT_COLORS,
+    MATCH_MODE_LITERAL,
     MAX_FONT_SIZE,
     MIN_FONT_SIZE,
     TEXT_VIEWER_CLOSE_LABEL,
     TEXT_VIEWER_DEFAULT_HEIGHT,
     TEXT_VIEWER_DEFAULT_WIDTH,
+    TEXT_VIEWER_LINE_RANGE_TEMPLATE,
+    TEXT_VIEWER_MARKDOWN_LOADING_MESSAGE,
     TEXT_VIEWER_OPEN_FILE_LABEL,
     TEXT_VIEWER_PRINT_ERROR_TEMPLATES,
     TEXT_VIEWER_PRINT_LABEL,
+    TEXT_VIEWER_WINDOW_LINES,
+    TEXT_VIEWER_WINDOW_MARGIN,
     TEXT_VIEWER_ZOOM_IN_LABEL,
     TEXT_VIEWER_ZOOM_OUT_LABEL,
 )
@@ -41,37 +53,84 @@ from widgets.auto_close_message_widget import AutoCloseMessage
 logger = logging.getLogger(__name__)
 
 
+class _BlockMatches(QTextBlockUserData):
+    """ブロックの一致箇所（開始位置, 長さ, 書式）を、照合したときのブロックの版と内容とともに保持する"""
+
+    def __init__(self, revision: int, text: str, matches: List[Tuple[int, int, QTextCharFormat]]) -> None:
+        super().__init__()
+        self.revision = revision
+        self.text = text
+        self.matches = matches
+
+    def is_valid_for(self, revision: int, text: str) -> bool:
+        # setPlainTextなど元に戻せない変更では版が変わらないことがあるため、内容も比べる
+        return self.revision == revision and self.text == text
+
+
 class SearchHighlighter(QSyntaxHighlighter):
-    """検索キーワードを背景色でハイライトするハイライタ"""
+    """検索キーワードを背景色でハイライトするハイライタ
+
+    一致箇所はHighlightMatcherで求めるため、結果一覧と同じ解釈と照合方法でハイライトされる。
+    照合結果はブロックに保持し、Qtがレイアウトのたびにブロックを再ハイライトしても、
+    ブロックの内容が変わっていなければ照合し直さない。
+    """
 
-    def __init__(self, document: QTextDocument, search_terms: List[str]) -> None:
+    def __init__(self, document: QTextDocument, search_terms: List[str],
+                 match_mode: str = MATCH_MODE_LITERAL, fold_kana: bool = DEFAULT_FOLD_KANA) -> None:
         super().__init__(document)
-        self.rules: List[Tuple[QRegularExpression, QTextCharFormat]] = []
+        self.matcher = HighlightMatcher(search_terms, match_mode, fold_kana)
+        self.rules: List[Tuple[int, QTextCharFormat]] = []
 
         for i, term in enumerate(search_terms):
-            stripped = term.strip()
-            if not stripped:
+            if not term.strip():
                 continue
 
             fmt = QTextCharFormat()
             fmt.setBackground(QColor(HIGHLIGHT_COLORS[i % len(HIGHLIGHT_COLORS)]))
+            self.rules.append((i, fmt))
 
-            regex = QRegularExpression(
-                QRegularExpression.escape(stripped),
-                QRegularExpression.CaseInsensitiveOption,
-            )
-            self.rules.append((regex, fmt))
+        self._formats: Dict[int, QTextCharFormat] = dict(self.rules)
 
     def highlightBlock(self, text: str) -> None:
-        for regex, fmt in self.rules:
-            iterator = regex.globalMatch(text)
-            while iterator.hasNext():
-                match = iterator.next()
-                self.setFormat(match.capturedStart(), match.capturedLength(), fmt)
+        if not self.matcher or not text:
+            return
+
+        revision = self.currentBlock().revision()
+        data = self.currentBlockUserData()
+        if not isinstance(data, _BlockMatches) or not data.is_valid_for(revision, text):
+            data = _BlockMatches(revision, text, self._match(text))
+            self.setCurrentBlockUserData(data)
+
+        for start, length, fmt in data.matches:
+            self.setFormat(start, length, fmt)
+
+    def _match(self, text: str) -> List[Tuple[int, int, QTextCharFormat]]:
+        # Qtの位置はUTF-16単位のため、サロゲートペアになる文字を含む場合は位置を変換する
+        offsets = _utf16_offsets(text) if any(ord(char) > 0xFFFF for char in text) else None
+        matches = []
+        for start, end, term_index in sorted(self.matcher.finditer(text)):
+            if offsets is not None:
+                start, end = offsets[start], offsets[end]
+            matches.append((start, end - start, self._formats[term_index]))
+        return matches
+
+
+def _utf16_offsets(text: str) -> List[int]:
+    """文字の位置ごとの、UTF-16での位置"""
+    offsets = [0]
+    for char in text:
+        offsets.append(offsets[-1] + (2 if ord(char) > 0xFFFF else 1))
+    return offsets
 
 
 class TextViewerWindow(QMainWindow):
-    """アプリ内完結のテキスト・Markdownビューアウィンドウ"""
+    """アプリ内完結のテキスト・Markdownビューアウィンドウ
+
+    text_fileを渡した場合は大きなファイルとして扱い、表示位置の前後の行だけを読み込む。
+    スクロールが読み込んだ範囲の端に達すると、表示中の行を基準に範囲を読み直す。
+    この場合、印刷されるのは読み込んでいる範囲の行のみ。
+    Markdownファイルはload_markdown_fileで別スレッドで描画し、描画後に該当行へ移動する。
+    """
 
     def __init__(
         self,
@@ -85,12 +144,24 @@ class TextViewerWindow(QMainWindow):
         height: int = TEXT_VIEWER_DEFAULT_HEIGHT,
         file_path: str = "",
         parent: Optional[QWidget] = None,
+        text_file: Optional[MappedTextFile] = None,
+        match_mode: str = MATCH_MODE_LITERAL,
+        fold_kana: bool = DEFAULT_FOLD_KANA,
     ) -> None:
         super().__init__(parent)
         self.setAttribute(Qt.WA_DeleteOnClose)
         self.setWindowTitle(title)
         self.resize(width, height)
         self._file_path = file_path
+        self._text_file = text_file
+        self._window_start = 0
+        self._window_end = 0
+        self._loading_window = False
+        self._line_blocks: Optional[List[int]] = None
+        self._markdown_position = 0
+        self._search_terms = search_terms
+        self._match_mode = match_mode
+        self._fold_kana = fold_kana
         self.auto_close_message = AutoCloseMessage(self)
 
         central = QWidget()
@@ -102,17 +173,22 @@ class TextViewerWindow(QMainWindow):
         self.text_browser = QTextBrowser()
         self._apply_font_size(font_size)
 
-        if is_markdown:
+        if search_terms:
+            self.highlighter = SearchHighlighter(self.text_browser.document(), search_terms, match_mode, fold_kana)
+
+        if text_file is not None:
+            self.line_range_label = QLabel()
+            layout.addWidget(self.line_range_label)
+            self._load_window(max(position, 1) - 1)
+            self.text_browser.verticalScrollBar().valueChanged.connect(self._on_scroll)
+        elif is_markdown:
             self.text_browser.setMarkdown(content)
         else:
             self.text_browser.setPlainText(content)
 
-        if search_terms:
-            self.highlighter = SearchHighlighter(self.text_browser.document(), search_terms)
-
         layout.addWidget(self.text_browser)
 
-        # Markdownは描画で行構造が変わるため、行ジャンプはプレーンテキストのみ
+        # 直接渡したMarkdownは行とブロックの対応がないため、行ジャンプはプレーンテキストのみ
         if position > 0 and not is_markdown:
             self._scroll_to_line(position)
 
@@ -215,14 +291,107 @@ class TextViewerWindow(QMainWindow):
         self.text_browser.setFont(font)
 
     def _scroll_to_line(self, line: int) -> None:
-        """1始まりの行番号へカーソルを移動してスクロールする"""
-        block = self.text_browser.document().findBlockByLineNumber(max(0, line - 1))
+        """1始まりの行番号へカーソルを移動してスクロールする
+
+        大きなファイルで読み込んだ範囲の外の行の場合は、その行の前後を読み込み直す。
+        """
+        line_index = max(0, line - 1)
+        if self._text_file is not None and not self._window_start <= line_index < self._window_end:
+            self._load_window(line_index)
+
+        block_number = line_index - self._window_start
+        if self._line_blocks is not None:
+            block_number = self._line_blocks[min(line_index, len(self._line_blocks) - 1)] if self._line_blocks else 0
+
+        block = self.text_browser.document().findBlockByNumber(block_number)
         cursor = QTextCursor(block)
         self.text_browser.setTextCursor(cursor)
         self.text_browser.ensureCursorVisible()
 
+    def load_markdown_file(self, file_path: str, position: int = 0) -> None:
+        """Markdownファイルを表示する
+
+        描画済みの文書がキャッシュにあればすぐに表示し、なければ別スレッドで描画してから表示する。
+
+        Args:
+            file_path: Markdownファイルパス
+            position: 移動する行番号（1始まり、0で移動なし）
+        """
+        self._markdown_position = position
+        rendered = markdown_cache.get(file_path)
+        if rendered is not None:
+            self._show_markdown(rendered)
+            return
+
+        self.text_browser.setPlainText(TEXT_VIEWER_MARKDOWN_LOADING_MESSAGE)
+        start_markdown_render(file_path, self._show_markdown, self._show_markdown_error)
+
+    def _show_markdown(self, rendered: RenderedMarkdown) -> None:
+        # 描画済みの文書は他のビューアと共有するため、複製してハイライトを付ける
+        document = rendered.document.clone(self.text_browser)
+        document.setDefaultFont(self.text_browser.font())
+        self.text_browser.setDocument(document)
+        # 元の文書とともにハイライタも破棄されるため、新しい文書に作り直す
+        if self._search_terms:
+            self.highlighter = SearchHighlighter(document, self._search_terms, self._match_mode, self._fold_kana)
+
+        self._line_blocks = rendered.line_blocks
+        if self._markdown_position > 0:
+            self._scroll_to_line(self._markdown_position)
+
+    def _show_markdown_error(self, error: str) -> None:
+        self.text_browser.setPlainText(FILE_OPEN_ERROR_TEMPLATES['FILE_OPEN_ERROR'].format(error=error))
+
+    def _load_window(self, line_index: int) -> None:
+        """0始まりの行番号の行とその前後を読み込んで表示する"""
+        text_file = self._text_file
+        start = max(0, min(line_index - TEXT_VIEWER_WINDOW_MARGIN, text_file.line_count - TEXT_VIEWER_WINDOW_LINES))
+        end = min(text_file.line_count, start + TEXT_VIEWER_WINDOW_LINES)
+
+        self._loading_window = True
+        try:
+            self.text_browser.setPlainText(text_file.lines(start, end))
+        finally:
+            self._loading_window = False
+
+        self._window_start = start
+        self._window_end = end
+        self.line_range_label.setText(TEXT_VIEWER_LINE_RANGE_TEMPLATE.format(
+            start=start + 1, end=end, count=text_file.line_count
+        ))
+
+    def _on_scroll(self, value: int) -> None:
+        if self._loading_window:
+            return
+
+        scroll_bar = self.text_browser.verticalScrollBar()
+        at_top = value <= scroll_bar.minimum() and self._window_start > 0
+        at_bottom = value >= scroll_bar.maximum() and self._window_end < self._text_file.line_count
+        if not (at_top or at_bottom):
+            return
+
+        # 文書の余白の位置では一致判定が定まらないため、余白の内側で先頭の行を求める
+        document = self.text_browser.document()
+        inside_margin = int(document.documentMargin()) + 1
+        top_block = self.text_browser.cursorForPosition(QPoint(inside_margin, inside_margin)).blockNumber()
+        top_line = self._window_start + top_block
+        self._load_window(top_line)
+
+        # 読み直す前に先頭に見えていた行を、読み直した後も先頭に表示する
+        block = document.findBlockByNumber(top_line - self._window_start)
+        self._loading_window = True
+        try:
+            scroll_bar.setValue(int(document.documentLayout().blockBoundingRect(block).top()))
+        finally:
+            self._loading_window = False
+
     def zoom_in(self) -> None:
         self.text_browser.zoomIn(1)
 
     def zoom_out(self) -> None:
         self.text_browser.zoomOut(1)
+
+    def closeEvent(self, a0: QCloseEvent) -> None:
+        if self._text_file is not None:
+            self._text_file.close()
+        super().closeEvent(a0)